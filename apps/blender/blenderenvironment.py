@@ -1,5 +1,6 @@
 from typing import Dict
 
+import apps.blender.resources.blenderloganalyser as log_analyser
 from apps.core import nvgpu
 from apps.core.nvgpu import get_devices
 from golem.docker.environment import DockerEnvironment
@@ -9,15 +10,19 @@ from golem.environments.environment import SupportStatus, UnsupportReason
 
 class BlenderEnvironment(DockerEnvironment):
     DOCKER_IMAGE = "golemfactory/blender"
-    DOCKER_TAG = "1.9"
+    DOCKER_TAG = "1.10"
     ENV_ID = "BLENDER"
     SHORT_DESCRIPTION = "Blender (www.blender.org)"
 
+    def get_progress_extractor(self, extra_data: Dict):
+        return log_analyser.make_progress_extractor(
+            extra_data.get('frames') or [])
+
 
 class BlenderNVGPUEnvironment(BlenderEnvironment):
 
     DOCKER_IMAGE = "golemfactory/blender_nvgpu"
-    DOCKER_TAG = "1.3"
+    DOCKER_TAG = "1.4"
     ENV_ID = "BLENDER_NVGPU"
     SHORT_DESCRIPTION = "Blender + NVIDIA GPU (www.blender.org)"
 
@@ -1,53 +1,203 @@
 import os
 import re
 from bisect import insort
+from functools import lru_cache
+from typing import Any, Dict, IO, Set, Tuple
 
 from golem.core.common import to_unicode
 
+# Status lines are matched for every line of a running render, so
+# the patterns are compiled once
+FRAME_STATUS_PATTERN = re.compile(
+    r"^Fra:(\d+) .*\| (?:"
+    r"Rendered (\d+)/(\d+) Tiles|"
+    r"Path Tracing Tile (\d+)/(\d+)(?:, Sample (\d+)/(\d+))?|"
+    r"(Finished))\s*$")
+
+
+# Size of the parts of a log file read at once by BlenderLogAnalyser
+LOG_READ_SIZE = 1024 * 1024
+
+# Lines reporting files missing from resources
+MISSING_FILE_LINE = r"Warning: Path '(.*)' not found"
+
+# Lines carrying values of the log, with the re flags they are matched with
+# and a function converting the matched groups into the value. Only the
+# first line matching in a log counts. Patterns are matched at the
+# beginning of a line.
+LOG_VALUE_LINES = {
+    'wrong_engine': (r"Error: engine(.*)", re.IGNORECASE,
+                     lambda groups: groups[0]),
+    'rendering_time': (r"(\s*Time:\s*)(\d+):(\d+\.\d+)", re.IGNORECASE,
+                       lambda groups: int(groups[1]) * 60 + float(groups[2])),
+    'output_file': (r"Saved: '(.*)'", re.IGNORECASE,
+                    lambda groups: groups[0]),
+    'resolution': (r"Info: Resolution: (\d+) x (\d+)", re.IGNORECASE,
+                   lambda groups: (int(groups[0]), int(groups[1]))),
+    'frames': (r"Info: Frames: (\d+)-(\d+);(\d+)", re.IGNORECASE,
+               lambda groups: list(range(int(groups[0]), int(groups[1]) + 1,
+                                         int(groups[2])))),
+    'file_format': (r"Info: File format: (\.\w+)", re.IGNORECASE,
+                    lambda groups: groups[0]),
+    'engine_type': (r"Info: Engine: (.*)", re.IGNORECASE,
+                    lambda groups: groups[0]),
+    'output_path': (r"Info: Filepath: (.*)", re.IGNORECASE,
+                    lambda groups: groups[0]),
+    'samples': (r"Info: Samples: (.*)", 0,
+                lambda groups: groups[0]),
+}
+
+# Values reported by make_log_analyses
+ANALYSED_VALUES = frozenset(LOG_VALUE_LINES) - {'output_file'}
+
+# "Time:" line, which may be followed by the rendering time after blank lines
+TIME_LABEL_PATTERN = re.compile(r"\s*Time:\s*", re.IGNORECASE)
+
 
 def make_log_analyses(log_content, return_data):
-    _get_warnings(log_content, return_data)
-    rendering_time = find_rendering_time(log_content)
-    if rendering_time:
-        return_data["rendering_time"] = to_unicode(rendering_time)
-    output_path = find_filepath(log_content)
-    if output_path:
-        return_data["output_path"] = to_unicode(output_path)
-    frames = find_frames(log_content)
-    if frames:
-        return_data["frames"] = frames
-    resolution = find_resolution(log_content)
-    if resolution:
-        return_data["resolution"] = resolution
-    file_format = find_file_format(log_content)
-    if file_format:
-        return_data["file_format"] = to_unicode(file_format)
-    engine_type = find_engine_type(log_content)
-    if engine_type:
-        return_data['engine_type'] = to_unicode(engine_type)
-        if engine_type == "CYCLES":
-            samples_pp = find_samples_for_scenes(log_content)
-            if samples_pp:
+    analyser = BlenderLogAnalyser()
+    analyser.feed(log_content)
+    analyser.finish()
+    analyser.update_return_data(return_data)
+
+
+def analyse_log_file(log_path, return_data):
+    """ Same as make_log_analyses for the content of a log file, which is
+    read in parts instead of being loaded whole """
+    analyser = BlenderLogAnalyser()
+    with open(log_path, "r") as log_file:
+        analyser.read(log_file)
+    analyser.finish()
+    analyser.update_return_data(return_data)
+
+
+@lru_cache()
+def _log_lines_pattern(value_names):
+    """ A single pattern matching missing file warnings and lines of
+    the given values, each preceded by a newline """
+    names = ['missing_file'] + sorted(value_names)
+    lines = dict(LOG_VALUE_LINES,
+                 missing_file=(MISSING_FILE_LINE, re.IGNORECASE, None))
+    alternatives = []
+    for name in names:
+        line, flags, _ = lines[name]
+        scope = "(?i:{})" if flags & re.IGNORECASE else "(?:{})"
+        alternatives.append("(?P<{}>{})".format(name, scope.format(line)))
+    # A literal prefix lets re skip to the candidate lines quickly
+    return re.compile("\n(?:{})".format("|".join(alternatives)))
+
+
+class BlenderLogAnalyser:
+    """ Finds the values reported by make_log_analyses in a single pass over
+    a log, which is fed in consecutive parts. Lines are analysed as soon as
+    they are complete, so a log still being written can be analysed as it
+    grows, see read(). All lines are matched with one combined pattern,
+    which stops looking for values once they are found.
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = dict()
+        self.missing_files: Set[Tuple[Tuple[str, str], ...]] = set()
+        # Text not analysed yet, starting with the newline before it
+        self._pending = "\n"
+
+    def feed(self, text: str) -> None:
+        """ Analyse the next part of the log """
+        self._pending += text
+        end = self._complete_end(self._pending)
+        if end > 0:
+            self._analyse(self._pending[:end])
+            self._pending = self._pending[end:]
+
+    def read(self, log_file: IO[str], read_size: int = LOG_READ_SIZE) -> None:
+        """ Analyse the text appended to the log file since the previous
+        read. The values found so far are available in between reads. """
+        while True:
+            text = log_file.read(read_size)
+            if not text:
+                break
+            self.feed(text)
+
+    def finish(self) -> None:
+        """ Analyse the rest of the log, once all of it has been fed """
+        self._analyse(self._pending)
+        self._pending = "\n"
+
+    def update_return_data(self, return_data: Dict) -> None:
+        """ Report the values found, as make_log_analyses does """
+        warnings = {}
+        if self.missing_files:
+            warnings['missing_files'] = list(map(dict, self.missing_files))
+        wrong_engine = self.values.get('wrong_engine')
+        if wrong_engine:
+            warnings['wrong_engine'] = wrong_engine
+        _update_warnings(return_data, warnings)
+
+        for name in ('rendering_time', 'output_path'):
+            value = self.values.get(name)
+            if value:
+                return_data[name] = to_unicode(value)
+        for name in ('frames', 'resolution'):
+            value = self.values.get(name)
+            if value:
+                return_data[name] = value
+        file_format = self.values.get('file_format')
+        if file_format:
+            return_data["file_format"] = to_unicode(file_format)
+        engine_type = self.values.get('engine_type')
+        if engine_type:
+            return_data['engine_type'] = to_unicode(engine_type)
+            samples_pp = self.values.get('samples')
+            if engine_type == "CYCLES" and samples_pp:
                 return_data['samples'] = samples_pp
 
+    def _complete_end(self, text: str) -> int:
+        """ Length of the beginning of the text which can be analysed """
+        end = text.rfind("\n")
+        if end <= 0 or 'rendering_time' in self.values:
+            return max(end, 0)
 
-def find_samples_for_scenes(log_content):
-    samples = re.search("^Info: Samples: (.*)", log_content,
-                        re.MULTILINE)
-    if samples:
-        return samples.group(1)
+        # The rendering time may follow "Time:" after blank lines, so such
+        # trailing lines are kept until the next non blank line
+        head = text[:end].rstrip()
+        if not head:
+            return 0
+        last_line = head.rfind("\n")
+        if TIME_LABEL_PATTERN.fullmatch(head, last_line + 1):
+            return last_line
+        return text.find("\n", len(head))
+
+    def _analyse(self, text: str) -> None:
+        pattern = _log_lines_pattern(ANALYSED_VALUES.difference(self.values))
+        for match in pattern.finditer(text):
+            name = match.lastgroup
+            # Groups of the matched line, following the group named after it
+            groups = match.groups()[pattern.groupindex[name]:]
+            if name == 'missing_file':
+                self.missing_files.add(_missing_file_info(groups[0]))
+            elif name not in self.values:
+                self.values[name] = LOG_VALUE_LINES[name][2](groups)
+
+
+def _find_value(name, log_content):
+    line, flags, convert = LOG_VALUE_LINES[name]
+    match = re.search("^" + line, log_content, flags | re.MULTILINE)
+    if match:
+        return convert(match.groups())
 
 
-def _get_warnings(log_content, return_data):
-    warnings = {}
-    missing_files = find_missing_files(log_content)
-    if missing_files:
-        warnings['missing_files'] = missing_files
+def _missing_file_info(missing_path):
+    return (
+        ('baseName', os.path.basename(missing_path)),
+        ('dirName', os.path.dirname(missing_path))
+    )
 
-    wrong_engine = find_wrong_renderer_warning(log_content)
-    if wrong_engine:
-        warnings['wrong_engine'] = wrong_engine
 
+def find_samples_for_scenes(log_content):
+    return _find_value('samples', log_content)
+
+
+def _update_warnings(return_data, warnings):
     if warnings:
         if return_data.get("warnings"):
             return_warnings = return_data.get("warnings")
@@ -59,26 +209,20 @@ def _get_warnings(log_content, return_data):
 
 
 def find_wrong_renderer_warning(log_content):
-    engine_error = re.search("^Error: engine(.*)", log_content,
-                             re.IGNORECASE | re.MULTILINE)
-    if engine_error:
-        return engine_error.group(1)
+    engine_error = _find_value('wrong_engine', log_content)
+    if engine_error is not None:
+        return engine_error
     return ""
 
 
 def find_missing_files(log_content):
     warnings = list()
     for l in log_content.splitlines():
-        missing_file = re.search("^Warning: Path '(.*)' not found", l,
-                                 re.IGNORECASE)
+        missing_file = re.search("^" + MISSING_FILE_LINE, l, re.IGNORECASE)
         if missing_file:
             # extract filename from warning message
             missing_path = missing_file.group(1)
-            fileInfo = (
-                ('baseName', os.path.basename(missing_path)),
-                ('dirName', os.path.dirname(missing_path))
-            )
-            insort(warnings, fileInfo)
+            insort(warnings, _missing_file_info(missing_path))
 
     if warnings:
         return list(map(dict, set(warnings)))
@@ -95,54 +239,72 @@ def _format_missing_files_warning(missing_files):
 
 
 def find_rendering_time(log_content):
-    time_ = re.search("(^\s*Time:\s*)(\d+):(\d+\.\d+)", log_content,
-                      re.MULTILINE | re.IGNORECASE)
-    if time_:
-        time_ = int(time_.group(2)) * 60 + float(time_.group(3))
-        return time_
+    return _find_value('rendering_time', log_content)
 
 
 def find_output_file(log_content):
-    output_file = re.search("^Saved: '(.*)'", log_content,
-                            re.MULTILINE | re.IGNORECASE)
-    if output_file:
-        return output_file.group(1)
+    return _find_value('output_file', log_content)
 
 
 def find_resolution(log_content):
-    resolution = re.search("^Info: Resolution: (\d+) x (\d+)", log_content,
-                           re.MULTILINE | re.IGNORECASE)
-    if resolution:
-        return int(resolution.group(1)), int(resolution.group(2))
+    return _find_value('resolution', log_content)
 
 
 def find_frames(log_content):
-    frames = re.search("^Info: Frames: (\d+)-(\d+);(\d+)", log_content,
-                       re.MULTILINE | re.IGNORECASE)
-    if frames:
-        start_frame = int(frames.group(1))
-        end_frame = int(frames.group(2))
-        frame_step = int(frames.group(3))
-        return list(range(start_frame, end_frame + 1, frame_step))
+    return _find_value('frames', log_content)
 
 
 def find_file_format(log_content):
-    file_format = re.search("^Info: File format: (\.\w+)", log_content,
-                            re.MULTILINE | re.IGNORECASE)
-    if file_format:
-        return file_format.group(1)
+    return _find_value('file_format', log_content)
 
 
 def find_engine_type(log_content):
-    file_format = re.search("^Info: Engine: (.*)", log_content,
-                            re.MULTILINE | re.IGNORECASE)
-    if file_format:
-        return file_format.group(1)
+    return _find_value('engine_type', log_content)
 
 
 def find_filepath(log_content):
-    filepath = re.search("^Info: Filepath: (.*)", log_content,
-                         re.MULTILINE | re.IGNORECASE)
+    return _find_value('output_path', log_content)
+
+
+def find_frame_progress(line):
+    """ Find the rendered part of a frame in a single Blender status line
+    :return: (frame number, fraction of the frame rendered) or None
+    """
+    status = FRAME_STATUS_PATTERN.search(line)
+    if not status:
+        return None
+
+    (frame, rendered, tiles, tile, path_tiles,
+     sample, samples, finished) = status.groups()
+    frame = int(frame)
+
+    if finished:
+        return frame, 1.0
+    if rendered:
+        return frame, int(rendered) / max(int(tiles), 1)
+
+    tile = int(tile)
+    path_tiles = max(int(path_tiles), 1)
+    if sample:
+        # The tile being sampled is counted in as well
+        tile_progress = int(sample) / max(int(samples), 1)
+        return frame, max(tile - 1 + tile_progress, 0) / path_tiles
+    return frame, tile / path_tiles
+
+
+def make_progress_extractor(frames):
+    """ Create a function translating Blender log lines into the progress of
+    rendering given frames, usable with golem.docker.progress.ProgressReader
+    """
+    frames = list(frames) or [None]
+
+    def extract_progress(line):
+        frame_progress = find_frame_progress(line)
+        if frame_progress is None:
+            return None
+
+        frame, fraction = frame_progress
+        index = frames.index(frame) if frame in frames else 0
+        return (index + fraction) / len(frames)
 
-    if filepath:
-        return filepath.group(1)
+    return extract_progress
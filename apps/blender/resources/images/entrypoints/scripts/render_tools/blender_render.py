@@ -11,8 +11,30 @@ BLENDER_COMMAND = "blender"
 
 
 def exec_cmd(cmd):
-    pc = subprocess.Popen(cmd)
-    return pc.wait()
+    progress_file = os.environ.get("PROGRESS_FILE")
+    if not progress_file:
+        pc = subprocess.Popen(cmd)
+        return pc.wait()
+
+    # Mirror Blender's status lines to the progress file, which is tailed
+    # by Golem while the subtask is being computed. The output is passed on
+    # as bytes: scene and layer names are not necessarily ASCII.
+    pc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        with open(progress_file, "ab") as progress:
+            for line in pc.stdout:
+                sys.stdout.buffer.write(line)
+                sys.stdout.buffer.flush()
+                if line.startswith(b"Fra:"):
+                    progress.write(line)
+                    progress.flush()
+    except BaseException:
+        pc.kill()
+        raise
+    finally:
+        pc.stdout.close()
+        exit_code = pc.wait()
+    return exit_code
 
 
 # pylint: disable=too-many-arguments
@@ -175,7 +197,7 @@ def render(parameters: dict,
 
         print(cmd, file=sys.stderr)
         exit_code = exec_cmd(cmd)
-        if exit_code is not 0:
+        if exit_code != 0:
             sys.exit(exit_code)
 
         crop_counter += 1
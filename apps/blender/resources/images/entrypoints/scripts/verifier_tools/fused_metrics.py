@@ -0,0 +1,199 @@
+import math
+from typing import Any, Callable, Dict, List, Tuple
+
+import cv2
+import numpy
+from PIL import Image, ImageFilter
+from scipy.ndimage import uniform_filter
+
+from .histograms_correlation import MetricHistogramsCorrelation
+from .mass_center_distance import MetricMassCenterDistance
+from .skimage import crop
+from .wavelet import MetricWavelet
+
+# Parameters of compare_ssim as called by MetricSSIM
+SSIM_WIN_SIZE = 7
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+# Data range of uint8 pixels, as used by compare_ssim and compare_psnr
+DATA_RANGE = 255
+
+
+class MetricImage:
+    """
+    An RGB crop compared by the metrics, together with the intermediate
+    results of the metrics which depend on this crop only. Intermediates are
+    computed on first use and kept, so a reference crop compared with many
+    rendered crops computes its part of every metric once.
+    """
+
+    def __init__(self, pixels: numpy.ndarray) -> None:
+        """
+        :param pixels: uint8 array of shape (height, width, 3)
+        """
+        self.pixels = numpy.ascontiguousarray(pixels, dtype=numpy.uint8)
+        self._intermediates: Dict[str, Any] = dict()
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> 'MetricImage':
+        return cls(numpy.asarray(image.convert("RGB")))
+
+    def _get(self, name: str, compute: Callable[[], Any]) -> Any:
+        if name not in self._intermediates:
+            self._intermediates[name] = compute()
+        return self._intermediates[name]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.pixels.shape
+
+    @property
+    def floats(self) -> numpy.ndarray:
+        """ Pixels as float32, which compare_mse works on for uint8 """
+        return self._get('floats',
+                         lambda: self.pixels.astype(numpy.float32))
+
+    @property
+    def local_statistics(self) -> List[Tuple[numpy.ndarray, ...]]:
+        """ Channels as float64 with their local means, squared local means
+        and local sample variances over SSIM windows """
+        return self._get('local_statistics', self._local_statistics)
+
+    def _local_statistics(self):
+        cov_norm = SSIM_WIN_SIZE ** 2 / (SSIM_WIN_SIZE ** 2 - 1)
+        statistics = []
+        for i in range(self.pixels.shape[-1]):
+            channel = self.pixels[..., i].astype(numpy.float64)
+            mean = uniform_filter(channel, size=SSIM_WIN_SIZE)
+            mean_of_squares = uniform_filter(channel * channel,
+                                             size=SSIM_WIN_SIZE)
+            variance = cov_norm * (mean_of_squares - mean * mean)
+            statistics.append((channel, mean, mean ** 2, variance))
+        return statistics
+
+    @property
+    def variance(self) -> numpy.float64:
+        """ Sum of variances of the channels """
+        def compute():
+            variance = numpy.var(self.pixels, axis=(0, 1))
+            return variance[0] + variance[1] + variance[2]
+        return self._get('variance', compute)
+
+    @property
+    def edges(self) -> numpy.ndarray:
+        """ Pixels filtered with PIL's FIND_EDGES, as float32 """
+        return self._get('edges', self._edges)[0]
+
+    @property
+    def edge_factor(self) -> numpy.float64:
+        """ Mean of the edges """
+        return self._get('edges', self._edges)[1]
+
+    def _edges(self):
+        edges = numpy.asarray(
+            Image.fromarray(self.pixels).filter(ImageFilter.FIND_EDGES))
+        return edges.astype(numpy.float32), numpy.mean(edges)
+
+    @property
+    def wavelets(self) -> Dict[str, List]:
+        return self._get('wavelets',
+                         lambda: MetricWavelet.decompose(self.pixels))
+
+    @property
+    def histogram(self) -> numpy.ndarray:
+        """ Normalized 3D histogram of the BGR pixels """
+        return self._get(
+            'histogram',
+            lambda: MetricHistogramsCorrelation.calculate_normalized_histogram(
+                cv2.cvtColor(self.pixels, cv2.COLOR_RGB2BGR)))
+
+    @property
+    def mass_centers(self) -> Dict[int, Tuple[float, float]]:
+        return self._get(
+            'mass_centers',
+            lambda: MetricMassCenterDistance.compute_array_mass_centers(
+                self.pixels))
+
+
+def _mse(floats1: numpy.ndarray, floats2: numpy.ndarray) -> numpy.float64:
+    # compare_mse of uint8 images
+    return numpy.mean(numpy.square(floats1 - floats2), dtype=numpy.float64)
+
+
+def _ssim(reference: MetricImage, image: MetricImage) -> numpy.float64:
+    # compare_ssim(multichannel=True) of uint8 images, with the local
+    # statistics of each image computed once
+    if numpy.any((numpy.asarray(reference.shape[:2]) - SSIM_WIN_SIZE) < 0):
+        raise ValueError(
+            "win_size exceeds image extent.  If the input is a multichannel "
+            "(color) image, set multichannel=True.")
+
+    cov_norm = SSIM_WIN_SIZE ** 2 / (SSIM_WIN_SIZE ** 2 - 1)
+    c1 = (SSIM_K1 * DATA_RANGE) ** 2
+    c2 = (SSIM_K2 * DATA_RANGE) ** 2
+    pad = (SSIM_WIN_SIZE - 1) // 2
+
+    channels = zip(reference.local_statistics, image.local_statistics)
+    mssim = numpy.empty(reference.shape[-1])
+    for i, ((x, ux, ux_sq, vx), (y, uy, uy_sq, vy)) in enumerate(channels):
+        uxy = uniform_filter(x * y, size=SSIM_WIN_SIZE)
+        vxy = cov_norm * (uxy - ux * uy)
+        a1 = 2 * ux * uy + c1
+        a2 = 2 * vxy + c2
+        b1 = ux_sq + uy_sq + c1
+        b2 = vx + vy + c2
+        s = (a1 * a2) / (b1 * b2)
+        mssim[i] = crop(s, pad).mean()
+    return mssim.mean()
+
+
+def _psnr(reference: MetricImage, image: MetricImage) -> float:
+    psnr = 10 * numpy.log10(
+        (DATA_RANGE ** 2) / _mse(reference.floats, image.floats))
+    if math.isinf(psnr):
+        psnr = numpy.finfo(numpy.float32).max
+    return psnr
+
+
+class FusedMetrics:
+    """
+    All metrics of ImgMetrics computed together. Every metric is derived
+    from intermediates of MetricImage, the results are the same as those of
+    the separate metric classes.
+    """
+
+    @staticmethod
+    def compute_metrics(image1, image2):
+        return FusedMetrics.compare(MetricImage.from_image(image1),
+                                    MetricImage.from_image(image2))
+
+    @staticmethod
+    def get_labels():
+        from .imgmetrics import ImgMetrics
+        return ImgMetrics.get_metric_names()
+
+    @staticmethod
+    def compare(reference: MetricImage, image: MetricImage) -> Dict:
+        if reference.shape != image.shape:
+            raise ValueError('Input images must have the same dimensions.')
+
+        result = dict()
+        result["ssim"] = _ssim(reference, image)
+        result["psnr"] = _psnr(reference, image)
+
+        result["reference_variance"] = reference.variance
+        result["image_variance"] = image.variance
+        result["variance_difference"] = image.variance - reference.variance
+
+        result["ref_edge_factor"] = reference.edge_factor
+        result["comp_edge_factor"] = image.edge_factor
+        result["edge_difference"] = _mse(reference.edges, image.edges)
+
+        result.update(MetricWavelet.compare_decompositions(reference.wavelets,
+                                                           image.wavelets))
+        result["histograms_correlation"] = \
+            MetricHistogramsCorrelation.correlate_histograms(
+                reference.histogram, image.histogram)
+        result.update(MetricMassCenterDistance.compare_mass_centers(
+            reference.mass_centers, image.mass_centers))
+        return result
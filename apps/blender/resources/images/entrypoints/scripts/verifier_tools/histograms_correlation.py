@@ -39,6 +39,10 @@ class MetricHistogramsCorrelation:
     def compare_histograms(image_a, image_b):
         histogram_a = MetricHistogramsCorrelation.calculate_normalized_histogram(image_a)
         histogram_b = MetricHistogramsCorrelation.calculate_normalized_histogram(image_b)
+        return MetricHistogramsCorrelation.correlate_histograms(histogram_a, histogram_b)
+
+    @staticmethod
+    def correlate_histograms(histogram_a, histogram_b):
         result = cv2.compareHist(histogram_a, histogram_b, cv2.HISTCMP_CORREL)
         return result
 
@@ -0,0 +1,85 @@
+import itertools
+import os
+from typing import Dict, List, Tuple
+
+import numpy
+from PIL import Image
+
+# Offsets (x, y) of crops compared with a reference crop, the exact
+# position goes first
+CROP_OFFSETS: List[Tuple[int, int]] = \
+    list(itertools.product([0, -1, 1], repeat=2))
+
+
+def get_file_extension_lowercase(file_path):
+    return os.path.splitext(file_path)[1][1:].lower()
+
+
+def decode_image(img_path) -> numpy.ndarray:
+    """
+    Decodes an image file into an RGB array of shape (height, width, 3).
+    EXR images are converted to 8 bits per channel the same way as by
+    ConvertEXRToPNG, without writing the PNG file.
+    """
+    if get_file_extension_lowercase(img_path) == "exr":
+        # OpenEXR is only available in the verifier image
+        from .img_format_converter import ReadEXRAsRGB
+        image = ReadEXRAsRGB(img_path)
+    else:
+        with Image.open(img_path) as opened:
+            image = opened.convert("RGB")
+    return numpy.asarray(image)
+
+
+def crop_array(image: numpy.ndarray, left: int, top: int,
+               width: int, height: int) -> numpy.ndarray:
+    """
+    Returns the crop of the image as a view into it. Like PIL's Image.crop,
+    areas outside the image are filled with zeros, such crops are copies.
+    """
+    image_height, image_width = image.shape[:2]
+    right, bottom = left + width, top + height
+    if left >= 0 and top >= 0 and right <= image_width \
+            and bottom <= image_height:
+        return image[top:bottom, left:right]
+
+    crop = numpy.zeros((height, width) + image.shape[2:], dtype=image.dtype)
+    src_left, src_top = max(left, 0), max(top, 0)
+    src_right, src_bottom = min(right, image_width), min(bottom, image_height)
+    if src_left < src_right and src_top < src_bottom:
+        crop[src_top - top:src_bottom - top,
+             src_left - left:src_right - left] = \
+            image[src_top:src_bottom, src_left:src_right]
+    return crop
+
+
+class ImageCache:
+    """
+    Images of a single verification, decoded once and kept in memory.
+    Reference crops and rendered subtasks are compared many times (once per
+    crop and per offset), crops are sliced out of the decoded arrays.
+    """
+
+    def __init__(self):
+        self._images: Dict[str, numpy.ndarray] = {}
+
+    def get(self, img_path) -> numpy.ndarray:
+        key = os.path.abspath(img_path)
+        image = self._images.get(key)
+        if image is None:
+            image = decode_image(img_path)
+            self._images[key] = image
+        return image
+
+    def get_crops(self, img_path, x, y, width, height) \
+            -> List[numpy.ndarray]:
+        """
+        Returns crops of the given size at (x, y) and at the positions moved
+        by CROP_OFFSETS.
+        """
+        image = self.get(img_path)
+        return [crop_array(image, x + x_offset, y + y_offset, width, height)
+                for x_offset, y_offset in CROP_OFFSETS]
+
+    def clear(self):
+        self._images.clear()
@@ -1,13 +1,17 @@
 
+import sys
+
 import numpy as np
 from PIL import Image
 import OpenEXR
 
 import Imath
 
-# converting .exr file to .png if user gave .exr file as a rendered scene
-def ConvertEXRToPNG(exrfile, pngfile):
+# reading .exr file as an 8-bit RGB image, in memory
+def ReadEXRAsRGB(exrfile):
     File = OpenEXR.InputFile(exrfile)
+    if 'RenderLayer.Combined.R' in File.header()['channels']:
+        sys.exit("There is no support for OpenEXR multilayer")
     PixType = Imath.PixelType(Imath.PixelType.FLOAT)
     DW = File.header()['dataWindow']
     Size = (DW.max.x - DW.min.x + 1, DW.max.y - DW.min.y + 1)
@@ -18,7 +22,11 @@ def ConvertEXRToPNG(exrfile, pngfile):
                           (rgb[i] * 12.92) * 255.0,
                           (1.055 * (rgb[i] ** (1.0 / 2.4)) - 0.055) * 255.0)
     rgb8 = [Image.frombytes("F", Size, c.tostring()).convert("L") for c in rgb]
-    Image.merge("RGB", rgb8).save(pngfile, "PNG")
+    return Image.merge("RGB", rgb8)
+
+# converting .exr file to .png if user gave .exr file as a rendered scene
+def ConvertEXRToPNG(exrfile, pngfile):
+    ReadEXRAsRGB(exrfile).save(pngfile, "PNG")
 
 # converting .tga file to .png if user gave .tga file as a rendered scene
 def ConvertTGAToPNG(tgafile, pngfile):
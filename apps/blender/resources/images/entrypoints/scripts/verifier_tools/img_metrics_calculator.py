@@ -1,14 +1,13 @@
-import itertools
 import os
 import sys
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
-import OpenEXR
 from PIL import Image
 
 from . import decision_tree
-from .img_format_converter import ConvertTGAToPNG, ConvertEXRToPNG
+from .fused_metrics import FusedMetrics, MetricImage
+from .image_cache import ImageCache
 from .imgmetrics import ImgMetrics
 
 CROP_NAME = "scene_crop.png"
@@ -22,7 +21,8 @@ def calculate_metrics(reference_img_path,
                       result_img_path,
                       xres,
                       yres,
-                      metrics_output_filename='metrics.txt'):
+                      metrics_output_filename='metrics.txt',
+                      image_cache: Optional[ImageCache] = None):
     """
     This is the entry point for calculation of metrics between the
     rendered_scene and the sample(cropped_img) generated for comparison.
@@ -31,14 +31,17 @@ def calculate_metrics(reference_img_path,
     :param xres: x position of crop (left, top)
     :param yres: y position of crop (left, top)
     :param metrics_output_filename:
+    :param image_cache: decoded images shared by all comparisons of
+    a verification, so that each file is decoded once
     :return:
     """
 
-    cropped_img, scene_crops, rendered_scene = \
+    cropped_img, scene_crops = \
         _load_and_prepare_images_for_comparison(reference_img_path,
                                                 result_img_path,
                                                 xres,
-                                                yres)
+                                                yres,
+                                                image_cache or ImageCache())
 
     best_crop = None
     best_img_metrics = None
@@ -47,10 +50,15 @@ def calculate_metrics(reference_img_path,
 
     effective_metrics, classifier, labels, available_metrics = get_metrics()
 
+    # The reference crop is compared with every scene crop, its part of
+    # the metrics is computed once
+    reference = MetricImage.from_image(cropped_img)
+
     # First try not offset crop
     # TODO this shouldn't depend on the crops' ordering
-    default_crop = scene_crops[0]
-    default_metrics = compare_images(cropped_img, default_crop, available_metrics)
+    default_crop = Image.fromarray(scene_crops[0])
+    default_metrics = compare_metric_images(reference,
+                                            MetricImage(scene_crops[0]))
     try:
         label = classify_with_tree(default_metrics, classifier, labels)
         default_metrics['Label'] = label
@@ -62,9 +70,11 @@ def calculate_metrics(reference_img_path,
         return ImgMetrics(default_metrics).write_to_file(metrics_output_filename)
     else:
         # Try offset crops
-        for crop in scene_crops[1:]:
+        for scene_crop in scene_crops[1:]:
+            crop = Image.fromarray(scene_crop)
             try:
-                img_metrics = compare_images(cropped_img, crop, available_metrics)
+                img_metrics = compare_metric_images(reference,
+                                                    MetricImage(scene_crop))
                 img_metrics['Label'] = classify_with_tree(img_metrics, classifier, labels)
             except Exception as e:
                 print("There were error %r" % e, file=sys.stderr)
@@ -105,52 +115,26 @@ def classify_with_tree(metrics, classifier, feature_labels):
 def _load_and_prepare_images_for_comparison(reference_img_path,
                                             result_img_path,
                                             xres,
-                                            yres):
+                                            yres,
+                                            image_cache):
 
     """
     This function prepares (i.e. crops) the rendered_scene so that it will
-    fit the sample(cropped_img) generated for comparison.
+    fit the sample(cropped_img) generated for comparison. Crops are arrays
+    sliced out of the decoded rendered_scene, nothing is written to disk.
 
     :param reference_img_path:
     :param result_img_path:
     :param xres: x position of crop (left, top)
     :param yres: y position of crop (left, top)
+    :param image_cache:
     :return:
     """
-    rendered_scene = convert_to_png_if_needed(result_img_path)
-    reference_img = convert_to_png_if_needed(reference_img_path)
+    reference_img = Image.fromarray(image_cache.get(reference_img_path))
     (crop_width, crop_height) = reference_img.size
-    crops = get_crops(rendered_scene, xres, yres, crop_width, crop_height)
-    return reference_img, crops, rendered_scene
-
-
-def get_file_extension_lowercase(file_path):
-    return os.path.splitext(file_path)[1][1:].lower()
-
-
-def convert_to_png_if_needed(img_path):
-    extension = get_file_extension_lowercase(img_path)
-    name = os.path.basename(img_path)
-    file_name = os.path.join("/tmp/", name)
-    if extension == "exr":
-        channels = OpenEXR.InputFile(img_path).header()['channels']
-        if 'RenderLayer.Combined.R' in channels:
-            sys.exit("There is no support for OpenEXR multilayer")
-        ConvertEXRToPNG(img_path, file_name)
-    elif extension == "tga":
-        ConvertTGAToPNG(img_path, file_name)
-    else:
-        file_name = img_path
-    return Image.open(file_name)
-
-
-def get_crops(rendered_scene, x, y, width, height):
-    offsets = itertools.product([0, -1, 1], repeat=2)
-    crops = [rendered_scene.crop((x + x_offset, y + y_offset,
-                                  x + width + x_offset,
-                                  y + height + y_offset))
-             for x_offset, y_offset in offsets]
-    return crops
+    crops = image_cache.get_crops(result_img_path, xres, yres,
+                                  crop_width, crop_height)
+    return reference_img, crops
 
 
 def get_metrics():
@@ -193,3 +177,19 @@ def compare_images(image_a, image_b, metrics) -> Dict:
             data[key] = value
 
     return data
+
+
+def compare_metric_images(reference: MetricImage, image: MetricImage) -> Dict:
+    """
+    Same as compare_images with all metrics of ImgMetrics, computed by
+    FusedMetrics from intermediates shared by the metrics.
+    :param reference: reference crop, reused between comparisons
+    :param image: crop of the rendered scene
+    :return: ImgMetrics
+    """
+    (crop_height, crop_width) = image.shape[:2]
+    crop_resolution = str(crop_width) + "x" + str(crop_height)
+
+    data = {"crop_resolution": crop_resolution}
+    data.update(FusedMetrics.compare(reference, image))
+    return data
@@ -1,3 +1,4 @@
+import numpy
 from PIL import Image
 import sys
 
@@ -10,6 +11,15 @@ class MetricMassCenterDistance:
             raise Exception("Image sizes differ")
         mass_centers_1 = MetricMassCenterDistance.compute_mass_centers(image1)
         mass_centers_2 = MetricMassCenterDistance.compute_mass_centers(image2)
+        return MetricMassCenterDistance.compare_mass_centers(mass_centers_1,
+                                                             mass_centers_2)
+
+    @staticmethod
+    def get_labels():
+        return ["max_x_mass_center_distance", "max_y_mass_center_distance"]
+
+    @staticmethod
+    def compare_mass_centers(mass_centers_1, mass_centers_2):
         max_x_distance = 0
         max_y_distance = 0
         for channel_index in mass_centers_1.keys():
@@ -24,41 +34,45 @@ class MetricMassCenterDistance:
             "max_y_mass_center_distance": max_y_distance
                 }
 
-    @staticmethod
-    def get_labels():
-        return ["max_x_mass_center_distance", "max_y_mass_center_distance"]
-
     @staticmethod
     def compute_mass_centers(image):
         image = image.convert('RGB')
-        pixels = image.load()
-        width, height = image.size
+        return MetricMassCenterDistance.compute_array_mass_centers(
+            numpy.asarray(image))
+
+    @staticmethod
+    def compute_array_mass_centers(pixels):
+        """
+        Mass centers of the channels of a (height, width, channels) array.
+        Masses are summed along rows and columns first, the sums are exact
+        integers as in a per pixel loop.
+        """
+        height, width, channels = pixels.shape
         results = dict()
-        for channel_index in range(len(pixels[0, 0])):
-            mass_center_x = 0
-            mass_center_y = 0
-            total_mass = 0
-            for x in range(width):
-                for y in range(height):
-                    mass = pixels[x, y][channel_index]
-                    mass_center_x += mass * x
-                    mass_center_y += mass * y
-                    total_mass += mass
-                    
+        for channel_index in range(channels):
+            channel = pixels[..., channel_index]
+            column_masses = channel.sum(axis=0, dtype=numpy.int64)
+            row_masses = channel.sum(axis=1, dtype=numpy.int64)
+            total_mass = int(column_masses.sum())
+            mass_center_x = int(numpy.dot(
+                column_masses, numpy.arange(width, dtype=numpy.int64)))
+            mass_center_y = int(numpy.dot(
+                row_masses, numpy.arange(height, dtype=numpy.int64)))
+
             divisor_x = (float(total_mass) * width)
             divisor_y = (float(total_mass) * height)
-               
+
             if divisor_x == 0:
                 mass_center_x = 0.5
             else:
                 mass_center_x = mass_center_x / divisor_x
-                
+
             if divisor_y == 0:
                 mass_center_y = 0.5
             else:
                 mass_center_y = mass_center_y / divisor_y
-            
-            results[channel_index] = mass_center_x, mass_center_y        
+
+            results[channel_index] = mass_center_x, mass_center_y
         return results
 
 
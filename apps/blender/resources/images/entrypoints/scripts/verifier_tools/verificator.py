@@ -6,6 +6,7 @@ from ..render_tools import blender_render as blender
 from .crop_generator import WORK_DIR, OUTPUT_DIR, SubImage, Region, PixelRegion, \
     generate_single_random_crop_data, Crop
 from .file_extension.matcher import get_expected_extension
+from .image_cache import ImageCache
 from .img_metrics_calculator import calculate_metrics
 
 def get_crop_with_id(id: int, crops: [List[Crop]]) -> Optional[Crop]:
@@ -69,6 +70,8 @@ def prepare_params(mounted_paths, subtask_border, scene_file_path, resolution, s
 
 def make_verdict( subtask_file_paths, crops, results ):
     verdict = True
+    # Subtask images are compared with every crop, they are decoded once
+    image_cache = ImageCache()
 
     for crop_data in results:
         crop = get_crop_with_id(crop_data['crop']['id'], crops)
@@ -83,7 +86,8 @@ def make_verdict( subtask_file_paths, crops, results ):
             results_path = calculate_metrics(crop_path,
                                 subtask,
                                 left, top,
-                                metrics_output_filename=os.path.join(OUTPUT_DIR, crop_data['crop']['outfilebasename'] + "metrics.txt"))
+                                metrics_output_filename=os.path.join(OUTPUT_DIR, crop_data['crop']['outfilebasename'] + "metrics.txt"),
+                                image_cache=image_cache)
 
             with open(results_path, 'r') as f:
                 data = json.load(f)
@@ -4,6 +4,8 @@ from PIL import Image
 
 import sys
 
+WAVELETS = [ "db4", "sym2", "haar" ]
+
 def calculate_sum( coeff ):
     return sum( sum( coeff ** 2 ) )
 
@@ -73,6 +75,22 @@ class MetricWavelet:
         np_image1 = numpy.array(image1)
         np_image2 = numpy.array(image2)
 
+        return MetricWavelet.compare_decompositions( MetricWavelet.decompose( np_image1 ), MetricWavelet.decompose( np_image2 ) )
+
+    ## ======================= ##
+    ##
+    @staticmethod
+    def decompose( np_image ):
+        """ Wavelet coefficients of each channel of an RGB array, for every
+        wavelet the metrics use """
+        return { wavelet: [ pywt.wavedec2( np_image[...,i], wavelet ) for i in range(0,3) ]
+                 for wavelet in WAVELETS }
+
+    ## ======================= ##
+    ##
+    @staticmethod
+    def compare_decompositions( decomposition1, decomposition2 ):
+
         result = dict()
         result["wavelet_db4_base"] = 0
         result["wavelet_db4_low"] = 0
@@ -80,8 +98,8 @@ class MetricWavelet:
         result["wavelet_db4_high"] = 0
 
         for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "db4" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "db4" )
+            coeff1 = decomposition1[ "db4" ][ i ]
+            coeff2 = decomposition2[ "db4" ][ i ]
 
             len_total = len( coeff1 ) - 1
             len_div_3 = int( len_total / 3 )
@@ -99,8 +117,8 @@ class MetricWavelet:
         result["wavelet_sym2_high"] = 0
 
         for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "sym2" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "sym2" )
+            coeff1 = decomposition1[ "sym2" ][ i ]
+            coeff2 = decomposition2[ "sym2" ][ i ]
 
             len_total = len( coeff1 ) - 1
             len_div_3 = int( len_total / 3 )
@@ -123,8 +141,8 @@ class MetricWavelet:
         result["wavelet_haar_high"] = 0
 
         for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "haar" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "haar" )  
+            coeff1 = decomposition1[ "haar" ][ i ]
+            coeff2 = decomposition2[ "haar" ][ i ]
             
             freqs = calculate_frequencies( coeff1, coeff2 )
             
@@ -11,6 +11,7 @@ from typing import Optional, Type
 import apps.blender.resources.blenderloganalyser as log_analyser
 from apps.blender.blenderenvironment import BlenderEnvironment, \
     BlenderNVGPUEnvironment
+from apps.blender.task.subtasksgeometry import SubtasksGeometry
 from apps.core.task.coretask import CoreTaskTypeInfo
 from apps.rendering.resources.imgrepr import OpenCVImgRepr
 from apps.rendering.resources.renderingtaskcollector import \
@@ -32,6 +33,10 @@ from golem.verificator.blender_verifier import BlenderVerifier
 
 logger = logging.getLogger(__name__)
 
+# Number of frame splits whose geometry is kept, each one is shared by all
+# subtasks of tasks split the same way
+SUBTASKS_GEOMETRY_CACHE_SIZE = 128
+
 
 class BlenderDefaults(RendererDefaults):
     def __init__(self):
@@ -206,22 +211,9 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         :param int res_y: image resolution height
         :return list: list of pixels that belong to a subtask border
         """
-        border = []
         if res_x == 0 or res_y == 0:
-            return border
-        offsets = generate_expected_offsets(parts, res_x, res_y)
-        scale_factor = offsets[parts + 1] / res_y
-        x = int(math.floor(res_x * scale_factor))
-
-        upper = offsets[start]
-        lower = offsets[start + 1]
-        for i in range(upper, lower):
-            border.append((0, i))
-            border.append((x, i))
-        for i in range(0, x):
-            border.append((i, upper))
-            border.append((i, lower))
-        return border
+            return []
+        return get_subtasks_geometry(parts, res_x, res_y).border(start)
 
     @classmethod
     def __get_border_path(cls, start, parts, res_x, res_y):
@@ -236,16 +228,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         """
         if res_x == 0 or res_y == 0:
             return []
-
-        offsets = generate_expected_offsets(parts, res_x, res_y)
-        scale_factor = offsets[parts + 1] / res_y
-
-        x = int(math.floor(res_x * scale_factor))
-        upper = offsets[start]
-        lower = max(0, offsets[start + 1] - 1)
-
-        return [(0, upper), (x, upper),
-                (x, lower), (0, lower)]
+        return get_subtasks_geometry(parts, res_x, res_y).border_path(start)
 
 
 class BlenderTaskTypeInfo(RenderingTaskTypeInfo):
@@ -500,7 +483,8 @@ class BlenderRenderTask(FrameRenderingTask):
             parts = int(self.total_tasks / len(self.frames))
         else:
             parts = self.total_tasks
-        return get_min_max_y(start_task, parts, self.res_y)
+        return get_subtasks_geometry(parts, self.res_x, self.res_y) \
+            .min_max_y(start_task)
 
     def after_test(self, results, tmp_dir):
         return_data = dict()
@@ -511,10 +495,7 @@ class BlenderRenderTask(FrameRenderingTask):
             if not has_ext(filename, ".log"):
                 continue
 
-            with open(filename, "r") as f:
-                log_content = f.read()
-
-            log_analyser.make_log_analyses(log_content, return_data)
+            log_analyser.analyse_log_file(filename, return_data)
 
         return return_data
 
@@ -664,23 +645,19 @@ class CustomCollector(RenderingTaskCollector):
         return img_offset
 
 
+@functools.lru_cache(SUBTASKS_GEOMETRY_CACHE_SIZE)
+def get_subtasks_geometry(parts, res_x, res_y) -> SubtasksGeometry:
+    """ Geometry of a frame split into parts, computed once and shared by all
+    queries about the parts """
+    scale_factor = BlenderTaskTypeInfo.scale_factor(res_x, res_y)
+    return SubtasksGeometry(parts, res_x, res_y, scale_factor)
+
+
 def generate_expected_offsets(parts, res_x, res_y):
     logger.debug('generate_expected_offsets(%r, %r, %r)', parts, res_x, res_y)
     # returns expected offsets for preview; the highest value is preview's
     # height
-    scale_factor = BlenderTaskTypeInfo.scale_factor(res_x, res_y)
-    expected_offsets = {}
-    previous_end = 0
-    for i in range(1, parts + 1):
-        low, high = get_min_max_y(i, parts, res_y)
-        low *= scale_factor * res_y
-        high *= scale_factor * res_y
-        height = int(math.floor(high - low))
-        expected_offsets[i] = previous_end
-        previous_end += height
-
-    expected_offsets[parts + 1] = previous_end
-    return expected_offsets
+    return get_subtasks_geometry(parts, res_x, res_y).expected_offsets()
 
 
 def get_min_max_y(task_num, parts, res_y):
@@ -0,0 +1,120 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy
+
+
+def get_min_max_y_array(parts: int, res_y: int) \
+        -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """ get_min_max_y of all parts 1..parts of a frame at once. The values
+    are the same, the arithmetic is done in the same order. """
+    task_num = numpy.arange(1, parts + 1, dtype=numpy.int64)
+    if res_y % parts == 0:
+        min_y = (parts - task_num) * (1.0 / parts)
+        max_y = (parts - task_num + 1) * (1.0 / parts)
+        return min_y, max_y
+
+    ceiling_height = int(math.ceil(res_y / parts))
+    ceiling_subtasks = parts - (ceiling_height * parts - res_y)
+    lower_parts = task_num > ceiling_subtasks
+    base = (parts - ceiling_subtasks) * (ceiling_height - 1)
+    min_y = numpy.where(
+        lower_parts,
+        (parts - task_num) * (ceiling_height - 1),
+        base + (ceiling_subtasks - task_num) * ceiling_height) / res_y
+    max_y = numpy.where(
+        lower_parts,
+        (parts - task_num + 1) * (ceiling_height - 1),
+        base + (ceiling_subtasks - task_num + 1) * ceiling_height) / res_y
+    return min_y, max_y
+
+
+class SubtasksGeometry:
+    """
+    Pixel geometry of a frame split into parts rendered by subtasks:
+    the vertical range of every part, the offsets of the parts in
+    the preview and the borders of the parts. It's computed for all parts
+    at once, queries about a single part are lookups.
+
+    Parts are numbered from 1 to parts. Queries about other parts raise
+    KeyError, they don't extrapolate the geometry.
+    """
+
+    def __init__(self, parts: int, res_x: int, res_y: int,
+                 scale_factor: float) -> None:
+        """
+        :param parts: number of parts of a frame
+        :param res_x: image resolution width
+        :param res_y: image resolution height
+        :param scale_factor: scale of the preview
+        """
+        self.parts = parts
+        self.res_x = res_x
+        self.res_y = res_y
+
+        if parts > 0:
+            min_y, max_y = get_min_max_y_array(parts, res_y)
+        else:
+            min_y = max_y = numpy.empty(0)
+        heights = numpy.floor(max_y * (scale_factor * res_y)
+                              - min_y * (scale_factor * res_y))
+        offsets = numpy.zeros(len(heights) + 1, dtype=numpy.int64)
+        numpy.cumsum(heights.astype(numpy.int64), out=offsets[1:])
+
+        self._min_y: List[float] = min_y.tolist()
+        self._max_y: List[float] = max_y.tolist()
+        # Offsets of the parts, followed by the preview's height
+        self._offsets: List[int] = offsets.tolist()
+
+        self.preview_x = 0
+        if res_x != 0 and res_y != 0:
+            preview_scale_factor = self._offsets[-1] / res_y
+            self.preview_x = int(math.floor(res_x * preview_scale_factor))
+
+    def min_max_y(self, part: int) -> Tuple[float, float]:
+        """ Vertical range of the part, as fractions of the frame's height
+        counted from the bottom """
+        self._check_part(part)
+        return self._min_y[part - 1], self._max_y[part - 1]
+
+    def offset(self, part: int) -> int:
+        """ Offset of the part in the preview, the offset following the last
+        part is the preview's height """
+        if not 1 <= part <= self.parts + 1:
+            raise KeyError("Part {} out of range 1..{}".format(
+                part, self.parts + 1))
+        return self._offsets[part - 1]
+
+    def expected_offsets(self) -> Dict[int, int]:
+        """ Offsets of all parts, keyed by part number """
+        return dict(zip(range(1, self.parts + 2), self._offsets))
+
+    def border(self, part: int) -> List[Tuple[int, int]]:
+        """ Pixels of the preview that belong to the border of the part """
+        self._check_part(part)
+        x = self.preview_x
+        upper = self._offsets[part - 1]
+        lower = self._offsets[part]
+
+        border = []
+        for i in range(upper, lower):
+            border.append((0, i))
+            border.append((x, i))
+        for i in range(0, x):
+            border.append((i, upper))
+            border.append((i, lower))
+        return border
+
+    def border_path(self, part: int) -> List[Tuple[int, int]]:
+        """ Points of the preview that make the border of the part """
+        self._check_part(part)
+        x = self.preview_x
+        upper = self._offsets[part - 1]
+        lower = max(0, self._offsets[part] - 1)
+        return [(0, upper), (x, upper),
+                (x, lower), (0, lower)]
+
+    def _check_part(self, part: int) -> None:
+        if not 1 <= part <= self.parts:
+            raise KeyError("Part {} out of range 1..{}".format(
+                part, self.parts))
@@ -30,8 +30,17 @@ def find_pow(input_data, difficulty, result_size):
     # This ensures that the generated number will not start with 0's as hex
 
     solution = (1 << (num_bits - 1)) | random.getrandbits(num_bits - 1)
+
+    # The hash state of the input is computed once and copied for every
+    # candidate, whose digest prefix is compared as raw bytes. The outcome
+    # is the same as checking candidates one by one with check_pow.
+    state = hashlib.sha256(input_data.encode())
+    copy = state.copy
+    threshold = difficulty.to_bytes(4, 'big') if difficulty > 0 else b''
     while True:
-        if check_pow(solution, input_data, difficulty):
+        h = copy()
+        h.update(b'%x' % solution)
+        if h.digest()[:4] >= threshold:
             return solution
         solution += 1
 
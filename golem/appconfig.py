@@ -68,6 +68,8 @@ FORWARDED_SESSION_REQUEST_TIMEOUT = 30
 COMPUTATION_CANCELLATION_TIMEOUT = 10.0
 CLEAN_RESOURES_OLDER_THAN_SECS = 3*24*60*60     # 3 days
 CLEAN_TASKS_OLDER_THAN_SECONDS = 3*24*60*60     # 3 days
+# Disk space for resource directories in KiB, 0 - unlimited
+RESOURCES_DISK_BUDGET = 0
 # FIXME Issue #3862
 CLEANING_ENABLED = 0
 
@@ -95,6 +97,10 @@ DEFAULT_HYPERDRIVE_ADDRESS = None
 DEFAULT_HYPERDRIVE_RPC_PORT = 3292
 DEFAULT_HYPERDRIVE_RPC_ADDRESS = 'localhost'
 
+DOCKER_WARM_POOL = 0
+PYTHON_WORKER_POOL = 0
+WATCH_RESOURCE_DIRS = 0
+
 
 class NodeConfig:
 
@@ -185,6 +191,7 @@ class AppConfig:
             clean_resources_older_than_seconds=CLEAN_RESOURES_OLDER_THAN_SECS,
             clean_tasks_older_than_seconds=CLEAN_TASKS_OLDER_THAN_SECONDS,
             cleaning_enabled=CLEANING_ENABLED,
+            resources_disk_budget=RESOURCES_DISK_BUDGET,
             debug_third_party=DEBUG_THIRD_PARTY,
             # network masking
             net_masking_enabled=NET_MASKING_ENABLED,
@@ -201,6 +208,12 @@ class AppConfig:
             hyperdrive_address=DEFAULT_HYPERDRIVE_ADDRESS,
             hyperdrive_rpc_port=DEFAULT_HYPERDRIVE_RPC_PORT,
             hyperdrive_rpc_address=DEFAULT_HYPERDRIVE_RPC_ADDRESS,
+            # docker
+            docker_warm_pool=DOCKER_WARM_POOL,
+            # direct computation
+            python_worker_pool=PYTHON_WORKER_POOL,
+            # follow sizes of resource directories with inotify
+            watch_resource_dirs=WATCH_RESOURCE_DIRS,
         )
 
         cfg = SimpleConfig(node_config, cfg_file, keep_old=False)
@@ -3,6 +3,7 @@
 import collections
 import enum
 import logging
+import os
 import sys
 import time
 import uuid
@@ -28,7 +29,8 @@ from golem.core.common import (
     string_to_timeout,
     to_unicode,
 )
-from golem.core.fileshelper import du
+from golem.core import dirsize
+from golem.core.fileshelper import format_size
 from golem.hardware.presets import HardwarePresets
 from golem.config.active import EthereumConfig
 from golem.core.keysauth import KeysAuth
@@ -41,7 +43,6 @@ from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.manager.nodestatesnapshot import ComputingSubtaskStateSnapshot
 from golem.ethereum import exceptions as eth_exceptions
 from golem.ethereum.fundslocker import FundsLocker
-from golem.model import PaymentStatus
 from golem.ethereum.transactionsystem import TransactionSystem
 from golem.monitor.model.nodemetadatamodel import NodeMetadataModel
 from golem.monitor.monitor import SystemMonitor
@@ -62,8 +63,12 @@ from golem.report import Component, Stage, StatusPublisher, report_calls
 from golem.resource.base.resourceserver import BaseResourceServer
 from golem.resource.dirmanager import DirManager, DirectoryType
 from golem.resource.hyperdrive.resourcesmanager import HyperdriveResourceManager
+from golem.resource import lifecycle
+from golem.resource.lifecycle import ResourceLifecycle
+from golem.rpc import execution as rpc_execution
 from golem.rpc import utils as rpc_utils
-from golem.rpc.mapping.rpceventnames import Task, Network, Environment, UI
+from golem.rpc.mapping.rpceventnames import Task, Network, Environment, UI, \
+    Computation
 from golem.task import taskpreset
 from golem.task.taskarchiver import TaskArchiver
 from golem.task.taskmanager import TaskManager
@@ -74,6 +79,12 @@ from golem.tools.talkback import enable_sentry_logger
 
 logger = logging.getLogger(__name__)
 
+# How long results of task listing RPC procedures are reused (seconds)
+TASKS_RPC_CACHE_TTL = 5
+# How often the disk budget of resource directories is enforced when they
+# are not cleaned by age (seconds)
+RESOURCE_BUDGET_CHECK_INTERVAL = 60
+
 
 class ClientTaskComputerEventListener(object):
 
@@ -172,15 +183,21 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         clean_resources_older_than = \
             self.config_desc.clean_resources_older_than_seconds
+        resources_disk_budget = self.config_desc.resources_disk_budget
         cleaning_enabled = self.config_desc.cleaning_enabled
-        if cleaning_enabled and clean_resources_older_than > 0:
+        if cleaning_enabled and (clean_resources_older_than > 0
+                                 or resources_disk_budget > 0):
             logger.debug('Starting resource cleaner service ...')
+            if clean_resources_older_than > 0:
+                interval = max(1, int(clean_resources_older_than / 10))
+            else:
+                interval = RESOURCE_BUDGET_CHECK_INTERVAL
             self._services.append(
                 ResourceCleanerService(
                     self,
-                    interval_seconds=max(
-                        1, int(clean_resources_older_than / 10)),
-                    older_than_seconds=clean_resources_older_than))
+                    interval_seconds=interval,
+                    older_than_seconds=clean_resources_older_than,
+                    disk_budget=int(resources_disk_budget) * 1024))
 
         self.ranking = Ranking(self)
 
@@ -220,6 +237,10 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
             self.taskserver_listener,
             signal='golem.taskserver'
         )
+        dispatcher.connect(
+            self.taskcomputer_listener,
+            signal='golem.taskcomputer'
+        )
 
         logger.debug('Client init completed')
 
@@ -314,6 +335,14 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
                 details=kwargs['details'],
             )
 
+    def taskcomputer_listener(self, event='default', **kwargs):
+        if event == 'subtask_progress':
+            self._publish(
+                Computation.evt_subtask_progress,
+                kwargs['subtask_id'],
+                kwargs['progress'],
+            )
+
     @report_calls(Component.client, 'sync')
     def sync(self):
         pass
@@ -328,6 +357,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
 
         if self.use_monitor and not self.monitor:
             self.init_monitor()
+        if self.config_desc.watch_resource_dirs:
+            dirsize.tracker.start_watching()
         try:
             self.start_network()
         except Exception:
@@ -355,6 +386,7 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         if self.use_monitor and self.monitor:
             self.stop_monitor()
             self.monitor = None
+        dirsize.tracker.stop_watching()
         logger.debug('Stopped client services')
 
     def start_network(self):
@@ -606,7 +638,9 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
     def init_monitor(self):
         logger.debug("Starting monitor ...")
         metadata = self.__get_nodemetadatamodel()
-        self.monitor = SystemMonitor(metadata, MONITOR_CONFIG)
+        self.monitor = SystemMonitor(
+            metadata, MONITOR_CONFIG,
+            spool_path=os.path.join(self.datadir, 'monitor.spool'))
         self.monitor.start()
         self.diag_service = DiagnosticsService(DiagnosticsOutputFormat.data)
         self.diag_service.register(
@@ -823,50 +857,81 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
     def get_task(self, task_id: str) -> Optional[dict]:
         assert isinstance(self.task_server, TaskServer)
 
-        task_dict = self.task_server.task_manager.get_task_dict(task_id)
-        if not task_dict:
-            return None
-
-        task_state = self.task_server.task_manager.query_task_state(task_id)
-        subtask_ids = list(task_state.subtask_states.keys())
-
-        # Get total value and total fee for payments for the given subtask IDs
-        subtasks_payments = \
-            self.transaction_system.get_subtasks_payments(subtask_ids)
-        all_sent = all(
-            p.status in [PaymentStatus.sent, PaymentStatus.confirmed]
-            for p in subtasks_payments)
-        if not subtasks_payments or not all_sent:
-            task_dict['cost'] = None
-            task_dict['fee'] = None
-        else:
-            # Because details are JSON field
-            task_dict['cost'] = sum(p.value or 0 for p in subtasks_payments)
-            task_dict['fee'] = \
-                sum(p.details.fee or 0 for p in subtasks_payments)
-
-        # Convert to string because RPC serializer fails on big numbers
-        for k in ('cost', 'fee', 'estimated_cost', 'estimated_fee'):
-            if task_dict[k] is not None:
-                task_dict[k] = str(task_dict[k])
-
-        return task_dict
+        task_dicts = self._get_task_dicts([task_id])
+        return task_dicts[0] if task_dicts else None
 
     @rpc_utils.expose('comp.tasks')
-    def get_tasks(self, task_id: Optional[str] = None) \
+    @rpc_execution.cached(TASKS_RPC_CACHE_TTL,
+                          invalidated_by=('golem.taskmanager',
+                                          'golem.payment'))
+    def get_tasks(self,
+                  task_id: Optional[str] = None,
+                  offset: int = 0,
+                  limit: Optional[int] = None,
+                  fields: Optional[List[str]] = None) \
             -> Union[Optional[dict], Iterable[dict]]:
+        """ Return dicts of all tasks or of the task with the given id.
+        :param offset: number of tasks to skip
+        :param limit: maximum number of tasks to return
+        :param fields: keys to include in task dicts, all if None
+        """
         if not self.task_server:
             return []
 
         if task_id:
-            return self.get_task(task_id)
+            task_dict = self.get_task(task_id)
+            if task_dict and fields is not None:
+                task_dict = {k: task_dict[k] for k in fields if k in task_dict}
+            return task_dict
 
         task_ids = list(self.task_server.task_manager.tasks.keys())
-        tasks = (self.get_task(task_id) for task_id in task_ids)
-        # Filter Nones because get_task returns Optional[dict]
-        return list(filter(None, tasks))
+        if offset or limit is not None:
+            end = None if limit is None else offset + limit
+            task_ids = task_ids[offset:end]
+        return self._get_task_dicts(task_ids, fields)
+
+    def _get_task_dicts(self, task_ids: List[str],
+                        fields: Optional[List[str]] = None) -> List[dict]:
+        task_manager = self.task_server.task_manager
+        task_dicts = []
+        for task_id in task_ids:
+            task_dict = task_manager.get_task_dict(task_id)
+            # get_task_dict returns None for tasks deleted in the meantime
+            if task_dict:
+                task_dicts.append(task_dict)
+
+        totals: Dict[str, Tuple[int, int]] = {}
+        if task_dicts and (fields is None or {'cost', 'fee'} & set(fields)):
+            if len(task_dicts) == len(task_manager.tasks):
+                subtask_tasks = task_manager.subtask2task_mapping
+            else:
+                subtask_tasks = {
+                    subtask_id: task_dict['id']
+                    for task_dict in task_dicts
+                    for subtask_id in task_manager.tasks_states[
+                        task_dict['id']].subtask_states
+                }
+            # Total value and total fee of payments for each task, a single
+            # query for all of them
+            totals = self.transaction_system.get_tasks_payment_totals(
+                subtask_tasks)
+
+        for task_dict in task_dicts:
+            task_dict['cost'], task_dict['fee'] = \
+                totals.get(task_dict['id'], (None, None))
+            # Convert to string because RPC serializer fails on big numbers
+            for k in ('cost', 'fee', 'estimated_cost', 'estimated_fee'):
+                if task_dict[k] is not None:
+                    task_dict[k] = str(task_dict[k])
+
+        if fields is None:
+            return task_dicts
+        return [{k: task_dict[k] for k in fields if k in task_dict}
+                for task_dict in task_dicts]
 
     @rpc_utils.expose('comp.task.subtasks')
+    @rpc_execution.cached(TASKS_RPC_CACHE_TTL,
+                          invalidated_by=('golem.taskmanager', ))
     def get_subtasks(self, task_id: str) \
             -> Optional[List[Dict]]:
         try:
@@ -894,6 +959,9 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
                                                               single=single)
 
     @rpc_utils.expose('comp.tasks.stats')
+    @rpc_execution.cached(TASKS_RPC_CACHE_TTL,
+                          invalidated_by=('golem.taskmanager',
+                                          'golem.taskcomputer'))
     def get_task_stats(self) -> Dict[str, Any]:
         return {
             'provider_state': self.get_provider_status(),
@@ -1079,8 +1147,11 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
                 "total distributed data": self.get_distributed_files_dir()}
 
     @rpc_utils.expose('res.dirs.size')
+    @rpc_execution.offload
     def get_res_dirs_sizes(self):
-        return {str(name): str(du(d))
+        # Directories are only walked on the first call, later the tracker
+        # is kept up to date by the writers
+        return {str(name): format_size(dirsize.tracker.get_size(d))
                 for name, d in list(self.get_res_dirs().items())}
 
     @rpc_utils.expose('res.dir')
@@ -1115,6 +1186,16 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         dir_manager.clear_dir(
             self.get_received_files_dir(), older_than_seconds)
 
+    def is_task_in_use(self, task_id: str) -> bool:
+        """ Tells whether resources of the task are still needed """
+        if self.task_server is None:
+            return False
+        state = self.task_server.task_manager.tasks_states.get(task_id)
+        if state is not None and not state.status.is_completed():
+            return True
+        subtask = self.task_server.task_computer.assigned_subtask
+        return subtask is not None and subtask['task_id'] == task_id
+
     def remove_task(self, task_id):
         self.p2pservice.remove_task(task_id)
 
@@ -1130,6 +1211,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
                 self.delete_task(task['id'])
 
     @rpc_utils.expose('comp.tasks.known')
+    @rpc_execution.offload
+    @rpc_execution.cached(TASKS_RPC_CACHE_TTL)
     def get_known_tasks(self):
         if self.task_server is None:
             return {}
@@ -1467,20 +1550,38 @@ class TaskArchiverService(LoopingCallService):
 class ResourceCleanerService(LoopingCallService):
     _client = None  # type: Client
     older_than_seconds = 0  # type: int
+    disk_budget = 0  # type: int
+    _lifecycle = None  # type: Optional[ResourceLifecycle]
 
     def __init__(self,
                  client: Client,
                  interval_seconds: int,
-                 older_than_seconds: int) -> None:
+                 older_than_seconds: int,
+                 disk_budget: int = 0) -> None:
         super().__init__(interval_seconds)
         self._client = client
         self.older_than_seconds = older_than_seconds
+        self.disk_budget = disk_budget
+
+    def start(self, now: bool = True):
+        # Used resources are only recorded while there is a cleaner
+        lifecycle.usage.enabled = True
+        super().start(now=now)
+
+    def stop(self):
+        super().stop()
+        lifecycle.usage.enabled = False
+        lifecycle.usage.pop()
 
     def _run(self):
-        # TODO: is any synchronization needed here? golemcli has none.
-        # Issue #2432
-        self._client.remove_distributed_files(self.older_than_seconds)
-        self._client.remove_received_files(self.older_than_seconds)
+        # Directories are known once the network is started
+        if self._lifecycle is None:
+            self._lifecycle = ResourceLifecycle(
+                self._client.get_res_dirs().values(),
+                disk_budget=self.disk_budget,
+                max_age=self.older_than_seconds,
+                is_protected=self._client.is_task_in_use)
+        self._lifecycle.clean()
 
 
 class TaskCleanerService(LoopingCallService):
@@ -42,6 +42,7 @@ class ClientConfigDescriptor(object):
         self.clean_resources_older_than_seconds = 0
         self.clean_tasks_older_than_seconds = 0
         self.cleaning_enabled = 0
+        self.resources_disk_budget = 0  # KiB
         self.offer_pooling_interval = 0.0
 
         self.node_snapshot_interval = 0.0
@@ -80,6 +81,10 @@ class ClientConfigDescriptor(object):
         self.hyperdrive_rpc_port: typing.Optional[int] = None
         self.hyperdrive_rpc_address: typing.Optional[str] = None
 
+        self.docker_warm_pool = 0
+        self.python_worker_pool = 0
+        self.watch_resource_dirs = 0
+
     def __repr__(self):
         return '{}: {}'.format(self.__class__, {
             v: getattr(self, v) for v in vars(self)})
@@ -1,7 +1,10 @@
+from concurrent.futures import Future
 from queue import Queue, Empty
+from typing import Iterable, List
 
+from twisted.internet import defer
 from twisted.internet.defer import Deferred, TimeoutError
-from twisted.internet.task import deferLater
+from twisted.internet.task import cooperate, deferLater
 from twisted.python.failure import Failure
 
 
@@ -37,3 +40,55 @@ def sync_wait(deferred, timeout=10):
 def call_later(delay: int, callable, *args, **kwargs) -> None:
     from twisted.internet import reactor
     deferLater(reactor, delay, callable, *args, **kwargs)
+
+
+def deferred_from_future(future: Future) -> Deferred:
+    """ Returns a Deferred fired in the reactor thread with the result of a
+        concurrent.futures.Future. Cancelling the Deferred cancels the
+        future, if it has not started running yet.
+    """
+    from twisted.internet import reactor
+
+    def cancel(_):
+        future.cancel()
+
+    deferred = Deferred(canceller=cancel)
+
+    def fire(result):
+        if deferred.called:
+            return
+        if isinstance(result, Failure):
+            deferred.errback(result)
+        else:
+            deferred.callback(result)
+
+    def done(completed: Future):
+        if completed.cancelled():
+            result = Failure(defer.CancelledError())
+        else:
+            exc = completed.exception()
+            if exc is None:
+                result = completed.result()
+            else:
+                result = Failure(exc, type(exc), exc.__traceback__)
+        reactor.callFromThread(fire, result)
+
+    future.add_done_callback(done)
+    return deferred
+
+
+def collect_chunks(chunks: Iterable[List]) -> Deferred:
+    """ Returns a Deferred fired with the concatenated chunks. Chunks are
+        produced by the reactor's cooperator between other events, so that
+        building a large result does not stall the reactor.
+    """
+    result: List = []
+
+    def work():
+        for chunk in chunks:
+            result.extend(chunk)
+            yield None
+
+    deferred = cooperate(work()).whenDone()
+    deferred.addCallback(lambda _: result)
+    return deferred
@@ -0,0 +1,252 @@
+import logging
+import os
+import stat
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# How often sizes of directories are recomputed to account for changes
+# made without notifying the tracker (seconds). Not used while watching.
+RECONCILE_INTERVAL = 10 * 60
+
+
+class _Dir:  # pylint: disable=too-few-public-methods
+    """ Size of a directory with its contents and sizes of its entries """
+    __slots__ = ('size', 'entries')
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.entries: Dict[str, Union[int, '_Dir']] = {}
+
+
+_Entry = Union[int, _Dir]
+
+
+def _size(entry: Optional[_Entry]) -> int:
+    if entry is None:
+        return 0
+    if isinstance(entry, _Dir):
+        return entry.size
+    return entry
+
+
+def _scan(path: str) -> Optional[_Entry]:
+    """ Returns the size of a file or the tree of sizes of a directory, like
+    get_dir_size. None if the path does not exist """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size if stat.S_ISREG(st.st_mode) else 0
+    return _scan_dir(path, st.st_size)
+
+
+def scan_size(path: str) -> int:
+    """ Returns the size of a file or a directory with its contents, without
+    tracking it. 0 if the path does not exist """
+    return _size(_scan(path))
+
+
+def _scan_dir(path: str, size: int) -> _Dir:
+    node = _Dir(size)
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as err:
+        logger.debug("Can't list directory %r: %r", path, err)
+        return node
+
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                child: _Entry = _scan_dir(entry.path, entry.stat().st_size)
+            elif entry.is_file():
+                child = entry.stat().st_size
+            else:
+                continue
+        except OSError as err:
+            logger.debug("Can't read %r: %r", entry.path, err)
+            continue
+        node.entries[entry.name] = child
+        node.size += _size(child)
+    return node
+
+
+class _Root:  # pylint: disable=too-few-public-methods
+    __slots__ = ('tree', 'scanned')
+
+    def __init__(self, tree: _Dir, scanned: float) -> None:
+        self.tree = tree
+        self.scanned = scanned
+
+
+class DirSizeTracker:
+    """ Keeps sizes of directories without walking them on every request.
+
+    A directory is scanned once, when its size is first requested. Code
+    writing to or removing from tracked directories calls update() with the
+    changed path, which rescans only that path and applies the difference to
+    the sizes of its parents. Other changes are picked up by rescanning
+    directories every reconcile_interval seconds, or as they happen after
+    start_watching() on platforms supported by watchdog's inotify observer.
+    """
+
+    def __init__(self,
+                 reconcile_interval: float = RECONCILE_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.reconcile_interval = reconcile_interval
+        self.clock = clock
+        self._roots: Dict[str, _Root] = {}
+        self._lock = threading.Lock()
+        self._observer = None
+        self._watched: Set[str] = set()
+
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def get_size(self, path: str) -> int:
+        path = os.path.abspath(path)
+        with self._lock:
+            root = self._roots.get(path)
+            if root is not None and (path in self._watched or self.clock() <
+                                     root.scanned + self.reconcile_interval):
+                return root.tree.size
+
+        scanned = self.clock()
+        tree = _scan(path)
+        if not isinstance(tree, _Dir):
+            return _size(tree)
+        with self._lock:
+            if path not in self._roots:
+                self._watch(path)
+            self._roots[path] = _Root(tree, scanned)
+        return tree.size
+
+    def update(self, path: str) -> None:
+        """ Accounts for a file or directory written or removed """
+        path = os.path.abspath(path)
+        with self._lock:
+            targets = {
+                self._target(root_path, root, path)
+                for root_path, root in self._roots.items()
+                if self._contains(root_path, path)
+            }
+
+        for target in targets:
+            entry = _scan(target)
+            with self._lock:
+                for root_path, root in self._roots.items():
+                    if target == root_path:
+                        if isinstance(entry, _Dir):
+                            root.tree = entry
+                    elif self._contains(root_path, target):
+                        self._apply(root, root_path, target, entry)
+
+    def forget(self, path: str) -> None:
+        path = os.path.abspath(path)
+        with self._lock:
+            self._roots.pop(path, None)
+
+    def start_watching(self) -> bool:
+        """ Follows changes to tracked directories with inotify, returns
+        False if it is not available """
+        try:
+            from watchdog.observers.inotify import InotifyObserver
+        except ImportError:
+            logger.debug("inotify is not available")
+            return False
+
+        with self._lock:
+            if self._observer is not None:
+                return True
+            self._observer = InotifyObserver()
+            self._observer.daemon = True
+            self._observer.start()
+            for path in self._roots:
+                self._watch(path)
+        return True
+
+    def stop_watching(self) -> None:
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self._watched.clear()
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+    def _watch(self, path: str) -> None:
+        if self._observer is None or path in self._watched:
+            return
+        try:
+            self._observer.schedule(_EventHandler(self), path, recursive=True)
+        except OSError as err:
+            logger.warning("Can't watch %r: %r", path, err)
+            return
+        self._watched.add(path)
+
+    @staticmethod
+    def _contains(root: str, path: str) -> bool:
+        return path == root or path.startswith(os.path.join(root, ''))
+
+    @staticmethod
+    def _target(root_path: str, root: _Root, path: str) -> str:
+        """ Returns the path to rescan for a change of the given path: the
+        path itself or its first parent unknown to the tree """
+        if path == root_path:
+            return path
+        node = root.tree
+        parts = os.path.relpath(path, root_path).split(os.sep)
+        for i, part in enumerate(parts[:-1]):
+            child = node.entries.get(part)
+            if not isinstance(child, _Dir):
+                return os.path.join(root_path, *parts[:i + 1])
+            node = child
+        return path
+
+    def _apply(self, root: _Root, root_path: str, path: str,
+               entry: Optional[_Entry]) -> None:
+        parts = os.path.relpath(path, root_path).split(os.sep)
+        parents: List[_Dir] = [root.tree]
+        for part in parts[:-1]:
+            child = parents[-1].entries.get(part)
+            if not isinstance(child, _Dir):
+                # Changed in the meantime, left for reconciliation
+                return
+            parents.append(child)
+        self._replace(parents, parts[-1], entry)
+
+    @staticmethod
+    def _replace(parents: List[_Dir], name: str,
+                 entry: Optional[_Entry]) -> None:
+        node = parents[-1]
+        old = node.entries.pop(name, None)
+        if entry is not None:
+            node.entries[name] = entry
+        delta = _size(entry) - _size(old)
+        for parent in parents:
+            parent.size += delta
+
+
+class _EventHandler:
+    """ Passes paths of watchdog's file system events to the tracker """
+
+    def __init__(self, tracker: DirSizeTracker) -> None:
+        self.tracker = tracker
+
+    def dispatch(self, event) -> None:
+        # Directories are modified by changes of their entries, which come
+        # with events of their own
+        if event.is_directory and event.event_type == 'modified':
+            return
+        self.tracker.update(event.src_path)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.tracker.update(dest_path)
+
+
+# Tracker shared by the writers of resource directories and their readers
+tracker = DirSizeTracker()
@@ -1,8 +1,13 @@
 import abc
+import struct
 from hashlib import sha256
 from Crypto.Cipher import AES
 from Crypto import Random
+from Crypto.Hash import SHA256
+from Crypto.Protocol.KDF import HKDF
 from Crypto.Random.random import StrongRandom
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from threading import Lock
 
 from io import IOBase
@@ -131,3 +136,111 @@ class AESFileEncryptor(FileEncryptor):
                     working = False
 
                 dst.write(chunk)
+
+
+class AESGCMFileEncryptor(FileEncryptor):
+    """ Streaming, authenticated AES-GCM encryptor.
+
+    The file starts with a versioned header, followed by chunks of up to
+    chunk_size bytes, each encrypted with its own nonce and followed by
+    a GCM tag. The nonce holds the chunk number and a final chunk flag, so
+    reordered, dropped or truncated chunks fail authentication. Files
+    without the header are decrypted with AESFileEncryptor.
+    """
+
+    magic = b'GLMENC'
+    version = 2
+    header_format = '>6sBI16s7s'
+    header_size = struct.calcsize(header_format)
+    salt_size = 16
+    nonce_prefix_size = 7
+    tag_size = 16
+    key_len = 32
+    chunk_size = 4 * 1024 * 1024
+
+    legacy_class = AESFileEncryptor
+
+    @classmethod
+    def get_key(cls, secret, salt):
+        return HKDF(secret, cls.key_len, salt, SHA256)
+
+    @classmethod
+    def encrypt(cls, file_in, file_out, secret,  # noqa pylint:disable=arguments-differ
+                chunk_size=None, digest=None):
+        """ Encrypt file_in into file_out
+        :param chunk_size: size of plaintext chunks in bytes
+        :param digest: hashlib object updated with the plaintext
+        """
+        chunk_size = chunk_size or cls.chunk_size
+        salt = Random.new().read(cls.salt_size)
+        nonce_prefix = Random.new().read(cls.nonce_prefix_size)
+        header = struct.pack(cls.header_format, cls.magic, cls.version,
+                             chunk_size, salt, nonce_prefix)
+        cipher = AESGCM(cls.get_key(secret, salt))
+
+        with FileHelper(file_in, 'rb') as src, \
+                FileHelper(file_out, 'wb') as dst:
+
+            dst.write(header)
+
+            index = 0
+            chunk = src.read(chunk_size)
+            while True:
+                next_chunk = src.read(chunk_size)
+                final = not next_chunk
+
+                if digest:
+                    digest.update(chunk)
+                nonce = cls._nonce(nonce_prefix, index, final)
+                dst.write(cipher.encrypt(nonce, chunk, header))
+
+                if final:
+                    break
+                chunk = next_chunk
+                index += 1
+
+    @classmethod
+    def decrypt(cls, file_in, file_out, secret):  # noqa pylint:disable=arguments-differ
+        with FileHelper(file_in, 'rb') as src:
+
+            header = src.read(cls.header_size)
+            if not header.startswith(cls.magic):
+                src.seek(0)
+                return cls.legacy_class.decrypt(src, file_out, secret)
+
+            if len(header) < cls.header_size:
+                raise ValueError("Truncated encrypted file header")
+
+            _, version, chunk_size, salt, nonce_prefix = \
+                struct.unpack(cls.header_format, header)
+            if version != cls.version:
+                raise ValueError("Unsupported encrypted file version: {}"
+                                 .format(version))
+
+            cipher = AESGCM(cls.get_key(secret, salt))
+            chunk_size += cls.tag_size
+
+            with FileHelper(file_out, 'wb') as dst:
+
+                index = 0
+                chunk = src.read(chunk_size)
+                while True:
+                    next_chunk = src.read(chunk_size)
+                    final = not next_chunk
+
+                    nonce = cls._nonce(nonce_prefix, index, final)
+                    try:
+                        dst.write(cipher.decrypt(nonce, chunk, header))
+                    except InvalidTag:
+                        raise ValueError("Encrypted file authentication "
+                                         "failed at chunk {}".format(index))
+
+                    if final:
+                        break
+                    chunk = next_chunk
+                    index += 1
+        return None
+
+    @staticmethod
+    def _nonce(nonce_prefix, index, final):
+        return nonce_prefix + struct.pack('>IB', index, int(final))
@@ -37,6 +37,17 @@ def copy_file_tree(src, dst, exclude=None):
             shutil.copy2(src_file, dst_dir)
 
 
+def link_or_copy(src, dst):
+    """Hard link src as dst, copy it when linking is not possible (e.g.
+       across file systems). Only for files which are never modified in
+       place, since both paths share the content.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
 def get_dir_size(dir_, report_error=lambda _: ()):
     """Returns the size of the given directory and it's contents, in bytes.
     Similar to the Linux command `du -b`. In particular, returns non-zero
@@ -193,6 +204,11 @@ def du(path):
             logger.info("Can't open dir {}: {}".format(path, str(err)))
             return "-1"
 
+    return format_size(size)
+
+
+def format_size(size):
+    """Returns the size in bytes in human readable format (eg. 6.5 MB)"""
     human_readable_size, idx = memoryhelper.dir_size_to_display(size)
     return "{} {}".format(
         human_readable_size,
@@ -1,7 +1,12 @@
 # Generating, solving and checking solutions of crypto-puzzles for proof of work system
 
+import ctypes
+import multiprocessing
+import os
+from hashlib import sha256
 from random import sample
 import time
+from typing import Optional
 
 from golem.core.keysauth import get_random, sha2
 
@@ -10,6 +15,13 @@ __author__ = 'Magda.Stasiewicz'
 CHALLENGE_HISTORY_LIMIT = 100
 MAX_RANDINT = 100000000000000000000000000
 
+# Number of nonces a worker process searches per task
+SOLVE_CHUNK_SIZE = 1 << 16
+# Number of nonces after which a worker checks whether it can give up
+SOLVE_CHECK_INTERVAL = 1 << 12
+# Below this difficulty the challenge is solved in the calling process
+PARALLEL_SOLVE_MIN_DIFFICULTY = 16
+
 
 def create_challenge(history, prev):
     """
@@ -27,20 +39,103 @@ def create_challenge(history, prev):
     return concat
 
 
-def solve_challenge(challenge, difficulty):
+def solve_challenge(challenge, difficulty, workers=None):
     """
     Solves the puzzle given in string challenge difficulty is required number of zeros in the beginning of binary
-    representation of solution's hash returns solution and computation time in seconds
+    representation of solution's hash returns solution and computation time in seconds.
+    The solution is the smallest one, so it does not depend on the number of worker processes used to find it.
     """
     start = time.time()
-    min_hash = pow(2, 256 - difficulty)     # could be done prettier
-    solution = 0
-    while sha2(challenge + str(solution)) > min_hash:
-        solution += 1
+    prefix = challenge.encode()
+    bound = _hash_bound(difficulty)
+    if bound is None:
+        solution = 0
+    else:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and difficulty >= PARALLEL_SOLVE_MIN_DIFFICULTY:
+            solution = _solve_parallel(prefix, bound, workers)
+        else:
+            solution = _solve(prefix, bound)
     end = time.time()
     return solution, end - start
 
 
+def _hash_bound(difficulty: int) -> Optional[bytes]:
+    """ Returns the largest acceptable digest as bytes, which compare the same way as the integers do;
+    None if any digest is acceptable """
+    if difficulty <= 0:
+        return None
+    if difficulty > 256:
+        return bytes(32)
+    return pow(2, 256 - difficulty).to_bytes(32, 'big')
+
+
+def _search(prefix: bytes, bound: bytes, start: int, stop: int, limit=None) -> Optional[int]:
+    """ Returns the smallest nonce in [start, stop) solving the challenge or None. The hash state of the prefix
+    is computed once and copied for every candidate. Gives up when the shared limit drops below the range
+    being searched """
+    state = sha256(prefix)
+    copy = state.copy
+    for batch_start in range(start, stop, SOLVE_CHECK_INTERVAL):
+        if limit is not None and limit.value < batch_start:
+            return None
+        for nonce in range(batch_start, min(batch_start + SOLVE_CHECK_INTERVAL, stop)):
+            h = copy()
+            h.update(b'%d' % nonce)
+            if h.digest() <= bound:
+                return nonce
+    return None
+
+
+def _solve(prefix: bytes, bound: bytes) -> int:
+    start = 0
+    while True:
+        solution = _search(prefix, bound, start, start + SOLVE_CHUNK_SIZE)
+        if solution is not None:
+            return solution
+        start += SOLVE_CHUNK_SIZE
+
+
+_limit = None
+
+
+def _init_worker(limit) -> None:
+    global _limit  # pylint: disable=global-statement
+    _limit = limit
+
+
+def _search_chunk(prefix: bytes, bound: bytes, start: int) -> Optional[int]:
+    return _search(prefix, bound, start, start + SOLVE_CHUNK_SIZE, _limit)
+
+
+def _solve_parallel(prefix: bytes, bound: bytes, workers: int) -> int:
+    """ Splits the nonce space into chunks searched by worker processes. Results are collected in chunk order,
+    so the first solution found is the smallest one. Chunks above the smallest solution known so far are
+    abandoned """
+    limit = multiprocessing.Value(ctypes.c_uint64, 2 ** 64 - 1)
+
+    def found(solution):
+        if solution is not None:
+            with limit.get_lock():
+                limit.value = min(limit.value, solution)
+
+    pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(limit,))
+    try:
+        pending = []
+        next_start = 0
+        while True:
+            while len(pending) < 2 * workers:
+                pending.append(pool.apply_async(_search_chunk, (prefix, bound, next_start), callback=found))
+                next_start += SOLVE_CHUNK_SIZE
+            solution = pending.pop(0).get()
+            if solution is not None:
+                return solution
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 def accept_challenge(challenge, solution, difficulty):
     """ Returns true if solution is valid for given challenge and difficulty, false otherwise
     :param challenge:
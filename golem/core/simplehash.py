@@ -1,5 +1,23 @@
-import hashlib
 import base64
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Size of the buffer files are streamed through while hashing
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+# Smaller files are hashed in the calling thread
+PARALLEL_HASH_MIN_SIZE = 1024 * 1024
+# Name of the digest cache database in the data directory
+FILE_HASH_CACHE_DB = 'filehashes.db'
+# Maximum number of digests kept in the cache, the oldest are dropped first
+FILE_HASH_CACHE_MAX_ENTRIES = 100000
 
 
 class SimpleHash(object):
@@ -52,9 +70,13 @@ class SimpleHash(object):
         """Return sha1 of data from given file
         :param str filename: name of a file that should be read
         :param int block_size: *Default: 2**20* data will be read from file in
-        chunks of this size
+        chunks of this size; the default size uses the shared file_hasher()
+        and its digest cache
         :return bytes: bytes of data from file <filename>
         """
+        if block_size == 2 ** 20:
+            return file_hasher().hash_file(filename)
+
         with open(filename, "rb") as f:
             sha = hashlib.sha1()
 
@@ -79,3 +101,241 @@ class SimpleHash(object):
     @classmethod
     def hash_object(cls):
         return hashlib.sha1()
+
+
+class FileHashCache:
+    """ Persistent store of file digests. An entry is only valid as long as
+    the file's size, modification time and inode are unchanged. At most
+    max_entries digests are kept, the least recently stored are dropped. """
+
+    # Stays below SQLite's limit of host parameters in a query
+    QUERY_BATCH_SIZE = 500
+
+    def __init__(self, db_path: str = ':memory:',
+                 max_entries: int = FILE_HASH_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            if db_path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS file_hash ('
+                '  path TEXT NOT NULL,'
+                '  algorithm TEXT NOT NULL,'
+                '  size INTEGER NOT NULL,'
+                '  mtime_ns INTEGER NOT NULL,'
+                '  inode INTEGER NOT NULL,'
+                '  digest BLOB NOT NULL,'
+                '  PRIMARY KEY (path, algorithm))')
+
+    def get(self, path: str, algorithm: str,
+            stat: os.stat_result) -> Optional[bytes]:
+        return self.get_many([(path, stat)], algorithm).get(path)
+
+    def get_many(self, entries: Iterable, algorithm: str) -> Dict[str, bytes]:
+        """ Return valid digests of given (path, stat) entries """
+        stats = dict(entries)
+        paths = list(stats)
+        rows = []
+
+        with self._lock:
+            for i in range(0, len(paths), self.QUERY_BATCH_SIZE):
+                batch = paths[i:i + self.QUERY_BATCH_SIZE]
+                rows += self._conn.execute(
+                    'SELECT path, size, mtime_ns, inode, digest '
+                    'FROM file_hash WHERE algorithm = ? AND path IN ({})'
+                    .format(', '.join('?' * len(batch))),
+                    [algorithm] + batch).fetchall()
+
+        return {row[0]: row[4] for row in rows
+                if tuple(row[1:4]) == _stat_key(stats[row[0]])}
+
+    def set_many(self, entries: Iterable) -> None:
+        """ Store (path, algorithm, stat, digest) entries """
+        rows = [(path, algorithm) + _stat_key(stat) + (digest,)
+                for path, algorithm, stat, digest in entries]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO file_hash '
+                '(path, algorithm, size, mtime_ns, inode, digest) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            # Stored rows get increasing rowids, so the ones below the
+            # newest max_entries are the oldest
+            self._conn.execute(
+                'DELETE FROM file_hash WHERE rowid <= '
+                '(SELECT MAX(rowid) FROM file_hash) - ?',
+                (self.max_entries, ))
+
+    def prune(self) -> int:
+        """ Remove digests of files which were deleted or modified since.
+        Returns the number of removed entries. """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT rowid, path, size, mtime_ns, inode '
+                'FROM file_hash').fetchall()
+
+        stale = []
+        for row in rows:
+            try:
+                stat = os.stat(row[1])
+            except OSError:
+                stale.append((row[0], ))
+                continue
+            if tuple(row[2:]) != _stat_key(stat):
+                stale.append((row[0], ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'DELETE FROM file_hash WHERE rowid = ?', stale)
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileHasher:
+    """ Hashes files with large buffered reads, in parallel threads (hashlib
+    releases the GIL while hashing), reusing digests of unchanged files
+    stored in a FileHashCache. """
+
+    def __init__(self,
+                 cache: Optional[FileHashCache] = None,
+                 algorithm: str = 'sha1',
+                 block_size: int = HASH_BLOCK_SIZE,
+                 workers: int = HASH_WORKERS) -> None:
+        self.cache = cache
+        self.algorithm = algorithm
+        self.block_size = block_size
+        self.workers = workers
+        # Read buffers are reused by each hashing thread
+        self._local = threading.local()
+
+    def hash_file(self, path: str, cache: bool = True) -> bytes:
+        return self.hash_files([path], cache=cache)[path]
+
+    def hash_files(self, paths: Iterable[str],
+                   cache: bool = True) -> Dict[str, bytes]:
+        """ Return digests of given files, keyed by the paths as given.
+        Digests of one-off files should not be cached (cache=False). """
+        paths = list(paths)
+        digests: Dict[str, bytes] = dict()
+        missing = []
+
+        files = []
+        for path in paths:
+            abs_path = os.path.abspath(path)
+            files.append((path, abs_path, os.stat(abs_path)))
+
+        cached = self._get_cached(
+            (abs_path, stat) for _, abs_path, stat in files) if cache \
+            else dict()
+
+        for path, abs_path, stat in files:
+            if abs_path in cached:
+                digests[path] = cached[abs_path]
+            else:
+                missing.append((path, abs_path, stat))
+
+        # Dispatching small files to threads costs more than hashing them
+        large = [abs_path for _, abs_path, stat in missing
+                 if stat.st_size >= PARALLEL_HASH_MIN_SIZE]
+        if len(large) < 2 or self.workers < 2:
+            large = []
+
+        computed: Dict[str, bytes] = dict()
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as executor:
+            futures = {abs_path: executor.submit(self._compute, abs_path)
+                       for abs_path in large}
+            for _, abs_path, _ in missing:
+                if abs_path not in futures:
+                    computed[abs_path] = self._compute(abs_path)
+            for abs_path, future in futures.items():
+                computed[abs_path] = future.result()
+
+        entries = []
+        for path, abs_path, stat in missing:
+            digest = computed[abs_path]
+            digests[path] = digest
+            # Files modified while being hashed are not cached
+            if cache and self.cache and self._unchanged(abs_path, stat):
+                entries.append((abs_path, self.algorithm, stat, digest))
+
+        self._set_cached(entries)
+        return digests
+
+    def prune(self) -> None:
+        """ Forget digests of files which were deleted or modified """
+        if not self.cache:
+            return
+        try:
+            removed = self.cache.prune()
+        except sqlite3.Error as e:
+            logger.warning("Cannot prune the file hash cache: %r", e)
+            return
+        logger.debug("Removed %d stale file hashes", removed)
+
+    def _get_cached(self, entries: Iterable) -> Dict[str, bytes]:
+        if not self.cache:
+            return dict()
+        try:
+            return self.cache.get_many(entries, self.algorithm)
+        except sqlite3.Error as e:
+            logger.warning("Cannot read the file hash cache: %r", e)
+            return dict()
+
+    def _set_cached(self, entries: List) -> None:
+        if not self.cache:
+            return
+        try:
+            self.cache.set_many(entries)
+        except sqlite3.Error as e:
+            logger.warning("Cannot update the file hash cache: %r", e)
+
+    def _compute(self, path: str) -> bytes:
+        sha = hashlib.new(self.algorithm)
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = bytearray(self.block_size)
+        view = memoryview(buffer)
+
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                sha.update(view[:read])
+        return sha.digest()
+
+    @staticmethod
+    def _unchanged(path: str, stat: os.stat_result) -> bool:
+        try:
+            current = os.stat(path)
+        except OSError:
+            return False
+        return _stat_key(current) == _stat_key(stat)
+
+
+def _stat_key(stat: os.stat_result):
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+_file_hasher = FileHasher()
+
+
+def initialize(datadir: str) -> None:
+    """ Keep digests of files hashed by file_hasher() in datadir """
+    global _file_hasher  # pylint: disable=global-statement
+    previous = _file_hasher
+    _file_hasher = FileHasher(
+        FileHashCache(os.path.join(datadir, FILE_HASH_CACHE_DB)))
+    if previous.cache:
+        previous.cache.close()
+
+
+def file_hasher() -> FileHasher:
+    """ The hasher shared by the node, with its persistent digest cache """
+    return _file_hasher
@@ -4,7 +4,7 @@ import logging
 import sys
 import types
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from golem_messages import datastructures
 
@@ -124,8 +124,241 @@ class DictCoder:
         return fmt.format(obj.__module__, obj.__class__.__name__)
 
 
+class CompiledDictCoder(DictCoder):
+    """ DictCoder producing identical output without reflection on every
+    value. Each type is classified once, object encoders are generated for
+    every attribute layout of a class and object decoders are created for
+    every class path, all of them cached for the lifetime of the process.
+    """
+
+    _SKIP = object()
+    _encoders: Dict[type, Callable] = {}
+    _field_encoders: Dict[type, Callable] = {}
+    _object_encoders: Dict[Tuple[type, Tuple], Callable] = {}
+    _decoders: Dict[type, Callable] = {}
+    _object_decoders: Dict[str, Callable] = {}
+
+    @classmethod
+    def to_dict(cls, obj, typed=True):
+        return cls._encode(obj, typed)
+
+    @classmethod
+    def obj_to_dict(cls, obj, typed=True):
+        return cls._encode_obj(obj, typed)
+
+    @classmethod
+    def obj_from_dict(cls, dictionary):
+        cls_path = dictionary.pop(cls.cls_key)
+        decoder = cls._object_decoders.get(cls_path)
+        if decoder is None:
+            decoder = cls._compile_object_decoder(cls_path)
+        return decoder(dictionary)
+
+    @classmethod
+    def _to_dict_traverse_obj(cls, obj, typed=True):
+        return cls._encode(obj, typed)
+
+    @classmethod
+    def _from_dict_traverse_obj(cls, obj):
+        return cls._decode(obj)
+
+    # Encoding
+
+    @classmethod
+    def _encode(cls, obj, typed):
+        encoder = cls._encoders.get(type(obj))
+        if encoder is None:
+            encoder = cls._compile_encoder(obj)
+        return encoder(obj, typed)
+
+    @classmethod
+    def _compile_encoder(cls, obj) -> Callable:
+        """ Mirrors the checks of DictCoder._to_dict_traverse_obj """
+        # pylint: disable=too-many-return-statements
+        if isinstance(obj, dict):
+            encoder = cls._encode_dict
+        elif type(obj) is str:  # pylint: disable=unidiomatic-typecheck
+            encoder = _identity
+        elif isinstance(obj, str):
+            encoder = _to_unicode
+        elif isinstance(obj, collections.Iterable):
+            encoder = cls._encode_iterable
+        elif isinstance(obj, datastructures.Container):
+            encoder = _container_to_dict
+        elif cls.deep_serialization and hasattr(obj, '__dict__') \
+                and not cls._is_builtin(obj):
+            encoder = cls._encode_obj
+        else:
+            encoder = _identity
+        cls._encoders[type(obj)] = encoder
+        return encoder
+
+    @classmethod
+    def _field_encoder(cls, value) -> Callable:
+        """ Encoder of a dict value, _SKIP for callables """
+        encoder = cls._field_encoders.get(type(value))
+        if encoder is None:
+            if isinstance(value, collections.Callable):
+                encoder = cls._SKIP
+            else:
+                encoder = cls._encoders.get(type(value)) \
+                    or cls._compile_encoder(value)
+            cls._field_encoders[type(value)] = encoder
+        return encoder
+
+    @classmethod
+    def _encode_dict(cls, dictionary, typed):
+        result = dict()
+        field_encoders = cls._field_encoders
+        for k, v in list(dictionary.items()):
+            if isinstance(k, str) and k.startswith('_'):
+                continue
+            encoder = field_encoders.get(type(v)) or cls._field_encoder(v)
+            if encoder is not cls._SKIP:
+                result[str(k)] = encoder(v, typed)
+        return result
+
+    @classmethod
+    def _encode_iterable(cls, obj, typed):
+        if isinstance(obj, (set, frozenset)):
+            logger.warning(
+                'set/frozenset have known problems with umsgpack: %r',
+                obj,
+            )
+        encoders = cls._encoders
+        return obj.__class__([
+            (encoders.get(type(o)) or cls._compile_encoder(o))(o, typed)
+            for o in obj
+        ])
+
+    @classmethod
+    def _encode_obj(cls, obj, typed):
+        state = obj.__dict__
+        layout = (type(obj), tuple(state))
+        encoder = cls._object_encoders.get(layout)
+        if encoder is None:
+            encoder = cls._compile_object_encoder(obj, layout[1])
+            cls._object_encoders[layout] = encoder
+        return encoder(state, typed)
+
+    @classmethod
+    def _compile_object_encoder(cls, obj, keys: Tuple) -> Callable:
+        """ Generates a function encoding the __dict__ of objects of obj's
+        class having the given keys, in their order """
+        namespace = {
+            'SKIP': cls._SKIP,
+            'field_encoders': cls._field_encoders,
+            'field_encoder': cls._field_encoder,
+            'cls_key': cls.cls_key,
+            'cls_path': cls.module_and_class(obj),
+        }
+        lines = ['def encode(state, typed):', '    result = dict()']
+        for i, key in enumerate(keys):
+            if isinstance(key, str) and key.startswith('_'):
+                continue
+            namespace['k{}'.format(i)] = key
+            namespace['n{}'.format(i)] = str(key)
+            lines += [
+                '    v = state[k{}]'.format(i),
+                '    e = field_encoders.get(type(v)) or field_encoder(v)',
+                '    if e is not SKIP:',
+                '        result[n{}] = e(v, typed)'.format(i),
+            ]
+        lines += [
+            '    if typed:',
+            '        result[cls_key] = cls_path',
+            '    return result',
+        ]
+        exec('\n'.join(lines), namespace)  # pylint: disable=exec-used
+        return namespace['encode']
+
+    # Decoding
+
+    @classmethod
+    def _decode(cls, obj):
+        decoder = cls._decoders.get(type(obj))
+        if decoder is None:
+            decoder = cls._compile_decoder(obj)
+        return decoder(obj)
+
+    @classmethod
+    def _compile_decoder(cls, obj) -> Callable:
+        """ Mirrors the checks of DictCoder._from_dict_traverse_obj """
+        if isinstance(obj, dict):
+            decoder = cls._decode_dict
+        elif type(obj) is str:  # pylint: disable=unidiomatic-typecheck
+            decoder = _identity
+        elif isinstance(obj, str):
+            decoder = to_unicode
+        elif isinstance(obj, collections.Iterable):
+            decoder = cls._decode_iterable
+        else:
+            decoder = _identity
+        cls._decoders[type(obj)] = decoder
+        return decoder
+
+    @classmethod
+    def _decode_dict(cls, dictionary):
+        if cls.cls_key in dictionary:
+            return cls.obj_from_dict(dictionary)
+        decode = cls._decode
+        return {k: decode(v) for k, v in list(dictionary.items())}
+
+    @classmethod
+    def _decode_iterable(cls, obj):
+        decode = cls._decode
+        return obj.__class__([decode(o) for o in obj])
+
+    @classmethod
+    def _compile_object_decoder(cls, cls_path: str) -> Callable:
+        _idx = cls_path.rfind('.')
+        module_name, cls_name = cls_path[:_idx], cls_path[_idx+1:]
+        module = sys.modules[module_name]
+        sub_cls = getattr(module, cls_name)
+        new = sub_cls.__new__
+        decode = cls._decode
+
+        # Attributes of plain classes can be written to __dict__ directly,
+        # setattr is still needed for properties and other descriptors
+        setters = {
+            name for klass in sub_cls.__mro__
+            for name, attr in vars(klass).items()
+            if hasattr(type(attr), '__set__')
+        }
+        plain = sub_cls.__setattr__ is object.__setattr__ and not any(
+            '__slots__' in vars(klass) for klass in sub_cls.__mro__)
+
+        def decode_obj(dictionary):
+            obj = new(sub_cls)
+            if plain and setters.isdisjoint(dictionary):
+                obj.__dict__.update(
+                    (k, decode(v)) for k, v in list(dictionary.items()))
+            else:
+                for k, v in list(dictionary.items()):
+                    setattr(obj, k, decode(v))
+            return obj
+
+        cls._object_decoders[cls_path] = decode_obj
+        return decode_obj
+
+
+def _identity(obj, *_):
+    return obj
+
+
+def _to_unicode(obj, _typed):
+    return to_unicode(obj)
+
+
+def _container_to_dict(obj, _typed):
+    return obj.to_dict()
+
+
 class DictSerializer(object):
     """ Serialize and deserialize objects to a dictionary"""
+    # DictCoder produces the same output, inspecting every value
+    coder = CompiledDictCoder
+
     @staticmethod
     def dump(obj, typed=True):
         """
@@ -134,7 +367,7 @@ class DictSerializer(object):
         :param typed: simple serialization does not include type information
         :return: serialized object in json format
         """
-        return DictCoder.to_dict(obj, typed=typed)
+        return DictSerializer.coder.to_dict(obj, typed=typed)
 
     @staticmethod
     def load(dictionary, as_class=None):
@@ -144,7 +377,7 @@ class DictSerializer(object):
         :param dict dictionary: dictionary to deserialize
         :return: deserialized Python object
         """
-        return DictCoder.from_dict(dictionary, as_class=as_class)
+        return DictSerializer.coder.from_dict(dictionary, as_class=as_class)
 
 
 class DictSerializable(metaclass=ABCMeta):
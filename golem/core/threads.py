@@ -1,10 +1,18 @@
 import logging
-import time
 from collections import deque
-from threading import Thread, Lock
+from concurrent.futures import Future
+from threading import Condition, Thread
+from typing import Deque, List, Optional
+
+from twisted.internet.defer import Deferred
+
+from golem.core.deferred import deferred_from_future
 
 logger = logging.getLogger(__name__)
 
+# How long drain() waits for the queued jobs by default (seconds)
+DRAIN_TIMEOUT = 5 * 60
+
 
 class QueueJob(object):
 
@@ -15,79 +23,180 @@ class QueueJob(object):
         self.kwargs = kwargs
 
 
-class QueueExecutor(Thread):
+class QueueExecutor(object):
+    """ Executes queued jobs in a configurable number of worker threads.
 
-    def __init__(self, queue_name=None):
+    Workers sleep on a condition variable while the queue is empty, so a job
+    starts as soon as a worker is free and an idle executor does not wake up
+    at all. Each push returns a Future of the job's result.
+    Workers are started on the first push and can be stopped (pending jobs
+    are kept) or finished (pending jobs are executed first).
+    """
 
-        self.queue_name = queue_name
-        self.max_size = None
+    def __init__(self, queue_name=None, workers: int = 1,
+                 max_size: Optional[int] = None) -> None:
 
-        self.sleep_idle = 0.5
-        self.sleep_job = 0.01
+        self.queue_name = queue_name
+        self.workers = max(workers, 1)
+        self.max_size = max_size
 
         self._working = False
         self._stop_if_empty = False
-
-        self._queue = deque()
-        self._lock = Lock()
-
-        self.__was_started = False
-        self.__reinitialize()
-
-    def start(self):
-        """ Starts the thread. May reinitialize
-        current instance if the thread had been started."""
-
-        if self.isAlive():
-            return
-
-        self._working = True
-        self._stop_if_empty = False
-
-        if self.__was_started:
-            self.__reinitialize()
-        self.__was_started = True
-
-        super(QueueExecutor, self).start()
-
-    def stop(self):
-        self._working = False
-
-    def finish(self):
-        self._stop_if_empty = True
-        self.join()
-
-    def push(self, source, *args, **kwargs):
+        self._running = 0
+
+        self._queue: Deque = deque()
+        self._futures: Deque[Future] = deque()
+        self._condition = Condition()
+        self._threads: List[Thread] = []
+
+    def isAlive(self) -> bool:  # pylint: disable=invalid-name
+        return any(t.is_alive() for t in self._threads)
+
+    is_alive = isAlive
+
+    def start(self) -> None:
+        """ Starts the worker threads, if they are not running """
+
+        with self._condition:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if self._working and len(self._threads) >= self.workers:
+                return
+
+            self._working = True
+            self._stop_if_empty = False
+
+            for _ in range(self.workers - len(self._threads)):
+                name = self.queue_name
+                if name and self.workers > 1:
+                    name = '{}-{}'.format(name, len(self._threads))
+                thread = Thread(target=self._process_queue, name=name,
+                                daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def stop(self) -> None:
+        """ Stops the workers after their current jobs, keeping the pending
+        ones in the queue """
+
+        with self._condition:
+            self._working = False
+            self._condition.notify_all()
+
+    def finish(self, timeout: Optional[float] = None) -> None:
+        """ Executes the pending jobs and stops the workers """
+
+        with self._condition:
+            self._stop_if_empty = True
+            self._condition.notify_all()
+        self.join(timeout)
+
+    def drain(self, timeout: Optional[float] = DRAIN_TIMEOUT,
+              cancel_pending: bool = False) -> bool:
+        """ Waits until the queue is empty and no job is running, without
+        stopping the workers. On timeout the jobs still queued are logged
+        and, with cancel_pending, cancelled; returns False.
+        """
+
+        with self._condition:
+            if self._condition.wait_for(
+                    lambda: not (self._queue or self._running),
+                    timeout):
+                return True
+            pending = len(self._queue)
+            running = self._running
+
+        logger.warning("Queue executor [%s] not drained in %r s. "
+                       "pending=%d, running=%d", self.queue_name, timeout,
+                       pending, running)
+        if cancel_pending:
+            self._cancel_pending()
+        return False
+
+    def shutdown(self, wait: bool = True,
+                 cancel_pending: bool = False) -> None:
+        """ Stops the workers. Pending jobs are either executed or, with
+        cancel_pending, cancelled. """
+
+        if cancel_pending:
+            self._cancel_pending()
+
+        with self._condition:
+            self._stop_if_empty = True
+            self._condition.notify_all()
+        if wait:
+            self.join()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in list(self._threads):
+            thread.join(timeout)
+
+    def _cancel_pending(self) -> None:
+        with self._condition:
+            self._queue.clear()
+            futures = list(self._futures)
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+
+    def push(self, source, *args, **kwargs) -> Future:
         job = self._to_job(source, *args, **kwargs)
+        future: Future = Future()
 
-        with self._lock:
+        with self._condition:
             if self.max_size and len(self._queue) >= self.max_size:
                 self._queue[-1] = job
+                self._futures[-1].cancel()
+                self._futures[-1] = future
             else:
                 self._queue.append(job)
+                self._futures.append(future)
+            self._condition.notify()
 
         if not self.isAlive():
             self.start()
-
-    def _process_queue(self):
-        while self._working:
-
-            if self._queue:
-                with self._lock:
-                    job = self._queue.popleft()
-
-                try:
-                    self._execute(job)
-                except Exception as e:
-                    logger.debug("Queue executor [{}] error: {}"
-                                 .format(self.getName(), e.message))
-                else:
-                    time.sleep(self.sleep_job)
-
-            elif self._stop_if_empty:
-                self.stop()
-            else:
-                time.sleep(self.sleep_idle)
+        return future
+
+    def push_deferred(self, source, *args, **kwargs) -> Deferred:
+        """ Pushes a job, returning a Deferred fired in the reactor thread
+        with the job's result """
+
+        return deferred_from_future(self.push(source, *args, **kwargs))
+
+    def _next_job(self):
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._queue or self._stop_if_empty
+                or not self._working)
+            if not self._working or not self._queue:
+                return None
+
+            self._running += 1
+            return self._queue.popleft(), self._futures.popleft()
+
+    def _process_queue(self) -> None:
+        while True:
+            next_job = self._next_job()
+            if next_job is None:
+                break
+
+            job, future = next_job
+            try:
+                if future.set_running_or_notify_cancel():
+                    self._run(job, future)
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._condition.notify_all()
+
+    def _run(self, job, future: Future) -> None:
+        try:
+            result = self._execute(job)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Queue executor [%s] error: %r",
+                         self.queue_name, e)
+            future.set_exception(e)
+        else:
+            future.set_result(result)
 
     @classmethod
     def _to_job(cls, source, *args, **kwargs):
@@ -95,20 +204,15 @@ class QueueExecutor(Thread):
 
     @classmethod
     def _execute(cls, job):
-        job.method(*job.args, **job.kwargs)
-
-    def __reinitialize(self):
-        super(QueueExecutor, self).__init__(target=self._process_queue,
-                                            name=self.queue_name)
-        self.setDaemon(True)
+        return job.method(*job.args, **job.kwargs)
 
 
 class ThreadQueueExecutor(QueueExecutor):
 
     def __init__(self, queue_name=None, max_size=2):
 
-        super(ThreadQueueExecutor, self).__init__(queue_name=queue_name)
-        self.max_size = max_size
+        super(ThreadQueueExecutor, self).__init__(queue_name=queue_name,
+                                                  max_size=max_size)
 
     @classmethod
     def _to_job(cls, source, *args, **kwargs):
@@ -0,0 +1,118 @@
+import heapq
+import logging
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Size of the blocks copied from an archive member to its file (bytes)
+BUFFER_SIZE = 1024 * 1024
+# Fixed cost of creating a file, expressed in bytes of data to extract
+FILE_COST = 64 * 1024
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+Member = Tuple[zipfile.ZipInfo, str]
+
+
+def member_path(output_dir: str, member: zipfile.ZipInfo) -> str:
+    """ Returns the path ZipFile.extract would write the member to """
+    arcname = member.filename.replace('/', os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    # interpret absolute pathname as relative, remove drive letter or
+    # UNC path, redundant separators, "." and ".." components.
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_path_parts = ('', os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(x for x in arcname.split(os.path.sep)
+                               if x not in invalid_path_parts)
+    if os.path.sep == '\\':
+        # pylint: disable=protected-access
+        arcname = zipfile.ZipFile._sanitize_windows_name(  # type: ignore
+            arcname, os.path.sep)
+    return os.path.normpath(os.path.join(output_dir, arcname))
+
+
+def extract_all(input_path: str, output_dir: str,
+                workers: int = DEFAULT_WORKERS,
+                buffer_size: int = BUFFER_SIZE) -> List[str]:
+    """ Extracts a ZIP archive like ZipFile.extractall and returns the names
+    of its members.
+
+    Members are streamed to their files in buffer_size blocks and their
+    CRC-32 is checked as they are read; a member failing the check is
+    removed and the error is raised. Files are split between up to `workers`
+    threads, each reading the archive through its own handle, so that
+    large members are written in parallel with many small ones.
+    """
+    with zipfile.ZipFile(input_path, 'r') as zf:
+        names = zf.namelist()
+        infos = zf.infolist()
+
+    # Later members overwrite earlier ones with the same path
+    files: Dict[str, zipfile.ZipInfo] = {}
+    for info in infos:
+        path = member_path(output_dir, info)
+        if info.is_dir():
+            os.makedirs(path, exist_ok=True)
+            files.pop(path, None)
+        else:
+            files.pop(path, None)
+            files[path] = info
+
+    for directory in {os.path.dirname(path) for path in files}:
+        os.makedirs(directory, exist_ok=True)
+
+    partitions = _partition([(info, path) for path, info in files.items()],
+                            workers)
+    if len(partitions) <= 1:
+        for members in partitions:
+            _extract_members(input_path, members, buffer_size)
+        return names
+
+    with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+        futures = [
+            executor.submit(_extract_members, input_path, members,
+                            buffer_size)
+            for members in partitions
+        ]
+    for future in futures:
+        future.result()
+    return names
+
+
+def _partition(members: List[Member], workers: int) -> List[List[Member]]:
+    """ Splits members into at most `workers` lists of similar cost, the
+    largest members first. Order is kept for members of the same size """
+    members = sorted(members, key=lambda m: m[0].file_size, reverse=True)
+    count = max(1, min(workers, len(members)))
+    partitions: List[List[Member]] = [[] for _ in range(count)]
+    heap = [(0, i) for i in range(count)]
+    for member in members:
+        cost, i = heapq.heappop(heap)
+        partitions[i].append(member)
+        heapq.heappush(heap, (cost + member[0].file_size + FILE_COST, i))
+    return [partition for partition in partitions if partition]
+
+
+def _extract_members(input_path: str, members: List[Member],
+                     buffer_size: int) -> None:
+    with zipfile.ZipFile(input_path, 'r') as zf:
+        for info, path in members:
+            try:
+                with zf.open(info) as source, open(path, 'wb') as target:
+                    shutil.copyfileobj(source, target, buffer_size)
+            except Exception:
+                logger.warning("Cannot extract %r from %r",
+                               info.filename, input_path)
+                _remove(path)
+                raise
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
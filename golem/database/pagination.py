@@ -0,0 +1,67 @@
+import json
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import peewee
+
+# Default number of rows in a page
+PAGE_SIZE = 1000
+
+Page = Tuple[List[peewee.Model], Optional[str]]
+GetPage = Callable[[int, Optional[str]], Tuple[List, Optional[str]]]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(row: peewee.Model, fields: Sequence[peewee.Field]) -> str:
+    return json.dumps([str(getattr(row, field.name)) for field in fields])
+
+
+def decode_cursor(cursor: str, fields: Sequence[peewee.Field]) -> List:
+    try:
+        values = json.loads(cursor)
+    except (TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor: {!r}".format(cursor))
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor("Invalid cursor: {!r}".format(cursor))
+    return [field.python_value(value) for field, value in zip(fields, values)]
+
+
+def _after(fields: Sequence[peewee.Field], values: List):
+    """ Rows following the given values in descending order of fields """
+    condition = fields[-1] < values[-1]
+    for field, value in zip(reversed(fields[:-1]), reversed(values[:-1])):
+        condition = (field < value) | ((field == value) & condition)
+    # The redundant bound on the first field lets SQLite start an index
+    # range scan at the cursor instead of filtering rows from the top
+    return (fields[0] <= values[0]) & condition
+
+
+def keyset_page(query: peewee.SelectQuery,
+                fields: Sequence[peewee.Field],
+                limit: int = PAGE_SIZE,
+                after: Optional[str] = None) -> Page:
+    """ Returns up to limit rows of the query in descending order of fields,
+    starting after the cursor, and the cursor of the next page or None if
+    there are no more rows. Fields should be covered by an index and unique
+    together, e.g. a creation date followed by the primary key.
+    """
+    if after is not None:
+        query = query.where(_after(fields, decode_cursor(after, fields)))
+    rows = list(query.order_by(*(field.desc() for field in fields))
+                .limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], fields)
+
+
+def iter_pages(get_page: GetPage, limit: int = PAGE_SIZE) -> Iterator[List]:
+    """ Yields consecutive pages returned by get_page(limit, after) """
+    cursor = None
+    while True:
+        items, cursor = get_page(limit, cursor)
+        yield items
+        if cursor is None:
+            return
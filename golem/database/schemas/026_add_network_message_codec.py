@@ -0,0 +1,17 @@
+# pylint: disable=no-member
+import peewee as pw
+
+from golem.model import MessageCodec
+
+SCHEMA_VERSION = 26
+
+
+def migrate(migrator, _database, **_kwargs):
+    # Existing rows hold pickled messages, they're converted when read
+    migrator.add_fields(
+        'networkmessage',
+        msg_codec=pw.MessageCodecField(default=MessageCodec.pickle.value))
+
+
+def rollback(migrator, _database, **_kwargs):
+    migrator.remove_fields('networkmessage', 'msg_codec')
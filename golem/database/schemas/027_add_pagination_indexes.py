@@ -0,0 +1,13 @@
+# pylint: disable=no-member
+SCHEMA_VERSION = 27
+
+
+def migrate(migrator, _database, **_kwargs):
+    migrator.add_index('income', 'created_date', 'sender_node', 'subtask',
+                       unique=False)
+    migrator.add_index('payment', 'created_date', 'subtask', unique=False)
+
+
+def rollback(migrator, _database, **_kwargs):
+    migrator.drop_index('income', 'created_date', 'sender_node', 'subtask')
+    migrator.drop_index('payment', 'created_date', 'subtask')
@@ -0,0 +1,26 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+import datetime
+
+import peewee as pw
+
+SCHEMA_VERSION = 28
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    @migrator.create_model  # pylint: disable=unused-variable
+    class ResourceUsage(pw.Model):
+        path = pw.CharField(max_length=255, primary_key=True)
+        directory = pw.CharField(max_length=255, index=True)
+        size = pw.IntegerField(default=0)
+        mtime = pw.FloatField(default=0.)
+        last_used = pw.FloatField(index=True)
+        created_date = pw.DateTimeField(default=datetime.datetime.now)
+        modified_date = pw.DateTimeField(default=datetime.datetime.now)
+
+        class Meta:
+            db_table = "resourceusage"
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.remove_model("resourceusage")
@@ -63,6 +63,13 @@ class DockerEnvironment(Environment, metaclass=abc.ABCMeta):
             environment={},
         )
 
+    def get_progress_extractor(self, extra_data: Dict):
+        """ Return a function translating lines written to the progress file
+        by the task script into progress values, or None to expect
+        structured progress records.
+        """
+        return None
+
     @property
     @abc.abstractmethod
     def DOCKER_IMAGE(cls):
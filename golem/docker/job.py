@@ -55,6 +55,10 @@ class DockerJob:
     # Name of the parameters file, relative to WORK_DIR
     PARAMS_FILE = "params.json"
 
+    # Name of the file the task script may report its progress to,
+    # relative to WORK_DIR
+    PROGRESS_FILE = "progress.log"
+
     # pylint:disable=too-many-arguments
     def __init__(self,
                  image: DockerImage,
@@ -182,6 +186,9 @@ class DockerJob:
     def _get_host_params_path(self):
         return os.path.join(self.work_dir, self.PARAMS_FILE)
 
+    def get_host_progress_path(self):
+        return os.path.join(self.work_dir, self.PROGRESS_FILE)
+
     @staticmethod
     def _host_dir_chmod(dst_dir, mod):
         if isinstance(mod, str):
@@ -4,11 +4,11 @@ import time
 from contextlib import contextmanager
 from pathlib import Path
 from threading import Thread
-from typing import Optional, Callable, Any, Iterable
+from typing import Optional, Callable, Any, Dict, Iterable
 
 from golem import hardware
 from golem.core.common import is_linux, is_windows, is_osx
-from golem.core.threads import ThreadQueueExecutor
+from golem.core.threads import QueueExecutor, ThreadQueueExecutor
 from golem.docker.commands.docker import DockerCommandHandler
 from golem.docker.config import DockerConfigManager, APPS_DIR, IMAGES_INI, \
     CONSTRAINT_KEYS, MIN_CONSTRAINTS, DEFAULTS
@@ -16,6 +16,9 @@ from golem.docker.hypervisor.docker_for_mac import DockerForMac
 from golem.docker.hypervisor.hyperv import HyperVHypervisor
 from golem.docker.hypervisor.virtualbox import VirtualBoxHypervisor
 from golem.docker.hypervisor.xhyve import XhyveHypervisor
+from golem.docker.image import DockerImage
+from golem.docker.pool import WarmContainerPool, WarmDockerJob, \
+    warm_pool_size
 from golem.docker.task_thread import DockerBind
 from golem.report import report_calls, Component
 
@@ -32,6 +35,12 @@ class DockerManager(DockerConfigManager):
         self._env_checked = False
         self._threads = ThreadQueueExecutor(queue_name='docker-machine')
 
+        self._warm_pool_dir: Optional[Path] = None
+        self._warm_pools: Dict[str, WarmContainerPool] = dict()
+        # Pools are filled in their own thread, the docker-machine queue
+        # keeps only the last of its pending jobs
+        self._warm_pool_filler = QueueExecutor(queue_name='docker-warm-pool')
+
         if config_desc:
             self.build_config(config_desc)
 
@@ -133,6 +142,9 @@ class DockerManager(DockerConfigManager):
             cpu_count=config_desc.num_cores,
         )
 
+        for pool in list(self._warm_pools.values()):
+            pool.resize(self.warm_pool_size)
+
     @contextmanager
     def locked_config(self):
         self._config_locked = True
@@ -153,6 +165,85 @@ class DockerManager(DockerConfigManager):
             }
         return host_config
 
+    @property
+    def warm_pool_enabled(self) -> bool:
+        return self._warm_pool_dir is not None
+
+    @property
+    def warm_pool_size(self) -> int:
+        return warm_pool_size(self._config.get('cpu_count'),
+                              self._config.get('memory_size'))
+
+    def enable_warm_pool(self, root_dir: Path,
+                         images: Iterable[DockerImage] = ()) -> None:
+        """ Run Docker jobs in pre-created, paused containers kept in
+        per-image pools. Container directories are created in root_dir.
+        Pools of the given images are filled in the background.
+        """
+        if self._warm_pool_dir == root_dir:
+            return
+
+        self.disable_warm_pool()
+        root_dir.mkdir(parents=True, exist_ok=True)
+        self._warm_pool_dir = root_dir
+        logger.info("Docker: warm container pool enabled (size: %d)",
+                    self.warm_pool_size)
+        self.prewarm(images)
+
+    def disable_warm_pool(self) -> None:
+        pools = list(self._warm_pools.values())
+        self._warm_pools.clear()
+        self._warm_pool_dir = None
+
+        for pool in pools:
+            pool.close()
+
+    def get_warm_pool(self, image: DockerImage) -> WarmContainerPool:
+        if self._warm_pool_dir is None:
+            raise RuntimeError("Docker warm container pool is disabled")
+
+        pool = self._warm_pools.get(image.name)
+        if pool is None:
+            root_dir = self._warm_pool_dir / image.name.replace('/', '_') \
+                .replace(':', '_')
+            pool = WarmContainerPool(image, root_dir,
+                                     host_config=self.get_host_config_for_task,
+                                     size=self.warm_pool_size)
+            self._warm_pools[image.name] = pool
+        return pool
+
+    def prewarm(self, images: Iterable[DockerImage]) -> None:
+        for image in images:
+            self._warm_pool_filler.push(self._fill_warm_pool,
+                                        self.get_warm_pool(image))
+
+    def _fill_warm_pool(self, pool: WarmContainerPool) -> None:
+        # Don't create containers while the VM is being reconfigured
+        if not self._threads.drain():
+            return
+        try:
+            pool.fill()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Docker: cannot fill the warm container pool of "
+                           "%s: %r", pool.image.name, e)
+
+    # pylint: disable=too-many-arguments
+    def get_warm_job(self, image: DockerImage, entrypoint: str,
+                     parameters: dict, resources_dir: str, work_dir: str,
+                     output_dir: str, environment: dict) -> WarmDockerJob:
+        return WarmDockerJob(self.get_warm_pool(image),
+                             entrypoint=entrypoint,
+                             parameters=parameters,
+                             resources_dir=resources_dir,
+                             work_dir=work_dir,
+                             output_dir=output_dir,
+                             environment=environment)
+
+    def quit(self) -> None:
+        self._warm_pool_filler.shutdown(wait=False, cancel_pending=True)
+        self.disable_warm_pool()
+        super().quit()
+
     def constrain(self, restart_vm: bool = True, **params) -> bool:
         if not self.hypervisor:
             return False
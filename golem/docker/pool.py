@@ -0,0 +1,476 @@
+import errno
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Optional, Set
+
+import docker.errors
+
+from golem.core.common import is_windows
+from golem.core.threads import QueueExecutor
+from golem.docker.image import DockerImage
+from golem.docker.job import DockerJob
+from golem.docker.task_thread import DockerBind, DockerDirMapping
+from .client import local_client
+
+__all__ = ['WarmContainerPool', 'WarmDockerJob', 'warm_pool_size']
+
+logger = logging.getLogger(__name__)
+
+# Memory (MiB) reserved for every warm container when sizing a pool
+WARM_CONTAINER_MEMORY = 1024
+# Upper bound on the number of containers kept warm per image
+WARM_POOL_MAX_SIZE = 4
+# Number of jobs after which a warm container is replaced with a fresh one
+WARM_CONTAINER_MAX_JOBS = 64
+
+# Command keeping a warm container alive between jobs
+IDLE_COMMAND = 'tail -f /dev/null'
+# Directory in the container where job's stdout and stderr are redirected to
+LOGS_DIR = '/golem/logs'
+# Paths mounted as tmpfs, so that they are wiped on every container restart
+TMPFS = {'/tmp': '', '/home': ''}
+
+WAIT_MIN_INTERVAL = 0.01
+WAIT_MAX_INTERVAL = 0.5
+
+HostConfigFunction = Callable[[Iterable[DockerBind]], dict]
+
+
+def warm_pool_size(cpu_count: int, memory_size: int) -> int:
+    """ Compute the number of warm containers to keep per image from
+    a hardware preset
+    :param cpu_count: number of CPU cores assigned to Golem
+    :param memory_size: memory assigned to Golem, in MiB
+    """
+    by_memory = int(memory_size or 0) // WARM_CONTAINER_MEMORY
+    return max(1, min(int(cpu_count or 1), by_memory, WARM_POOL_MAX_SIZE))
+
+
+class WarmContainer:
+
+    def __init__(self, container_id: str, slot: DockerDirMapping) -> None:
+        self.container_id = container_id
+        self.slot = slot
+        self.jobs = 0
+        self.reusable = True
+
+
+class WarmContainerPool:
+    """ Keeps pre-created, paused containers for a single image.
+
+    Every container has its own slot directory on the host, bound to the
+    work, resources, output and logs directories in the container. Subtask
+    directories are linked into the slot before a job and the results are
+    moved out afterwards. Between jobs the slot is wiped and the container
+    is restarted, which kills any leftover processes and clears the tmpfs
+    mounts, and then paused again.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self,
+                 image: DockerImage,
+                 root_dir: Path,
+                 host_config: HostConfigFunction,
+                 size: int = 1,
+                 max_jobs: int = WARM_CONTAINER_MAX_JOBS,
+                 client_factory: Callable = local_client) -> None:
+
+        self.image = image
+        self.root_dir = root_dir
+        self.size = size
+        self.max_jobs = max_jobs
+
+        self._host_config = host_config
+        self._client_factory = client_factory
+
+        self._idle: Deque[WarmContainer] = deque()
+        self._busy: Set[WarmContainer] = set()
+        self._lock = threading.Lock()
+        self._next_slot = 0
+        self._closed = False
+        self._recycler = QueueExecutor(queue_name='docker-warm-pool')
+
+        self.stats: Dict[str, int] = dict(created=0, reused=0, removed=0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._idle) + len(self._busy)
+
+    @property
+    def idle(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def resize(self, size: int) -> None:
+        with self._lock:
+            self.size = size
+            excess = len(self._idle) + len(self._busy) - size
+            to_remove = [self._idle.pop()
+                         for _ in range(min(max(excess, 0), len(self._idle)))]
+
+        for container in to_remove:
+            self._remove(container)
+
+    def fill(self) -> None:
+        """ Create containers until the pool reaches its size """
+        while True:
+            with self._lock:
+                if self._closed or \
+                        len(self._idle) + len(self._busy) >= self.size:
+                    return
+            container = self._create()
+            with self._lock:
+                self._idle.append(container)
+
+    def acquire(self) -> WarmContainer:
+        """ Take an idle container and unpause it. A container is created on
+        the spot when the pool is empty. """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Warm pool for {} is closed"
+                                   .format(self.image.name))
+            container = self._idle.popleft() if self._idle else None
+
+        if container:
+            self.stats['reused'] += 1
+        else:
+            container = self._create()
+
+        with self._lock:
+            self._busy.add(container)
+
+        try:
+            self.client().unpause(container.container_id)
+        except docker.errors.APIError:
+            self.release(container, reusable=False)
+            raise
+
+        container.jobs += 1
+        return container
+
+    def release(self, container: WarmContainer,
+                reusable: bool = True) -> None:
+        """ Return a container to the pool. The container is reset in the
+        background; broken and worn out containers are replaced. """
+        with self._lock:
+            self._busy.discard(container)
+
+        reusable = reusable and container.reusable \
+            and container.jobs < self.max_jobs
+
+        self._recycler.push(self._recycle, container, reusable)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            containers = list(self._idle) + list(self._busy)
+            self._idle.clear()
+            self._busy.clear()
+
+        for container in containers:
+            self._remove(container)
+        self._recycler.stop()
+
+    def _recycle(self, container: WarmContainer, reusable: bool) -> None:
+        if reusable:
+            try:
+                self._reset(container)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Cannot reset warm container %s: %r",
+                               container.container_id, exc)
+                reusable = False
+
+        with self._lock:
+            closed = self._closed
+            oversized = len(self._idle) + len(self._busy) >= self.size
+            if reusable and not closed and not oversized:
+                self._idle.append(container)
+                return
+
+        self._remove(container)
+        if closed:
+            return
+
+        try:
+            self.fill()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Cannot refill warm pool for %s: %r",
+                           self.image.name, exc)
+
+    def _create(self) -> WarmContainer:
+        with self._lock:
+            index = self._next_slot
+            self._next_slot += 1
+
+        slot = DockerDirMapping(
+            resources=self.root_dir / str(index) / 'resources',
+            temporary=self.root_dir / str(index),
+            work=self.root_dir / str(index) / 'work',
+            output=self.root_dir / str(index) / 'output',
+            logs=self.root_dir / str(index) / 'logs')
+        shutil.rmtree(str(slot.temporary), ignore_errors=True)
+        slot.mkdirs()
+        for path in (slot.work, slot.resources, slot.output, slot.logs):
+            DockerJob._host_dir_chmod(str(path), 'rw')  # noqa pylint: disable=protected-access
+
+        binds = [
+            DockerBind(slot.work, DockerJob.WORK_DIR),
+            DockerBind(slot.resources, DockerJob.RESOURCES_DIR),
+            DockerBind(slot.output, DockerJob.OUTPUT_DIR),
+            DockerBind(slot.logs, LOGS_DIR),
+        ]
+
+        host_config = dict(self._host_config(binds))
+        host_config['tmpfs'] = dict(TMPFS)
+
+        client = self.client()
+        result = client.create_container(
+            image=self.image.name,
+            volumes=[bind.target for bind in binds],
+            host_config=client.create_host_config(**host_config),
+            command=IDLE_COMMAND if is_windows() else [IDLE_COMMAND],
+            working_dir=DockerJob.WORK_DIR,
+            environment=DockerJob.get_environment(),
+        )
+
+        container = WarmContainer(result['Id'], slot)
+        client.start(container.container_id)
+        client.pause(container.container_id)
+
+        self.stats['created'] += 1
+        logger.debug("Warm container %s created, image: %s, slot: %s",
+                     container.container_id, self.image.name, slot.temporary)
+        return container
+
+    def _reset(self, container: WarmContainer) -> None:
+        slot = container.slot
+        for path in (slot.work, slot.resources, slot.output, slot.logs):
+            clear_dir(path)
+
+        client = self.client()
+        client.restart(container.container_id, timeout=0)
+        client.pause(container.container_id)
+
+    def _remove(self, container: WarmContainer) -> None:
+        try:
+            self.client().remove_container(container.container_id,
+                                            force=True)
+        except docker.errors.APIError:
+            pass  # Already removed
+        shutil.rmtree(str(container.slot.temporary), ignore_errors=True)
+        self.stats['removed'] += 1
+        logger.debug("Warm container %s removed", container.container_id)
+
+    def client(self):
+        return self._client_factory()
+
+
+class WarmDockerJob:
+    """ A DockerJob counterpart which executes the entrypoint in a container
+    taken from a WarmContainerPool instead of creating a new one. """
+
+    STATE_NEW = DockerJob.STATE_NEW
+    STATE_RUNNING = DockerJob.STATE_RUNNING
+    STATE_EXITED = DockerJob.STATE_EXITED
+    STATE_KILLED = DockerJob.STATE_KILLED
+    STATE_REMOVED = DockerJob.STATE_REMOVED
+
+    STDOUT_FILE = 'stdout.log'
+    STDERR_FILE = 'stderr.log'
+
+    # pylint:disable=too-many-arguments
+    def __init__(self,
+                 pool: WarmContainerPool,
+                 entrypoint: str,
+                 parameters: Dict,
+                 resources_dir: str,
+                 work_dir: str,
+                 output_dir: str,
+                 environment: Optional[dict] = None) -> None:
+
+        self.pool = pool
+        self.image = pool.image
+        self.entrypoint = entrypoint
+        self.parameters = dict(parameters) if parameters else {}
+        self.parameters.update(DockerJob.PATH_PARAMS)
+        self.environment = environment or {}
+
+        self.resources_dir = resources_dir
+        self.work_dir = work_dir
+        self.output_dir = output_dir
+
+        self.container: Optional[WarmContainer] = None
+        self.container_id: Optional[str] = None
+        self.exec_id: Optional[str] = None
+        self.state = self.STATE_NEW
+
+    def __enter__(self):
+        self.container = self.pool.acquire()
+        self.container_id = self.container.container_id
+        try:
+            self._stage_in()
+        except Exception:
+            self.pool.release(self.container, reusable=False)
+            self.container = None
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.container:
+            return
+        try:
+            self._stage_out()
+        finally:
+            self.pool.release(self.container)
+            self.container = None
+            self.state = self.STATE_REMOVED
+
+    def start(self):
+        if not self.container or self.exec_id:
+            return None
+
+        client = self.pool.client()
+        command = '{} > {} 2> {}'.format(
+            self.entrypoint,
+            '/'.join([LOGS_DIR, self.STDOUT_FILE]),
+            '/'.join([LOGS_DIR, self.STDERR_FILE]))
+
+        environment = dict(self.environment)
+        user = ''
+        if 'LOCAL_USER_ID' in environment or 'OSX_USER' in environment:
+            user = 'task'
+            environment['HOME'] = '/home/task'
+
+        result = client.exec_create(
+            self.container_id,
+            ['/bin/sh', '-c', command],
+            environment=environment,
+            workdir=DockerJob.WORK_DIR,
+            user=user,
+        )
+        self.exec_id = result['Id']
+        client.exec_start(self.exec_id, detach=True)
+        self.state = self.STATE_RUNNING
+        logger.debug("Job started in warm container %s", self.container_id)
+        return result
+
+    def wait(self, timeout=None):
+        """Block until the job completes, or timeout elapses.
+        :param timeout: time to block
+        :returns job exit code
+        """
+        if not self.exec_id:
+            return -1
+
+        client = self.pool.client()
+        deadline = time.time() + timeout if timeout else None
+        interval = WAIT_MIN_INTERVAL
+
+        while True:
+            result = client.exec_inspect(self.exec_id)
+            if not result.get('Running'):
+                self.state = self.STATE_EXITED
+                return result.get('ExitCode')
+            if deadline and time.time() >= deadline:
+                return None
+            time.sleep(interval)
+            interval = min(interval * 2, WAIT_MAX_INTERVAL)
+
+    def kill(self):
+        if self.state != self.STATE_RUNNING or not self.container:
+            return
+
+        # Processes started with exec cannot be killed separately; the
+        # container is killed and replaced in the pool.
+        self.container.reusable = False
+        try:
+            self.pool.client().kill(self.container_id)
+            self.state = self.STATE_KILLED
+        except docker.errors.APIError as exc:
+            logger.error("Couldn't kill warm container %s: %s",
+                         self.container_id, exc)
+
+    def dump_logs(self, stdout_file=None, stderr_file=None):
+        if not self.container:
+            return
+
+        logs = self.container.slot.logs
+        for name, path in ((self.STDOUT_FILE, stdout_file),
+                           (self.STDERR_FILE, stderr_file)):
+            if not path:
+                continue
+            try:
+                shutil.copyfile(str(logs / name), path)
+            except FileNotFoundError:
+                Path(path).touch()
+
+    def get_status(self):
+        return self.state
+
+    def get_host_progress_path(self):
+        return str(self.container.slot.work / DockerJob.PROGRESS_FILE)
+
+    def _stage_in(self) -> None:
+        slot = self.container.slot
+        link_tree(Path(self.resources_dir), slot.resources)
+        link_tree(Path(self.work_dir), slot.work)
+
+        with open(str(slot.work / DockerJob.PARAMS_FILE), 'w') as f:
+            json.dump(self.parameters, f)
+
+    def _stage_out(self) -> None:
+        slot = self.container.slot
+        move_tree(slot.output, Path(self.output_dir))
+        move_tree(slot.work, Path(self.work_dir))
+
+
+def link_tree(src: Path, dst: Path) -> None:
+    """ Recreate the tree under `src` in `dst` using hard links. Files are
+    copied when linking is not possible. """
+    if not src.is_dir():
+        return
+
+    for root, dirs, files in os.walk(str(src)):
+        rel = os.path.relpath(root, str(src))
+        target = os.path.normpath(os.path.join(str(dst), rel))
+
+        for name in dirs:
+            os.makedirs(os.path.join(target, name), exist_ok=True)
+        for name in files:
+            src_file = os.path.join(root, name)
+            dst_file = os.path.join(target, name)
+            try:
+                os.link(src_file, dst_file)
+            except OSError as exc:
+                if exc.errno == errno.EEXIST:
+                    os.unlink(dst_file)
+                shutil.copy2(src_file, dst_file)
+
+
+def move_tree(src: Path, dst: Path) -> None:
+    """ Move the contents of `src` to `dst`, replacing existing files """
+    dst.mkdir(parents=True, exist_ok=True)
+
+    for entry in os.scandir(str(src)):
+        target = dst / entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if target.is_dir():
+                move_tree(Path(entry.path), target)
+                continue
+        elif target.exists():
+            target.unlink()
+        shutil.move(entry.path, str(target))
+
+
+def clear_dir(path: Path) -> None:
+    for entry in os.scandir(str(path)):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            os.unlink(entry.path)
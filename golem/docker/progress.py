@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+from typing import Callable, IO, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressExtractor = Callable[[str], Optional[float]]
+
+# Upper bound on the number of bytes consumed by a single read
+MAX_READ_SIZE = 1024 * 1024
+
+
+def parse_progress_record(line: str) -> Optional[float]:
+    """ Parse a structured progress record written by the task script.
+    A record is either a JSON object with a "progress" key or a bare number,
+    both in the [0, 1] range, e.g.:
+
+        {"progress": 0.25}
+        0.5
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+
+    if isinstance(record, dict):
+        record = record.get('progress')
+    if isinstance(record, bool) or not isinstance(record, (int, float)):
+        return None
+    return float(record)
+
+
+class ProgressReader:
+    """ Incrementally tails a progress file written by a running container.
+
+    Only the bytes appended since the previous read are consumed. Every
+    complete line is passed to a custom extractor, so extractors may keep
+    state between lines. Structured records are cumulative, so with the
+    default extractor only the most recent valid record is parsed. The
+    reported progress never decreases and is clamped to the [0, 1] range.
+    """
+
+    def __init__(self, path: str,
+                 extractor: Optional[ProgressExtractor] = None,
+                 max_read_size: int = MAX_READ_SIZE) -> None:
+        self.path = path
+        self.extractor = extractor or parse_progress_record
+        self._latest_only = extractor is None
+        self.max_read_size = max_read_size
+
+        self._file: Optional[IO[bytes]] = None
+        self._partial = b''
+        self._progress = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def progress(self) -> float:
+        return self._progress
+
+    def read(self) -> float:
+        """ Consume new records and return the current progress """
+        with self._lock:
+            if self._closed:
+                return self._progress
+
+            data = self._read_new_data()
+            if data:
+                self._consume(data)
+            return self._progress
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _read_new_data(self) -> bytes:
+        if not self._file:
+            try:
+                self._file = open(self.path, 'rb')
+            except OSError:
+                return b''
+
+        chunks = []
+        remaining = self.max_read_size
+        while remaining > 0:
+            chunk = self._file.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    def _consume(self, data: bytes) -> None:
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+
+        if self._latest_only:
+            lines.reverse()
+
+        for line in lines:
+            try:
+                value = self.extractor(line.decode('utf-8', 'replace'))
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Cannot extract progress from %r", line,
+                             exc_info=True)
+                continue
+
+            if value is None:
+                continue
+
+            self._progress = max(self._progress,
+                                 min(max(float(value), 0.), 1.))
+            if self._latest_only:
+                break
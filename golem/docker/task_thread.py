@@ -1,4 +1,5 @@
 import logging
+import posixpath
 from pathlib import Path
 from typing import ClassVar, Optional, TYPE_CHECKING, Tuple, Dict, Union, \
     List, NamedTuple
@@ -8,12 +9,14 @@ import requests
 from golem.core.common import posix_path
 from golem.docker.image import DockerImage
 from golem.docker.job import DockerJob
+from golem.docker.progress import ProgressReader
 from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.task.taskthread import TaskThread, JobException, TimeoutException
 from golem.vm.memorychecker import MemoryChecker
 
 if TYPE_CHECKING:
     from .manager import DockerManager  # noqa pylint:disable=unused-import
+    from .pool import WarmDockerJob  # noqa pylint:disable=unused-import
 
 
 logger = logging.getLogger(__name__)
@@ -101,7 +104,8 @@ class DockerTaskThread(TaskThread):
                 self.image = img
                 break
 
-        self.job: Optional[DockerJob] = None
+        self.job: Optional[Union[DockerJob, 'WarmDockerJob']] = None
+        self.progress_reader: Optional[ProgressReader] = None
         self.check_mem = check_mem
         self.dir_mapping = dir_mapping
 
@@ -144,6 +148,8 @@ class DockerTaskThread(TaskThread):
 
         finally:
             self.job = None
+            if self.progress_reader:
+                self.progress_reader.close()
 
     def _get_default_binds(self) -> List[DockerBind]:
         return [
@@ -162,7 +168,9 @@ class DockerTaskThread(TaskThread):
         environment.update(
             WORK_DIR=DockerJob.WORK_DIR,
             RESOURCES_DIR=DockerJob.RESOURCES_DIR,
-            OUTPUT_DIR=DockerJob.OUTPUT_DIR
+            OUTPUT_DIR=DockerJob.OUTPUT_DIR,
+            PROGRESS_FILE=posixpath.join(DockerJob.WORK_DIR,
+                                         DockerJob.PROGRESS_FILE)
         )
 
         assert self.image is not None
@@ -172,23 +180,23 @@ class DockerTaskThread(TaskThread):
             env_config = docker_env.get_container_config()
 
             environment.update(env_config['environment'])
-            binds += env_config['binds']
+            env_binds = list(env_config['binds'])
             volumes += env_config['volumes']
             devices = env_config['devices']
             runtime = env_config['runtime']
         else:
             logger.debug('No Docker environment found for image %r', self.image)
 
+            env_binds = []
             devices = None
             runtime = None
 
+        progress_extractor = docker_env.get_progress_extractor(
+            self.extra_data) if docker_env else None
+
         assert self.docker_manager is not None, "Docker Manager undefined"
         # PyLint still thinks docker_manager is of type DockerConfigManager
         # pylint: disable=no-member
-        host_config = self.docker_manager.get_host_config_for_task(binds)
-        host_config['devices'] = devices
-        host_config['runtime'] = runtime
-
         params = dict(
             image=self.image,
             entrypoint=self.extra_data['entrypoint'],
@@ -196,17 +204,33 @@ class DockerTaskThread(TaskThread):
             resources_dir=str(self.dir_mapping.resources),
             work_dir=str(self.dir_mapping.work),
             output_dir=str(self.dir_mapping.output),
-            volumes=volumes,
             environment=environment,
-            host_config=host_config
         )
 
-        with DockerJob(**params) as job, MemoryChecker(self.check_mem) as mc:
+        # Warm containers are created up front, so they can't be given
+        # environment-specific binds, devices or runtimes
+        use_warm_pool = self.docker_manager.warm_pool_enabled \
+            and not env_binds and not devices and not runtime
+
+        if use_warm_pool:
+            docker_job = self.docker_manager.get_warm_job(**params)
+        else:
+            host_config = self.docker_manager.get_host_config_for_task(
+                binds + env_binds)
+            host_config['devices'] = devices
+            host_config['runtime'] = runtime
+            docker_job = DockerJob(volumes=volumes, host_config=host_config,
+                                   **params)
+
+        with docker_job as job, MemoryChecker(self.check_mem) as mc:
             self.job = job
+            self.progress_reader = ProgressReader(
+                job.get_host_progress_path(), progress_extractor)
             job.start()
 
             exit_code = job.wait()
             estm_mem = mc.estm_mem
+            self.progress_reader.read()
 
             job.dump_logs(str(self.dir_mapping.logs / self.STDOUT_FILE),
                           str(self.dir_mapping.logs / self.STDERR_FILE))
@@ -235,8 +259,9 @@ class DockerTaskThread(TaskThread):
         self._deferred.callback(self)
 
     def get_progress(self):
-        # TODO: make the container update some status file? Issue #56
-        return 0.0
+        if not self.progress_reader:
+            return 0.0
+        return self.progress_reader.read()
 
     def end_comp(self):
         try:
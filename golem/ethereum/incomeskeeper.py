@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import logging
 import time
+from typing import Optional
 
 from ethereum.utils import denoms
+from peewee import fn, JOIN
 from pydispatch import dispatcher
 
 from golem.core.variables import PAYMENT_DEADLINE
-from golem.model import Income
+from golem.database.pagination import keyset_page, Page, PAGE_SIZE
+from golem.model import CachedNode, Income
 
 logger = logging.getLogger(__name__)
 
@@ -140,10 +143,32 @@ class IncomesKeeper:
 
     @staticmethod
     def get_list_of_all_incomes():
-        # TODO: pagination. issue #2402
         return Income.select(
         ).order_by(Income.created_date.desc())
 
+    @staticmethod
+    def get_incomes_page(limit: int = PAGE_SIZE,
+                         after: Optional[str] = None) -> Page:
+        """ Returns a page of incomes, newest first, and the cursor of the
+        next one. Incomes carry the cached node of their sender as raw JSON
+        in the node_json attribute, or 'null' if the node is not known.
+        """
+        query = Income.select(
+            Income,
+            fn.COALESCE(CachedNode.node_field, 'null').coerce(False)
+            .alias('node_json'),
+        ).join(
+            CachedNode,
+            JOIN.LEFT_OUTER,
+            on=(Income.sender_node == CachedNode.node),
+        ).naive()
+        return keyset_page(
+            query,
+            (Income.created_date, Income.sender_node, Income.subtask),
+            limit,
+            after,
+        )
+
     @staticmethod
     def update_overdue_incomes() -> None:
         """
@@ -1,14 +1,21 @@
+import json
 import logging
 from datetime import datetime, timedelta
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
 from eth_utils import encode_hex
+from peewee import fn
 
 from golem.core.common import to_unicode, datetime_to_timestamp_utc
-from golem.model import Payment
+from golem.database.pagination import keyset_page, Page, PAGE_SIZE
+from golem.model import Payment, PaymentStatus
 
 logger = logging.getLogger(__name__)
 
+# Above this number of subtasks, payments are selected without a subtask
+# filter, which would exceed the SQLite limit of query parameters
+SUBTASKS_QUERY_LIMIT = 500
+
 
 class PaymentsDatabase(object):
     """ Save and retrieve from database information about payments that this node has to make / made
@@ -39,6 +46,42 @@ class PaymentsDatabase(object):
             Payment.subtask.in_(subtask_ids),
         ))
 
+    @staticmethod
+    def get_tasks_payment_totals(subtask_tasks: Mapping[str, str]) \
+            -> Dict[str, Tuple[int, int]]:
+        """ Return total value and fee of payments for subtasks of each task,
+        read with a single query. Tasks without payments or with payments
+        that have not been sent yet are left out.
+        :param subtask_tasks: task ids of subtasks to sum up payments for
+        """
+        query = Payment.select(
+            Payment.subtask,
+            Payment.status,
+            Payment.value,
+            # Raw JSON, decoding PaymentDetails is not needed for the fee
+            fn.COALESCE(Payment.details, 'null').coerce(False),
+        )
+        if len(subtask_tasks) <= SUBTASKS_QUERY_LIMIT:
+            query = query.where(Payment.subtask.in_(list(subtask_tasks)))
+
+        sent = (PaymentStatus.sent, PaymentStatus.confirmed)
+        totals: Dict[str, List[int]] = {}
+        unsent: Set[str] = set()
+        for subtask_id, status, value, details in query.tuples().iterator():
+            task_id = subtask_tasks.get(subtask_id)
+            if task_id is None or task_id in unsent:
+                continue
+            if status not in sent:
+                unsent.add(task_id)
+                totals.pop(task_id, None)
+                continue
+            fee = (json.loads(details) or {}).get('fee')
+            total = totals.setdefault(task_id, [0, 0])
+            total[0] += value or 0
+            total[1] += fee or 0
+        return {task_id: (cost, fee) for task_id, (cost, fee)
+                in totals.items()}
+
     @staticmethod
     def add_payment(subtask_id: str, eth_address: bytes, value: int):
         """ Add new payment to the database.
@@ -91,6 +134,19 @@ class PaymentsDatabase(object):
 
         return query.execute()
 
+    @staticmethod
+    def get_payments_page(limit: int = PAGE_SIZE,
+                          after: Optional[str] = None) -> Page:
+        """ Return a page of payments, newest first, and the cursor of the
+        next one
+        """
+        return keyset_page(
+            Payment.select(),
+            (Payment.created_date, Payment.subtask),
+            limit,
+            after,
+        )
+
 
 class PaymentsKeeper:
     """ Keeps information about payments for tasks that should be processed and send or received. """
@@ -102,7 +158,18 @@ class PaymentsKeeper:
     def get_list_of_all_payments(self, num: Optional[int] = None,
                                  interval: Optional[timedelta] = None):
         # This data is used by UI.
-        return [{
+        return [self._payment_dict(payment)
+                for payment in self.db.get_newest_payment(num, interval)]
+
+    def get_payments_page(self, limit: int = PAGE_SIZE,
+                          after: Optional[str] = None) \
+            -> Tuple[List[Dict], Optional[str]]:
+        payments, cursor = self.db.get_payments_page(limit, after)
+        return [self._payment_dict(payment) for payment in payments], cursor
+
+    @staticmethod
+    def _payment_dict(payment: Payment) -> Dict:
+        return {
             "subtask": to_unicode(payment.subtask),
             "payee": to_unicode(encode_hex(payment.payee)),
             "value": to_unicode(payment.value),
@@ -116,7 +183,7 @@ class PaymentsKeeper:
                 else None,
             "created": datetime_to_timestamp_utc(payment.created_date),
             "modified": datetime_to_timestamp_utc(payment.modified_date)
-        } for payment in self.db.get_newest_payment(num, interval)]
+        }
 
     def finished_subtasks(
             self,
@@ -140,3 +207,7 @@ class PaymentsKeeper:
             self,
             subtask_ids: Iterable[str]) -> List[Payment]:
         return self.db.get_subtasks_payments(subtask_ids)
+
+    def get_tasks_payment_totals(self, subtask_tasks: Mapping[str, str]) \
+            -> Dict[str, Tuple[int, int]]:
+        return self.db.get_tasks_payment_totals(subtask_tasks)
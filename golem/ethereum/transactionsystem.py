@@ -1,4 +1,5 @@
 import functools
+import itertools
 import json
 import logging
 import os
@@ -14,6 +15,7 @@ from typing import (
     Generator,
     Iterable,
     List,
+    Mapping,
     Optional,
     Tuple,
 )
@@ -33,13 +35,13 @@ from twisted.internet import defer
 
 from golem import model
 from golem.core import common
-from golem.core.deferred import call_later
+from golem.core.deferred import call_later, collect_chunks
+from golem.database import pagination
 from golem.core.service import LoopingCallService
 from golem.ethereum.node import NodeProcess
 from golem.ethereum.paymentprocessor import PaymentProcessor
 from golem.ethereum.incomeskeeper import IncomesKeeper
 from golem.ethereum.paymentskeeper import PaymentsKeeper
-from golem.network import nodeskeeper
 from golem.rpc import utils as rpc_utils
 from golem.utils import privkeytoaddr
 
@@ -347,12 +349,38 @@ class TransactionSystem(LoopingCallService):
             self,
             num: Optional[int] = None,
             last_seconds: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
+            stream: bool = False,
+    ):
+        """ Return payments, most recently modified first.
+        :param stream: return a Deferred with all payments, newest first,
+            read in pages between other work of the reactor. num and
+            last_seconds are not supported in this mode.
+        """
+        if stream:
+            if num is not None or last_seconds is not None:
+                raise ValueError(
+                    "num and last_seconds are not supported with stream")
+            return collect_chunks(pagination.iter_pages(
+                self._payments_keeper.get_payments_page))
+
         interval = None
         if last_seconds is not None:
             interval = timedelta(seconds=last_seconds)
         return self._payments_keeper.get_list_of_all_payments(num, interval)
 
+    @rpc_utils.expose('pay.payments.page')
+    def get_payments_page(
+            self,
+            limit: int = pagination.PAGE_SIZE,
+            after: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """ Return a page of payments, newest first, and the cursor to pass
+        as `after` to get the next page, None after the last one.
+        """
+        payments, cursor = self._payments_keeper.get_payments_page(
+            limit, after)
+        return {'payments': payments, 'next': cursor}
+
     @rpc_utils.expose('pay.deposit_payments')
     @classmethod
     def get_deposit_payments_list(cls, limit=1000, offset=0)\
@@ -382,13 +410,56 @@ class TransactionSystem(LoopingCallService):
             subtask_ids: Iterable[str]) -> List[model.Payment]:
         return self._payments_keeper.get_subtasks_payments(subtask_ids)
 
-    @rpc_utils.expose('pay.incomes')
-    def get_incomes_list(self) -> List[Dict[str, Any]]:
-        incomes = self._incomes_keeper.get_list_of_all_incomes()
+    def get_tasks_payment_totals(
+            self,
+            subtask_tasks: Mapping[str, str]) -> Dict[str, Tuple[int, int]]:
+        return self._payments_keeper.get_tasks_payment_totals(subtask_tasks)
 
-        # Our version of peewee (2.10.2) doesn't support
-        # .join(attr='XXX'). So we'll have to join manually
-        lru_node = functools.lru_cache()(nodeskeeper.get)
+    @rpc_utils.expose('pay.incomes')
+    def get_incomes_list(self, stream: bool = False):
+        """ Return all incomes, newest first.
+        :param stream: return a Deferred with the incomes, read in pages
+            between other work of the reactor
+        """
+        # Nodes are decoded once for all the pages
+        nodes: Dict[str, Optional[Dict]] = {}
+
+        def get_page(limit, after):
+            return self._get_incomes_page(limit, after, nodes)
+
+        pages = pagination.iter_pages(get_page)
+        if stream:
+            return collect_chunks(pages)
+        return list(itertools.chain.from_iterable(pages))
+
+    @rpc_utils.expose('pay.incomes.page')
+    def get_incomes_page(
+            self,
+            limit: int = pagination.PAGE_SIZE,
+            after: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """ Return a page of incomes, newest first, and the cursor to pass
+        as `after` to get the next page, None after the last one.
+        """
+        incomes, cursor = self._get_incomes_page(limit, after, {})
+        return {'incomes': incomes, 'next': cursor}
+
+    def _get_incomes_page(
+            self,
+            limit: int,
+            after: Optional[str],
+            nodes: Dict[str, Optional[Dict]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        incomes, cursor = self._incomes_keeper.get_incomes_page(limit, after)
+
+        def node(o):
+            # Sender nodes are joined by the query as raw JSON
+            if o.sender_node not in nodes:
+                node_field = model.CachedNode.node_field
+                nodes[o.sender_node] = \
+                    node_field.python_value(o.node_json).to_dict() \
+                    if o.node_json != 'null' else None
+            return nodes[o.sender_node]
 
         def item(o):
             return {
@@ -399,12 +470,10 @@ class TransactionSystem(LoopingCallService):
                 "transaction": common.to_unicode(o.transaction),
                 "created": common.datetime_to_timestamp_utc(o.created_date),
                 "modified": common.datetime_to_timestamp_utc(o.modified_date),
-                "node":
-                    lru_node(o.sender_node).to_dict()
-                    if o.sender_node else None,
+                "node": node(o) if o.sender_node else None,
             }
 
-        return [item(income) for income in incomes]
+        return [item(income) for income in incomes], cursor
 
     def get_available_eth(self) -> int:
         return self._eth_balance - self.get_locked_eth()
@@ -5,7 +5,8 @@ import json
 import pickle
 import sys
 import time
-from typing import Optional
+import zlib
+from typing import Optional, Tuple
 
 from eth_utils import decode_hex, encode_hex
 from ethereum.utils import denoms
@@ -302,6 +303,12 @@ class Payment(BaseModel):
     details = PaymentDetailsField()
     processed_ts = IntegerField(null=True)
 
+    class Meta:
+        database = db
+        indexes = (
+            (('created_date', 'subtask'), False),  # keyset pagination
+        )
+
     def __init__(self, *args, **kwargs):
         super(Payment, self).__init__(*args, **kwargs)
         # For convenience always have .details as a dictionary
@@ -354,6 +361,10 @@ class Income(BaseModel):
     class Meta:
         database = db
         primary_key = CompositeKey('sender_node', 'subtask')
+        indexes = (
+            # keyset pagination
+            (('created_date', 'sender_node', 'subtask'), False),
+        )
 
     def __repr__(self):
         return "<Income: {!r} v:{:.3f} accepted_ts:{!r} tid:{!r}>"\
@@ -541,6 +552,52 @@ class ActorField(StringEnumField):
         super().__init__(Actor, *args, **kwargs)
 
 
+class MessageCodec(enum.Enum):
+    """ The encoding of NetworkMessage.msg_data """
+    pickle = 0  # Written by older versions, converted on read
+    golem_messages = 1  # golem_messages canonical serialization
+    golem_messages_zlib = 2  # The above, compressed with zlib
+
+
+class MessageCodecField(EnumField):
+    """ Database field that stores MessageCodec objects as integers. """
+    def __init__(self, *args, **kwargs):
+        super().__init__(MessageCodec, *args, **kwargs)
+
+
+# Shorter messages are not worth compressing
+MESSAGE_COMPRESSION_THRESHOLD = 256
+
+
+def encode_message(
+        msg: message.base.Message,
+        codec: MessageCodec = MessageCodec.golem_messages_zlib
+) -> Tuple[MessageCodec, bytes]:
+    """ Encode a signed message for storage. Compression is skipped when it
+    does not make the message smaller.
+    :return: the codec actually used and the encoded message
+    """
+    if codec is MessageCodec.pickle:
+        return codec, pickle.dumps(msg)
+
+    data = golem_messages.dump(msg, None, None)
+    if codec is MessageCodec.golem_messages_zlib:
+        if len(data) >= MESSAGE_COMPRESSION_THRESHOLD:
+            compressed = zlib.compress(data)
+            if len(compressed) < len(data):
+                return codec, compressed
+        codec = MessageCodec.golem_messages
+    return codec, data
+
+
+def decode_message(codec: MessageCodec, data: bytes) -> message.base.Message:
+    if codec is MessageCodec.pickle:
+        return pickle.loads(data)
+    if codec is MessageCodec.golem_messages_zlib:
+        data = zlib.decompress(data)
+    return golem_messages.load(data, None, None, check_time=False)
+
+
 class NetworkMessage(BaseModel):
     local_role = ActorField(null=False)
     remote_role = ActorField(null=False)
@@ -554,10 +611,11 @@ class NetworkMessage(BaseModel):
     msg_date = DateTimeField(null=False)
     msg_cls = CharField(null=False)
     msg_data = BlobField(null=False)
+    msg_codec = MessageCodecField(null=False,
+                                  default=MessageCodec.pickle.value)
 
     def as_message(self) -> message.base.Message:
-        msg = pickle.loads(self.msg_data)
-        return msg
+        return decode_message(self.msg_codec, self.msg_data)
 
 
 class QueuedMessage(BaseModel):
@@ -624,6 +682,30 @@ class CachedNode(BaseModel):
         )
 
 
+###################
+# RESOURCE MODELS #
+###################
+
+
+class ResourceUsage(BaseModel):
+    """ Top-level entry of a resource directory, indexed for its cleanup """
+    path = CharField(primary_key=True)
+    directory = CharField(index=True)
+    size = IntegerField(default=0)
+    # Modification time of the entry when its size was measured
+    mtime = FloatField(default=0.)
+    last_used = FloatField(index=True)
+
+    class Meta:
+        database = db
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__module__}.{self.__class__.__qualname__}:"
+            f" {self.path!r}, size={self.size}, last_used={self.last_used}>"
+        )
+
+
 def collect_db_models(module: str = __name__):
     return inspect.getmembers(
         sys.modules[module],
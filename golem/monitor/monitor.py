@@ -1,8 +1,9 @@
+import collections
 import logging
 import queue
 import threading
 import time
-from typing import Optional, Dict
+from typing import Deque, Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
@@ -17,7 +18,10 @@ from .model import statssnapshotmodel
 from .model.loginlogoutmodel import LoginModel, LogoutModel
 from .model.nodemetadatamodel import NodeInfoModel, NodeMetadataModel
 from .model.taskcomputersnapshotmodel import TaskComputerSnapshotModel
+from .transport.httptransport import PostResult
+from .transport.sender import BatchJSONSender as BatchSender
 from .transport.sender import DefaultJSONSender as Sender
+from .transport.spool import RingSpool
 
 log = logging.getLogger('golem.monitor')
 
@@ -52,13 +56,137 @@ class SenderThread(threading.Thread):
         super(SenderThread, self).join(timeout)
 
 
+class BatchSenderThread(threading.Thread):
+    """ Sends monitoring messages in gzipped batches of up to batch_size,
+    at least every batch_interval seconds.
+
+    While the monitor cannot be reached, up to max_pending messages wait in
+    memory and the rest goes to a spool file of spool_size bytes, which drops
+    the oldest messages when full. Spooled messages are sent first once the
+    monitor is back. Batches the monitor rejects (client errors) are
+    dropped instead of being retried.
+    """
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 node_info, monitor_host, monitor_request_timeout,
+                 monitor_sender_thread_timeout, proto_ver,
+                 batch_size: int = 100,
+                 batch_interval: float = 5,
+                 max_pending: int = 1000,
+                 spool_size: int = 4 * 1024 * 1024,
+                 spool_path: Optional[str] = None) -> None:
+        super().__init__()
+        self.node_info = node_info
+        self.sender = BatchSender(monitor_host, monitor_request_timeout,
+                                  proto_ver)
+        self.monitor_sender_thread_timeout = monitor_sender_thread_timeout
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_pending = max_pending
+
+        self.pending: Deque[bytes] = collections.deque()
+        self.spool = RingSpool(spool_size, spool_path)
+        self.stats = dict(queued=0, sent=0, batches=0, failed=0, spooled=0,
+                          dropped=0)
+        self.stop_request = threading.Event()
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._last_queued = time.time()
+        self._retry_at = 0.
+        self._retry_delay = batch_interval
+
+    def send(self, o):
+        event = self.sender.encode(o)
+        with self._lock:
+            self.pending.append(event)
+            self.stats['queued'] += 1
+            self._last_queued = time.time()
+            overflow = [self.pending.popleft() for _ in
+                        range(len(self.pending) - self.max_pending)]
+            ready = len(self.pending) >= self.batch_size
+
+        if overflow:
+            self._spool(overflow)
+        if ready:
+            self._wakeup.set()
+
+    def _spool(self, events: List[bytes]) -> None:
+        dropped = self.spool.push(events)
+        with self._lock:
+            self.stats['spooled'] += len(events)
+            self.stats['dropped'] += dropped
+
+    def flush(self) -> bool:
+        """ Sends all waiting messages, oldest first. Returns False when the
+        monitor could not be reached """
+        while True:
+            events = self.spool.peek(self.batch_size)
+            spooled = bool(events)
+            if not spooled:
+                with self._lock:
+                    events = [self.pending.popleft() for _ in
+                              range(min(self.batch_size, len(self.pending)))]
+            if not events:
+                return True
+
+            result = self.sender.send_batch(events)
+            if result is PostResult.failed:
+                if not spooled:
+                    self._spool(events)
+                with self._lock:
+                    self.stats['failed'] += 1
+                return False
+
+            if spooled:
+                self.spool.discard(len(events))
+            if result is PostResult.rejected:
+                log.warning("Monitor rejected a batch of %d messages",
+                            len(events))
+                with self._lock:
+                    self.stats['dropped'] += len(events)
+                continue
+            with self._lock:
+                self.stats['sent'] += len(events)
+                self.stats['batches'] += 1
+
+    def run(self):
+        while not self.stop_request.is_set():
+            self._wakeup.wait(self.batch_interval)
+            self._wakeup.clear()
+
+            now = time.time()
+            if now - self._last_queued >= self.monitor_sender_thread_timeout:
+                # send ping message
+                self.send(self.node_info)
+            if now < self._retry_at or self.stop_request.is_set():
+                continue
+
+            if self.flush():
+                self._retry_delay = self.batch_interval
+            else:
+                self._retry_at = now + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2,
+                                        self.monitor_sender_thread_timeout)
+
+        # Last attempt, unsent messages stay in the spool
+        self.flush()
+
+    def join(self, timeout=None):
+        self.stop_request.set()
+        self._wakeup.set()
+        super().join(timeout)
+
+
 class SystemMonitor(object):
     def __init__(self,
                  meta_data: NodeMetadataModel,
-                 monitor_config: dict) -> None:
+                 monitor_config: dict,
+                 spool_path: Optional[str] = None) -> None:
         self.meta_data = meta_data
         self.node_info = NodeInfoModel(meta_data.cliid, meta_data.sessid)
         self.config = monitor_config
+        self.spool_path = spool_path
         dispatcher.connect(self.dispatch_listener, signal='golem.monitor')
         dispatcher.connect(self.p2p_listener, signal='golem.p2p')
 
@@ -69,13 +197,27 @@ class SystemMonitor(object):
             request_timeout = self.config['REQUEST_TIMEOUT']
             sender_thread_timeout = self.config['SENDER_THREAD_TIMEOUT']
             proto_ver = self.config['PROTO_VERSION']
-            self._sender_thread = SenderThread(
-                self.node_info,
-                host,
-                request_timeout,
-                sender_thread_timeout,
-                proto_ver
-            )
+            if self.config.get('BATCH_SIZE'):
+                self._sender_thread = BatchSenderThread(
+                    self.node_info,
+                    host,
+                    request_timeout,
+                    sender_thread_timeout,
+                    proto_ver,
+                    batch_size=self.config['BATCH_SIZE'],
+                    batch_interval=self.config['BATCH_INTERVAL'],
+                    max_pending=self.config['MAX_PENDING'],
+                    spool_size=self.config['SPOOL_SIZE'],
+                    spool_path=self.spool_path,
+                )
+            else:
+                self._sender_thread = SenderThread(
+                    self.node_info,
+                    host,
+                    request_timeout,
+                    sender_thread_timeout,
+                    proto_ver
+                )
         return self._sender_thread
 
     def p2p_listener(self, event='default', ports=None, *_, **__):
@@ -1,31 +1,59 @@
+import enum
+import gzip
 import logging
 import requests
 import time
 
 log = logging.getLogger('golem.monitor.transport')
 
+# Client errors which are worth retrying: request timeout, too many requests
+RETRIABLE_STATUS_CODES = (408, 429)
+
+
+class PostResult(enum.Enum):
+    sent = 'sent'
+    # The monitor could not be reached or failed, the payload may be resent
+    failed = 'failed'
+    # The monitor refused the payload, resending it won't help
+    rejected = 'rejected'
+
 
 class DefaultHttpSender(object):
     def __init__(self, url, request_timeout):
         self.url = url
         self.timeout = request_timeout
         self.json_headers = {'content-type': 'application/json'}
+        self.gzip_json_headers = {'content-type': 'application/json',
+                                  'content-encoding': 'gzip'}
         self.last_exception_time = 0
 
     def _post(self, headers, payload):
+        return self._send(headers, payload) is PostResult.sent
+
+    def _send(self, headers, payload) -> PostResult:
         try:
-            log.debug(f'sending msg {payload}')
+            log.debug('sending msg %s', payload)
             r = requests.post(self.url, data=payload, headers=headers,
                               timeout=self.timeout)
             log.debug(f'result {r}')
-            return r.status_code == 200
         except requests.exceptions.RequestException as e:
             delta = time.time() - self.last_exception_time
             if delta > 60*10:  # seconds
                 log.warning('Problem sending payload to: %r, because %s',
                             self.url, e)
                 self.last_exception_time = time.time()
-            return False
+            return PostResult.failed
+
+        if r.status_code == 200:
+            return PostResult.sent
+        if 400 <= r.status_code < 500 \
+                and r.status_code not in RETRIABLE_STATUS_CODES:
+            return PostResult.rejected
+        return PostResult.failed
 
     def post_json(self, json_payload):
         return self._post(self.json_headers, json_payload)
+
+    def post_gzip_json(self, json_payload: bytes) -> PostResult:
+        return self._send(self.gzip_json_headers,
+                          gzip.compress(json_payload))
@@ -1,3 +1,5 @@
+from typing import List
+
 from golem.monitor.serialization.defaultserializer import dict2json
 
 
@@ -8,3 +10,8 @@ class DefaultProto(object):
     def prepare_json_message(self, d):
         json_dict = {'proto_ver': self.proto_version, 'data': d}
         return dict2json(json_dict)
+
+    def prepare_json_batch(self, events: List[bytes]) -> bytes:
+        """ Joins JSON-encoded messages into a single message """
+        return b'{"proto_ver": %d, "data": [%s]}' % (
+            self.proto_version, b', '.join(events))
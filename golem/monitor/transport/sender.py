@@ -1,4 +1,7 @@
-from .httptransport import DefaultHttpSender
+import json
+from typing import List
+
+from .httptransport import DefaultHttpSender, PostResult
 from .proto import DefaultProto
 
 
@@ -10,3 +13,15 @@ class DefaultJSONSender(object):
     def send(self, o):
         msg = self.proto.prepare_json_message(o.dict_repr())
         return self.transport.post_json(msg)
+
+
+class BatchJSONSender(DefaultJSONSender):
+    """ Sends gzipped lists of messages in a single request """
+
+    @staticmethod
+    def encode(o) -> bytes:
+        return json.dumps(o.dict_repr()).encode()
+
+    def send_batch(self, events: List[bytes]) -> PostResult:
+        msg = self.proto.prepare_json_batch(events)
+        return self.transport.post_gzip_json(msg)
@@ -0,0 +1,133 @@
+import os
+import struct
+import tempfile
+import threading
+from typing import List, Optional
+
+# magic, capacity, head offset, used bytes, record count
+HEADER = struct.Struct('<4sQQQQ')
+MAGIC = b'GMS1'
+RECORD_LENGTH = struct.Struct('<I')
+
+
+class RingSpool:
+    """ Bounded FIFO of byte records kept in a ring buffer file.
+
+    When a new record does not fit, the oldest records are dropped to make
+    room for it. Records are only removed from the head by discard(), so a
+    batch read with peek() survives a failed delivery. Without a path the
+    spool lives in an anonymous temporary file.
+    """
+
+    def __init__(self, capacity: int, path: Optional[str] = None) -> None:
+        self.capacity = capacity
+        self.head = 0
+        self.used = 0
+        self.count = 0
+        self.dropped = 0
+        # Number of records removed from the head, locates peeked records
+        self._removed = 0
+        self._peeked = 0
+        self._lock = threading.Lock()
+
+        if path is None:
+            self._file = tempfile.TemporaryFile()
+        elif os.path.exists(path):
+            self._file = open(path, 'r+b')
+            self._load()
+        else:
+            self._file = open(path, 'w+b')
+        self._file.truncate(HEADER.size + self.capacity)
+        self._write_header()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _load(self) -> None:
+        data = self._file.read(HEADER.size)
+        if len(data) < HEADER.size:
+            return
+        magic, capacity, head, used, count = HEADER.unpack(data)
+        # A spool of a different size starts empty
+        if magic == MAGIC and capacity == self.capacity:
+            self.head, self.used, self.count = head, used, count
+
+    def _write_header(self) -> None:
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, self.capacity, self.head,
+                                     self.used, self.count))
+        self._file.flush()
+
+    def _write(self, offset: int, data: bytes) -> None:
+        first = min(len(data), self.capacity - offset)
+        self._file.seek(HEADER.size + offset)
+        self._file.write(data[:first])
+        if first < len(data):
+            self._file.seek(HEADER.size)
+            self._file.write(data[first:])
+
+    def _read(self, offset: int, size: int) -> bytes:
+        first = min(size, self.capacity - offset)
+        self._file.seek(HEADER.size + offset)
+        data = self._file.read(first)
+        if first < size:
+            self._file.seek(HEADER.size)
+            data += self._file.read(size - first)
+        return data
+
+    def _pop(self) -> int:
+        length, = RECORD_LENGTH.unpack(
+            self._read(self.head, RECORD_LENGTH.size))
+        size = RECORD_LENGTH.size + length
+        self.head = (self.head + size) % self.capacity
+        self.used -= size
+        self.count -= 1
+        self._removed += 1
+        return size
+
+    def push(self, records: List[bytes]) -> int:
+        """ Appends records, returns the number of records dropped """
+        dropped = 0
+        with self._lock:
+            for record in records:
+                size = RECORD_LENGTH.size + len(record)
+                if size > self.capacity:
+                    dropped += 1
+                    continue
+                while self.capacity - self.used < size:
+                    self._pop()
+                    dropped += 1
+                tail = (self.head + self.used) % self.capacity
+                self._write(tail, RECORD_LENGTH.pack(len(record)) + record)
+                self.used += size
+                self.count += 1
+            self._write_header()
+            self.dropped += dropped
+        return dropped
+
+    def peek(self, max_records: int) -> List[bytes]:
+        """ Returns up to max_records oldest records without removing them """
+        records = []
+        with self._lock:
+            self._peeked = self._removed
+            offset = self.head
+            for _ in range(min(max_records, self.count)):
+                length, = RECORD_LENGTH.unpack(
+                    self._read(offset, RECORD_LENGTH.size))
+                records.append(self._read(
+                    (offset + RECORD_LENGTH.size) % self.capacity, length))
+                offset = (offset + RECORD_LENGTH.size + length) \
+                    % self.capacity
+        return records
+
+    def discard(self, count: int) -> None:
+        """ Removes the first count records returned by the last peek(),
+        unless they have already been dropped """
+        with self._lock:
+            while self.count and self._removed < self._peeked + count:
+                self._pop()
+            self._write_header()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
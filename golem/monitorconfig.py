@@ -11,6 +11,15 @@ MONITOR_CONFIG = {
     # Increase this number every time any change is made to the protocol
     # (e.g. message object representation changes)
     'PROTO_VERSION': 1,
+
+    # Number of messages sent in a single gzipped request, 0 sends messages
+    # one by one. Batches are sent at least every BATCH_INTERVAL seconds
+    'BATCH_SIZE': 0,
+    'BATCH_INTERVAL': 5,
+    # Messages kept in memory while the monitor cannot be reached, the rest
+    # goes to a spool file of SPOOL_SIZE bytes
+    'MAX_PENDING': 1000,
+    'SPOOL_SIZE': 4 * 1024 * 1024,
 }
 
 # so that the queue will not get filled up
@@ -1,7 +1,11 @@
 import calendar
+import concurrent.futures
 import datetime
+import heapq
+import itertools
 import logging
 import queue
+import random
 import threading
 import time
 import typing
@@ -175,12 +179,134 @@ def build_key(*args) -> str:
     return '/'.join(str(a) for a in args)
 
 
+# Messages with lower priority values are sent first. Responses to requests
+# forced by the Concent have the shortest deadlines, payments have none.
+MSG_PRIORITIES: typing.Dict[str, int] = {
+    'AckReportComputedTask': 0,
+    'RejectReportComputedTask': 0,
+    'ForceSubtaskResultsResponse': 0,
+    'ForceReportComputedTask': 1,
+    'ForceGetTaskResult': 1,
+    'ForceSubtaskResults': 1,
+    'SubtaskResultsVerify': 1,
+    'ForcePayment': 2,
+}
+DEFAULT_MSG_PRIORITY = 1
+
+
+class ConcentRequest:
+    """ A message waiting to be sent to the Concent """
+
+    __slots__ = ('key', 'msg', 'priority', 'attempts', 'not_before',
+                 'enqueued', 'superseded', 'cancelled')
+
+    def __init__(self, key: typing.Hashable, msg: message.base.Message,
+                 priority: int, attempts: int = 0,
+                 not_before: float = 0.0,
+                 enqueued: typing.Optional[float] = None) -> None:
+        self.key = key
+        self.msg = msg
+        self.priority = priority
+        self.attempts = attempts
+        self.not_before = not_before
+        self.enqueued = time.time() if enqueued is None else enqueued
+        self.superseded = False
+        self.cancelled = False
+
+
+class ConcentRequestQueue:
+    """
+    Requests ready to be sent are ordered by priority, then by the order of
+    submission. Requests scheduled for a retry wait until their time comes.
+    Submitting a request with the key of a queued one supersedes the latter.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._ready: typing.List[typing.Tuple[int, int, ConcentRequest]] = []
+        self._waiting: typing.List[
+            typing.Tuple[float, int, ConcentRequest]] = []
+        self._queued: typing.Dict[typing.Hashable, ConcentRequest] = dict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._queued)
+
+    def put(self, request: ConcentRequest, replace: bool = True) -> bool:
+        """
+        Queues the request. With replace=False the request is dropped if
+        another one with the same key is already queued.
+
+        :return: whether the request has been queued
+        """
+        with self._lock:
+            queued = self._queued.get(request.key)
+            if queued is not None:
+                if not replace:
+                    return False
+                logger.debug('Superseding Concent request %r', request.key)
+                queued.superseded = True
+
+            self._queued[request.key] = request
+            if request.not_before > time.time():
+                heapq.heappush(self._waiting, (request.not_before,
+                                               next(self._counter), request))
+            else:
+                heapq.heappush(self._ready, (request.priority,
+                                             next(self._counter), request))
+            return True
+
+    def pop_ready(self) -> typing.Optional[ConcentRequest]:
+        with self._lock:
+            now = time.time()
+            while self._waiting and self._waiting[0][0] <= now:
+                _, _, request = heapq.heappop(self._waiting)
+                heapq.heappush(self._ready, (request.priority,
+                                             next(self._counter), request))
+
+            while self._ready:
+                _, _, request = heapq.heappop(self._ready)
+                if request.superseded or request.cancelled:
+                    continue
+                del self._queued[request.key]
+                return request
+            return None
+
+    def remove(self, key: typing.Hashable) -> bool:
+        """
+        Removes the queued request with the given key.
+
+        :return: whether a request has been removed
+        """
+        with self._lock:
+            request = self._queued.pop(key, None)
+            if request is None:
+                return False
+            request.cancelled = True
+            return True
+
+
 class ConcentClientService(threading.Thread):
+    """
+    Sends queued messages to the Concent, keeping up to MAX_IN_FLIGHT
+    requests in flight, so that a slow response does not hold back the
+    other messages. Failed requests are retried with a jittered exponential
+    backoff. Responses are handled in the service thread.
+    """
 
     MIN_GRACE_TIME = 5  # s
     MAX_GRACE_TIME = 5 * 60  # s
     GRACE_FACTOR = 2  # n times on each failure
 
+    MAX_IN_FLIGHT = 4
+    MAX_RETRIES = 5
+    # Requests failing with these errors will not succeed when retried
+    PERMANENT_ERRORS = (
+        exceptions.ConcentRequestError,
+        exceptions.ConcentVersionMismatchError,
+    )
+
     def __init__(self, keys_auth: keysauth.KeysAuth, variant: dict) -> None:
         super().__init__(daemon=True)
 
@@ -189,8 +315,19 @@ class ConcentClientService(threading.Thread):
         self.variant: dict = variant
         self._stop_event = threading.Event()
 
-        self._queue: queue.Queue = queue.Queue()
+        self._queue = ConcentRequestQueue()
         self._grace_time: int = self.MIN_GRACE_TIME
+        self._receive_after = 0.0
+
+        self._wakeup = threading.Event()
+        self._in_flight = 0
+        self._completed: queue.Queue = queue.Queue()
+        # Requests taken from the queue and not yet completed. Guarded by
+        # _lock, which also makes cancelling atomic with retrying.
+        self._sending: typing.Set[ConcentRequest] = set()
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.MAX_IN_FLIGHT)
 
         self._delayed: dict = dict()
         self.received_messages: queue.Queue = queue.Queue(maxsize=100)
@@ -217,13 +354,18 @@ class ConcentClientService(threading.Thread):
         last_receive = 0.0
         while not self._stop_event.isSet():
             self._loop()
-            if time.time() - last_receive > variables.CONCENT_PULL_INTERVAL:
+            if time.time() - last_receive > variables.CONCENT_PULL_INTERVAL \
+                    and time.time() >= self._receive_after:
                 last_receive = time.time()
                 self.receive()
-            time.sleep(1)
+            # Woken up early by submitted messages and finished requests
+            self._wakeup.wait(1)
+            self._wakeup.clear()
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wakeup.set()
+        self._executor.shutdown(wait=False)
         logger.info('Waiting for received messages queue to empty')
         self.received_messages.join()
         logger.info('%s stopped', self)
@@ -297,47 +439,123 @@ class ConcentClientService(threading.Thread):
 
     def cancel(self, key: typing.Hashable) -> bool:
         """
-        Cancel a delayed Concent request.
+        Cancel a Concent request, either delayed or waiting in the queue
+        (e.g. for a retry). Requests in flight are not retried.
 
         :param key: Request identifier
-        :return: True if a request has been successfuly cancelled;
-                 False otherwise
+        :return: True if a delayed or queued request has been successfuly
+                 cancelled; False otherwise
         """
+        cancelled = False
         call = self._delayed.pop(key, None)
         if call:
             call.cancel()
-            return True
-        return False
+            cancelled = True
+
+        with self._lock:
+            if self._queue.remove(key):
+                cancelled = True
+            for request in self._sending:
+                if request.key == key:
+                    request.cancelled = True
+        return cancelled
 
     def _loop(self) -> None:
         """
-        Main service loop. Requests from the queue are sent one by one (FIFO).
-        In case of failure, service enters a grace period.
+        Main service loop. Handles finished requests and sends the queued
+        ones, most urgent first, while fewer than MAX_IN_FLIGHT requests
+        are in flight.
         """
-        try:
-            msg = self._queue.get_nowait()
-        except queue.Empty:
-            return
+        self._process_completed()
+
+        while self._in_flight < self.MAX_IN_FLIGHT:
+            with self._lock:
+                request = self._queue.pop_ready()
+                if request is not None:
+                    self._sending.add(request)
+            if request is None:
+                return
+
+            if not self.available:
+                logger.debug('Concent disabled. Dropping %r', request.msg)
+                self._discard(request)
+                continue
 
-        if not self.available:
-            logger.debug('Concent disabled. Dropping %r', msg)
-            return
+            self._in_flight += 1
+            try:
+                self._executor.submit(self._send, request)
+            except RuntimeError:  # executor shut down
+                self._in_flight -= 1
+                self._discard(request)
+                return
+
+    def _discard(self, request: ConcentRequest) -> None:
+        with self._lock:
+            self._sending.discard(request)
 
+    def _send(self, request: ConcentRequest) -> None:
+        """ Runs in the executor's threads """
         try:
             res = send_to_concent(
-                msg,
+                request.msg,
                 self.keys_auth._private_key,  # pylint: disable=protected-access
                 concent_variant=self.variant,
             )
-        except exceptions.ConcentError as e:
-            logger.info('send_to_concent error: %s', e)
-            self._grace_sleep()
-        except Exception:  # pylint: disable=broad-except
-            logger.exception('send_to_concent(%r) failed', msg)
-            self._grace_sleep()
+        except Exception as e:  # pylint: disable=broad-except
+            self._completed.put((request, None, e))
+        else:
+            self._completed.put((request, res, None))
+        self._wakeup.set()
+
+    def _process_completed(self) -> None:
+        while True:
+            try:
+                request, res, error = self._completed.get_nowait()
+            except queue.Empty:
+                return
+
+            self._in_flight -= 1
+            if error is None:
+                self._discard(request)
+                logger.debug('Concent request %r sent after %.3fs',
+                             request.key, time.time() - request.enqueued)
+                self.react_to_concent_message(res, response_to=request.msg)
+            else:
+                self._retry(request, error)
+
+    def _retry(self, request: ConcentRequest, error: Exception) -> None:
+        if isinstance(error, exceptions.ConcentError):
+            logger.info('send_to_concent error: %s', error)
         else:
-            self._grace_time = self.MIN_GRACE_TIME
-            self.react_to_concent_message(res, response_to=msg)
+            logger.error('send_to_concent(%r) failed', request.msg,
+                         exc_info=error)
+
+        if isinstance(error, self.PERMANENT_ERRORS) \
+                or request.attempts >= self.MAX_RETRIES:
+            logger.warning('Dropping Concent request %r after %d attempt(s)',
+                           request.key, request.attempts + 1)
+            self._discard(request)
+            return
+
+        backoff = min(self.MIN_GRACE_TIME * self.GRACE_FACTOR **
+                      request.attempts, self.MAX_GRACE_TIME)
+        delay = random.uniform(backoff / 2, backoff)
+
+        with self._lock:
+            self._sending.discard(request)
+            if request.cancelled:
+                logger.debug('Concent request %r cancelled, not retrying',
+                             request.key)
+                return
+            logger.debug('Retrying Concent request %r in %.1fs',
+                         request.key, delay)
+            # A newer message submitted in the meantime takes precedence
+            self._queue.put(ConcentRequest(
+                request.key, request.msg, request.priority,
+                attempts=request.attempts + 1,
+                not_before=time.time() + delay,
+                enqueued=request.enqueued,
+            ), replace=False)
 
     def receive(self) -> None:
         if not self.available:
@@ -351,12 +569,13 @@ class ConcentClientService(threading.Thread):
             )
         except exceptions.ConcentError as e:
             logger.warning("Can't receive message from Concent: %s", e)
-            self._grace_sleep()
+            self._postpone_receive()
             return
         except Exception:  # pylint: disable=broad-except
             logger.exception('receive_from_concent() failed')
-            self._grace_sleep()
+            self._postpone_receive()
             return
+        self._grace_time = self.MIN_GRACE_TIME
         self.react_to_concent_message(res)
 
     @staticmethod
@@ -389,17 +608,21 @@ class ConcentClientService(threading.Thread):
         else:
             self.process_synchronous_response(msg, response_to)
 
-    def _grace_sleep(self):
+    def _postpone_receive(self):
+        """ Postpones the next receive, without holding back the sending """
         self._grace_time = min(self._grace_time * self.GRACE_FACTOR,
                                self.MAX_GRACE_TIME)
 
         logger.debug('Concent grace time: %r', self._grace_time)
-        time.sleep(self._grace_time)
+        self._receive_after = time.time() + self._grace_time
 
     def _enqueue(self, key, msg):
         logger.debug("_enqueue(%r, %r)", key, msg)
         self._delayed.pop(key, None)
-        self._queue.put(msg)
+        priority = MSG_PRIORITIES.get(msg.__class__.__name__,
+                                      DEFAULT_MSG_PRIORITY)
+        self._queue.put(ConcentRequest(key, msg, priority))
+        self._wakeup.set()
 
     def income_listener(self, event, **kwargs):
         logger.debug("income listener event: %s", event)
@@ -1,5 +1,9 @@
 import base64
+import concurrent.futures
+import hashlib
 import logging
+import os
+import threading
 import typing
 import queue
 
@@ -17,6 +21,15 @@ from .helpers import ssl_kwargs
 
 logger = logging.getLogger(__name__)
 
+# Number of transfers processed concurrently
+DEFAULT_WORKERS = 4
+# Size of the blocks read from disk and from the network (bytes)
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Number of times a broken connection is resumed before a transfer fails
+MAX_TRANSFER_RETRIES = 3
+# Suffix of files holding data of unfinished downloads
+PARTIAL_SUFFIX = '.part'
+
 
 class ConcentFileRequest:
     def __init__(self,  # noqa pylint:disable=too-many-arguments
@@ -46,19 +59,108 @@ class ConcentFiletransferError(Exception):
     pass
 
 
+class IncompleteTransferError(ConcentFiletransferError):
+    pass
+
+
+TRANSFER_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+    IncompleteTransferError,
+)
+
+
+def new_hash(checksum: typing.Optional[str]):
+    """ Returns an empty hash object of the algorithm used in an
+    'algorithm:hexdigest' checksum """
+    algorithm = 'sha1'
+    if checksum and ':' in checksum:
+        algorithm = checksum.split(':', 1)[0]
+    return hashlib.new(algorithm)
+
+
+def verify_file(file_info: FileTransferToken.FileInfo, size: int,
+                file_hash) -> None:
+    """ Compares the size and the hash of transferred data with the ones
+    declared in the File Transfer Token """
+    expected_size = file_info.get('size')
+    if expected_size is not None and expected_size != size:
+        raise ConcentFiletransferError(
+            'Size mismatch: expected {}, got {}'.format(expected_size, size))
+
+    checksum = file_info.get('checksum')
+    if checksum:
+        actual = '{}:{}'.format(file_hash.name, file_hash.hexdigest())
+        if actual != checksum:
+            raise ConcentFiletransferError(
+                'Checksum mismatch: expected {}, got {}'.format(
+                    checksum, actual))
+
+
+class HashingReader:
+    """ Streams a range of an open file as a request body in chunk_size
+    blocks, feeding the read data into a hash object """
+
+    def __init__(self,  # noqa pylint:disable=too-many-arguments
+                 file, file_hash, chunk_size: int,
+                 offset: int = 0, length: typing.Optional[int] = None) \
+            -> None:
+        if length is None:
+            length = os.fstat(file.fileno()).st_size - offset
+        file.seek(offset)
+        self.file = file
+        self.file_hash = file_hash
+        self.chunk_size = chunk_size
+        self.remaining = length
+
+    def __len__(self):
+        # Lets requests send a Content-Length header
+        return self.remaining
+
+    def read(self, size: int = -1) -> bytes:
+        # http.client asks for small blocks; reading more is allowed and
+        # saves syscalls on large files
+        size = self.remaining if size is None or size < 0 \
+            else min(max(size, self.chunk_size), self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        self.file_hash.update(data)
+        return data
+
+
 class ConcentFiletransferService(LoopingCallService):
     """
     Golem service responsible for exchanging files with the Concent service.
+
+    Up to `workers` transfers run concurrently, each in its own thread with
+    a reused HTTP session. Data is streamed in `chunk_size` blocks and hashed
+    on the fly; downloads are verified against the File Transfer Token and
+    resumed with Range requests after a broken connection or a restart.
+    Uploads are sent in one request or, when `part_size` is set, as ranged
+    parts which are retried separately.
     """
 
-    def __init__(self,
+    def __init__(self,  # noqa pylint:disable=too-many-arguments
                  keys_auth: keysauth.KeysAuth,
                  variant: dict,
-                 interval_seconds: int = 1,) -> None:
+                 interval_seconds: int = 1,
+                 workers: int = DEFAULT_WORKERS,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 part_size: typing.Optional[int] = None,
+                 max_retries: int = MAX_TRANSFER_RETRIES) -> None:
         # SEE golem.core.variables.CONCENT_CHOICES
         self.variant = variant
         self.keys_auth = keys_auth
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.part_size = part_size
+        self.max_retries = max_retries
         self._transfers: queue.Queue = queue.Queue()
+        self._executor: typing.Optional[
+            concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
         super().__init__(interval_seconds=interval_seconds)
 
     def start(self, now: bool = True):
@@ -67,6 +169,10 @@ class ConcentFiletransferService(LoopingCallService):
 
     def stop(self):
         self._transfers.join()
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
         super().stop()
         logger.debug("Concent Filetransfer Service stopped")
 
@@ -78,9 +184,6 @@ class ConcentFiletransferService(LoopingCallService):
                  file_category: typing.Optional[
                      FileTransferToken.FileInfo.Category] = None) -> None:  # noqa pylint:disable=bad-whitespace
 
-        if not self.running:
-            logger.warning("Request scheduled when service is not started")
-
         request = ConcentFileRequest(
             file_path, file_transfer_token,
             success=success, error=error, file_category=file_category)
@@ -88,33 +191,99 @@ class ConcentFiletransferService(LoopingCallService):
         logger.debug("Scheduling: %r", request)
         self._transfers.put(request)
 
+        if self.running:
+            self._dispatch()
+        else:
+            logger.warning("Request scheduled when service is not started")
+
     def _run(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        """ Hands all scheduled requests over to the worker threads """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='ConcentFiletransfer')
+            while True:
+                try:
+                    request = self._transfers.get_nowait()
+                except queue.Empty:
+                    return
+                self._executor.submit(self._process_scheduled, request)
+
+    def _process_scheduled(self, request: ConcentFileRequest):
+        """ Transfers the file in a worker thread and hands the outcome over
+        to the reactor thread, where the callbacks of the request are called
+        """
+        from twisted.internet import reactor
         try:
-            request = self._transfers.get_nowait()
-        except queue.Empty:
-            return
-        self.process(request)
-        self._transfers.task_done()
+            try:
+                response = self._transfer(request)
+            except Exception as e:  # noqa pylint:disable=broad-except
+                reactor.callFromThread(self._complete, request, error=e)
+            else:
+                reactor.callFromThread(self._complete, request,
+                                       response=response)
+        finally:
+            self._transfers.task_done()
+
+    def _complete(self, request: ConcentFileRequest, response=None,
+                  error: typing.Optional[Exception] = None):
+        try:
+            self._finish(request, response=response, error=error)
+        except Exception:  # noqa pylint:disable=broad-except
+            logger.exception("Concent file transfer failed: %r", request)
 
     def process(self, request: ConcentFileRequest):
-        logger.debug("Processing: %r", request)
         try:
-            if request.file_transfer_token.is_upload:
-                response = self.upload(request)
-            else:
-                response = self.download(request)
-            if not response.ok:
-                raise ConcentFiletransferError(
-                    '{}: {}'.format(response.status_code, response.text))
+            response = self._transfer(request)
         except Exception as e:  # noqa pylint:disable=broad-except
+            return self._finish(request, error=e)
+        return self._finish(request, response=response)
+
+    @staticmethod
+    def _finish(request: ConcentFileRequest, response=None,
+                error: typing.Optional[Exception] = None):
+        if error is not None:
             if request.error:
-                request.error(e)
+                request.error(error)
                 return None
-            else:
-                raise e
-
+            raise error
         return request.success(response) if request.success else response
 
+    def _transfer(self, request: ConcentFileRequest):
+        logger.debug("Processing: %r", request)
+        if request.file_transfer_token.is_upload:
+            response = self.upload(request)
+        else:
+            response = self.download(request)
+        if not response.ok:
+            raise ConcentFiletransferError(
+                '{}: {}'.format(response.status_code, response.text))
+        return response
+
+    @property
+    def _session(self) -> requests.Session:
+        """ HTTP session of the current worker thread """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _retrying(self, send: typing.Callable, description: str):
+        attempt = 0
+        while True:
+            try:
+                return send()
+            except TRANSFER_ERRORS as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                logger.debug("Retrying %s (%d/%d): %r", description,
+                             attempt, self.max_retries, e)
+
     @staticmethod
     def _get_upload_uri(file_transfer_token: FileTransferToken):
         return '{}upload/'.format(
@@ -152,28 +321,120 @@ class ConcentFiletransferService(LoopingCallService):
     def upload(self, request: ConcentFileRequest):
         uri = self._get_upload_uri(request.file_transfer_token)
         ftt = request.file_transfer_token
+        file_info = ftt.get_file_info(request.file_category)
         headers = self._get_auth_headers(ftt)
-        path = ftt.get_file_info(request.file_category).get('path')
         headers.update({
-            'Concent-Upload-Path': path,
+            'Concent-Upload-Path': file_info.get('path'),
             'Content-Type': 'application/octet-stream',
         })
 
         logger.debug("Uploading file '%s' to '%s' using %s",
                      request.file_path, uri, headers)
 
+        file_hash = new_hash(file_info.get('checksum'))
         with open(request.file_path, mode='rb') as f:
-            response = requests.post(
-                uri, data=f, headers=headers, **ssl_kwargs(self.variant))
+            size = os.fstat(f.fileno()).st_size
+            part_size = self.part_size or size
+            offset = 0
+
+            while True:
+                length = min(part_size, size - offset)
+                part_headers = headers
+                if length < size:
+                    part_headers = dict(headers, **{
+                        'Content-Range': 'bytes {}-{}/{}'.format(
+                            offset, offset + length - 1, size),
+                    })
+
+                def send(offset=offset, length=length,
+                         part_headers=part_headers):
+                    # Parts which failed midway are hashed again
+                    part_hash = file_hash.copy()
+                    response = self._session.post(
+                        uri,
+                        data=HashingReader(f, part_hash, self.chunk_size,
+                                           offset, length),
+                        headers=part_headers,
+                        **ssl_kwargs(self.variant))
+                    return response, part_hash
+
+                response, file_hash = self._retrying(
+                    send, 'upload of {!r}'.format(request.file_path))
+                offset += length
+                if not response.ok or offset >= size:
+                    break
+
+        if response.ok:
+            verify_file(file_info, offset, file_hash)
         return response
 
     def download(self, request: ConcentFileRequest):
         uri = self._get_download_uri(request.file_transfer_token,
                                      request.file_category)
+        file_info = request.file_transfer_token.get_file_info(
+            request.file_category)
         headers = self._get_auth_headers(request.file_transfer_token)
-        response = requests.get(
-            uri, stream=True, headers=headers, **ssl_kwargs(self.variant))
-        with open(request.file_path, mode='wb') as f:
-            for chunk in response.iter_content(chunk_size=None):
-                f.write(chunk)
+        partial_path = request.file_path + PARTIAL_SUFFIX
+
+        # Resume a download interrupted before the previous shutdown
+        file_hash = new_hash(file_info.get('checksum'))
+        offset = 0
+        if os.path.exists(partial_path):
+            with open(partial_path, mode='rb') as f:
+                offset = self._hash_file(f, file_hash)
+
+        def send():
+            nonlocal file_hash, offset
+            range_headers = headers
+            if offset:
+                range_headers = dict(headers, Range='bytes={}-'.format(offset))
+            response = self._session.get(
+                uri, stream=True, headers=range_headers,
+                **ssl_kwargs(self.variant))
+
+            with response:
+                if response.status_code == 416 and offset:
+                    # The previous attempt received the whole file
+                    response.status_code = 200
+                    return response
+                if not response.ok:
+                    return response
+                if offset and response.status_code != 206:
+                    # The server ignored the range
+                    file_hash = new_hash(file_info.get('checksum'))
+                    offset = 0
+
+                start = offset
+                with open(partial_path, mode='ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(
+                            chunk_size=self.chunk_size):
+                        f.write(chunk)
+                        file_hash.update(chunk)
+                        offset += len(chunk)
+
+            length = response.headers.get('Content-Length')
+            if length is not None and offset - start < int(length):
+                # The connection was closed before the whole body was sent
+                raise IncompleteTransferError('Received {} of {} bytes'.format(
+                    offset - start, length))
+            return response
+
+        response = self._retrying(
+            send, 'download of {!r}'.format(request.file_path))
+        if not response.ok:
+            return response
+
+        try:
+            verify_file(file_info, offset, file_hash)
+        except ConcentFiletransferError:
+            os.remove(partial_path)
+            raise
+        os.replace(partial_path, request.file_path)
         return response
+
+    def _hash_file(self, file, file_hash) -> int:
+        size = 0
+        for chunk in iter(lambda: file.read(self.chunk_size), b''):
+            file_hash.update(chunk)
+            size += len(chunk)
+        return size
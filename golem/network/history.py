@@ -1,11 +1,10 @@
 import datetime
 import logging
 import operator
-import pickle
 import queue
 import threading
 from functools import reduce, wraps
-from typing import List
+from typing import List, Sequence, Tuple
 from typing import Optional
 
 from golem_messages import message
@@ -13,7 +12,7 @@ from peewee import (PeeweeException, DataError, ProgrammingError,
                     NotSupportedError, Field, IntegrityError)
 
 from golem.core.service import IService
-from golem.model import NetworkMessage, Actor
+from golem.model import NetworkMessage, Actor, MessageCodec, encode_message
 
 logger = logging.getLogger('golem.network.history')
 
@@ -119,7 +118,54 @@ class MessageHistoryService(IService):
         if not db_result:
             raise MessageNotFound()
         db_msg = db_result[0]
-        return db_msg.as_message()
+        msg = db_msg.as_message()
+        if db_msg.msg_codec is MessageCodec.pickle:
+            cls.convert_sync(db_msg, msg)
+        return msg
+
+    @classmethod
+    def get_columns_sync(cls, columns: Sequence[str],
+                         **properties) -> List[Tuple]:
+        """
+        Returns chosen columns of messages synchronously. Message payloads
+        are neither loaded nor decoded unless requested.
+        :param columns: NetworkMessage property names, e.g. msg_cls, msg_date
+        :param properties: Optional NetworkMessage properties
+        :return: Collection of tuples of column values
+        """
+        fields = []
+        for name in columns:
+            field = getattr(NetworkMessage, name, None)
+            if not isinstance(field, Field):
+                raise ValueError("Invalid column: {}".format(name))
+            fields.append(field)
+
+        query = NetworkMessage.select(*fields)
+        clauses = cls.build_clauses(**properties)
+        if clauses:
+            query = query.where(reduce(operator.and_, clauses))
+
+        return list(query.order_by(+NetworkMessage.msg_date).tuples())
+
+    @staticmethod
+    def convert_sync(db_msg: NetworkMessage,
+                     msg: message.base.Message) -> None:
+        """
+        Re-encodes a message stored in a legacy format. Failures are not
+        critical, the message will be converted on the next read.
+        :param db_msg: Stored message
+        :param msg: The decoded message
+        """
+        try:
+            codec, data = encode_message(msg)
+            NetworkMessage.update(msg_codec=codec, msg_data=data) \
+                .where(NetworkMessage.id == db_msg.id) \
+                .execute()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug("Cannot convert stored message %r: %r",
+                         db_msg.msg_cls, exc)
+            return
+        db_msg.msg_codec, db_msg.msg_data = codec, data
 
     def add(self, msg_dict: dict) -> None:
         """
@@ -250,7 +296,9 @@ class MessageHistoryService(IService):
 def message_to_model(msg: message.base.Message,
                      node_id,
                      local_role: Actor,
-                     remote_role: Actor) -> dict:
+                     remote_role: Actor,
+                     codec: MessageCodec = MessageCodec.golem_messages_zlib) \
+        -> dict:
     """Converts a message to its database model dictionary representation.
 
     MessageHistoryService operates in a separate thread, whereas peewee
@@ -263,15 +311,18 @@ def message_to_model(msg: message.base.Message,
 
     :param local_role: Local node's role in computation
     :param remote_role: Remote node's role in computation
+    :param codec: Preferred encoding of the message
     :return: Dict representation of NetworkMessage
     """
+    msg_codec, msg_data = encode_message(msg, codec)
     return {
         'task': getattr(msg, 'task_id', None),
         'subtask': getattr(msg, 'subtask_id', None),
         'node': node_id,
         'msg_date': datetime.datetime.now(),
         'msg_cls': msg.__class__.__name__,
-        'msg_data': pickle.dumps(msg),
+        'msg_data': msg_data,
+        'msg_codec': msg_codec,
         'local_role': local_role,
         'remote_role': remote_role,
     }
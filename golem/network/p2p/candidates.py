@@ -0,0 +1,97 @@
+import collections
+from typing import (
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from golem.network.transport.tcpnetwork import SocketAddress
+
+# Maximum number of peers whose candidates and history are kept
+MAX_PEERS = 10000
+# Score bounds, so that old history can be outweighed by new events
+MAX_SCORE = 10
+MIN_SCORE = -10
+
+Address = Tuple[str, int]
+
+
+class _PeerCandidates:  # pylint: disable=too-few-public-methods
+    __slots__ = ('signature', 'addresses', 'scores')
+
+    def __init__(self) -> None:
+        self.signature: Optional[Hashable] = None
+        self.addresses: List[SocketAddress] = []
+        self.scores: Dict[Address, int] = {}
+
+
+class CandidateCache:
+    """ Keeps the connection candidates of peers, ranked by the history of
+    connections to them.
+
+    Candidates are stored together with a signature of the data they were
+    built from and are only returned for the same signature. Each successful
+    connection raises the score of the address it was made to, each failed
+    attempt lowers the score of the address tried first. Addresses are
+    ordered by score; addresses of equal score keep their relative order.
+    """
+
+    def __init__(self, max_peers: int = MAX_PEERS) -> None:
+        self.max_peers = max_peers
+        self._peers: 'collections.OrderedDict[str, _PeerCandidates]' = \
+            collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._peers)
+
+    def get(self, key, signature: Hashable) -> Optional[List[SocketAddress]]:
+        peer = self._peers.get(key)
+        if peer is None or peer.signature != signature:
+            return None
+        self._peers.move_to_end(key)
+        return list(peer.addresses)
+
+    def put(self, key, signature: Hashable,
+            addresses: List[SocketAddress]) -> List[SocketAddress]:
+        """ Stores candidates of the peer, returns them ranked """
+        peer = self._entry(key)
+        peer.signature = signature
+        peer.addresses = self._rank(peer, addresses)
+        return list(peer.addresses)
+
+    def record_success(self, key, address: str, port: int) -> None:
+        peer = self._entry(key)
+        score = peer.scores.get((address, port), 0)
+        peer.scores[(address, port)] = min(score + 1, MAX_SCORE)
+        peer.addresses = self._rank(peer, peer.addresses)
+
+    def record_failure(self, key) -> None:
+        peer = self._peers.get(key)
+        if peer is None or not peer.addresses:
+            return
+        first = peer.addresses[0]
+        address = (first.address, first.port)
+        score = peer.scores.get(address, 0)
+        peer.scores[address] = max(score - 1, MIN_SCORE)
+        peer.addresses = self._rank(peer, peer.addresses)
+
+    def _entry(self, key) -> _PeerCandidates:
+        peer = self._peers.get(key)
+        if peer is None:
+            peer = self._peers[key] = _PeerCandidates()
+            while len(self._peers) > self.max_peers:
+                self._peers.popitem(last=False)
+        else:
+            self._peers.move_to_end(key)
+        return peer
+
+    @staticmethod
+    def _rank(peer: _PeerCandidates,
+              addresses: List[SocketAddress]) -> List[SocketAddress]:
+        scores = peer.scores
+        if not scores:
+            return list(addresses)
+        return sorted(addresses,
+                      key=lambda a: -scores.get((a.address, a.port), 0))
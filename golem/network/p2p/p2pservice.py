@@ -1,7 +1,6 @@
 import ipaddress
 import itertools
 import logging
-import socket
 import random
 import time
 from collections import deque
@@ -11,6 +10,7 @@ from typing import (
     Callable,
     Dict,
     List,
+    Optional,
 )
 
 from golem_messages import message
@@ -28,7 +28,9 @@ from golem.network.transport import tcpnetwork
 from golem.network.transport import tcpserver
 from golem.network.transport.network import ProtocolFactory, SessionFactory
 from golem.ranking.manager.gossip_manager import GossipManager
+from .candidates import CandidateCache
 from .peerkeeper import PeerKeeper, key_distance
+from .resolver import ResolverCache
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +120,11 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
 
         self._peer_lock = Lock()
 
+        # Seed host name resolutions, done outside of the reactor thread
+        self.resolver = ResolverCache(listener=self._seed_resolved)
+        # Connection candidates of peers, ranked by connection history
+        self.candidates = CandidateCache()
+
         try:
             self.__remove_redundant_hosts_from_db()
             self._sync_seeds()
@@ -190,7 +197,7 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         connect_info = tcpnetwork.TCPConnectInfo(
             [socket_address],
             self.__connection_established,
-            P2PService.__connection_failure
+            self.__connection_failure
         )
         self.network.connect(connect_info)
 
@@ -581,25 +588,40 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         prv_port = prv_port or node_info.p2p_prv_port
         pub_port = pub_port or node_info.p2p_pub_port
 
+        address = self.suggested_address.get(node_info.key, None)
+        prv_addresses = node_info.prv_addresses
+        signature = (
+            node_info.pub_addr,
+            node_info.prv_addr,
+            tuple(prv_addresses) if isinstance(prv_addresses, list) else None,
+            prv_port,
+            pub_port,
+            address,
+        )
+        cached = self.candidates.get(node_info.key, signature)
+        if cached is not None:
+            return cached
+
         socket_addresses = super().get_socket_addresses(
             node_info=node_info,
             prv_port=prv_port,
             pub_port=pub_port
         )
 
-        address = self.suggested_address.get(node_info.key, None)
-        if not address:
-            return socket_addresses
-
-        if self._is_address_valid(address, prv_port):
-            socket_address = tcpnetwork.SocketAddress(address, prv_port)
-            self._prepend_address(socket_addresses, socket_address)
+        if address:
+            if self._is_address_valid(address, prv_port):
+                socket_address = tcpnetwork.SocketAddress(address, prv_port)
+                self._prepend_address(socket_addresses, socket_address)
 
-        if self._is_address_valid(address, pub_port):
-            socket_address = tcpnetwork.SocketAddress(address, pub_port)
-            self._prepend_address(socket_addresses, socket_address)
+            if self._is_address_valid(address, pub_port):
+                socket_address = tcpnetwork.SocketAddress(address, pub_port)
+                self._prepend_address(socket_addresses, socket_address)
 
-        return socket_addresses[:MAX_CONNECT_SOCKET_ADDRESSES]
+        return self.candidates.put(
+            node_info.key,
+            signature,
+            socket_addresses[:MAX_CONNECT_SOCKET_ADDRESSES],
+        )
 
     def add_metadata_provider(self, name: str, provider: Callable[[], Any]):
         self.metadata_providers[name] = provider
@@ -864,12 +886,12 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
 
     def _set_conn_failure(self):
         self.conn_failure_for_type.update({
-            P2PConnTypes.Start: P2PService.__connection_failure
+            P2PConnTypes.Start: self.__connection_failure
         })
 
     def _set_conn_final_failure(self):
         self.conn_final_failure_for_type.update({
-            P2PConnTypes.Start: P2PService.__connection_final_failure
+            P2PConnTypes.Start: self.__connection_final_failure
         })
 
     # In the future it may be changed to something more flexible
@@ -896,24 +918,32 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         for p in list(self.peers.values()):
             p.send_get_tasks()
 
-    def __connection_established(self, session, conn_id: str):
+    def __connection_established(self, session, conn_id: str,
+                                 node_key: Optional[str] = None):
         peer_conn = session.conn.transport.getPeer()
         ip_address = peer_conn.host
         port = peer_conn.port
 
         session.conn_id = conn_id
         self._mark_connected(conn_id, session.address, session.port)
+        if node_key:
+            self.candidates.record_success(node_key, session.address,
+                                           session.port)
 
         logger.debug("Connection to peer established. %s: %s, conn_id %s",
                      ip_address, port, conn_id)
 
-    @staticmethod
-    def __connection_failure(conn_id: str):
+    def __connection_failure(self, conn_id: str,
+                             node_key: Optional[str] = None):
         logger.debug("Connection to peer failure %s.", conn_id)
+        if node_key:
+            self.candidates.record_failure(node_key)
 
     @staticmethod
-    def __connection_final_failure(conn_id: str):
-        logger.debug("Can't connect to peer %s.", conn_id)
+    def __connection_final_failure(conn_id: str,
+                                   node_key: Optional[str] = None):
+        logger.debug("Can't connect to peer %s. node_key=%r",
+                     conn_id, node_key)
 
     def __is_new_peer(self, id_):
         return id_ not in self.incoming_peers\
@@ -957,7 +987,7 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                     node,
                     prv_port=node.p2p_prv_port,
                     pub_port=node.p2p_pub_port,
-                    args={}
+                    args={'node_key': node.key}
                 )
 
     def __sync_peer_keeper(self):
@@ -981,24 +1011,17 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                     host,
                     port,
                 )
-                return
+                return []
             if not (host and port):
                 logger.debug(
                     "Ignoring incomplete seed. host=%r port=%r",
                     host,
                     port,
                 )
-                return
-            try:
-                for addrinfo in socket.getaddrinfo(host, port):
-                    yield addrinfo[4]  # (ip, port)
-            except OSError as e:
-                logger.error(
-                    "Can't resolve %s:%s. %s",
-                    host,
-                    port,
-                    e,
-                )
+                return []
+            # Cached addresses, host names missing from the cache are
+            # resolved in the background and added by _seed_resolved
+            return self.resolver.get(host, port)
 
         self.seeds = set()
 
@@ -1016,6 +1039,15 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                 )):
             self.seeds.update(_resolve_hostname(*hostport))
 
+    def _seed_resolved(self, _host, _port, addresses):
+        had_seeds = bool(self.seeds)
+        self.seeds.update(addresses)
+        # Host names of a fresh node are not resolved yet when it tries to
+        # connect to the seeds for the first time
+        if not had_seeds and self.seeds and not self.peers \
+                and self.last_time_tried_connect_with_seed:
+            self.connect_to_seeds()
+
     def _get_next_random_seed(self):
         # this loop won't execute more than twice
         while True:
@@ -0,0 +1,178 @@
+import collections
+import ipaddress
+import logging
+import socket
+import time
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from twisted.internet import threads
+from twisted.internet.defer import Deferred
+
+logger = logging.getLogger(__name__)
+
+# How long resolved addresses are kept (seconds)
+RESOLVE_TTL = 10 * 60
+# How long a failed resolution is remembered (seconds)
+NEGATIVE_TTL = 60
+# Maximum number of host names kept in the cache
+MAX_ENTRIES = 1024
+
+Address = Tuple[str, int]
+HostPort = Tuple[str, int]
+
+
+def getaddrinfo_resolve(host: str, port: int) -> List[Address]:
+    """ Blocking resolution of a host name with socket.getaddrinfo """
+    addresses: List[Address] = []
+    for addrinfo in socket.getaddrinfo(host, port):
+        address = addrinfo[4][:2]  # (ip, port)
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+class CacheEntry(NamedTuple):
+    addresses: Tuple[Address, ...]
+    expires: float
+
+
+class ResolverCache:
+    """ Bounded cache of host name resolutions.
+
+    get() never blocks: it returns the cached addresses, possibly stale, and
+    starts an asynchronous lookup when the entry is missing or has expired.
+    Failed lookups are cached for negative_ttl seconds so that unresolvable
+    hosts are not queried over and over. IP literals are returned as they
+    are. Once a lookup completes, `listener` is called with the host, the
+    port and the resolved addresses.
+    """
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 resolve: Callable[[str, int], List[Address]]
+                 = getaddrinfo_resolve,
+                 ttl: float = RESOLVE_TTL,
+                 negative_ttl: float = NEGATIVE_TTL,
+                 max_entries: int = MAX_ENTRIES,
+                 listener: Optional[Callable[[str, int, List[Address]], None]]
+                 = None,
+                 run_async: Callable[..., Deferred] = threads.deferToThread,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.resolve_fn = resolve
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.listener = listener
+        self.run_async = run_async
+        self.clock = clock
+
+        self._entries: 'collections.OrderedDict[HostPort, CacheEntry]' = \
+            collections.OrderedDict()
+        self._pending: Dict[HostPort, Deferred] = {}
+        self.stats = dict(hits=0, misses=0, lookups=0, failures=0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, host: str, port: int) -> List[Address]:
+        literal = self._literal(host, port)
+        if literal is not None:
+            return literal
+
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= self.clock():
+            self.stats['misses'] += 1
+            self._lookup(key)
+            # The lookup may have completed synchronously
+            entry = self._entries.get(key)
+            if entry is None:
+                return []
+        else:
+            self.stats['hits'] += 1
+        self._entries.move_to_end(key)
+        return list(entry.addresses)
+
+    def resolve(self, host: str, port: int) -> Deferred:
+        """ Returns a deferred firing with fresh addresses of the host """
+        literal = self._literal(host, port)
+        if literal is not None:
+            deferred = Deferred()
+            deferred.callback(literal)
+            return deferred
+
+        key = (host, port)
+        deferred = Deferred()
+        lookup = self._lookup(key)
+        lookup.addCallback(lambda _: list(self._entries[key].addresses)
+                           if key in self._entries else [])
+        lookup.chainDeferred(deferred)
+        return deferred
+
+    def invalidate(self, host: str, port: int) -> None:
+        self._entries.pop((host, port), None)
+
+    def _lookup(self, key: HostPort) -> Deferred:
+        pending = self._pending.get(key)
+        if pending is not None:
+            return self._follow(pending)
+
+        self.stats['lookups'] += 1
+        deferred = self.run_async(self.resolve_fn, *key)
+        deferred.addCallbacks(self._resolved, self._failed,
+                              callbackArgs=(key, ), errbackArgs=(key, ))
+        if not deferred.called:
+            self._pending[key] = deferred
+        return self._follow(deferred)
+
+    @staticmethod
+    def _follow(deferred: Deferred) -> Deferred:
+        """ Returns a deferred fired after the given one, without taking its
+        result """
+        follower = Deferred()
+
+        def _fire(result):
+            follower.callback(None)
+            return result
+
+        deferred.addBoth(_fire)
+        return follower
+
+    def _resolved(self, addresses: List[Address], key: HostPort) -> None:
+        self._pending.pop(key, None)
+        if not addresses:
+            logger.info("No addresses found for %s:%s", *key)
+            self.stats['failures'] += 1
+            self._store(key, (), self.negative_ttl)
+        else:
+            self._store(key, tuple(addresses), self.ttl)
+        if self.listener is not None:
+            self.listener(key[0], key[1], list(addresses))
+
+    def _failed(self, failure, key: HostPort) -> None:
+        self._pending.pop(key, None)
+        self.stats['failures'] += 1
+        logger.error("Can't resolve %s:%s. %s", key[0], key[1],
+                     failure.getErrorMessage())
+        self._store(key, (), self.negative_ttl)
+
+    def _store(self, key: HostPort, addresses: Tuple[Address, ...],
+               ttl: float) -> None:
+        self._entries[key] = CacheEntry(addresses, self.clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _literal(host: str, port: int) -> Optional[List[Address]]:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return None
+        return [(host, port)]
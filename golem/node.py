@@ -29,6 +29,7 @@ from golem.core.deferred import chain_function
 from golem.hardware.presets import HardwarePresets, HardwarePresetsMixin
 from golem.core.keysauth import KeysAuth, WrongPassword
 from golem.core import golem_async
+from golem.core import simplehash
 from golem.core.variables import PRIVATE_KEY
 from golem.core import virtualization
 from golem.database import Database
@@ -158,6 +159,8 @@ class Node(HardwarePresetsMixin):
         HardwarePresets.initialize(self._datadir)
         HardwarePresets.update_config(self._config_desc.hardware_preset_name,
                                       self._config_desc)
+        simplehash.initialize(self._datadir)
+        threads.deferToThread(simplehash.file_hasher().prune)
 
         try:
             rpc = self._start_rpc()
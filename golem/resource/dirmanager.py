@@ -4,6 +4,9 @@ import shutil
 import time
 from typing import Iterator
 
+from golem.core import dirsize
+from golem.resource import lifecycle
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,10 +100,12 @@ class DirManager(object):
 
             if os.path.isfile(path):
                 os.remove(path)
+                dirsize.tracker.update(path)
             if os.path.isdir(path):
                 self.clear_dir(path)
                 if not os.listdir(path):
                     shutil.rmtree(path, ignore_errors=True)
+                    dirsize.tracker.update(path)
 
     def create_dir(self, full_path):
         """ Create new directory, remove old directory if it exists.
@@ -110,6 +115,7 @@ class DirManager(object):
             os.remove(full_path)
 
         os.makedirs(full_path)
+        dirsize.tracker.update(full_path)
 
     def get_dir(self, full_path, create, err_msg):
         """ Return path to a give directory if it exists. If it doesn't exist and option create is set to False
@@ -121,9 +127,11 @@ class DirManager(object):
         :return:
         """
         if os.path.isdir(full_path):
+            lifecycle.usage.touch(full_path)
             return full_path
         elif create:
             self.create_dir(full_path)
+            lifecycle.usage.touch(full_path)
             return full_path
         else:
             logger.error(err_msg)
@@ -6,8 +6,10 @@ from collections import Iterable, Sized
 from functools import partial
 from twisted.internet.defer import Deferred
 
+from golem.core import dirsize
 from golem.core.fileshelper import common_dir
 from golem.network.hyperdrive.client import HyperdriveAsyncClient
+from golem.resource import lifecycle
 from golem.resource.client import ClientHandler, DummyClient
 from golem.resource.hyperdrive.resource import Resource, ResourceStorage, \
     ResourceError
@@ -299,6 +301,8 @@ class HyperdriveResourceManager(ClientHandler):
             logger.debug("Downloaded resource. path=%s, hash=%s",
                          resource.path, resource.hash)
 
+            dirsize.tracker.update(path)
+            lifecycle.usage.touch(path)
             self._cache_resource(resource)
             files = self._parse_pull_response(response, res_id)
             success(entry, files, res_id)
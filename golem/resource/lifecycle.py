@@ -0,0 +1,245 @@
+import collections
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from peewee import fn
+
+from golem.core import dirsize
+from golem.model import db, ResourceUsage
+
+logger = logging.getLogger(__name__)
+
+# Number of entries removed at once
+BATCH_SIZE = 100
+# Pause between batches of removals (seconds)
+BATCH_DELAY = 0.5
+# SQLite limits the number of variables of a single query
+_QUERY_CHUNK = 500
+# Maximum number of used paths waiting to be recorded in the index
+MAX_USAGE_ENTRIES = 10000
+
+
+class UsageLog:
+    """ Collects paths used by tasks until they are recorded in the index.
+
+    Writers and readers of resource directories call touch() from any thread,
+    the index is only updated by the cleaner. A disabled log records nothing,
+    an enabled one keeps up to max_entries paths, forgetting the least
+    recently used first.
+    """
+
+    def __init__(self,
+                 clock: Callable[[], float] = time.time,
+                 max_entries: int = MAX_USAGE_ENTRIES,
+                 enabled: bool = True) -> None:
+        self.clock = clock
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._used: 'collections.OrderedDict[str, float]' = \
+            collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def touch(self, path: str) -> None:
+        if not self.enabled:
+            return
+        path = os.path.abspath(path)
+        with self._lock:
+            self._used[path] = self.clock()
+            self._used.move_to_end(path)
+            while len(self._used) > self.max_entries:
+                self._used.popitem(last=False)
+
+    def pop(self) -> Dict[str, float]:
+        with self._lock:
+            used, self._used = self._used, collections.OrderedDict()
+        return used
+
+
+class ResourceLifecycle:
+    """ Keeps resource directories within their age limit and disk budget.
+
+    Top-level entries of the directories (resources of a single task) are
+    recorded in the ResourceUsage table with their sizes and the time of
+    their last use. Synchronisation only lists the directories themselves,
+    an entry is measured again when it was used or its modification time
+    changed. Entries not used for max_age seconds and the least recently used
+    ones exceeding the disk budget are removed, batch_size at a time.
+
+    :param directories: resource directories to keep clean
+    :param disk_budget: maximum size of the directories in bytes, 0 for none
+    :param max_age: seconds after the last use of an entry to remove it,
+                    0 for none
+    :param is_protected: tells whether an entry with the given name is still
+                         needed and can't be removed
+    """
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 directories: Iterable[str],
+                 disk_budget: int = 0,
+                 max_age: int = 0,
+                 is_protected: Callable[[str], bool] = lambda _: False,
+                 usage_log: Optional[UsageLog] = None,
+                 batch_size: int = BATCH_SIZE,
+                 batch_delay: float = BATCH_DELAY,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.disk_budget = disk_budget
+        self.max_age = max_age
+        self.is_protected = is_protected
+        self.usage_log = usage_log or usage
+        self.usage_log.enabled = True
+        self.batch_size = max(1, batch_size)
+        self.batch_delay = batch_delay
+        self.clock = clock
+        self.sleep = sleep
+
+    def total_size(self) -> int:
+        return ResourceUsage \
+            .select(fn.COALESCE(fn.SUM(ResourceUsage.size), 0)) \
+            .where(ResourceUsage.directory << self.directories) \
+            .scalar()
+
+    def sync(self) -> None:
+        """ Updates the index with the entries of the directories """
+        used = self._used_entries()
+        for directory in self.directories:
+            self._sync_directory(directory, used)
+
+    def plan(self) -> List[ResourceUsage]:
+        """ Returns entries to remove, least recently used first """
+        budget_left = self.disk_budget - self.total_size()
+        min_last_used = self.clock() - self.max_age
+
+        query = ResourceUsage \
+            .select(ResourceUsage.path, ResourceUsage.size,
+                    ResourceUsage.last_used) \
+            .where(ResourceUsage.directory << self.directories) \
+            .order_by(ResourceUsage.last_used.asc()) \
+            .naive()
+
+        removed: List[ResourceUsage] = []
+        for entry in query.iterator():
+            expired = self.max_age > 0 and entry.last_used <= min_last_used
+            over_budget = self.disk_budget > 0 and budget_left < 0
+            if not (expired or over_budget):
+                break
+            if self.is_protected(os.path.basename(entry.path)):
+                continue
+            removed.append(entry)
+            budget_left += entry.size
+        return removed
+
+    def clean(self) -> Tuple[int, int]:
+        """ Removes expired and over budget entries, returns the number of
+        entries removed and the bytes freed """
+        self.sync()
+        removed = self.plan()
+        freed = 0
+        for start in range(0, len(removed), self.batch_size):
+            if start:
+                self.sleep(self.batch_delay)
+            batch = removed[start:start + self.batch_size]
+            for entry in batch:
+                self._remove(entry.path)
+                freed += entry.size
+            self._delete([entry.path for entry in batch])
+
+        if removed:
+            logger.info("Removed %d resource entries, %d bytes freed",
+                        len(removed), freed)
+        return len(removed), freed
+
+    def _used_entries(self) -> Dict[str, float]:
+        """ Returns the entries containing used paths with the times of
+        their last use """
+        entries: Dict[str, float] = {}
+        for path, used in self.usage_log.pop().items():
+            for directory in self.directories:
+                if not path.startswith(os.path.join(directory, '')):
+                    continue
+                relative = os.path.relpath(path, directory)
+                entry = os.path.join(directory, relative.split(os.sep)[0])
+                entries[entry] = max(used, entries.get(entry, used))
+        return entries
+
+    def _sync_directory(self, directory: str, used: Dict[str, float]) -> None:
+        indexed = {
+            entry.path: entry for entry in ResourceUsage
+            .select(ResourceUsage.path, ResourceUsage.size,
+                    ResourceUsage.mtime, ResourceUsage.last_used)
+            .where(ResourceUsage.directory == directory)
+            .naive()
+            .iterator()
+        }
+
+        try:
+            with os.scandir(directory) as it:
+                listed = list(it)
+        except OSError as err:
+            logger.debug("Can't list directory %r: %r", directory, err)
+            listed = []
+
+        created: List[dict] = []
+        with db.atomic():
+            for item in listed:
+                try:
+                    mtime = item.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+                entry = indexed.pop(item.path, None)
+                last_used = used.get(item.path)
+
+                if entry is None:
+                    created.append(dict(
+                        path=item.path,
+                        directory=directory,
+                        size=dirsize.scan_size(item.path),
+                        mtime=mtime,
+                        last_used=max(mtime, last_used or mtime)))
+                elif last_used is not None or mtime != entry.mtime:
+                    ResourceUsage.update(
+                        size=dirsize.scan_size(item.path),
+                        mtime=mtime,
+                        last_used=max(entry.last_used, last_used or mtime),
+                    ).where(ResourceUsage.path == item.path).execute()
+
+            # Each row holds 5 variables
+            chunk = _QUERY_CHUNK // 5
+            for start in range(0, len(created), chunk):
+                ResourceUsage.insert_many(created[start:start + chunk]) \
+                    .execute()
+
+        # Removed in the meantime
+        self._delete(list(indexed))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            logger.warning("Can't remove resource %r: %r", path, err)
+        dirsize.tracker.update(path)
+
+    @staticmethod
+    def _delete(paths: List[str]) -> None:
+        with db.atomic():
+            for start in range(0, len(paths), _QUERY_CHUNK):
+                chunk = paths[start:start + _QUERY_CHUNK]
+                ResourceUsage.delete() \
+                    .where(ResourceUsage.path << chunk) \
+                    .execute()
+
+
+# Usage log shared by the users of resource directories and the cleaner,
+# enabled once there is a cleaner
+usage = UsageLog(enabled=False)
@@ -2,10 +2,13 @@ import os
 import hashlib
 import base64
 
+from golem.core.simplehash import file_hasher
+
 
 class ResourceHash:
-    def __init__(self, resource_dir):
+    def __init__(self, resource_dir, hasher=None):
         self.resource_dir = resource_dir
+        self.hasher = hasher or file_hasher()
 
     def split_file(self, filename, block_size=2 ** 20):
         with open(filename, "rb") as f:
@@ -35,10 +38,8 @@ class ResourceHash:
                         f.write(data)
 
     def get_file_hash(self, filename):
-        with open(filename, "rb") as f:
-            data = f.read()
-            hash_ = self.__count_hash(data)
-        return hash_
+        digest = self.hasher.hash_file(filename)
+        return base64.urlsafe_b64encode(digest).decode('utf-8')
 
     def set_resource_dir(self, resource_dir):
         self.resource_dir = resource_dir
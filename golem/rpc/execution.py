@@ -0,0 +1,270 @@
+import bisect
+import functools
+import logging
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from pydispatch import dispatcher
+from twisted.internet import threads
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+
+logger = logging.getLogger('golem.rpc')
+
+# Upper bounds of latency histogram buckets (milliseconds)
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+# Synchronous calls blocking the reactor for longer are logged (seconds)
+BLOCKING_WARNING = 0.1
+
+
+class CachePolicy(NamedTuple):
+    ttl: float
+    invalidated_by: Tuple[str, ...]
+
+
+def _mark(f, name: str, value) -> None:
+    if isinstance(f, (staticmethod, classmethod)):
+        setattr(f.__func__, name, value)
+    else:
+        setattr(f, name, value)
+
+
+def offload(f):
+    """ Marks an RPC procedure to be run in the reactor's thread pool.
+    Offloaded procedures must not modify state shared with the reactor
+    thread and should only read snapshots of it.
+    """
+    _mark(f, 'rpc_offload', True)
+    return f
+
+
+def cached(ttl: float, invalidated_by: Iterable[str] = ()):
+    """ Marks an RPC procedure whose results are reused for ttl seconds.
+    Results are kept per arguments and dropped on any of the pydispatch
+    signals named in invalidated_by. Cached results are shared between
+    callers and must not be modified.
+    """
+    def wrapper(f):
+        _mark(f, 'rpc_cache', CachePolicy(ttl, tuple(invalidated_by)))
+        return f
+    return wrapper
+
+
+class LatencyHistogram:
+    """ Counts of durations in LATENCY_BUCKETS, with their total and maximum
+    """
+
+    def __init__(self) -> None:
+        # The last bucket counts durations above the largest bound
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.
+        self.max = 0.
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def record(self, seconds: float) -> None:
+        millis = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, millis)] += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ['inf']
+        return {
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+            'buckets': dict(zip(bounds, self.counts)),
+        }
+
+
+class ProcedureStats:  # pylint: disable=too-few-public-methods
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        # Time spent by calls on the reactor thread
+        self.blocking = LatencyHistogram()
+        self.cache_hits = 0
+        self.errors = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'latency': self.latency.to_dict(),
+            'blocking': self.blocking.to_dict(),
+            'cache_hits': self.cache_hits,
+            'errors': self.errors,
+        }
+
+
+class _CacheEntry(NamedTuple):
+    result: Any
+    expires: float
+
+
+class _Cache:
+    """ Results of a cached procedure and calls in progress """
+
+    def __init__(self, policy: CachePolicy) -> None:
+        self.policy = policy
+        self.entries: Dict[Hashable, _CacheEntry] = {}
+        self.pending: Dict[Hashable, List[Deferred]] = {}
+        # Incremented on invalidation, results of older calls are not kept
+        self.generation = 0
+
+    def invalidate(self) -> None:
+        self.entries.clear()
+        self.pending.clear()
+        self.generation += 1
+
+
+def _freeze(value) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return type(value).__name__, tuple(_freeze(v) for v in value)
+    hash(value)
+    return value
+
+
+class ProcedureExecutor:
+    """ Runs RPC procedures as declared with `offload` and `cached`.
+
+    wrap() returns a procedure recording its latency and the time it blocked
+    the reactor thread, running it in a thread if it is offloaded and
+    reusing its results if it is cached. Procedures returning Deferreds are
+    timed until the Deferred fires.
+    """
+
+    def __init__(self,
+                 run_async: Callable[..., Deferred] = threads.deferToThread,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.run_async = run_async
+        self.clock = clock
+        self.stats: Dict[str, ProcedureStats] = {}
+        self._caches: Dict[str, _Cache] = {}
+        self._signals: Dict[str, List[str]] = {}
+
+    def wrap(self, uri: str, procedure: Callable) -> Callable:
+        stats = self.stats[uri] = ProcedureStats()
+        policy: Optional[CachePolicy] = getattr(procedure, 'rpc_cache', None)
+        if getattr(procedure, 'rpc_offload', False):
+            run = functools.partial(self.run_async, procedure)
+        else:
+            run = procedure
+
+        @functools.wraps(procedure)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = run(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                self._record_blocking(uri, stats, time.perf_counter() - start)
+            if isinstance(result, Deferred):
+                result.addBoth(self._record_latency, stats, start)
+            else:
+                self._record_latency(result, stats, start)
+            return result
+
+        if policy is None:
+            return wrapper
+
+        cache = self._caches[uri] = _Cache(policy)
+        for signal in policy.invalidated_by:
+            self._connect(signal, uri)
+
+        @functools.wraps(procedure)
+        def cached_wrapper(*args, **kwargs):
+            try:
+                key = _freeze((args, kwargs))
+            except TypeError:
+                return wrapper(*args, **kwargs)
+
+            entry = cache.entries.get(key)
+            if entry is not None and entry.expires > self.clock():
+                stats.cache_hits += 1
+                return entry.result
+
+            waiting = cache.pending.get(key)
+            if waiting is not None:
+                stats.cache_hits += 1
+                deferred = Deferred()
+                waiting.append(deferred)
+                return deferred
+
+            generation = cache.generation
+
+            def store(result):
+                if generation == cache.generation:
+                    cache.entries[key] = _CacheEntry(
+                        result, self.clock() + policy.ttl)
+                return result
+
+            result = wrapper(*args, **kwargs)
+            if not isinstance(result, Deferred):
+                return store(result)
+
+            # Identical calls made until the result is ready wait for it
+            waiting = cache.pending[key] = []
+
+            def done(result):
+                if cache.pending.get(key) is waiting:
+                    del cache.pending[key]
+                if not isinstance(result, Failure):
+                    store(result)
+                for deferred in waiting:
+                    deferred.callback(result)
+                return result
+
+            return result.addBoth(done)
+
+        return cached_wrapper
+
+    def invalidate(self, uri: str) -> None:
+        cache = self._caches.get(uri)
+        if cache is not None:
+            cache.invalidate()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {uri: stats.to_dict() for uri, stats in self.stats.items()}
+
+    def _connect(self, signal: str, uri: str) -> None:
+        uris = self._signals.get(signal)
+        if uris is None:
+            uris = self._signals[signal] = []
+            dispatcher.connect(self._on_signal, signal=signal)
+        if uri not in uris:
+            uris.append(uri)
+
+    def _on_signal(self, signal=None, **_):
+        for uri in self._signals.get(signal, ()):
+            self.invalidate(uri)
+
+    @staticmethod
+    def _record_blocking(uri: str, stats: ProcedureStats,
+                         seconds: float) -> None:
+        stats.blocking.record(seconds)
+        if seconds > BLOCKING_WARNING:
+            logger.debug("RPC: %s blocked the reactor for %.3f s",
+                         uri, seconds)
+
+    @staticmethod
+    def _record_latency(result, stats: ProcedureStats, start: float):
+        stats.latency.record(time.perf_counter() - start)
+        if isinstance(result, Failure):
+            stats.errors += 1
+        return result
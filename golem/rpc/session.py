@@ -17,6 +17,7 @@ from twisted.internet.endpoints import (
 
 from golem.rpc.common import X509_COMMON_NAME
 from golem.rpc import utils as rpc_utils
+from golem.rpc.execution import ProcedureExecutor
 
 logger = logging.getLogger('golem.rpc')
 
@@ -64,11 +65,15 @@ class Session(ApplicationSession):
     # pylint: disable=too-many-arguments
     def __init__(self, address, mapping=None,
                  cert_manager=None, use_ipv6=False,
-                 crsb_user=None, crsb_user_secret=None) -> None:
+                 crsb_user=None, crsb_user_secret=None,
+                 executor=None) -> None:
         self.address = address
         if mapping is None:
             mapping = {}
         self.mapping = mapping
+        if executor is None:
+            executor = ProcedureExecutor()
+        self.executor = executor
 
         self.ready = Deferred()
         self.connected = False
@@ -199,7 +204,7 @@ class Session(ApplicationSession):
     @inlineCallbacks
     def register_procedures(self, mapping):
         for uri, procedure in mapping.items():
-            deferred = self.register(procedure, uri)
+            deferred = self.register(self.executor.wrap(uri, procedure), uri)
             deferred.addErrback(self._on_error)
             yield deferred
 
@@ -212,6 +217,11 @@ class Session(ApplicationSession):
             exposed[registration.procedure] = qname
         return exposed
 
+    @rpc_utils.expose('sys.procedure_stats')
+    def procedure_stats(self):
+        """ Latency, reactor blocking time and cache hits of procedures """
+        return self.executor.to_dict()
+
     def is_open(self):
         return self.connected and self.is_attached() and not self.is_closing()
 
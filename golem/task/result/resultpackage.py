@@ -7,10 +7,11 @@ from typing import Dict
 import abc
 import os
 
-from golem.core.fileencrypt import AESFileEncryptor
+from golem.core.fileencrypt import AESGCMFileEncryptor
 from golem.core.fileshelper import common_dir, relative_path
 from golem.core.printable_object import PrintableObject
-from golem.core.simplehash import SimpleHash
+from golem.core.simplehash import SimpleHash, file_hasher
+from golem.core.zipextract import extract_all
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,14 @@ class Packager(object):
                output_path: str,
                disk_files: Dict[str, str]):
 
+        self.pack(output_path, disk_files)
+        pkg_sha1 = self.compute_sha1(output_path)
+        return output_path, pkg_sha1
+
+    def pack(self,
+             output_path: str,
+             disk_files: Dict[str, str]) -> None:
+
         if not disk_files:
             logger.warning('No files to pack')
         else:
@@ -49,12 +58,10 @@ class Packager(object):
                 for file_path, file_name in disk_files.items():
                     self.write_disk_file(of, file_path, file_name)
 
-        pkg_sha1 = self.compute_sha1(output_path)
-        return output_path, pkg_sha1
-
     @staticmethod
     def compute_sha1(source_path: str):
-        pkg_sha1 = SimpleHash.hash_file(source_path)
+        # Packages are hashed once, right after being created
+        pkg_sha1 = file_hasher().hash_file(source_path, cache=False)
         return binascii.hexlify(pkg_sha1).decode('utf8')
 
     @classmethod
@@ -97,10 +104,7 @@ class ZipPackager(Packager):
             output_dir = os.path.dirname(input_path)
         os.makedirs(output_dir, exist_ok=True)
 
-        with zipfile.ZipFile(input_path, 'r', compression=self.ZIP_MODE) as zf:
-            zf.extractall(output_dir)
-            extracted = zf.namelist()
-
+        extracted = extract_all(input_path, output_dir)
         return extracted, output_dir
 
     def generator(self, output_path):
@@ -144,7 +148,7 @@ class ZipPackager(Packager):
 class EncryptingPackager(Packager):
 
     creator_class = ZipPackager
-    encryptor_class = AESFileEncryptor
+    encryptor_class = AESGCMFileEncryptor
 
     def __init__(self, secret):
         self._packager = self.creator_class()
@@ -157,11 +161,14 @@ class EncryptingPackager(Packager):
         tmp_file_path = self.package_name(output_path)
         backup_rename(tmp_file_path)
 
-        pkg_file_path, pkg_sha1 = super().create(tmp_file_path, disk_files)
+        self.pack(tmp_file_path, disk_files)
 
-        self.encryptor_class.encrypt(pkg_file_path, output_path,
-                                     secret=self._secret)
-        return output_path, pkg_sha1
+        # The package is hashed while it's being encrypted, saving a pass
+        # over the file
+        pkg_sha1 = SimpleHash.hash_object()
+        self.encryptor_class.encrypt(tmp_file_path, output_path,
+                                     secret=self._secret, digest=pkg_sha1)
+        return output_path, pkg_sha1.hexdigest()
 
     def extract(self, input_path, output_dir=None):
         tmp_file_path = self.package_name(input_path)
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, ClassVar, Dict, Optional, TYPE_CHECKING
 
 import os
 import time
@@ -14,13 +14,15 @@ from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.core.common import deadline_to_timeout
 from golem.core.deferred import sync_wait
 from golem.core.statskeeper import IntStatsKeeper
+from golem.docker.environment import DockerEnvironment
 from golem.docker.image import DockerImage
 from golem.docker.manager import DockerManager
 from golem.docker.task_thread import DockerTaskThread
 from golem.manager.nodestatesnapshot import ComputingSubtaskStateSnapshot
 from golem.resource.dirmanager import DirManager
 from golem.task.timer import ProviderTimer
-from golem.vm.vm import PythonProcVM, PythonTestVM
+from golem.vm.pool import PythonWorkerPool
+from golem.vm.vm import PooledPythonProcVM, PythonProcVM, PythonTestVM
 
 from .taskthread import TaskThread
 
@@ -32,6 +34,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 BENCHMARK_TIMEOUT = 60  # s
+WARM_POOL_DIR = "warm-pool"
 
 
 class CompStats(object):
@@ -84,6 +87,7 @@ class TaskComputer(object):
         self.assigned_subtask: Optional['ComputeTaskDef'] = None
 
         self.last_task_timeout_checking = None
+        self.last_reported_progress: Optional[float] = None
         self.support_direct_computation = False
         # Should this node behave as provider and compute tasks?
         self.compute_tasks = task_server.config_desc.accept_tasks \
@@ -201,11 +205,30 @@ class TaskComputer(object):
         """ Main loop of task computer """
         if self.counting_thread is not None:
             self.counting_thread.check_timeout()
+            self.__report_progress()
         elif self.compute_tasks and self.runnable:
             last_request = time.time() - self.last_task_request
             if last_request > self.task_request_frequency:
                 self.__request_task()
 
+    def __report_progress(self) -> None:
+        counting_thread = self.counting_thread
+        subtask = self.assigned_subtask
+        if counting_thread is None or subtask is None:
+            return
+
+        progress = counting_thread.get_progress()
+        if progress == self.last_reported_progress:
+            return
+
+        self.last_reported_progress = progress
+        dispatcher.send(
+            signal='golem.taskcomputer',
+            event='subtask_progress',
+            subtask_id=subtask['subtask_id'],
+            progress=progress,
+        )
+
     def get_progress(self) -> Optional[ComputingSubtaskStateSnapshot]:
         if not self.is_computing() or self.assigned_subtask is None:
             return None
@@ -250,12 +273,33 @@ class TaskComputer(object):
         self.task_request_frequency = config_desc.task_request_interval
         self.compute_tasks = config_desc.accept_tasks \
             and not config_desc.in_shutdown
+        self.change_python_worker_pool(
+            config_desc.python_worker_pool,
+            memory_limit=config_desc.max_memory_size * 1024 or None)
         return self.change_docker_config(
             config_desc=config_desc,
             run_benchmarks=run_benchmarks,
             work_dir=Path(self.dir_manager.root_path),
             in_background=in_background)
 
+    @staticmethod
+    def change_python_worker_pool(size: int,
+                                  memory_limit: Optional[int] = None) -> None:
+        """
+        :param size: number of pooled workers, 0 disables the pool
+        :param memory_limit: address space limit of a single job in bytes
+        """
+        pool = PyTaskThread.worker_pool
+        if pool and pool.size == size and pool.memory_limit == memory_limit:
+            return
+        if pool:
+            PyTaskThread.worker_pool = None
+            pool.close()
+        if size > 0:
+            PyTaskThread.worker_pool = PythonWorkerPool(
+                size, memory_limit=memory_limit)
+            PyTaskThread.worker_pool.fill()
+
     def config_changed(self):
         for l in self.listeners:
             l.config_changed()
@@ -277,9 +321,7 @@ class TaskComputer(object):
             self.task_server.benchmark_manager.run_all_benchmarks(
                 deferred.callback, deferred.errback
             )
-            return deferred
-
-        if dm.hypervisor and self.use_docker_manager:  # noqa pylint: disable=no-member
+        elif dm.hypervisor and self.use_docker_manager:  # noqa pylint: disable=no-member
             self.lock_config(True)
 
             def status_callback():
@@ -304,10 +346,35 @@ class TaskComputer(object):
                 done_callback=done_callback,
                 work_dir=work_dir,
                 in_background=in_background)
+        else:
+            deferred = None
 
-            return deferred
-
-        return None
+        # Enabled after the VM update is queued, which warm containers wait
+        # for before they are created
+        if config_desc.docker_warm_pool and self.use_docker_manager:
+            dm.enable_warm_pool(work_dir / WARM_POOL_DIR,
+                                images=self._get_warm_pool_images())
+        else:
+            dm.disable_warm_pool()
+
+        return deferred
+
+    def _get_warm_pool_images(self):
+        """ Images of the supported Docker environments which accept tasks
+        and can run in warm containers """
+        environments_manager = self.task_server.task_keeper \
+            .environments_manager
+        images = []
+        for env_id, env in environments_manager.get_environments().items():
+            if not isinstance(env, DockerEnvironment) \
+                    or not env.is_accepted() \
+                    or not environments_manager.get_support_status(env_id):
+                continue
+            config = env.get_container_config()
+            if config['binds'] or config['devices'] or config['runtime']:
+                continue
+            images.append(env.docker_images[0])
+        return images
 
     def register_listener(self, listener):
         self.listeners.append(listener)
@@ -396,20 +463,27 @@ class TaskComputer(object):
 
         with self.lock:
             self.counting_thread = None
+        self.last_reported_progress = None
         if self.finished_cb:
             self.finished_cb()
 
     def quit(self):
         if self.counting_thread is not None:
             self.counting_thread.end_comp()
+        self.change_python_worker_pool(0)
 
 
 class PyTaskThread(TaskThread):
+    worker_pool: ClassVar[Optional[PythonWorkerPool]] = None
+
     # pylint: disable=too-many-arguments
     def __init__(self, extra_data, res_path, tmp_path, timeout):
         super(PyTaskThread, self).__init__(
             extra_data, res_path, tmp_path, timeout)
-        self.vm = PythonProcVM()
+        if self.worker_pool:
+            self.vm = PooledPythonProcVM(self.worker_pool)
+        else:
+            self.vm = PythonProcVM()
 
 
 class PyTestTaskThread(PyTaskThread):
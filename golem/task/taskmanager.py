@@ -1,7 +1,6 @@
 import logging
 import os
 import pickle
-import shutil
 import time
 import uuid
 from functools import partial
@@ -12,8 +11,8 @@ from typing import (
     Iterable,
     List,
     Optional,
+    Set,
 )
-from zipfile import ZipFile
 
 from golem_messages import message
 from pydispatch import dispatcher
@@ -28,6 +27,8 @@ from golem import model
 from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.core.common import get_timestamp_utc, HandleForwardedError, \
     HandleKeyError, node_info_str, short_node_id, to_unicode, update_dict
+from golem.core.fileshelper import link_or_copy
+from golem.core.zipextract import extract_all
 from golem.manager.nodestatesnapshot import LocalTaskStateSnapshot
 from golem.ranking.manager.database_manager import update_provider_efficiency, \
     update_provider_efficacy
@@ -42,7 +43,7 @@ from golem.task.taskkeeper import CompTaskKeeper, compute_subtask_value
 from golem.task.taskrequestorstats import RequestorTaskStatsManager
 from golem.task.taskstate import TaskState, TaskStatus, SubtaskStatus, \
     SubtaskState, Operation, TaskOp, SubtaskOp, OtherOp
-from golem.task.timer import ProviderComputeTimers
+from golem.task.timer import DeadlineQueue, ProviderComputeTimers
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +100,16 @@ class TaskManager(TaskEventListener):
         self.tasks: Dict[str, Task] = {}
         self.tasks_states: Dict[str, TaskState] = {}
         self.subtask2task_mapping: Dict[str, str] = {}
+        # Parts of task dicts which only change with notice_task_updated
+        self._task_dict_fragments: Dict[str, Dict] = {}
+
+        # Deadlines of tasks and subtasks, indexed by their ids, so that
+        # check_timeouts only has to look at the expired ones
+        self._task_deadlines = DeadlineQueue()
+        self._subtask_deadlines = DeadlineQueue()
+        # Expired deadlines of tasks which were not active when checked;
+        # task id -> subtask ids, None standing for the task itself
+        self._dormant_deadlines: Dict[str, Set[Optional[str]]] = {}
 
         self.task_persistence = task_persistence
 
@@ -195,6 +206,7 @@ class TaskManager(TaskEventListener):
 
         self.tasks[task_id] = task
         self.tasks_states[task_id] = ts
+        self._task_deadlines.add(task_id, task.header.deadline)
         logger.info("Task %s added", task_id)
 
         self._create_task_output_dir(task.task_definition)
@@ -329,9 +341,12 @@ class TaskManager(TaskEventListener):
                     task_id = task.header.task_id
                     self.tasks[task_id] = task
                     self.tasks_states[task_id] = state
+                    self._task_deadlines.add(task_id, task.header.deadline)
 
                     for sub in state.subtask_states.values():
                         self.subtask2task_mapping[sub.subtask_id] = task_id
+                        self._subtask_deadlines.add(sub.subtask_id,
+                                                    sub.deadline)
 
                     logger.debug('TASK %s RESTORED from %r', task_id, path)
 
@@ -643,17 +658,16 @@ class TaskManager(TaskEventListener):
                 old_task_id, old_subtask_id)
             new_result_path = new_tmp_dir / '{}.{}.zip'.format(
                 new_task_id, new_subtask_id)
-            shutil.copy(old_result_path, new_result_path)
+            link_or_copy(old_result_path, new_result_path)
 
             subtask_result_dir = new_tmp_dir / new_subtask_id
             os.makedirs(subtask_result_dir)
-            with ZipFile(new_result_path, 'r') as zf:
-                zf.extractall(subtask_result_dir)
-                return [
-                    str(subtask_result_dir / name)
-                    for name in zf.namelist()
-                    if name != '.package_desc'
-                ]
+            return [
+                str(subtask_result_dir / name)
+                for name in extract_all(str(old_result_path),
+                                        str(subtask_result_dir))
+                if name != '.package_desc'
+            ]
 
         def after_results_extracted(results):
             new_task.copy_subtask_results(
@@ -870,35 +884,84 @@ class TaskManager(TaskEventListener):
     # CHANGE TO RETURN KEY_ID (check IF SUBTASK COMPUTER HAS KEY_ID
     def check_timeouts(self):
         nodes_with_timeouts = []
-        for t in list(self.tasks.values()):
-            th = t.header
-            if self.tasks_states[th.task_id].status not in self.activeStatus:
+        cur_time = int(get_timestamp_utc())
+        self._wake_dormant_deadlines()
+
+        # Check subtask timeouts
+        expired = list(self._subtask_deadlines.pop_expired(cur_time))
+        for subtask_id, _ in expired:
+            task_id = self.subtask2task_mapping.get(subtask_id)
+            if not self._deadline_task_active(task_id, subtask_id):
+                continue
+            s = self.tasks_states[task_id].subtask_states.get(subtask_id)
+            if s is None or not s.status.is_computed():
                 continue
-            cur_time = int(get_timestamp_utc())
-            # Check subtask timeout
-            ts = self.tasks_states[th.task_id]
-            for s in list(ts.subtask_states.values()):
-                if s.status.is_computed():
-                    if cur_time > s.deadline:
-                        logger.info("Subtask %r dies with status %r",
-                                    s.subtask_id,
-                                    s.status.value)
-                        s.status = SubtaskStatus.failure
-                        nodes_with_timeouts.append(s.node_id)
-                        t.computation_failed(s.subtask_id)
-                        s.stderr = "[GOLEM] Timeout"
-                        self.notice_task_updated(th.task_id,
-                                                 subtask_id=s.subtask_id,
-                                                 op=SubtaskOp.TIMEOUT)
-            # Check task timeout
-            if cur_time > th.deadline:
-                logger.info("Task %r dies", th.task_id)
-                self.tasks_states[th.task_id].status = TaskStatus.timeout
-                # TODO: t.tell_it_has_timeout()?
-                self.notice_task_updated(th.task_id, op=TaskOp.TIMEOUT)
-                self._try_remove_task_output_dir(t.task_definition)
+            if cur_time <= s.deadline:
+                self._subtask_deadlines.add(subtask_id, s.deadline)
+                continue
+
+            logger.info("Subtask %r dies with status %r",
+                        s.subtask_id,
+                        s.status.value)
+            s.status = SubtaskStatus.failure
+            nodes_with_timeouts.append(s.node_id)
+            self.tasks[task_id].computation_failed(s.subtask_id)
+            s.stderr = "[GOLEM] Timeout"
+            self.notice_task_updated(task_id,
+                                     subtask_id=s.subtask_id,
+                                     op=SubtaskOp.TIMEOUT)
+
+        # Check task timeouts
+        expired = list(self._task_deadlines.pop_expired(cur_time))
+        for task_id, _ in expired:
+            if not self._deadline_task_active(task_id, None):
+                continue
+            t = self.tasks[task_id]
+            if cur_time <= t.header.deadline:
+                self._task_deadlines.add(task_id, t.header.deadline)
+                continue
+
+            logger.info("Task %r dies", task_id)
+            self.tasks_states[task_id].status = TaskStatus.timeout
+            # TODO: t.tell_it_has_timeout()?
+            self.notice_task_updated(task_id, op=TaskOp.TIMEOUT)
+            self._try_remove_task_output_dir(t.task_definition)
         return nodes_with_timeouts
 
+    def _deadline_task_active(self, task_id: Optional[str],
+                              subtask_id: Optional[str]) -> bool:
+        """ Tells whether an expired deadline of a task (subtask_id=None) or
+            one of its subtasks should be acted upon now. Deadlines of tasks
+            which are not active yet are put aside until they become active,
+            the ones of completed tasks are dropped.
+        """
+        if task_id not in self.tasks:
+            return False
+        status = self.tasks_states[task_id].status
+        if status in self.activeStatus:
+            return True
+        if not status.is_completed():
+            self._dormant_deadlines.setdefault(task_id, set()).add(subtask_id)
+        return False
+
+    def _wake_dormant_deadlines(self) -> None:
+        for task_id in list(self._dormant_deadlines):
+            task_state = self.tasks_states.get(task_id)
+            if task_state is None or task_state.status.is_completed():
+                del self._dormant_deadlines[task_id]
+                continue
+            if task_state.status not in self.activeStatus:
+                continue
+
+            for subtask_id in self._dormant_deadlines.pop(task_id):
+                if subtask_id is None:
+                    self._task_deadlines.add(
+                        task_id, self.tasks[task_id].header.deadline)
+                elif subtask_id in task_state.subtask_states:
+                    self._subtask_deadlines.add(
+                        subtask_id,
+                        task_state.subtask_states[subtask_id].deadline)
+
     def get_progresses(self):
         tasks_progresses = {}
 
@@ -970,7 +1033,9 @@ class TaskManager(TaskEventListener):
         self.tasks_states[task_id].status = TaskStatus.aborted
         for sub in list(self.tasks_states[task_id].subtask_states.values()):
             del self.subtask2task_mapping[sub.subtask_id]
+            self._subtask_deadlines.remove(sub.subtask_id)
         self.tasks_states[task_id].subtask_states.clear()
+        self._task_deadlines.remove(task_id)
 
         self.notice_task_updated(task_id, op=TaskOp.ABORTED)
 
@@ -983,11 +1048,15 @@ class TaskManager(TaskEventListener):
     def delete_task(self, task_id):
         for sub in list(self.tasks_states[task_id].subtask_states.values()):
             del self.subtask2task_mapping[sub.subtask_id]
+            self._subtask_deadlines.remove(sub.subtask_id)
         self.tasks_states[task_id].subtask_states.clear()
+        self._task_deadlines.remove(task_id)
+        self._dormant_deadlines.pop(task_id, None)
 
         self.tasks[task_id].unregister_listener(self)
         del self.tasks[task_id]
         del self.tasks_states[task_id]
+        self._task_dict_fragments.pop(task_id, None)
 
         self.dir_manager.clear_temporary(task_id)
         self.remove_dump(task_id)
@@ -1065,21 +1134,27 @@ class TaskManager(TaskEventListener):
         if not task:  # task might have been deleted after the request was made
             return None
 
-        task_type_name = task.task_definition.task_type.lower()
-        task_type = self.task_types[task_type_name]
         state = self.query_task_state(task.header.task_id)
+        fragment = self._task_dict_fragments.get(task_id)
+        if fragment is None:
+            task_type_name = task.task_definition.task_type.lower()
+            task_type = self.task_types[task_type_name]
+            fragment = self._task_dict_fragments[task_id] = {
+                # single=True retrieves one preview file. If rendering frames,
+                # it's the preview of the most recently computed frame.
+                'preview': task_type.get_preview(task, single=True),
+                'definition': self.get_task_definition_dict(task),
+            }
 
         dictionary = {
             'duration': state.elapsed_time,
-            # single=True retrieves one preview file. If rendering frames,
-            # it's the preview of the most recently computed frame.
-            'preview': task_type.get_preview(task, single=True)
+            'preview': fragment['preview'],
         }
 
         return update_dict(dictionary,
                            task.to_dictionary(),
                            state.to_dictionary(),
-                           self.get_task_definition_dict(task))
+                           fragment['definition'])
 
     def get_tasks_dict(self) -> List[Dict]:
         task_ids = list(self.tasks.keys())
@@ -1143,6 +1218,7 @@ class TaskManager(TaskEventListener):
 
         self.tasks_states[ctd['task_id']].\
             subtask_states[ctd['subtask_id']] = ss
+        self._subtask_deadlines.add(ctd['subtask_id'], ctd['deadline'])
 
     def notify_update_task(self, task_id):
         self.notice_task_updated(task_id)
@@ -1186,6 +1262,7 @@ class TaskManager(TaskEventListener):
         if persist and self.task_persistence:
             self.dump_task(task_id)
 
+        self._task_dict_fragments.pop(task_id, None)
         task_state = self.tasks_states.get(task_id)
         dispatcher.send(
             signal='golem.taskmanager',
@@ -7,6 +7,8 @@ from typing import Any, Dict, Tuple, Union
 
 from twisted.internet.defer import Deferred
 
+from golem.vm import sharedresult
+
 
 logger = logging.getLogger("golem.task.taskthread")
 
@@ -115,9 +117,14 @@ class TaskThread(threading.Thread):
         try:
             extra_data["resourcePath"] = abs_res_path
             extra_data["tmp_path"] = abs_tmp_path
-            self.result, self.error_msg = self.vm.run_task(
+            result, self.error_msg = self.vm.run_task(
                 extra_data['src_code'],
                 extra_data
             )
+            if self.error_msg:
+                sharedresult.release(result)
+            # Payloads of shared results are handed to the result packager
+            # as files in the temporary directory, without being read
+            self.result = sharedresult.claim(result)
         finally:
             self.end_time = time.time()
@@ -1,7 +1,8 @@
+import heapq
 import logging
 import math
 import time
-from typing import ClassVar, Optional, Dict
+from typing import ClassVar, Dict, Hashable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -121,6 +122,58 @@ class ActionTimers:
             return None
 
 
+class DeadlineQueue:
+    """ Min-heap of deadlines, allowing to find expired entries without
+        scanning all of them.
+
+        Entries are invalidated lazily: re-adding a key replaces its deadline
+        and removing a key only forgets it, stale heap items are skipped when
+        popped and dropped when they outnumber the live ones.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = dict()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def add(self, key: Hashable, deadline: float) -> None:
+        """ Schedules the key or updates its deadline
+        """
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+
+    def remove(self, key: Hashable) -> None:
+        self._deadlines.pop(key, None)
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+
+    def pop_expired(self, now: float) -> Iterator[Tuple[Hashable, float]]:
+        """ Removes and yields (key, deadline) pairs of entries whose
+            deadline is earlier than now, in deadline order.
+        """
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            deadline, key = heapq.heappop(heap)
+            if self._deadlines.get(key) != deadline:
+                continue
+            del self._deadlines[key]
+            yield key, deadline
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def _compact(self) -> None:
+        self._heap = [(deadline, key)
+                      for key, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+
 ProviderTimer = ThirstTimer()  # noqa
 ProviderComputeTimers = ActionTimers()  # noqa
 ProviderTTCDelayTimers = ActionTimers()  # noqa
@@ -0,0 +1,246 @@
+import collections
+import logging
+import multiprocessing as mp
+import threading
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import psutil
+
+from golem.vm import sharedresult
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Number of jobs after which a worker process is replaced
+WORKER_MAX_JOBS = 100
+# Resident memory a worker may grow by before it is replaced (bytes)
+WORKER_MAX_MEMORY_GROWTH = 256 * 1024 * 1024
+
+JobResult = Tuple[Any, Optional[str]]
+
+
+def worker_main(conn, memory_limit: Optional[int]) -> None:
+    """ Main loop of a pooled worker process. Receives (src_code, scope)
+    pairs and sends back (output, error, rss) triples until it receives None
+    or the pipe is closed.
+    :param conn: worker's end of the job pipe
+    :param memory_limit: per-job address space limit in bytes, applied on top
+    of the worker's current usage
+    """
+    process = psutil.Process()
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        src_code, scope = job
+        with _address_space_limit(process, memory_limit):
+            output, error = _exec_job(src_code, scope)
+
+        rss = process.memory_info().rss
+        try:
+            conn.send((output, error, rss))
+        except Exception as err:  # pylint: disable=broad-except
+            conn.send((None, "Cannot send job output: {}".format(err), rss))
+    conn.close()
+
+
+def _exec_job(src_code: str, scope: Dict) -> JobResult:
+    # pylint: disable=exec-used
+    directory = scope.get("tmp_path")
+    scope["shared_result"] = sharedresult.factory(directory)
+    try:
+        exec(src_code, scope)
+        output = sharedresult.share(scope.get("output"), directory)
+    except MemoryError:
+        return None, "Job exceeded its memory limit"
+    except Exception as err:  # pylint: disable=broad-except
+        return None, str(err)
+    return output, scope.get("error")
+
+
+class _address_space_limit:  # pylint: disable=invalid-name
+    """ Temporarily limits the address space of the current process """
+
+    def __init__(self, process: psutil.Process,
+                 memory_limit: Optional[int]) -> None:
+        self.process = process
+        self.memory_limit = memory_limit
+        self.previous: Optional[Tuple[int, int]] = None
+
+    def __enter__(self):
+        if not self.memory_limit or resource is None:
+            return self
+        self.previous = resource.getrlimit(resource.RLIMIT_AS)
+        soft = self.process.memory_info().vms + self.memory_limit
+        hard = self.previous[1]
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+        return self
+
+    def __exit__(self, *_):
+        if self.previous is not None:
+            resource.setrlimit(resource.RLIMIT_AS, self.previous)
+
+
+class PythonWorker:
+    """ Long-lived process executing Python jobs sent through a pipe """
+
+    def __init__(self, memory_limit: Optional[int] = None) -> None:
+        self.conn, child_conn = mp.Pipe()
+        self.process = mp.Process(target=worker_main,
+                                  args=(child_conn, memory_limit),
+                                  daemon=True)
+        self.process.start()
+        child_conn.close()
+
+        self.jobs = 0
+        self.broken = False
+        self.base_rss: Optional[int] = None
+        self.rss: Optional[int] = None
+
+    @property
+    def alive(self) -> bool:
+        return not self.broken and self.process.is_alive()
+
+    @property
+    def memory_growth(self) -> int:
+        if self.base_rss is None or self.rss is None:
+            return 0
+        return self.rss - self.base_rss
+
+    def run(self, src_code: str, scope: Dict) -> JobResult:
+        """ Execute the code in the worker and wait for the result """
+        self.jobs += 1
+        try:
+            self.conn.send((src_code, scope))
+            output, error, rss = self.conn.recv()
+        except (EOFError, OSError):
+            self.broken = True
+            self.process.join(1.0)
+            return None, "Worker process terminated (exit code {})".format(
+                self.process.exitcode)
+
+        if self.base_rss is None:
+            self.base_rss = rss
+        self.rss = rss
+        return output, error
+
+    def terminate(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+
+    def close(self, timeout: float = 1.0) -> None:
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (EOFError, OSError):
+                pass
+            self.process.join(timeout)
+            self.terminate()
+        self.process.join(timeout)
+        self.conn.close()
+
+
+class PythonWorkerPool:
+    """ Keeps pre-forked worker processes for PythonProcVM, so that subtasks
+    do not pay for interpreter start-up and manager server set-up.
+
+    Workers are replaced after max_jobs jobs, when their resident memory grew
+    by more than max_memory_growth bytes, or when they died. Modules imported
+    by a job stay loaded in the worker; scopes are not shared between jobs.
+    """
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 size: int = 1,
+                 max_jobs: int = WORKER_MAX_JOBS,
+                 max_memory_growth: int = WORKER_MAX_MEMORY_GROWTH,
+                 memory_limit: Optional[int] = None) -> None:
+        self.size = max(size, 1)
+        self.max_jobs = max_jobs
+        self.max_memory_growth = max_memory_growth
+        self.memory_limit = memory_limit
+
+        self._lock = threading.Lock()
+        self._idle: Deque[PythonWorker] = collections.deque()
+        self._busy: List[PythonWorker] = []
+        self._closed = False
+
+        self.stats = dict(started=0, recycled=0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._idle) + len(self._busy)
+
+    @property
+    def idle(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def fill(self) -> None:
+        """ Pre-fork workers up to the pool size """
+        while True:
+            with self._lock:
+                if self._closed or \
+                        len(self._idle) + len(self._busy) >= self.size:
+                    return
+                self._idle.append(self._start_worker())
+
+    def acquire(self) -> PythonWorker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Python worker pool is closed")
+            worker = self._idle.popleft() if self._idle \
+                else self._start_worker()
+            self._busy.append(worker)
+            return worker
+
+    def release(self, worker: PythonWorker) -> None:
+        recycle = not worker.alive \
+            or worker.jobs >= self.max_jobs \
+            or worker.memory_growth > self.max_memory_growth
+
+        with self._lock:
+            if worker in self._busy:
+                self._busy.remove(worker)
+            keep = not (recycle or self._closed) \
+                and len(self._idle) + len(self._busy) < self.size
+            if keep:
+                self._idle.append(worker)
+
+        if not keep:
+            if recycle:
+                logger.debug("Recycling Python worker. jobs=%r, growth=%r",
+                             worker.jobs, worker.memory_growth)
+                self.stats['recycled'] += 1
+            worker.close()
+            self.fill()
+
+    def run(self, src_code: str, scope: Dict) -> JobResult:
+        worker = self.acquire()
+        try:
+            return worker.run(src_code, scope)
+        finally:
+            self.release(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers = list(self._idle) + self._busy
+            self._idle.clear()
+            self._busy = []
+
+        for worker in workers:
+            worker.close()
+
+    def _start_worker(self) -> PythonWorker:
+        self.stats['started'] += 1
+        return PythonWorker(self.memory_limit)
@@ -0,0 +1,157 @@
+import contextlib
+import functools
+import logging
+import mmap
+import os
+import tempfile
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bytes-like outputs of pooled jobs of at least this size are returned as
+# SharedResults
+SHARE_THRESHOLD = 64 * 1024
+
+_BYTES_LIKE = (bytes, bytearray, memoryview)
+
+
+class SharedResult:
+    """ Payload of a job result kept in a memory-mapped file.
+
+    Only the path and the size are pickled, so a SharedResult crosses the
+    pipe of a pooled worker or the manager proxy of PythonProcVM without the
+    payload. The file is created in the task's temporary directory, where
+    the result packager reads it as any other result file.
+
+    Lifecycle: the job creates the result and writes the payload through
+    view(), the task thread claims its path for the packager, or release()
+    removes the file when the result is dropped.
+    """
+    __slots__ = ('path', 'size')
+
+    def __init__(self, path: str, size: int) -> None:
+        self.path = path
+        self.size = size
+
+    @classmethod
+    def create(cls, size: int,
+               directory: Optional[str] = None) -> 'SharedResult':
+        fd, path = tempfile.mkstemp(prefix='result_', suffix='.bin',
+                                    dir=directory)
+        try:
+            os.ftruncate(fd, size)
+        except OSError:
+            os.close(fd)
+            os.remove(path)
+            raise
+        os.close(fd)
+        return cls(path, size)
+
+    @classmethod
+    def from_buffer(cls, data, directory: Optional[str] = None) \
+            -> 'SharedResult':
+        """ Writes a bytes-like object to a new shared result """
+        source = memoryview(data).cast('B')
+        try:
+            shared = cls.create(source.nbytes, directory)
+            with shared.view() as target:
+                target[:] = source
+        finally:
+            source.release()
+        return shared
+
+    @contextlib.contextmanager
+    def view(self, writable: bool = True) -> Iterator[memoryview]:
+        """ Maps the payload into memory, the view is released on exit """
+        if not self.size:
+            # Empty files can't be mapped
+            yield memoryview(bytearray() if writable else b'')
+            return
+
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        with open(self.path, 'r+b' if writable else 'rb') as f, \
+                mmap.mmap(f.fileno(), self.size, access=access) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def claim(self) -> str:
+        """ Hands the file over to the caller, who becomes responsible for
+        removing it """
+        return self.path
+
+    def release(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            logger.warning("Can't remove shared result %r: %r",
+                           self.path, err)
+
+    def __enter__(self) -> 'SharedResult':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release()
+
+    def __reduce__(self):
+        return SharedResult, (self.path, self.size)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SharedResult) \
+            and self.path == other.path and self.size == other.size
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __repr__(self) -> str:
+        return '<SharedResult: {!r}, size={}>'.format(self.path, self.size)
+
+
+def factory(directory: Optional[str]) -> Callable[[int], SharedResult]:
+    """ Returns SharedResult.create for the given directory, as exposed to
+    the job code """
+    return functools.partial(SharedResult.create, directory=directory)
+
+
+def _map(obj: Any, fn: Callable[[Any], Any]) -> Any:
+    """ Applies fn to obj or to the items of dicts, lists and tuples """
+    # Subclasses, e.g. named tuples, are left intact
+    if type(obj) is dict:  # pylint: disable=unidiomatic-typecheck
+        return {key: _map(value, fn) for key, value in obj.items()}
+    if type(obj) in (list, tuple):  # pylint: disable=unidiomatic-typecheck
+        return type(obj)(_map(value, fn) for value in obj)
+    return fn(obj)
+
+
+def share(output: Any, directory: Optional[str] = None,
+          threshold: Optional[int] = None) -> Any:
+    """ Replaces large bytes-like objects in the output of a job with
+    SharedResults. Called in the worker process before the output is sent """
+    if threshold is None:
+        threshold = SHARE_THRESHOLD
+
+    def share_buffer(obj):
+        if isinstance(obj, _BYTES_LIKE) and \
+                memoryview(obj).nbytes >= threshold:
+            return SharedResult.from_buffer(obj, directory)
+        return obj
+    return _map(output, share_buffer)
+
+
+def claim(result: Any) -> Any:
+    """ Replaces SharedResults in the result with the paths of their files """
+    return _map(result, lambda obj: obj.claim()
+                if isinstance(obj, SharedResult) else obj)
+
+
+def release(result: Any) -> None:
+    """ Removes the files of SharedResults in the result """
+    def release_shared(obj):
+        if isinstance(obj, SharedResult):
+            obj.release()
+        return obj
+    _map(result, release_shared)
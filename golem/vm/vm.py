@@ -3,6 +3,7 @@ import logging
 import abc
 import multiprocessing as mp
 
+from . import sharedresult
 from .memorychecker import MemoryChecker
 
 logger = logging.getLogger(__name__)
@@ -95,13 +96,41 @@ class PythonProcVM(GolemVM):
         return scope.get("output"), scope.get('error')
 
 
+class PooledPythonProcVM(GolemVM):
+    """ Golem Virtual Machine that executes python code in a long-lived
+    worker process taken from a PythonWorkerPool.
+    """
+    def __init__(self, pool):
+        GolemVM.__init__(self)
+        self.pool = pool
+        self.worker = None
+
+    def end_comp(self):
+        worker = self.worker
+        if worker:
+            worker.terminate()
+
+    def _interpret(self):
+        del self.scope['taskProgress']
+        self.worker = self.pool.acquire()
+        try:
+            return self.worker.run(self.src_code, self.scope)
+        finally:
+            self.pool.release(self.worker)
+            self.worker = None
+
+
 def exec_code(src_code, scope_manager):
     """ Simple method that is executed by process in PythonProcVm. After execution computation results should be saved
     in scope_manager["output"] and potential error's in scope_manager["error"].
+    The output is returned as is, the code may opt in to passing a large
+    payload through a file by creating it with shared_result(size).
     :param str src_code: python code that should be executed
     :param Manager scope_manager: Manager class from multiprocessing
     """
     scope = dict(scope_manager)
+    directory = scope.get("tmp_path")
+    scope["shared_result"] = sharedresult.factory(directory)
     try:
         exec(src_code, scope)
     except Exception as err:
@@ -0,0 +1,144 @@
+import os
+import threading
+
+import psutil
+import pytest
+
+import apps.blender.resources.blenderloganalyser as bla
+
+MB = 1024 * 1024
+SIZES = [MB, 16 * MB, 256 * MB, 1024 * MB]
+
+HEADER = """Blender 2.79 (sub 0) (hash f4dc9f9d68b built 2018-02-20 12:43:05)
+read blend: /golem/resources/scene.blend
+Warning: Path '/home/user/textures/wood.png' not found
+Info: Resolution: 1920 x 1080
+Info: File format: .png
+Info: Filepath: /golem/output/
+Info: Frames: 1-250;1
+Info: Engine: CYCLES
+Info: Samples: 400
+"""
+STATUS = ("Fra:{frame} Mem:255.24M (0.00M, Peak 858.34M) | Time:01:04.20 | "
+          "Remaining:12:31.40 | Mem:31.12M, Peak:31.12M | Scene, RenderLayer "
+          "| Path Tracing Tile {tile}/240, Sample {sample}/400\n")
+WARNING = "Warning: Path '/home/user/textures/grass.png' not found\n"
+FOOTER = """Fra:250 Mem:255.24M (0.00M, Peak 858.34M) | Time:01:04.20 | Finished
+Saved: '/golem/output/scene_0250.png'
+ Time: 13:35.60 (Saving: 00:00.21)
+
+Blender quit
+"""
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+class RSSMonitor(threading.Thread):
+    """ Samples the resident memory of the process """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.stopped = threading.Event()
+        self.base = self.process.memory_info().rss
+        self.peak = self.base
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def stop(self) -> int:
+        """ Returns the peak growth of resident memory """
+        self.stopped.set()
+        self.join()
+        return self.peak - self.base
+
+
+@pytest.fixture(scope='module', params=SIZES,
+                ids=lambda size: '{}MB'.format(size // MB))
+def log_path(request, tmpdir_factory):
+    """ A verbose log of a long Cycles render, of about the given size """
+    path = str(tmpdir_factory.mktemp('log').join('stdout.log'))
+    block = WARNING + "".join(
+        STATUS.format(frame=frame, tile=tile, sample=sample)
+        for frame in range(1, 3) for tile in range(1, 5)
+        for sample in range(1, 401, 50))
+    with open(path, "w") as log_file:
+        log_file.write(HEADER)
+        written = len(HEADER) + len(FOOTER)
+        while written < request.param:
+            log_file.write(block)
+            written += len(block)
+        log_file.write(FOOTER)
+    yield path
+    os.remove(path)
+
+
+def analyse_whole_log(path, return_data):
+    """ Analysis as done before BlenderLogAnalyser, with the whole log in
+    memory and searched once per value """
+    with open(path, "r") as f:
+        log_content = f.read()
+
+    warnings = {}
+    missing_files = bla.find_missing_files(log_content)
+    if missing_files:
+        warnings['missing_files'] = missing_files
+    wrong_engine = bla.find_wrong_renderer_warning(log_content)
+    if wrong_engine:
+        warnings['wrong_engine'] = wrong_engine
+    if warnings:
+        return_data["warnings"] = warnings
+
+    rendering_time = bla.find_rendering_time(log_content)
+    if rendering_time:
+        return_data["rendering_time"] = str(rendering_time)
+    output_path = bla.find_filepath(log_content)
+    if output_path:
+        return_data["output_path"] = output_path
+    frames = bla.find_frames(log_content)
+    if frames:
+        return_data["frames"] = frames
+    resolution = bla.find_resolution(log_content)
+    if resolution:
+        return_data["resolution"] = resolution
+    file_format = bla.find_file_format(log_content)
+    if file_format:
+        return_data["file_format"] = file_format
+    engine_type = bla.find_engine_type(log_content)
+    if engine_type:
+        return_data['engine_type'] = engine_type
+        if engine_type == "CYCLES":
+            samples_pp = bla.find_samples_for_scenes(log_content)
+            if samples_pp:
+                return_data['samples'] = samples_pp
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('mode', ['whole', 'streaming'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_log_analysis(benchmark, log_path, mode):
+    # pylint: disable=redefined-outer-name
+    analyse = analyse_whole_log if mode == 'whole' else bla.analyse_log_file
+    results = []
+    peaks = []
+
+    def run():
+        return_data = dict()
+        monitor = RSSMonitor()
+        monitor.start()
+        analyse(log_path, return_data)
+        peaks.append(monitor.stop())
+        results.append(return_data)
+
+    large = os.path.getsize(log_path) >= 256 * MB
+    benchmark.pedantic(run, rounds=1 if large else 3)
+    benchmark.extra_info['peak_rss_growth'] = max(peaks)
+
+    return_data = results[-1]
+    assert return_data['rendering_time'] == '815.6'
+    assert return_data['samples'] == '400'
+    assert len(return_data['warnings']['missing_files']) == 2
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from unittest import TestCase
 
 import apps.blender.resources.blenderloganalyser as bla
@@ -70,3 +71,97 @@ class TestBlenderLogAnalyser(TestCase):
 
         filepath = bla.find_filepath("No filepath here")
         assert filepath is None
+
+    def test_find_frame_progress(self):
+        assert bla.find_frame_progress(
+            "Fra:3 Mem:10.00M (0.00M, Peak 10.00M) | Time:00:01.00 | "
+            "Rendered 3/12 Tiles") == (3, 0.25)
+        assert bla.find_frame_progress(
+            "Fra:3 Mem:10.00M (0.00M, Peak 10.00M) | Time:00:01.00 | "
+            "Remaining:00:02.00 | Mem:1.00M, Peak:1.00M | Scene, RenderLayer "
+            "| Path Tracing Tile 2/4, Sample 5/10") == (3, 0.375)
+        assert bla.find_frame_progress(
+            "Fra:3 Mem:10.00M (0.00M, Peak 10.00M) | Time:00:01.00 | "
+            "Scene, RenderLayer | Path Tracing Tile 2/4") == (3, 0.5)
+        assert bla.find_frame_progress(
+            "Fra:3 Mem:10.00M (0.00M, Peak 10.00M) | Time:00:01.00 | "
+            "Scene, RenderLayer | Finished") == (3, 1.0)
+        assert bla.find_frame_progress(
+            "Fra:3 Mem:10.00M (0.00M, Peak 10.00M) | Time:00:01.00 | "
+            "Scene, RenderLayer | Synchronizing object | Cube") is None
+        assert bla.find_frame_progress("Saved: /tmp/out0003.png") is None
+
+    def test_make_progress_extractor(self):
+        extract = bla.make_progress_extractor([5, 6])
+        assert extract("Blender 2.79 (sub 0)") is None
+        assert extract("Fra:5 Mem:1M | Time:00:01.00 | Rendered 1/2 Tiles") \
+            == 0.25
+        assert extract("Fra:5 Mem:1M | Time:00:01.00 | Scene | Finished") \
+            == 0.5
+        assert extract("Fra:6 Mem:1M | Time:00:01.00 | Scene | Finished") \
+            == 1.0
+
+        extract = bla.make_progress_extractor([])
+        assert extract("Fra:1 Mem:1M | Time:00:01.00 | Rendered 1/4 Tiles") \
+            == 0.25
+
+    def test_make_log_analyses(self):
+        return_data = dict()
+        bla.make_log_analyses(self._get_log_file(), return_data)
+        missing_files = return_data.pop('warnings')['missing_files']
+        assert len(missing_files) == 3
+        assert return_data == {
+            'rendering_time': '11.82',
+            'output_path': '/tmp/',
+            'frames': list(range(0, 101)),
+            'resolution': (501, 230),
+            'file_format': '.png',
+        }
+
+    def test_analyser_parts(self):
+        log_content = self._get_log_file()
+        expected = dict()
+        bla.make_log_analyses(log_content, expected)
+
+        for size in (1, 100, 4096):
+            analyser = bla.BlenderLogAnalyser()
+            for i in range(0, len(log_content), size):
+                analyser.feed(log_content[i:i + size])
+            analyser.finish()
+            return_data = dict()
+            analyser.update_return_data(return_data)
+            assert return_data == expected
+
+    def test_analyser_time_after_blank_lines(self):
+        analyser = bla.BlenderLogAnalyser()
+        for part in ("Info: Engine: CYCLES\n Time:", "\n\n", " 01:", "02.50"):
+            analyser.feed(part)
+            assert 'rendering_time' not in analyser.values
+        analyser.feed("\n")
+        assert analyser.values['rendering_time'] == 62.5
+        assert analyser.values['engine_type'] == "CYCLES"
+
+    def test_analyse_growing_log_file(self):
+        log_content = self._get_log_file()
+        half = log_content.index("Info: Frames")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "stdout.log")
+            analyser = bla.BlenderLogAnalyser()
+            with open(log_path, "w") as writer, open(log_path, "r") as reader:
+                writer.write(log_content[:half])
+                writer.flush()
+                analyser.read(reader, read_size=1000)
+                assert analyser.values['resolution'] == (501, 230)
+                assert 'frames' not in analyser.values
+
+                writer.write(log_content[half:])
+                writer.flush()
+                analyser.read(reader, read_size=1000)
+            analyser.finish()
+            return_data = dict()
+            analyser.update_return_data(return_data)
+
+            expected = dict()
+            bla.analyse_log_file(log_path, expected)
+        assert return_data == expected
+        assert return_data['frames'] == list(range(0, 101))
@@ -0,0 +1,63 @@
+import math
+import os
+
+import pytest
+
+from apps.blender.task import blenderrendertask
+from apps.blender.task.blenderrendertask import BlenderTaskTypeInfo, \
+    get_min_max_y
+
+# Subtasks of a task, each one rendering a part of a frame
+SUBTASKS = [100, 1000, 10000]
+RES_X, RES_Y = 3840, 21600
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def uncached_border_path(start, parts, res_x, res_y):
+    """ Border path as computed before SubtasksGeometry, with the offsets of
+    all parts computed for every subtask """
+    scale_factor = BlenderTaskTypeInfo.scale_factor(res_x, res_y)
+    offsets = {}
+    previous_end = 0
+    for i in range(1, parts + 1):
+        low, high = get_min_max_y(i, parts, res_y)
+        low *= scale_factor * res_y
+        high *= scale_factor * res_y
+        offsets[i] = previous_end
+        previous_end += int(math.floor(high - low))
+    offsets[parts + 1] = previous_end
+
+    x = int(math.floor(res_x * offsets[parts + 1] / res_y))
+    upper = offsets[start]
+    lower = max(0, offsets[start + 1] - 1)
+    return [(0, upper), (x, upper), (x, lower), (0, lower)]
+
+
+def cached_border_path(start, parts, res_x, res_y):
+    return blenderrendertask.get_subtasks_geometry(parts, res_x, res_y) \
+        .border_path(start)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('subtasks', SUBTASKS)
+@pytest.mark.parametrize('mode', ['uncached', 'cached'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_subtasks_borders(benchmark, mode, subtasks):
+    """ Border paths of all subtasks of a task, as returned by
+    TaskManager.get_subtasks_borders """
+    border_path = uncached_border_path if mode == 'uncached' \
+        else cached_border_path
+    # The geometry is computed when the task is created
+    blenderrendertask.generate_expected_offsets(subtasks, RES_X, RES_Y)
+
+    def borders():
+        return {start: border_path(start, subtasks, RES_X, RES_Y)
+                for start in range(1, subtasks + 1)}
+
+    result = benchmark.pedantic(borders,
+                                rounds=1 if subtasks >= 10000 else 3)
+    assert result[subtasks] == cached_border_path(subtasks, subtasks,
+                                                  RES_X, RES_Y)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from apps.blender.task.blenderrendertask import get_min_max_y
+from apps.blender.task.subtasksgeometry import SubtasksGeometry, \
+    get_min_max_y_array
+
+
+class TestGetMinMaxYArray(TestCase):
+
+    def test_same_as_get_min_max_y(self):
+        for parts in [1, 2, 3, 7, 20, 64]:
+            for res_y in [1, 7, 100, 299, 300, 1080]:
+                min_y, max_y = get_min_max_y_array(parts, res_y)
+                for part in range(1, parts + 1):
+                    self.assertEqual(
+                        (min_y[part - 1], max_y[part - 1]),
+                        get_min_max_y(part, parts, res_y))
+
+
+class TestSubtasksGeometry(TestCase):
+
+    def test_offsets(self):
+        geometry = SubtasksGeometry(3, 300, 200, 0.5)
+        self.assertEqual(geometry.expected_offsets(),
+                         {1: 0, 2: 33, 3: 66, 4: 99})
+        self.assertEqual(geometry.offset(2), 33)
+        self.assertEqual(geometry.offset(4), 99)
+        self.assertEqual(geometry.preview_x, 148)
+
+    def test_min_max_y(self):
+        geometry = SubtasksGeometry(7, 2, 300, 1.0)
+        for part in range(1, 8):
+            self.assertEqual(geometry.min_max_y(part),
+                             get_min_max_y(part, 7, 300))
+            self.assertIsInstance(geometry.min_max_y(part)[0], float)
+
+    def test_border(self):
+        geometry = SubtasksGeometry(2, 3, 4, 1.0)
+        self.assertEqual(
+            geometry.border(1),
+            [(0, 0), (3, 0), (0, 1), (3, 1),
+             (0, 0), (0, 2), (1, 0), (1, 2), (2, 0), (2, 2)])
+        self.assertEqual(geometry.border_path(1),
+                         [(0, 0), (3, 0), (3, 1), (0, 1)])
+        self.assertEqual(geometry.border_path(2),
+                         [(0, 2), (3, 2), (3, 3), (0, 3)])
+
+    def test_wrong_part(self):
+        geometry = SubtasksGeometry(2, 3, 4, 1.0)
+        for part in [0, 3]:
+            with self.assertRaises(KeyError):
+                geometry.border(part)
+            with self.assertRaises(KeyError):
+                geometry.border_path(part)
+            with self.assertRaises(KeyError):
+                geometry.min_max_y(part)
+        with self.assertRaisesRegex(KeyError, r'Part 4 out of range 1\.\.3'):
+            geometry.offset(4)
+        with self.assertRaisesRegex(KeyError, r'Part 0 out of range 1\.\.2'):
+            geometry.min_max_y(0)
+
+    def test_no_parts(self):
+        geometry = SubtasksGeometry(0, 300, 200, 0.5)
+        self.assertEqual(geometry.expected_offsets(), {1: 0})
+        self.assertEqual(geometry.preview_x, 0)
@@ -0,0 +1,139 @@
+import os
+import time
+from unittest import mock
+
+import numpy
+import psutil
+import pytest
+from PIL import Image
+
+WIDTH, HEIGHT = 3840, 2160
+CROPS = 9
+CROP_WIDTH, CROP_HEIGHT = WIDTH // 10, HEIGHT // 10
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.fixture(scope='module')
+def verifier_tools():
+    # Dependencies of the verifier image
+    for module in ('OpenEXR', 'Imath', 'cv2', 'pywt', 'sklearn'):
+        pytest.importorskip(module)
+    from apps.blender.resources.images.entrypoints.scripts import \
+        verifier_tools
+    return verifier_tools
+
+
+@pytest.fixture(scope='module')
+def subtask(tmpdir_factory, verifier_tools):
+    """ 4K EXR result of a subtask and CROPS reference crops rendered
+    from it """
+    # pylint: disable=redefined-outer-name
+    import Imath
+    import OpenEXR
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import image_cache
+
+    directory = tmpdir_factory.mktemp('subtask')
+    random = numpy.random.RandomState(0)
+    channels = {
+        c: random.random_sample((HEIGHT, WIDTH)).astype(numpy.float32)
+        for c in 'RGB'
+    }
+    result_path = str(directory.join('result.exr'))
+    header = OpenEXR.Header(WIDTH, HEIGHT)
+    header['channels'] = {
+        c: Imath.Channel(Imath.PixelType(Imath.PixelType.FLOAT))
+        for c in 'RGB'
+    }
+    output = OpenEXR.OutputFile(result_path, header)
+    output.writePixels({c: data.tobytes() for c, data in channels.items()})
+    output.close()
+
+    decoded = image_cache.decode_image(result_path)
+    crops = []
+    for i in range(CROPS):
+        x = random.randint(1, WIDTH - CROP_WIDTH - 1)
+        y = random.randint(1, HEIGHT - CROP_HEIGHT - 1)
+        crop_path = str(directory.join('crop{}.png'.format(i)))
+        Image.fromarray(image_cache.crop_array(
+            decoded, x, y, CROP_WIDTH, CROP_HEIGHT)).save(crop_path)
+        crops.append((crop_path, x, y))
+    return str(directory), result_path, crops
+
+
+def decode_through_png(img_path):
+    """ Decoding as before the image cache, through a PNG in /tmp """
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import img_format_converter
+    png_path = os.path.join('/tmp', os.path.basename(img_path))
+    if img_path.lower().endswith('.exr'):
+        img_format_converter.ConvertEXRToPNG(img_path, png_path)
+    else:
+        png_path = img_path
+    return numpy.asarray(Image.open(png_path).convert('RGB'))
+
+
+def verify(verifier_tools, subtask, shared):
+    # pylint: disable=redefined-outer-name
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import img_metrics_calculator, image_cache
+
+    directory, result_path, crops = subtask
+    cache = image_cache.ImageCache() if shared else None
+    for i, (crop_path, x, y) in enumerate(crops):
+        img_metrics_calculator.calculate_metrics(
+            crop_path, result_path, x, y,
+            metrics_output_filename=os.path.join(
+                directory, 'crop{}_metrics.txt'.format(i)),
+            image_cache=cache)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('mode', ['png_per_crop', 'decode_per_crop',
+                                  'shared_cache'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_subtask_verification(benchmark, monkeypatch, verifier_tools,
+                              subtask, mode):
+    # pylint: disable=redefined-outer-name
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import image_cache
+
+    monkeypatch.chdir(subtask[0])
+    if mode == 'png_per_crop':
+        monkeypatch.setattr(image_cache, 'decode_image', decode_through_png)
+
+    process = psutil.Process()
+    io_before = process.io_counters()
+    cpu_before = time.process_time()
+    benchmark.pedantic(verify, args=(verifier_tools, subtask,
+                                     mode == 'shared_cache'), rounds=1)
+    io_after = process.io_counters()
+
+    benchmark.extra_info['cpu_time'] = time.process_time() - cpu_before
+    benchmark.extra_info['read_bytes'] = \
+        io_after.read_chars - io_before.read_chars
+    benchmark.extra_info['written_bytes'] = \
+        io_after.write_chars - io_before.write_chars
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+def test_same_metrics(verifier_tools, subtask, tmpdir):
+    """ Sharing decoded images does not change the metrics """
+    # pylint: disable=redefined-outer-name
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import img_metrics_calculator, image_cache
+
+    _, result_path, crops = subtask
+    crop_path, x, y = crops[0]
+    paths = []
+    for decode in (decode_through_png, image_cache.decode_image):
+        with mock.patch.object(image_cache, 'decode_image', decode):
+            paths.append(img_metrics_calculator.calculate_metrics(
+                crop_path, result_path, x, y,
+                metrics_output_filename=str(tmpdir.join(decode.__name__))))
+
+    with open(paths[0]) as expected, open(paths[1]) as actual:
+        assert expected.read() == actual.read()
@@ -0,0 +1,113 @@
+import os
+
+import numpy
+import pytest
+from PIL import Image
+
+# Crop sizes used by verification of 480p, 1080p and 4K renders, and a
+# large crop
+SIZES = [(64, 48), (192, 108), (384, 216), (1024, 1024)]
+CROPS = 9
+# Modules of the metrics, imported lazily as they need the verifier image's
+# dependencies
+METRICS = ['ssim', 'psnr', 'variance', 'edges', 'wavelet',
+           'histograms_correlation', 'mass_center_distance']
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.fixture(scope='module')
+def verifier_tools():
+    # Dependencies of the verifier image
+    for module in ('cv2', 'pywt', 'scipy.ndimage'):
+        pytest.importorskip(module)
+    from apps.blender.resources.images.entrypoints.scripts import \
+        verifier_tools
+    return verifier_tools
+
+
+def make_crops(size):
+    """ A reference crop and CROPS noisy crops of the rendered scene """
+    width, height = size
+    random = numpy.random.RandomState(0)
+    reference = random.randint(0, 256, (height, width, 3)).astype(numpy.uint8)
+    crops = [
+        numpy.clip(reference + random.randint(-20, 20, reference.shape),
+                   0, 255).astype(numpy.uint8)
+        for _ in range(CROPS)
+    ]
+    return reference, crops
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('size', SIZES, ids=lambda s: '{}x{}'.format(*s))
+@pytest.mark.parametrize('metric', METRICS)
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_metric(benchmark, verifier_tools, metric, size):
+    """ A single metric comparing two crops """
+    # pylint: disable=redefined-outer-name
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import imgmetrics
+    metric_class, = [
+        cls for cls in imgmetrics.ImgMetrics.get_metric_classes()
+        if cls.__module__.endswith('.' + metric)
+    ]
+    reference, crops = make_crops(size)
+    image1, image2 = Image.fromarray(reference), Image.fromarray(crops[0])
+    benchmark(metric_class.compute_metrics, image1, image2)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('size', SIZES, ids=lambda s: '{}x{}'.format(*s))
+@pytest.mark.parametrize('mode', ['separate', 'fused'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_all_metrics(benchmark, verifier_tools, mode, size):
+    """ All metrics comparing two crops """
+    # pylint: disable=redefined-outer-name
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import fused_metrics, imgmetrics
+    reference, crops = make_crops(size)
+    image1, image2 = Image.fromarray(reference), Image.fromarray(crops[0])
+    if mode == 'fused':
+        metric_classes = [fused_metrics.FusedMetrics]
+    else:
+        metric_classes = imgmetrics.ImgMetrics.get_metric_classes()
+
+    def compare():
+        for metric_class in metric_classes:
+            metric_class.compute_metrics(image1, image2)
+
+    benchmark(compare)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('size', SIZES, ids=lambda s: '{}x{}'.format(*s))
+@pytest.mark.parametrize('mode', ['separate', 'fused'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_verification_crops(benchmark, verifier_tools, mode, size):
+    """ All metrics comparing the reference crop with every offset crop of
+    the scene, as done by calculate_metrics when no crop matches """
+    # pylint: disable=redefined-outer-name
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+        import img_metrics_calculator, imgmetrics
+    from apps.blender.resources.images.entrypoints.scripts.verifier_tools.\
+        fused_metrics import MetricImage
+    reference, crops = make_crops(size)
+    metric_classes = imgmetrics.ImgMetrics.get_metric_classes()
+
+    def separate():
+        reference_image = Image.fromarray(reference)
+        for crop in crops:
+            img_metrics_calculator.compare_images(
+                reference_image, Image.fromarray(crop), metric_classes)
+
+    def fused():
+        reference_image = MetricImage(reference)
+        for crop in crops:
+            img_metrics_calculator.compare_metric_images(
+                reference_image, MetricImage(crop))
+
+    benchmark.pedantic(separate if mode == 'separate' else fused,
+                       rounds=1 if size[0] * size[1] > 10 ** 6 else 3)
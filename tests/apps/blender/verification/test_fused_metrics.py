@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+import numpy
+import pytest
+from PIL import Image
+
+from apps.blender.resources.images.entrypoints.\
+    scripts.verifier_tools.mass_center_distance import \
+    MetricMassCenterDistance
+
+
+def loop_mass_centers(pixels):
+    """ Mass centers computed pixel by pixel """
+    height, width, channels = pixels.shape
+    results = dict()
+    for channel_index in range(channels):
+        mass_center_x = mass_center_y = total_mass = 0
+        for x in range(width):
+            for y in range(height):
+                mass = int(pixels[y, x, channel_index])
+                mass_center_x += mass * x
+                mass_center_y += mass * y
+                total_mass += mass
+        if total_mass == 0:
+            results[channel_index] = 0.5, 0.5
+        else:
+            results[channel_index] = (
+                mass_center_x / (float(total_mass) * width),
+                mass_center_y / (float(total_mass) * height))
+    return results
+
+
+class TestMassCenters(TestCase):
+
+    def test_same_as_loop(self):
+        random = numpy.random.RandomState(0)
+        pixels = random.randint(0, 256, (23, 31, 3)).astype(numpy.uint8)
+        pixels[..., 2] = 0
+        self.assertEqual(
+            MetricMassCenterDistance.compute_array_mass_centers(pixels),
+            loop_mass_centers(pixels))
+
+    def test_identical_images(self):
+        image = Image.new('RGB', (16, 8), (10, 20, 30))
+        self.assertEqual(
+            MetricMassCenterDistance.compute_metrics(image, image),
+            {'max_x_mass_center_distance': 0,
+             'max_y_mass_center_distance': 0})
+
+
+class TestFusedMetrics(TestCase):
+
+    def setUp(self):
+        # Dependencies of the verifier image
+        for module in ('cv2', 'pywt', 'scipy.ndimage'):
+            pytest.importorskip(module)
+        from apps.blender.resources.images.entrypoints.scripts.verifier_tools \
+            import fused_metrics, imgmetrics
+        self.fused_metrics = fused_metrics
+        self.metric_classes = imgmetrics.ImgMetrics.get_metric_classes()
+
+        random = numpy.random.RandomState(0)
+        self.reference = random.randint(0, 256, (54, 96, 3)) \
+            .astype(numpy.uint8)
+        noise = random.randint(-20, 20, self.reference.shape)
+        self.crops = [
+            numpy.clip(self.reference + noise, 0, 255).astype(numpy.uint8),
+            self.reference.copy(),
+            numpy.zeros_like(self.reference),
+        ]
+
+    def separate_metrics(self, pixels1, pixels2):
+        image1, image2 = Image.fromarray(pixels1), Image.fromarray(pixels2)
+        result = dict()
+        for metric_class in self.metric_classes:
+            result.update(metric_class.compute_metrics(image1, image2))
+        return result
+
+    def assert_same_metrics(self, actual, expected):
+        self.assertEqual(set(actual), set(expected))
+        for label, value in expected.items():
+            self.assertIs(type(actual[label]), type(value), label)
+            self.assertEqual(repr(actual[label]), repr(value), label)
+
+    def test_same_as_separate_metrics(self):
+        FusedMetrics = self.fused_metrics.FusedMetrics
+        for crop in self.crops:
+            self.assert_same_metrics(
+                FusedMetrics.compute_metrics(Image.fromarray(self.reference),
+                                             Image.fromarray(crop)),
+                self.separate_metrics(self.reference, crop))
+
+    def test_shared_reference(self):
+        MetricImage = self.fused_metrics.MetricImage
+        reference = MetricImage(self.reference)
+        for crop in self.crops + self.crops:
+            self.assert_same_metrics(
+                self.fused_metrics.FusedMetrics.compare(reference,
+                                                        MetricImage(crop)),
+                self.separate_metrics(self.reference, crop))
+
+    def test_labels(self):
+        self.assertEqual(
+            set(self.fused_metrics.FusedMetrics.get_labels()),
+            {label for metric_class in self.metric_classes
+             for label in metric_class.get_labels()})
+
+    def test_sizes_differ(self):
+        MetricImage = self.fused_metrics.MetricImage
+        with self.assertRaises(ValueError):
+            self.fused_metrics.FusedMetrics.compare(
+                MetricImage(self.reference), MetricImage(self.reference[1:]))
@@ -0,0 +1,67 @@
+import os
+from unittest import mock
+
+import numpy
+from PIL import Image
+
+from apps.blender.resources.images.entrypoints.\
+    scripts.verifier_tools import image_cache
+from apps.blender.resources.images.entrypoints.\
+    scripts.verifier_tools.image_cache import CROP_OFFSETS, ImageCache
+from golem.testutils import TempDirFixture
+
+
+class TestImageCache(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        random = numpy.random.RandomState(0)
+        self.pixels = random.randint(0, 256, (40, 60, 4), dtype=numpy.uint8)
+        self.image = Image.fromarray(self.pixels, 'RGBA')
+        self.path = os.path.join(self.tempdir, 'image.png')
+        self.image.save(self.path)
+        self.cache = ImageCache()
+
+    def assert_pil_crops(self, x, y, width, height):
+        rgb = self.image.convert('RGB')
+        crops = self.cache.get_crops(self.path, x, y, width, height)
+        self.assertEqual(len(crops), len(CROP_OFFSETS))
+        for crop, (x_offset, y_offset) in zip(crops, CROP_OFFSETS):
+            expected = rgb.crop((x + x_offset, y + y_offset,
+                                 x + width + x_offset,
+                                 y + height + y_offset))
+            numpy.testing.assert_array_equal(crop, numpy.asarray(expected))
+
+    def test_decode(self):
+        image = self.cache.get(self.path)
+        self.assertEqual(image.shape, (40, 60, 3))
+        numpy.testing.assert_array_equal(image, self.pixels[..., :3])
+
+    def test_decoded_once(self):
+        with mock.patch.object(image_cache, 'decode_image',
+                               wraps=image_cache.decode_image) as decode:
+            self.cache.get_crops(self.path, 10, 10, 8, 8)
+            self.cache.get_crops(self.path, 20, 20, 8, 8)
+            self.cache.get(os.path.join(self.tempdir, '.', 'image.png'))
+        decode.assert_called_once_with(self.path)
+
+        self.cache.clear()
+        self.assertEqual(self.cache._images, {})  # noqa pylint: disable=protected-access
+
+    def test_crops(self):
+        self.assert_pil_crops(10, 20, 8, 6)
+
+    def test_crops_are_views(self):
+        image = self.cache.get(self.path)
+        for crop in self.cache.get_crops(self.path, 10, 20, 8, 6):
+            self.assertTrue(numpy.shares_memory(crop, image))
+
+    def test_crops_at_borders(self):
+        self.assert_pil_crops(0, 0, 8, 6)
+        self.assert_pil_crops(52, 34, 8, 6)
+        self.assert_pil_crops(0, 0, 60, 40)
+
+    def test_crop_outside(self):
+        crop = image_cache.crop_array(self.cache.get(self.path),
+                                      100, 100, 4, 4)
+        numpy.testing.assert_array_equal(crop, numpy.zeros((4, 4, 3)))
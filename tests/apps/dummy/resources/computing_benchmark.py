@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from apps.dummy.resources.code_dir import computing
+
+# Fraction of hashes accepted is (2 ** 32 - difficulty) / 2 ** 32
+DIFFICULTIES = [0xff000000, 0xfff00000, 0xffff0000]
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_find_pow(benchmark, difficulty):
+    benchmark(computing.find_pow, 'input data', difficulty, 16)
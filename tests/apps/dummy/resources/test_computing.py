@@ -1,2 +1,33 @@
-#DOIT
-pass
+import hashlib
+import random
+from unittest import TestCase
+
+from apps.dummy.resources.code_dir import computing
+
+
+def reference_find_pow(input_data, difficulty, result_size):
+    """ The original solver, hashing every candidate from scratch """
+    num_bits = result_size * 4
+    solution = (1 << (num_bits - 1)) | random.getrandbits(num_bits - 1)
+    while True:
+        sha = hashlib.sha256()
+        sha.update(input_data.encode())
+        sha.update(('%x' % solution).encode())
+        if int(sha.hexdigest()[0:8], 16) >= difficulty:
+            return solution
+        solution += 1
+
+
+class TestFindPow(TestCase):
+
+    def test_same_as_reference(self):
+        for seed in range(10):
+            for difficulty in (0, 0xff000000, 0xfff00000):
+                random.seed(seed)
+                expected = reference_find_pow('input', difficulty, 16)
+                random.seed(seed)
+                solution = computing.find_pow('input', difficulty, 16)
+
+                assert solution == expected
+                assert computing.check_pow(solution, 'input', difficulty)
+                assert len('%x' % solution) == 16
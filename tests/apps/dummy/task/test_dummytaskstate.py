@@ -75,3 +75,10 @@ class TestDummyTaskDefinition(TempDirFixture):
             assert os.path.isdir(os.path.join(td.tmp_dir, "data"))
             assert os.path.commonpath(list(td.resources)) == self.tempdir
             assert td.resources == set(list_dir_recursive(td.tmp_dir))
+
+            # The solver is sent with the task, it isn't a part of the image
+            computing = os.path.join(td.tmp_dir, "code", "computing.py")
+            assert computing in td.resources
+            with open(computing) as sent, \
+                    open(os.path.join(td.code_dir, "computing.py")) as local:
+                assert sent.read() == local.read()
@@ -0,0 +1,100 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from golem.client import Client
+from golem.database import Database
+from golem.ethereum.paymentskeeper import PaymentsKeeper
+from golem.model import db, DB_FIELDS, DB_MODELS, Payment, PaymentDetails, \
+    PaymentStatus
+from golem.task.taskserver import TaskServer
+
+TASKS = 1000
+SUBTASKS = 1000
+BATCH_SIZE = 500
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def subtask_ids(task_id: str):
+    return ['{}-{}'.format(task_id, s) for s in range(SUBTASKS)]
+
+
+@pytest.fixture(scope='module', autouse=True)
+def database(tmpdir_factory):
+    database = Database(db, fields=DB_FIELDS, models=DB_MODELS,
+                        db_dir=str(tmpdir_factory.mktemp('database')))
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope='module')
+def client(database):  # pylint: disable=redefined-outer-name,unused-argument
+    """ Client with TASKS tasks, payments of all their subtasks have been
+        confirmed """
+    task_manager = Mock(tasks={}, tasks_states={}, subtask2task_mapping={})
+    rows = []
+    for t in range(TASKS):
+        task_id = 'task-{}'.format(t)
+        subtasks = subtask_ids(task_id)
+        task_manager.tasks[task_id] = Mock()
+        task_manager.tasks_states[task_id] = Mock(
+            subtask_states=dict.fromkeys(subtasks))
+        task_manager.subtask2task_mapping.update(
+            dict.fromkeys(subtasks, task_id))
+        rows.extend(
+            dict(subtask=subtask_id, payee=b'\x01' * 20, value=10 ** 18,
+                 details=PaymentDetails(fee=10 ** 14),
+                 status=PaymentStatus.confirmed)
+            for subtask_id in subtasks)
+
+    with db.atomic():
+        for offset in range(0, len(rows), BATCH_SIZE):
+            Payment.insert_many(rows[offset:offset + BATCH_SIZE]).execute()
+
+    task_manager.get_task_dict = lambda task_id: dict(
+        id=task_id, status='Finished', estimated_cost=10 ** 21,
+        estimated_fee=10 ** 17)
+
+    client = Client.__new__(Client)
+    client.task_server = Mock(spec=TaskServer, task_manager=task_manager)
+    client.transaction_system = PaymentsKeeper()
+    return client
+
+
+def get_tasks_per_task(client):  # pylint: disable=redefined-outer-name
+    """ One payments query per task, as before the batched listing """
+    keeper = client.transaction_system
+    for task_id in client.task_server.task_manager.tasks:
+        keeper.get_subtasks_payments(subtask_ids(task_id))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_payments_per_task(benchmark, client):
+    benchmark.pedantic(get_tasks_per_task, args=(client, ), rounds=1)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+def test_get_tasks(benchmark, client):
+    tasks = benchmark(client.get_tasks)
+    assert len(tasks) == TASKS
+    assert tasks[0]['cost'] == str(SUBTASKS * 10 ** 18)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=10, warmup=False)
+def test_get_tasks_page(benchmark, client):
+    tasks = benchmark(client.get_tasks, offset=TASKS // 2, limit=20)
+    assert len(tasks) == 20
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=10, warmup=False)
+def test_get_tasks_without_payments(benchmark, client):
+    tasks = benchmark(client.get_tasks, fields=['id', 'status'])
+    assert len(tasks) == TASKS
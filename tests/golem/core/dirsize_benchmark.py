@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from golem.core.dirsize import DirSizeTracker
+from golem.core.fileshelper import du, get_dir_size
+
+FILES = 100000
+FILES_PER_DIR = 1000
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.fixture(scope='module')
+def tree(tmpdir_factory):
+    """ Directory of FILES small files, FILES_PER_DIR in each subdirectory """
+    root = tmpdir_factory.mktemp('tree')
+    for i in range(FILES):
+        directory = root.join('dir{}'.format(i // FILES_PER_DIR))
+        directory.ensure(dir=True)
+        directory.join('file{}'.format(i)).write('data')
+    return str(root)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+class TestDirSize:
+    # pylint: disable=redefined-outer-name,no-self-use
+
+    def test_get_dir_size(self, benchmark, tree):
+        benchmark.pedantic(get_dir_size, args=(tree, ), rounds=3)
+
+    def test_du(self, benchmark, tree):
+        benchmark.pedantic(du, args=(tree, ), rounds=3)
+
+    def test_tracker_scan(self, benchmark, tree):
+        def scan():
+            DirSizeTracker().get_size(tree)
+        benchmark.pedantic(scan, rounds=3)
+
+    def test_tracker_size(self, benchmark, tree):
+        tracker = DirSizeTracker()
+        assert tracker.get_size(tree) == get_dir_size(tree)
+        benchmark(tracker.get_size, tree)
+
+    def test_tracker_update(self, benchmark, tree):
+        tracker = DirSizeTracker()
+        tracker.get_size(tree)
+        path = os.path.join(tree, 'dir0', 'new')
+
+        def write_and_update():
+            with open(path, 'w') as f:
+                f.write('data')
+            tracker.update(path)
+
+        benchmark(write_and_update)
+        assert tracker.get_size(tree) == get_dir_size(tree)
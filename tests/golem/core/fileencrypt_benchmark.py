@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from golem.core.fileencrypt import AESFileEncryptor, AESGCMFileEncryptor, \
+    FileEncryptor
+
+MiB = 1024 * 1024
+SIZES = [1 * MiB, 64 * MiB, 1024 * MiB, 4096 * MiB]
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module', params=SIZES, ids=lambda s: f'{s // MiB}MiB')
+def plaintext(request, tmpdir_factory):
+    path = str(tmpdir_factory.mktemp('fileencrypt').join('plain'))
+    block = os.urandom(MiB)
+    with open(path, 'wb') as f:
+        for _ in range(request.param // MiB):
+            f.write(block)
+    yield path
+    os.remove(path)
+
+
+def round_trip(encryptor, path, secret):
+    encryptor.encrypt(path, path + '.enc', secret)
+    encryptor.decrypt(path + '.enc', path + '.dec', secret)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('encryptor', [AESFileEncryptor, AESGCMFileEncryptor],
+                         ids=['cbc', 'gcm'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_encryption_throughput(benchmark, plaintext, encryptor):
+    secret = FileEncryptor.gen_secret(10, 20)
+    benchmark.pedantic(round_trip, args=(encryptor, plaintext, secret),
+                       rounds=3)
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from golem.core.simplehash import FileHashCache, FileHasher, SimpleHash
+
+MiB = 1024 * 1024
+SMALL_FILES = 10000
+SMALL_FILE_SIZE = 4096
+LARGE_FILES = 3
+LARGE_FILE_SIZE = 2048 * MiB
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+def write_file(path, size):
+    block = os.urandom(min(size, MiB))
+    with open(path, 'wb') as f:
+        for _ in range(size // len(block)):
+            f.write(block)
+
+
+@pytest.fixture(scope='module')
+def small_files(tmpdir_factory):
+    root = tmpdir_factory.mktemp('small')
+    paths = [str(root.join('file_{}'.format(i))) for i in range(SMALL_FILES)]
+    for path in paths:
+        write_file(path, SMALL_FILE_SIZE)
+    return paths
+
+
+@pytest.fixture(scope='module')
+def large_files(tmpdir_factory):
+    root = tmpdir_factory.mktemp('large')
+    paths = [str(root.join('file_{}'.format(i))) for i in range(LARGE_FILES)]
+    for path in paths:
+        write_file(path, LARGE_FILE_SIZE)
+    yield paths
+    for path in paths:
+        os.remove(path)
+
+
+def hash_sequentially(paths):
+    return {path: SimpleHash.hash_file(path) for path in paths}
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=3, warmup=False)
+@pytest.mark.parametrize('files', ['small_files', 'large_files'])
+class TestFileHashing:
+
+    def test_simple_hash(self, benchmark, request, files):
+        paths = request.getfixturevalue(files)
+        benchmark.pedantic(hash_sequentially, args=(paths,), rounds=3)
+
+    def test_hasher_cold(self, benchmark, request, files):
+        paths = request.getfixturevalue(files)
+        benchmark.pedantic(FileHasher().hash_files, args=(paths,), rounds=3)
+
+    def test_hasher_warm(self, benchmark, request, tmpdir, files):
+        paths = request.getfixturevalue(files)
+        cache = FileHashCache(str(tmpdir.join('hashes.db')))
+        hasher = FileHasher(cache)
+        hasher.hash_files(paths)
+        try:
+            benchmark.pedantic(hasher.hash_files, args=(paths,), rounds=3)
+        finally:
+            cache.close()
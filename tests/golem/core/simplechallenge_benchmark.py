@@ -0,0 +1,36 @@
+import os
+from itertools import count
+
+import pytest
+
+from golem.core.simplechallenge import solve_challenge
+
+DIFFICULTIES = [8, 12, 16, 20]
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def solver(difficulty, workers):
+    challenges = count()
+
+    def solve():
+        challenge = 'challenge {}'.format(next(challenges))
+        return solve_challenge(challenge, difficulty, workers=workers)
+
+    return solve
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_solve_challenge_single_process(benchmark, difficulty):
+    benchmark(solver(difficulty, workers=1))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_solve_challenge_parallel(benchmark, difficulty):
+    benchmark(solver(difficulty, workers=os.cpu_count()))
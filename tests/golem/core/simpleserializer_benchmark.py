@@ -0,0 +1,72 @@
+import copy
+import os
+
+import pytest
+
+from apps.core.task.coretaskstate import TaskDefinition
+from golem.core.simpleserializer import CompiledDictCoder, DictCoder
+from golem.task.taskstate import SubtaskState, SubtaskStatus, TaskState
+
+DEFINITIONS = 1000
+SUBTASKS = 10000
+CODERS = [DictCoder, CompiledDictCoder]
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def task_definitions():
+    definitions = []
+    for i in range(DEFINITIONS):
+        definition = TaskDefinition()
+        definition.task_id = 'task-{}'.format(i)
+        definition.name = 'Task {}'.format(i)
+        definition.subtasks_count = 100
+        definition.resources = ['/res/{}/file{}'.format(i, j)
+                                for j in range(10)]
+        definition.options.output_path = '/out/{}'.format(i)
+        definitions.append(definition)
+    return definitions
+
+
+def task_state():
+    state = TaskState()
+    for i in range(SUBTASKS):
+        subtask_state = SubtaskState()
+        subtask_state.subtask_id = 'subtask-{}'.format(i)
+        subtask_state.status = SubtaskStatus.finished
+        subtask_state.extra_data = {'start_task': i, 'end_task': i}
+        state.subtask_states[subtask_state.subtask_id] = subtask_state
+    state.outputs = ['/out/{}.png'.format(i) for i in range(SUBTASKS)]
+    return state
+
+
+@pytest.fixture(scope='module', params=['definitions', 'state'])
+def graph(request):
+    if request.param == 'definitions':
+        return task_definitions()
+    return task_state()
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('coder', CODERS, ids=lambda c: c.__name__)
+@pytest.mark.benchmark(min_rounds=5, warmup=True)
+def test_to_dict(benchmark, graph, coder):
+    result = benchmark(coder.to_dict, graph)
+    assert repr(result) == repr(DictCoder.to_dict(graph))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('coder', CODERS, ids=lambda c: c.__name__)
+@pytest.mark.benchmark(min_rounds=5, warmup=True)
+def test_from_dict(benchmark, graph, coder):
+    # Task statuses are enums, which cannot be restored from typed dicts
+    dict_repr = DictCoder.to_dict(graph,
+                                  typed=not isinstance(graph, TaskState))
+
+    def setup():
+        # from_dict consumes class keys of the dictionary
+        return (copy.deepcopy(dict_repr), ), {}
+
+    benchmark.pedantic(coder.from_dict, setup=setup, rounds=5)
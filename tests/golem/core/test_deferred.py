@@ -1,9 +1,14 @@
 import unittest
+from concurrent.futures import Future
+from unittest import mock
 
+from twisted.internet import defer
 from twisted.internet.defer import Deferred
+from twisted.internet.task import Cooperator
 from twisted.python.failure import Failure
 
-from golem.core.deferred import chain_function
+from golem.core.deferred import chain_function, collect_chunks, \
+    deferred_from_future
 
 
 class TestChainFunction(unittest.TestCase):
@@ -49,3 +54,98 @@ class TestChainFunction(unittest.TestCase):
         assert result.called
         assert result.result
         assert isinstance(result.result, Failure)
+
+
+@mock.patch('twisted.internet.reactor.callFromThread',
+            lambda fn, *args: fn(*args))
+class TestDeferredFromFuture(unittest.TestCase):
+
+    def test_result(self):
+        future = Future()
+        deferred = deferred_from_future(future)
+        assert not deferred.called
+
+        future.set_result(7)
+        assert deferred.called
+        assert deferred.result == 7
+
+    def test_exception(self):
+        future = Future()
+        deferred = deferred_from_future(future)
+        future.set_exception(ValueError('error'))
+
+        assert deferred.called
+        assert isinstance(deferred.result, Failure)
+        assert deferred.result.check(ValueError)
+        deferred.addErrback(lambda _: None)
+
+    def test_cancel_future(self):
+        future = Future()
+        deferred = deferred_from_future(future)
+        future.cancel()
+
+        assert isinstance(deferred.result, Failure)
+        assert deferred.result.check(defer.CancelledError)
+        deferred.addErrback(lambda _: None)
+
+    def test_cancel_deferred(self):
+        future = Future()
+        deferred = deferred_from_future(future)
+        deferred.addErrback(lambda _: None)
+        deferred.cancel()
+
+        assert future.cancelled()
+
+
+class TestCollectChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        # One chunk per iteration of the cooperator
+        cooperator = Cooperator(
+            terminationPredicateFactory=lambda: lambda: True,
+            scheduler=self.schedule)
+        patcher = mock.patch('golem.core.deferred.cooperate',
+                             cooperator.cooperate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def schedule(self, fn):
+        self.calls.append(fn)
+        return mock.Mock()
+
+    def run_iteration(self):
+        self.calls.pop(0)()
+
+    def test_chunks(self):
+        produced = []
+
+        def chunks():
+            for chunk in ([1, 2], [], [3]):
+                produced.append(chunk)
+                yield chunk
+
+        deferred = collect_chunks(chunks())
+        assert not produced
+
+        self.run_iteration()
+        assert produced == [[1, 2]]
+        assert not deferred.called
+
+        for _ in range(3):
+            self.run_iteration()
+        assert deferred.called
+        assert deferred.result == [1, 2, 3]
+
+    def test_error(self):
+        def chunks():
+            yield [1]
+            raise ValueError('error')
+
+        deferred = collect_chunks(chunks())
+        for _ in range(2):
+            self.run_iteration()
+
+        assert isinstance(deferred.result, Failure)
+        assert deferred.result.check(ValueError)
+        deferred.addErrback(lambda _: None)
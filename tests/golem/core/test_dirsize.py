@@ -0,0 +1,119 @@
+import os
+import shutil
+import time
+import unittest
+
+from golem.core.common import is_linux
+from golem.core.dirsize import DirSizeTracker
+from golem.core.fileshelper import get_dir_size
+from golem.testutils import TempDirFixture
+
+
+class TestDirSizeTracker(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.time = 0.
+        self.tracker = DirSizeTracker(reconcile_interval=60,
+                                      clock=lambda: self.time)
+        self.root = os.path.join(self.tempdir, 'root')
+        self.write('a/file1', 100)
+        self.write('a/b/file2', 200)
+        self.write('file3', 300)
+
+    def tearDown(self):
+        self.tracker.stop_watching()
+        super().tearDown()
+
+    def file_path(self, relative):
+        return os.path.join(self.root, *relative.split('/'))
+
+    def write(self, relative, size):
+        path = self.file_path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'0' * size)
+        return path
+
+    def assert_tracked(self):
+        self.assertEqual(self.tracker.get_size(self.root),
+                         get_dir_size(self.root))
+
+    def test_get_size(self):
+        self.assert_tracked()
+        self.assertEqual(self.tracker.get_size(self.file_path('file3')), 300)
+        self.assertEqual(self.tracker.get_size(self.file_path('missing')), 0)
+
+    def test_not_rescanned(self):
+        size = self.tracker.get_size(self.root)
+        self.write('file4', 400)
+        self.assertEqual(self.tracker.get_size(self.root), size)
+
+    def test_reconcile(self):
+        size = self.tracker.get_size(self.root)
+        self.write('file4', 400)
+        self.time = 60
+        self.assertEqual(self.tracker.get_size(self.root), size + 400)
+
+    def test_update_file(self):
+        self.tracker.get_size(self.root)
+        self.tracker.update(self.write('file4', 400))
+        self.assert_tracked()
+        self.tracker.update(self.write('a/file1', 50))
+        self.assert_tracked()
+        os.remove(self.file_path('a/b/file2'))
+        self.tracker.update(self.file_path('a/b/file2'))
+        self.assert_tracked()
+
+    def test_update_directory(self):
+        self.tracker.get_size(self.root)
+        self.write('c/d/file5', 500)
+        self.write('c/d/file6', 600)
+        # Parents are rescanned when they are not known
+        self.tracker.update(self.file_path('c/d/file5'))
+        self.assert_tracked()
+
+        shutil.rmtree(self.file_path('a'))
+        self.tracker.update(self.file_path('a'))
+        self.assert_tracked()
+
+    def test_update_root(self):
+        self.tracker.get_size(self.root)
+        self.write('file4', 400)
+        self.tracker.update(self.root)
+        self.assert_tracked()
+
+    def test_update_untracked(self):
+        self.tracker.update(self.write('file4', 400))
+        self.tracker.update(os.path.join(self.tempdir, 'other'))
+        self.assert_tracked()
+
+    def test_nested_roots(self):
+        self.tracker.get_size(self.root)
+        self.tracker.get_size(self.file_path('a'))
+        self.tracker.update(self.write('a/file4', 400))
+        self.assert_tracked()
+        self.assertEqual(self.tracker.get_size(self.file_path('a')),
+                         get_dir_size(self.file_path('a')))
+
+    def test_forget(self):
+        size = self.tracker.get_size(self.root)
+        self.write('file4', 400)
+        self.tracker.forget(self.root)
+        self.assertEqual(self.tracker.get_size(self.root), size + 400)
+
+    @unittest.skipIf(not is_linux(), "inotify is only available on Linux")
+    def test_watching(self):
+        self.assertTrue(self.tracker.start_watching())
+        size = self.tracker.get_size(self.root)
+        self.write('a/file4', 400)
+        os.remove(self.file_path('a/b/file2'))
+
+        # Sizes of the directories themselves are not followed, only their
+        # contents are
+        expected = size + 400 - 200
+        deadline = time.monotonic() + 5
+        while self.tracker.get_size(self.root) != expected \
+                and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.tracker.get_size(self.root), expected)
@@ -1,9 +1,11 @@
+import hashlib
 import os
 import random
 
 from io import IOBase
 
-from golem.core.fileencrypt import FileHelper, FileEncryptor, AESFileEncryptor
+from golem.core.fileencrypt import FileHelper, FileEncryptor, AESFileEncryptor, \
+    AESGCMFileEncryptor
 from golem.resource.dirmanager import DirManager
 from golem.tools.testdirfixture import TestDirFixture
 
@@ -138,3 +140,120 @@ class TestFileHelper(TestDirFixture):
             with FileHelper(file_, mode) as f:
                 self.assertIsInstance(f, IOBase)
                 self.assertEqual(f.mode, mode)
+
+
+class TestAESGCMFileEncryptor(TestDirFixture):
+    """ Test encryption using AESGCMFileEncryptor """
+
+    def setUp(self):
+        TestDirFixture.setUp(self)
+
+        self.secret = FileEncryptor.gen_secret(10, 20)
+        self.test_file_path = os.path.join(self.path, 'test_file')
+        self.enc_file_path = os.path.join(self.path, 'test_file.enc')
+        self.dec_file_path = os.path.join(self.path, 'test_file.dec')
+
+        self.data = os.urandom(10 * 1024 + 7)
+        with open(self.test_file_path, 'wb') as f:
+            f.write(self.data)
+
+    def _encrypt(self, chunk_size=1024, **kwargs):
+        AESGCMFileEncryptor.encrypt(self.test_file_path, self.enc_file_path,
+                                    self.secret, chunk_size=chunk_size,
+                                    **kwargs)
+
+    def _decrypt(self, secret=None):
+        AESGCMFileEncryptor.decrypt(self.enc_file_path, self.dec_file_path,
+                                    secret or self.secret)
+        with open(self.dec_file_path, 'rb') as f:
+            return f.read()
+
+    def _tamper(self, transform):
+        with open(self.enc_file_path, 'rb') as f:
+            encrypted = f.read()
+        with open(self.enc_file_path, 'wb') as f:
+            f.write(transform(encrypted))
+
+    def test_encrypt_decrypt(self):
+        self._encrypt()
+        with open(self.enc_file_path, 'rb') as f:
+            encrypted = f.read()
+
+        chunks = 11
+        assert encrypted.startswith(AESGCMFileEncryptor.magic)
+        assert len(encrypted) == AESGCMFileEncryptor.header_size + \
+            len(self.data) + chunks * AESGCMFileEncryptor.tag_size
+        assert self._decrypt() == self.data
+
+    def test_chunk_size_multiple(self):
+        self.data = self.data[:8 * 1024]
+        with open(self.test_file_path, 'wb') as f:
+            f.write(self.data)
+
+        self._encrypt()
+        assert self._decrypt() == self.data
+
+    def test_empty_file(self):
+        self.data = b''
+        open(self.test_file_path, 'wb').close()
+
+        self._encrypt()
+        assert self._decrypt() == b''
+
+    def test_digest(self):
+        digest = hashlib.sha1()
+        self._encrypt(digest=digest)
+        assert digest.digest() == hashlib.sha1(self.data).digest()
+
+    def test_legacy_format(self):
+        AESFileEncryptor.encrypt(self.test_file_path, self.enc_file_path,
+                                 self.secret)
+        assert self._decrypt() == self.data
+
+    def test_wrong_secret(self):
+        self._encrypt()
+        with self.assertRaises(ValueError):
+            self._decrypt(self.secret + b'0')
+
+    def test_tampered_chunk(self):
+        self._encrypt()
+        offset = AESGCMFileEncryptor.header_size + 2048
+
+        def flip_bit(data):
+            return data[:offset] + bytes([data[offset] ^ 1]) + \
+                data[offset + 1:]
+
+        self._tamper(flip_bit)
+        with self.assertRaises(ValueError):
+            self._decrypt()
+
+    def test_tampered_header(self):
+        self._encrypt()
+        offset = AESGCMFileEncryptor.header_size - 1
+        self._tamper(lambda data: data[:offset] + b'\0' + data[offset + 1:])
+        with self.assertRaises(ValueError):
+            self._decrypt()
+
+    def test_truncated(self):
+        self._encrypt()
+        stored_chunk = 1024 + AESGCMFileEncryptor.tag_size
+        end = AESGCMFileEncryptor.header_size + 3 * stored_chunk
+        self._tamper(lambda data: data[:end])
+        with self.assertRaises(ValueError):
+            self._decrypt()
+
+    def test_reordered(self):
+        self._encrypt()
+        header_size = AESGCMFileEncryptor.header_size
+        stored_chunk = 1024 + AESGCMFileEncryptor.tag_size
+
+        def swap_chunks(data):
+            first = data[header_size:header_size + stored_chunk]
+            second = data[header_size + stored_chunk:
+                          header_size + 2 * stored_chunk]
+            return data[:header_size] + second + first + \
+                data[header_size + 2 * stored_chunk:]
+
+        self._tamper(swap_chunks)
+        with self.assertRaises(ValueError):
+            self._decrypt()
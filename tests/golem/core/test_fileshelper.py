@@ -6,10 +6,12 @@ import locale
 import os
 import re
 import shutil
+from unittest.mock import patch
 
 from golem.core.common import get_golem_path, is_windows
 from golem.core.fileshelper import (common_dir, copy_file_tree, du, find_file_with_ext,
-                                    get_dir_size, has_ext, inner_dir_path, outer_dir_path)
+                                    get_dir_size, has_ext, inner_dir_path, link_or_copy,
+                                    outer_dir_path)
 from golem.tools.testdirfixture import TestDirFixture
 
 
@@ -345,3 +347,23 @@ class TestHasExt(TestDirFixture):
 
         assert has_ext(file_names[6], ".xyz")
         assert not has_ext(file_names[6], ".xyz", True)
+
+
+class TestLinkOrCopy(TestDirFixture):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.path, "src")
+        self.dst = os.path.join(self.path, "dst")
+        with open(self.src, 'w') as f:
+            f.write("content")
+
+    def test_link(self):
+        link_or_copy(self.src, self.dst)
+        assert os.path.samefile(self.src, self.dst)
+
+    @patch('os.link', side_effect=OSError)
+    def test_copy(self, _):
+        link_or_copy(self.src, self.dst)
+        assert not os.path.samefile(self.src, self.dst)
+        with open(self.dst) as f:
+            assert f.read() == "content"
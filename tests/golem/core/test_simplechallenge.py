@@ -0,0 +1,55 @@
+from unittest import TestCase, mock
+
+from golem.core import simplechallenge
+from golem.core.keysauth import sha2
+from golem.core.simplechallenge import accept_challenge, create_challenge, \
+    solve_challenge
+
+
+def reference_solution(challenge, difficulty):
+    """ The original, one-candidate-at-a-time solver """
+    min_hash = pow(2, 256 - difficulty)
+    solution = 0
+    while sha2(challenge + str(solution)) > min_hash:
+        solution += 1
+    return solution
+
+
+class TestSolveChallenge(TestCase):
+
+    def test_same_as_reference(self):
+        for i in range(10):
+            challenge = create_challenge([['node', str(i)]], 'prev')
+            for difficulty in (0, 1, 4, 8, 10):
+                solution, _ = solve_challenge(challenge, difficulty)
+                assert solution == reference_solution(challenge, difficulty)
+                assert accept_challenge(challenge, solution, difficulty)
+
+    @mock.patch('golem.core.simplechallenge.SOLVE_CHECK_INTERVAL', 16)
+    @mock.patch('golem.core.simplechallenge.SOLVE_CHUNK_SIZE', 64)
+    @mock.patch('golem.core.simplechallenge.PARALLEL_SOLVE_MIN_DIFFICULTY', 0)
+    def test_parallel_same_as_reference(self):
+        for i in range(5):
+            challenge = 'challenge {}'.format(i)
+            solution, _ = solve_challenge(challenge, 10, workers=2)
+            assert solution == reference_solution(challenge, 10)
+
+    def test_parallel_search(self):
+        challenge = 'golem'
+        solution, _ = solve_challenge(challenge, 16, workers=2)
+        assert accept_challenge(challenge, solution, 16)
+        assert solution == simplechallenge._solve(
+            challenge.encode(), simplechallenge._hash_bound(16))
+
+    def test_search_gives_up_above_limit(self):
+        bound = simplechallenge._hash_bound(256)
+        limit = mock.Mock(value=10)
+        with mock.patch('golem.core.simplechallenge.SOLVE_CHECK_INTERVAL', 5):
+            assert simplechallenge._search(b'x', bound, 20, 1000,
+                                           limit) is None
+
+    def test_accept_challenge(self):
+        challenge = 'challenge'
+        solution, _ = solve_challenge(challenge, 8)
+        assert accept_challenge(challenge, solution, 8)
+        assert not accept_challenge(challenge, solution, 64)
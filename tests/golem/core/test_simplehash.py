@@ -1,7 +1,12 @@
+import base64
+import hashlib
 import os
 import unittest
+from unittest import mock
 
-from golem.core.simplehash import SimpleHash
+from golem.core import simplehash
+from golem.core.simplehash import FileHashCache, FileHasher, SimpleHash
+from golem.resource.resourcehash import ResourceHash
 from golem.testutils import TempDirFixture
 
 
@@ -54,3 +59,143 @@ class TestFileHash(TempDirFixture):
 
         b64 = b"vkF3aLXDxcHZvLLnwRkZbddrVXA=\n"
         self.assertEqual(b64, SimpleHash.hash_file_base64(file_path))
+
+
+class TestFileHasher(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.paths = []
+        for i in range(8):
+            path = os.path.join(self.path, 'file_{}'.format(i))
+            with open(path, 'wb') as out:
+                out.write(os.urandom(i * 1000))
+            self.paths.append(path)
+
+    @staticmethod
+    def _sha1(path):
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).digest()
+
+    def test_hash_files(self):
+        hasher = FileHasher(block_size=256, workers=4)
+        digests = hasher.hash_files(self.paths)
+        assert digests == {path: self._sha1(path) for path in self.paths}
+        assert hasher.hash_file(self.paths[3]) == self._sha1(self.paths[3])
+
+    def test_algorithm(self):
+        hasher = FileHasher(algorithm='sha256')
+        with open(self.paths[1], 'rb') as f:
+            expected = hashlib.sha256(f.read()).digest()
+        assert hasher.hash_file(self.paths[1]) == expected
+
+    def test_cache(self):
+        cache = FileHashCache(os.path.join(self.path, 'hashes.db'))
+        hasher = FileHasher(cache)
+        expected = hasher.hash_files(self.paths)
+
+        with mock.patch.object(hasher, '_compute') as compute:
+            assert hasher.hash_files(self.paths) == expected
+        assert not compute.called
+
+        # The store persists between instances
+        cache.close()
+        cache = FileHashCache(os.path.join(self.path, 'hashes.db'))
+        hasher = FileHasher(cache)
+        with mock.patch.object(hasher, '_compute') as compute:
+            assert hasher.hash_files(self.paths) == expected
+        assert not compute.called
+        cache.close()
+
+    def test_cache_invalidation(self):
+        hasher = FileHasher(FileHashCache())
+        path = self.paths[2]
+        hasher.hash_file(path)
+
+        with open(path, 'ab') as out:
+            out.write(b'modified')
+        assert hasher.hash_file(path) == self._sha1(path)
+
+        stat = os.stat(path)
+        with open(path, 'r+b') as out:
+            out.write(b'X')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert hasher.hash_file(path) == self._sha1(path)
+
+    def test_file_modified_while_hashing(self):
+        cache = FileHashCache()
+        hasher = FileHasher(cache)
+        path = self.paths[1]
+
+        def compute(abs_path):
+            with open(abs_path, 'ab') as out:
+                out.write(b'modified')
+            return b'digest'
+
+        with mock.patch.object(hasher, '_compute', side_effect=compute):
+            assert hasher.hash_file(path) == b'digest'
+        assert cache.get(os.path.abspath(path), 'sha1', os.stat(path)) is None
+
+    def test_not_cached(self):
+        cache = FileHashCache()
+        hasher = FileHasher(cache)
+        path = self.paths[1]
+        assert hasher.hash_file(path, cache=False) == self._sha1(path)
+        assert cache.get(os.path.abspath(path), 'sha1', os.stat(path)) is None
+
+    def test_cache_bounded(self):
+        cache = FileHashCache(max_entries=3)
+        hasher = FileHasher(cache)
+        for path in self.paths:
+            hasher.hash_file(path)
+
+        cached = cache.get_many(
+            [(os.path.abspath(path), os.stat(path)) for path in self.paths],
+            'sha1')
+        assert set(cached) == {os.path.abspath(path)
+                               for path in self.paths[-3:]}
+
+    def test_prune(self):
+        cache = FileHashCache()
+        hasher = FileHasher(cache)
+        hasher.hash_files(self.paths)
+        os.remove(self.paths[0])
+        with open(self.paths[1], 'ab') as out:
+            out.write(b'modified')
+
+        assert cache.prune() == 2
+        assert cache.prune() == 0
+        cached = cache.get_many(
+            [(os.path.abspath(path), os.stat(path))
+             for path in self.paths[2:]], 'sha1')
+        assert len(cached) == len(self.paths) - 2
+
+    def test_cache_error(self):
+        cache = FileHashCache()
+        hasher = FileHasher(cache)
+        cache.close()
+        assert hasher.hash_file(self.paths[1]) == self._sha1(self.paths[1])
+
+    def test_shared_hasher(self):
+        hasher = simplehash.file_hasher()
+        try:
+            simplehash.initialize(self.path)
+            shared = simplehash.file_hasher()
+            assert shared.cache is not None
+            assert os.path.exists(
+                os.path.join(self.path, simplehash.FILE_HASH_CACHE_DB))
+
+            expected = shared.hash_files(self.paths)
+            with mock.patch.object(shared, '_compute') as compute:
+                assert ResourceHash(self.path).get_file_hash(self.paths[1]) \
+                    == base64.urlsafe_b64encode(expected[self.paths[1]]) \
+                    .decode('utf-8')
+            assert not compute.called
+
+            with mock.patch.object(shared, '_compute') as compute:
+                assert SimpleHash.hash_file(self.paths[2]) \
+                    == expected[self.paths[2]]
+            assert not compute.called
+            shared.cache.close()
+        finally:
+            simplehash._file_hasher = hasher
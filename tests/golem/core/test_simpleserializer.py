@@ -1,8 +1,9 @@
+import copy
 import random
 import unittest
 
 from golem.core.simpleserializer import \
-    DictCoder, DictSerializer
+    CompiledDictCoder, DictCoder, DictSerializer
 
 
 class MockSerializationInnerSubject(object):
@@ -157,3 +158,94 @@ class TestDictSerializer(unittest.TestCase):
         self.assertFalse(
             DictCoder.cls_key in DictSerializer.dump(obj, typed=False)
         )
+
+
+class MockSlotsSubject(object):
+    __slots__ = ('property_1', )
+
+    def __init__(self):
+        self.property_1 = 1
+
+
+class MockPropertySubject(object):
+    def __init__(self):
+        self._value = None
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value * 2
+
+
+class MockSetattrSubject(object):
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        super().__setattr__('last_set', key)
+
+
+class TestCompiledDictCoder(unittest.TestCase):
+
+    @staticmethod
+    def _subjects():
+        with_extra = MockSerializationSubject()
+        with_extra.extra = {1: b'bytes', 'callback': print, '_hidden': 1}
+        return [
+            MockSerializationSubject(),
+            with_extra,
+            [MockSerializationSubject(), (1, 2.0, None, 'x')],
+            {'slots': MockSlotsSubject(), 'cls': MockSerializationSubject},
+        ]
+
+    def test_to_dict_identical(self):
+        for typed in (True, False):
+            for obj in self._subjects():
+                expected = DictCoder.to_dict(obj, typed=typed)
+                # Second call uses the cached encoders
+                for _ in range(2):
+                    result = CompiledDictCoder.to_dict(obj, typed=typed)
+                    assert result == expected
+                    assert repr(result) == repr(expected)
+
+    def test_from_dict_identical(self):
+        # Objects with __slots__ are not encoded, skip them
+        for obj in self._subjects()[:-1]:
+            dict_repr = DictCoder.to_dict(obj)
+            expected = DictCoder.from_dict(copy.deepcopy(dict_repr))
+            result = CompiledDictCoder.from_dict(copy.deepcopy(dict_repr))
+            assert result == expected
+            assert repr(DictCoder.to_dict(result)) == repr(dict_repr)
+
+    def test_from_dict_as_class(self):
+        obj = MockSerializationSubject()
+        dict_repr = CompiledDictCoder.to_dict(obj, typed=False)
+        result = CompiledDictCoder.from_dict(
+            dict_repr, as_class=MockSerializationSubject)
+        assert isinstance(result, MockSerializationSubject)
+        assert result.property_1 == dict_repr['property_1']
+        assert result.property_4 == dict_repr['property_4']
+
+    def test_from_dict_property(self):
+        dict_repr = {'value': 2, DictCoder.cls_key:
+                     DictCoder.module_and_class(MockPropertySubject)}
+        result = CompiledDictCoder.from_dict(dict_repr)
+        assert result.value == 4
+
+    def test_from_dict_setattr(self):
+        dict_repr = {'a': 1, 'b': 2, DictCoder.cls_key:
+                     DictCoder.module_and_class(MockSetattrSubject)}
+        result = CompiledDictCoder.from_dict(dict_repr)
+        assert (result.a, result.b, result.last_set) == (1, 2, 'b')
+
+    def test_layouts(self):
+        """ Objects of one class with different attributes """
+        first = MockSerializationInnerSubject()
+        second = MockSerializationInnerSubject()
+        del second.property_3
+        second.property_5 = 5
+
+        for obj in (first, second, first):
+            assert repr(CompiledDictCoder.to_dict(obj)) \
+                == repr(DictCoder.to_dict(obj))
@@ -1,9 +1,11 @@
 import time
 import threading
 import unittest
-from unittest.mock import Mock
+from concurrent.futures import CancelledError
+from unittest.mock import Mock, patch
 
-from golem.core.threads import ThreadQueueExecutor, QueueExecutor
+from golem.core.threads import DRAIN_TIMEOUT, ThreadQueueExecutor, \
+    QueueExecutor
 
 
 class Thread(threading.Thread):
@@ -57,6 +59,148 @@ class TestQueueExecutor(unittest.TestCase):
 
         self.assertTrue(inner_mock.called)
 
+    def test_future(self):
+        executor = QueueExecutor()
+        future = executor.push(lambda a, b: a + b, 1, b=2)
+        assert future.result(timeout=5) == 3
+
+        future = executor.push(Mock(side_effect=ValueError('error')))
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+        executor.finish()
+
+    @patch('twisted.internet.reactor.callFromThread',
+           lambda fn, *args: fn(*args))
+    def test_push_deferred(self):
+        executor = QueueExecutor()
+        deferred = executor.push_deferred(lambda: 42)
+        executor.finish()
+
+        assert deferred.called
+        assert deferred.result == 42
+
+    def test_workers(self):
+        executor = QueueExecutor(workers=3)
+        barrier = threading.Barrier(3, timeout=5)
+        futures = [executor.push(barrier.wait) for _ in range(3)]
+
+        # All jobs have to run concurrently to pass the barrier
+        assert sorted(f.result(timeout=5) for f in futures) == [0, 1, 2]
+        executor.finish()
+        assert not executor.isAlive()
+
+    def test_max_size(self):
+        executor = QueueExecutor(max_size=1)
+        executor.start = Mock()
+
+        first = executor.push(Mock())
+        second = executor.push(Mock())
+        assert first.cancelled()
+        assert not second.done()
+        assert len(executor._queue) == 1
+
+    def test_stop_keeps_pending_jobs(self):
+        executor = QueueExecutor()
+        started = threading.Event()
+        release = threading.Event()
+
+        executor.push(lambda: started.set() or release.wait(5))
+        pending = executor.push(Mock(return_value=1))
+        assert started.wait(5)
+
+        executor.stop()
+        release.set()
+        executor.join(5)
+        assert not executor.isAlive()
+        assert not pending.done()
+
+        executor.start()
+        assert pending.result(timeout=5) == 1
+        executor.finish()
+
+    def test_drain(self):
+        executor = QueueExecutor()
+        release = threading.Event()
+        executor.push(release.wait, 5)
+        executor.push(Mock())
+
+        assert not executor.drain(timeout=0.1)
+        release.set()
+        assert executor.drain(timeout=5)
+        assert executor.isAlive()
+        executor.finish()
+
+    def test_drain_timeout_cancel_pending(self):
+        executor = QueueExecutor()
+        started = threading.Event()
+        release = threading.Event()
+
+        running = executor.push(lambda: started.set() or release.wait(5))
+        pending = executor.push(Mock())
+        assert started.wait(5)
+
+        with patch('golem.core.threads.logger') as logger:
+            assert not executor.drain(timeout=0.1, cancel_pending=True)
+        logger.warning.assert_called_once()
+        assert pending.cancelled()
+
+        release.set()
+        assert running.result(timeout=5) is True
+        assert executor.drain()
+        executor.finish()
+
+    def test_drain_default_timeout(self):
+        executor = QueueExecutor()
+        with patch.object(executor._condition, 'wait_for',
+                          return_value=True) as wait_for:
+            assert executor.drain()
+        assert wait_for.call_args[0][1] == DRAIN_TIMEOUT
+
+    def test_shutdown_cancel_pending(self):
+        executor = QueueExecutor()
+        started = threading.Event()
+        release = threading.Event()
+
+        running = executor.push(lambda: started.set() or release.wait(5))
+        pending = executor.push(Mock())
+        assert started.wait(5)
+
+        executor.shutdown(wait=False, cancel_pending=True)
+        release.set()
+        executor.join(5)
+
+        assert running.result(timeout=5) is True
+        with self.assertRaises(CancelledError):
+            pending.result(timeout=0)
+        assert not executor.isAlive()
+
+    def test_enqueue_to_start_latency(self):
+        executor = QueueExecutor()
+        executor.start()
+        latencies = []
+
+        for _ in range(20):
+            # Let the worker go idle before pushing the next job
+            time.sleep(0.01)
+            pushed = time.monotonic()
+            started = executor.push(time.monotonic).result(timeout=5)
+            latencies.append(started - pushed)
+        executor.finish()
+
+        assert max(latencies) < 0.1
+        assert sorted(latencies)[len(latencies) // 2] < 0.01
+
+    def test_idle_cpu_usage(self):
+        executor = QueueExecutor(workers=4)
+        executor.start()
+
+        cpu_started = time.process_time()
+        time.sleep(1.0)
+        cpu_used = time.process_time() - cpu_started
+        executor.finish()
+
+        assert cpu_used < 0.05
+
 
 class TestThreadExecutor(unittest.TestCase):
 
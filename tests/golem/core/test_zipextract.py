@@ -0,0 +1,99 @@
+import os
+import zipfile
+from unittest import mock
+
+from golem.core import zipextract
+from golem.testutils import TempDirFixture
+
+
+class TestExtractAll(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.archive = os.path.join(self.path, 'archive.zip')
+        self.members = {
+            'small.txt': b'small',
+            'dir/nested/file.bin': os.urandom(100 * 1024),
+            'dir/large.bin': os.urandom(3 * 1024 * 1024 + 1),
+            'empty': b'',
+        }
+        self.members.update({
+            'many/{}.txt'.format(i): str(i).encode() for i in range(50)
+        })
+        with zipfile.ZipFile(self.archive, 'w') as zf:
+            zf.writestr('emptydir/', b'')
+            for name, data in self.members.items():
+                zf.writestr(name, data)
+
+    def _read_tree(self, root):
+        tree = {}
+        for directory, dirs, files in os.walk(root):
+            for name in dirs + files:
+                path = os.path.join(directory, name)
+                rel = os.path.relpath(path, root)
+                if os.path.isdir(path):
+                    tree[rel] = None
+                else:
+                    with open(path, 'rb') as f:
+                        tree[rel] = f.read()
+        return tree
+
+    def _assert_like_extractall(self, **kwargs):
+        expected_dir = os.path.join(self.path, 'expected')
+        output_dir = os.path.join(self.path, 'output')
+        with zipfile.ZipFile(self.archive) as zf:
+            zf.extractall(expected_dir)
+            names = zf.namelist()
+
+        assert zipextract.extract_all(self.archive, output_dir,
+                                      **kwargs) == names
+        assert self._read_tree(output_dir) == self._read_tree(expected_dir)
+
+    def test_extract_all(self):
+        self._assert_like_extractall()
+
+    def test_extract_all_single_worker(self):
+        self._assert_like_extractall(workers=1, buffer_size=1000)
+
+    def test_extract_all_more_workers_than_files(self):
+        self._assert_like_extractall(workers=1000)
+
+    def test_unsafe_names(self):
+        with zipfile.ZipFile(self.archive, 'w') as zf:
+            zf.writestr('../outside.txt', b'1')
+            zf.writestr('/absolute.txt', b'2')
+            zf.writestr('a/./b/../c.txt', b'3')
+        self._assert_like_extractall()
+        assert not os.path.exists(os.path.join(self.path, 'outside.txt'))
+
+    def test_duplicate_names(self):
+        with zipfile.ZipFile(self.archive, 'w') as zf:
+            zf.writestr('file.txt', b'first')
+            zf.writestr('other.txt', b'other')
+            with mock.patch('warnings.warn'):
+                zf.writestr('file.txt', b'second')
+        self._assert_like_extractall()
+
+    def test_crc_mismatch(self):
+        data = self.members['dir/large.bin']
+        with open(self.archive, 'r+b') as f:
+            content = f.read()
+            offset = content.index(data[:64])
+            f.seek(offset + len(data) // 2)
+            f.write(bytes([data[len(data) // 2] ^ 0xff]))
+
+        output_dir = os.path.join(self.path, 'output')
+        with self.assertRaises(zipfile.BadZipFile):
+            zipextract.extract_all(self.archive, output_dir)
+        assert not os.path.exists(os.path.join(output_dir, 'dir/large.bin'))
+
+    def test_partition(self):
+        members = [(zipfile.ZipInfo(str(i)), str(i)) for i in range(10)]
+        for i, (info, _) in enumerate(members):
+            info.file_size = 1000 ** 2 if i < 2 else 10
+        partitions = zipextract._partition(members, 3)
+
+        assert len(partitions) == 3
+        assert sorted(len(p) for p in partitions) == [1, 1, 8]
+        assert sorted(path for p in partitions for _, path in p) \
+            == sorted(path for _, path in members)
@@ -0,0 +1,59 @@
+import os
+import shutil
+import zipfile
+
+import pytest
+
+from golem.core.zipextract import extract_all
+
+MB = 1024 * 1024
+SMALL_FILES = 5000
+SMALL_FILE_SIZE = 4 * 1024
+LARGE_FILES = 3
+LARGE_FILE_SIZE = 256 * MB
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.fixture(scope='module')
+def archive(tmpdir_factory):
+    """ Many small frames and a few large ones, stored uncompressed like
+    result packages """
+    path = str(tmpdir_factory.mktemp('archive').join('result.zip'))
+    with zipfile.ZipFile(path, 'w') as zf:
+        for i in range(SMALL_FILES):
+            zf.writestr('frames/{:05d}.exr'.format(i),
+                        os.urandom(SMALL_FILE_SIZE))
+        for i in range(LARGE_FILES):
+            with zf.open('large/{}.bin'.format(i), 'w',
+                         force_zip64=True) as f:
+                for _ in range(LARGE_FILE_SIZE // MB):
+                    f.write(os.urandom(MB))
+    return path
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_extractall(benchmark, archive, tmpdir):
+    output_dir = str(tmpdir.join('output'))
+
+    def extract():
+        with zipfile.ZipFile(archive) as zf:
+            zf.extractall(output_dir)
+
+    benchmark.pedantic(
+        extract, rounds=3,
+        setup=lambda: shutil.rmtree(output_dir, ignore_errors=True))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('workers', [1, 4])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_extract_all(benchmark, archive, tmpdir, workers):
+    output_dir = str(tmpdir.join('output'))
+    benchmark.pedantic(
+        extract_all, args=(archive, output_dir), kwargs={'workers': workers},
+        rounds=3,
+        setup=lambda: shutil.rmtree(output_dir, ignore_errors=True))
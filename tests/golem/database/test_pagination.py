@@ -0,0 +1,77 @@
+import datetime
+from unittest import TestCase
+
+from golem.database import pagination
+from golem.model import Payment
+from golem.tools.testwithdatabase import TestWithDatabase
+
+FIELDS = (Payment.created_date, Payment.subtask)
+
+
+def _select():
+    return Payment.select(*FIELDS)
+
+
+class TestCursor(TestCase):
+    def test_invalid(self):
+        for cursor in ('', '{', '{}', '["2018-01-01 00:00:00"]'):
+            with self.assertRaises(pagination.InvalidCursor):
+                pagination.decode_cursor(cursor, FIELDS)
+
+    def test_iter_pages(self):
+        pages = {None: ([1, 2], 'a'), 'a': ([3, 4], 'b'), 'b': ([5], None)}
+        calls = []
+
+        def get_page(limit, after):
+            calls.append((limit, after))
+            return pages[after]
+
+        self.assertEqual(list(pagination.iter_pages(get_page, 2)),
+                         [[1, 2], [3, 4], [5]])
+        self.assertEqual(calls, [(2, None), (2, 'a'), (2, 'b')])
+
+
+class TestKeysetPage(TestWithDatabase):
+    def setUp(self):
+        super().setUp()
+        base = datetime.datetime(2018, 1, 1)
+        # Two payments per timestamp, so that pages split ties
+        for i in range(7):
+            Payment.create(
+                subtask='subtask{}'.format(i),
+                payee=b'\x01' * 20,
+                value=i,
+                created_date=base + datetime.timedelta(seconds=i // 2),
+            )
+        self.expected = [
+            p.subtask for p in
+            _select().order_by(*(f.desc() for f in FIELDS))
+        ]
+
+    def _walk(self, limit):
+        subtasks = []
+        for page in pagination.iter_pages(
+                lambda limit, after: pagination.keyset_page(
+                    _select(), FIELDS, limit, after),
+                limit):
+            self.assertLessEqual(len(page), limit)
+            subtasks.extend(p.subtask for p in page)
+        return subtasks
+
+    def test_order(self):
+        self.assertEqual(self.expected[:2], ['subtask6', 'subtask5'])
+
+    def test_all_pages(self):
+        for limit in (1, 2, 3, 7, 100):
+            self.assertEqual(self._walk(limit), self.expected, limit)
+
+    def test_last_page(self):
+        rows, cursor = pagination.keyset_page(_select(), FIELDS, 7)
+        self.assertEqual(len(rows), 7)
+        self.assertIsNone(cursor)
+
+    def test_new_rows_do_not_shift_pages(self):
+        rows, cursor = pagination.keyset_page(_select(), FIELDS, 3)
+        Payment.create(subtask='new', payee=b'\x01' * 20, value=1)
+        rows, _ = pagination.keyset_page(_select(), FIELDS, 3, cursor)
+        self.assertEqual([p.subtask for p in rows], self.expected[3:6])
@@ -0,0 +1,345 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from golem.docker.image import DockerImage
+from golem.docker.job import DockerJob
+from golem.docker.manager import DockerManager
+from golem.docker.task_thread import DockerBind
+from golem.docker.pool import WarmContainerPool, WarmDockerJob, \
+    warm_pool_size, link_tree, move_tree, WARM_POOL_MAX_SIZE
+from golem.testutils import TempDirFixture
+
+RESULT_FILE = 'result.txt'
+CONTAINER_LATENCY = 0.02
+
+
+class FakeDockerAPIClient:
+    """ Mimics the subset of docker.APIClient used by DockerJob and
+    WarmContainerPool. Creating and removing containers is slowed down, like
+    it is in the real daemon. """
+
+    _ids = itertools.count()
+
+    def __init__(self, latency: float = CONTAINER_LATENCY) -> None:
+        self.latency = latency
+        self.containers = dict()
+        self.execs = dict()
+        self.calls = []
+
+    def create_host_config(self, **kwargs):
+        return kwargs
+
+    def create_container(self, image, host_config, **_kwargs):
+        self.calls.append('create_container')
+        time.sleep(self.latency)
+        container_id = 'container-{}'.format(next(self._ids))
+        self.containers[container_id] = dict(
+            image=image, status='created', host_config=host_config)
+        return {'Id': container_id}
+
+    def start(self, container_id):
+        self.calls.append('start')
+        self.containers[container_id]['status'] = 'running'
+
+    def pause(self, container_id):
+        self.calls.append('pause')
+        self.containers[container_id]['status'] = 'paused'
+
+    def unpause(self, container_id):
+        self.calls.append('unpause')
+        self.containers[container_id]['status'] = 'running'
+
+    def restart(self, container_id, **_kwargs):
+        self.calls.append('restart')
+        self.containers[container_id]['status'] = 'running'
+
+    def kill(self, container_id):
+        self.calls.append('kill')
+        self.containers[container_id]['status'] = 'exited'
+
+    def remove_container(self, container_id, **_kwargs):
+        self.calls.append('remove_container')
+        time.sleep(self.latency)
+        self.containers.pop(container_id, None)
+
+    def inspect_container(self, container_id):
+        status = self.containers[container_id]['status']
+        return {'State': {'Status': status}}
+
+    def wait(self, container_id, _timeout=None):
+        self._write_result(container_id)
+        self.containers[container_id]['status'] = 'exited'
+        return {'StatusCode': 0}
+
+    def logs(self, *_args, **_kwargs):
+        return iter([b'log'])
+
+    def exec_create(self, container_id, cmd, **_kwargs):
+        self.calls.append('exec_create')
+        assert self.containers[container_id]['status'] == 'running'
+        exec_id = 'exec-{}'.format(next(self._ids))
+        self.execs[exec_id] = dict(container_id=container_id, cmd=cmd)
+        return {'Id': exec_id}
+
+    def exec_start(self, exec_id, detach=False):
+        assert detach
+        self._write_result(self.execs[exec_id]['container_id'])
+
+    def exec_inspect(self, exec_id):
+        assert exec_id in self.execs
+        return {'Running': False, 'ExitCode': 0}
+
+    def _write_result(self, container_id):
+        binds = self.containers[container_id]['host_config']['binds']
+        for source, bind in binds.items():
+            if bind['bind'] == DockerJob.OUTPUT_DIR:
+                Path(source, RESULT_FILE).write_text(container_id)
+
+
+def host_config(binds):
+    return {'binds': {
+        bind.source_as_posix: {'bind': bind.target, 'mode': bind.mode}
+        for bind in binds
+    }}
+
+
+class TestWarmPoolSize(TestCase):
+
+    def test_memory_bound(self):
+        assert warm_pool_size(cpu_count=8, memory_size=2048) == 2
+
+    def test_cpu_bound(self):
+        assert warm_pool_size(cpu_count=1, memory_size=16384) == 1
+
+    def test_upper_bound(self):
+        assert warm_pool_size(cpu_count=64, memory_size=2 ** 20) == \
+            WARM_POOL_MAX_SIZE
+
+    def test_lower_bound(self):
+        assert warm_pool_size(cpu_count=0, memory_size=0) == 1
+
+
+class TestTreeHelpers(TempDirFixture):
+
+    def test_link_and_move(self):
+        src = self.new_path / 'src'
+        dst = self.new_path / 'dst'
+        (src / 'nested').mkdir(parents=True)
+        (src / 'a.txt').write_text('a')
+        (src / 'nested' / 'b.txt').write_text('b')
+        dst.mkdir()
+
+        link_tree(src, dst)
+        assert (dst / 'a.txt').read_text() == 'a'
+        assert (dst / 'nested' / 'b.txt').read_text() == 'b'
+        assert os.stat(str(dst / 'a.txt')).st_ino == \
+            os.stat(str(src / 'a.txt')).st_ino
+
+        out = self.new_path / 'out'
+        move_tree(dst, out)
+        assert not list(dst.iterdir())
+        assert (out / 'nested' / 'b.txt').read_text() == 'b'
+
+
+class WarmPoolTestBase(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.client = FakeDockerAPIClient()
+        self.image = DockerImage('golemfactory/base', tag='1.4')
+        self.pool = WarmContainerPool(
+            self.image,
+            self.new_path / 'pool',
+            host_config=host_config,
+            size=1,
+            client_factory=lambda: self.client)
+
+    def tearDown(self):
+        self.pool.close()
+        super().tearDown()
+
+    def _subtask_dirs(self, name):
+        dirs = dict(
+            resources_dir=self.new_path / name / 'resources',
+            work_dir=self.new_path / name / 'work',
+            output_dir=self.new_path / name / 'output',
+        )
+        for path in dirs.values():
+            path.mkdir(parents=True)
+        (dirs['resources_dir'] / 'scene.blend').write_bytes(b'\0' * 1024)
+        return {key: str(path) for key, path in dirs.items()}
+
+    def _run_warm_job(self, name):
+        dirs = self._subtask_dirs(name)
+        with WarmDockerJob(self.pool, 'python3 job.py', {'n': 1},
+                           environment={'LOCAL_USER_ID': 1000},
+                           **dirs) as job:
+            job.start()
+            exit_code = job.wait()
+        self._wait_for_recycling()
+        return exit_code, dirs
+
+    def _run_cold_job(self, name):
+        dirs = self._subtask_dirs(name)
+        binds = [DockerBind(Path(dirs['output_dir']), DockerJob.OUTPUT_DIR)]
+        with mock.patch('golem.docker.job.local_client',
+                        return_value=self.client):
+            with DockerJob(self.image, 'python3 job.py', {'n': 1},
+                           host_config=host_config(binds),
+                           container_log_level=logging.WARNING,
+                           **dirs) as job:
+                job.start()
+                exit_code = job.wait()
+        return exit_code, dirs
+
+    def _wait_for_recycling(self, timeout=5.0):
+        deadline = time.time() + timeout
+        while self.pool.idle < self.pool.size:
+            if time.time() > deadline:
+                self.fail("Container was not returned to the pool")
+            time.sleep(0.001)
+
+
+class TestWarmContainerPool(WarmPoolTestBase):
+
+    def test_fill(self):
+        self.pool.size = 2
+        self.pool.fill()
+
+        assert len(self.pool) == 2
+        assert self.pool.idle == 2
+        assert all(c['status'] == 'paused'
+                   for c in self.client.containers.values())
+
+    def test_job_results(self):
+        self.pool.fill()
+        exit_code, dirs = self._run_warm_job('subtask')
+
+        assert exit_code == 0
+        output = Path(dirs['output_dir'])
+        assert (output / RESULT_FILE).exists()
+        assert (Path(dirs['work_dir']) / DockerJob.PARAMS_FILE).exists()
+
+    def test_job_isolation(self):
+        self.pool.fill()
+        self._run_warm_job('first')
+        container = self.pool._idle[0]  # pylint: disable=protected-access
+
+        slot = container.slot
+        for path in (slot.work, slot.resources, slot.output, slot.logs):
+            assert not list(path.iterdir())
+        assert self.client.containers[container.container_id]['status'] \
+            == 'paused'
+        assert 'restart' in self.client.calls
+
+        _, dirs = self._run_warm_job('second')
+        assert len(self.client.containers) == 1
+        assert os.listdir(dirs['output_dir']) == [RESULT_FILE]
+
+    def test_killed_container_is_replaced(self):
+        self.pool.fill()
+        dirs = self._subtask_dirs('subtask')
+
+        with WarmDockerJob(self.pool, 'python3 job.py', {}, **dirs) as job:
+            killed = job.container_id
+            job.start()
+            job.kill()
+        self._wait_for_recycling()
+
+        assert killed not in self.client.containers
+        assert len(self.client.containers) == 1
+        assert self.pool.stats['removed'] == 1
+
+    def test_max_jobs(self):
+        self.pool.max_jobs = 2
+        self.pool.fill()
+        for i in range(3):
+            self._run_warm_job('subtask-{}'.format(i))
+
+        assert self.pool.stats['created'] == 2
+        assert len(self.client.containers) == 1
+
+    def test_resize(self):
+        self.pool.size = 3
+        self.pool.fill()
+        self.pool.resize(1)
+
+        assert len(self.pool) == 1
+        assert len(self.client.containers) == 1
+
+    def test_close(self):
+        self.pool.fill()
+        self.pool.close()
+
+        assert not self.client.containers
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire()
+
+    def test_per_subtask_overhead(self):
+        """ The warm pool keeps container creation and removal off the
+        critical path of a subtask """
+        jobs = 5
+        self.pool.fill()
+
+        started = time.time()
+        for i in range(jobs):
+            self._run_cold_job('cold-{}'.format(i))
+        cold = (time.time() - started) / jobs
+
+        started = time.time()
+        for i in range(jobs):
+            self._run_warm_job('warm-{}'.format(i))
+        warm = (time.time() - started) / jobs
+
+        assert cold >= 2 * CONTAINER_LATENCY
+        assert warm < cold
+        assert self.pool.stats['created'] == 1
+        assert self.pool.stats['reused'] == jobs
+
+
+class TestDockerManagerWarmPool(TempDirFixture):
+
+    def test_enable_disable(self):
+        dm = DockerManager()
+        assert not dm.warm_pool_enabled
+        with self.assertRaises(RuntimeError):
+            dm.get_warm_pool(DockerImage('golemfactory/base', tag='1.4'))
+
+        dm.enable_warm_pool(self.new_path / 'pool')
+        assert dm.warm_pool_enabled
+
+        image = DockerImage('golemfactory/base', tag='1.4')
+        pool = dm.get_warm_pool(image)
+        assert dm.get_warm_pool(image) is pool
+        assert pool.size == dm.warm_pool_size
+
+        with mock.patch.object(pool, 'close') as close:
+            dm.disable_warm_pool()
+        assert close.called
+        assert not dm.warm_pool_enabled
+
+    def test_enable_prewarms_pools(self):
+        dm = DockerManager()
+        image = DockerImage('golemfactory/base', tag='1.4')
+        vm_updated = threading.Event()
+        filled = threading.Event()
+
+        # A pending VM reconfiguration in the docker-machine queue
+        dm._threads.push(threading.Thread(target=vm_updated.wait))
+
+        with mock.patch.object(WarmContainerPool, 'fill',
+                               side_effect=filled.set), \
+                mock.patch.object(dm._threads, 'push') as push:
+            dm.enable_warm_pool(self.new_path / 'pool', images=[image])
+            assert not filled.wait(0.2)
+            vm_updated.set()
+            assert filled.wait(5)
+
+        assert not push.called
+        assert dm.get_warm_pool(image).size == dm.warm_pool_size
+        dm.disable_warm_pool()
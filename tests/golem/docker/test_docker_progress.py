@@ -0,0 +1,201 @@
+import queue
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from golem.docker.job import DockerJob
+from golem.docker.progress import ProgressReader, parse_progress_record
+from golem.docker.task_thread import DockerTaskThread
+from golem.testutils import TempDirFixture
+
+
+class TestParseProgressRecord(TestCase):
+
+    def test_json(self):
+        assert parse_progress_record('{"progress": 0.25}\n') == 0.25
+        assert parse_progress_record('{"progress": 1}') == 1.0
+
+    def test_number(self):
+        assert parse_progress_record('0.5') == 0.5
+
+    def test_invalid(self):
+        assert parse_progress_record('') is None
+        assert parse_progress_record('Fra:1 Mem:1M') is None
+        assert parse_progress_record('{"status": 0.5}') is None
+        assert parse_progress_record('{"progress": "half"}') is None
+        assert parse_progress_record('true') is None
+
+
+class TestProgressReader(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.path = self.new_path / DockerJob.PROGRESS_FILE
+
+    def _append(self, data: str):
+        with self.path.open('a') as f:
+            f.write(data)
+
+    def test_missing_file(self):
+        reader = ProgressReader(str(self.path))
+        assert reader.read() == 0.0
+
+        self._append('0.5\n')
+        assert reader.read() == 0.5
+
+    def test_incremental(self):
+        reader = ProgressReader(str(self.path))
+        self._append('0.1\n0.2\n')
+        assert reader.read() == 0.2
+
+        self._append('{"progress": 0.3}\n')
+        assert reader.read() == 0.3
+        assert reader.read() == 0.3
+
+    def test_partial_line(self):
+        reader = ProgressReader(str(self.path))
+        self._append('0.1\n0.4')
+        assert reader.read() == 0.1
+
+        self._append('5\n')
+        assert reader.read() == 0.45
+
+    def test_latest_valid_record(self):
+        reader = ProgressReader(str(self.path))
+        self._append('0.3\n{"progress": 0.4}\nnot a record\n')
+        assert reader.read() == 0.4
+
+    def test_monotonic_and_clamped(self):
+        reader = ProgressReader(str(self.path))
+        self._append('0.7\n')
+        assert reader.read() == 0.7
+
+        self._append('0.2\n')
+        assert reader.read() == 0.7
+
+        self._append('3\n')
+        assert reader.read() == 1.0
+
+    def test_custom_extractor(self):
+        lines = []
+
+        def extractor(line):
+            lines.append(line)
+            if line.startswith('boom'):
+                raise ValueError(line)
+            return len(lines) / 10
+
+        reader = ProgressReader(str(self.path), extractor)
+        self._append('a\nboom\nc\n')
+        assert reader.read() == 0.3
+        assert lines == ['a', 'boom', 'c']
+
+    def test_max_read_size(self):
+        reader = ProgressReader(str(self.path), max_read_size=4)
+        self._append('0.1\n0.2\n')
+        assert reader.read() == 0.1
+        assert reader.read() == 0.2
+
+    def test_close(self):
+        reader = ProgressReader(str(self.path))
+        self._append('0.5\n')
+        reader.read()
+        reader.close()
+
+        self._append('0.9\n')
+        assert reader.read() == 0.5
+        assert reader.progress == 0.5
+
+    def test_read_overhead(self):
+        """ Polling a frequently updated file only consumes new records """
+        reader = ProgressReader(str(self.path))
+        records = 20000
+
+        started = time.time()
+        with self.path.open('a') as f:
+            for i in range(records):
+                f.write('{{"progress": {}}}\n'.format(i / records))
+                if i % 100 == 0:
+                    f.flush()
+                    reader.read()
+        reader.read()
+        elapsed = time.time() - started
+
+        assert reader.progress == (records - 1) / records
+        assert elapsed < 5.0
+
+
+class FakeProgressJob(DockerJob):
+    """ Stands in for DockerJob, emitting progress records while running """
+
+    records = ['0.25', '{"progress": 0.5}', '0.75']
+    instances = queue.Queue()
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, work_dir, **_kwargs):
+        self.work_dir = work_dir
+        self.written = queue.Queue()
+        self.resume = threading.Semaphore(0)
+        self.instances.put(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def start(self):
+        pass
+
+    def wait(self, timeout=None):
+        with open(self.get_host_progress_path(), 'a') as f:
+            for record in self.records:
+                f.write(record + '\n')
+                f.flush()
+                self.written.put(record)
+                self.resume.acquire(timeout=5)
+        return 0
+
+    def dump_logs(self, stdout_file=None, stderr_file=None):
+        Path(stdout_file).write_text('')
+        Path(stderr_file).write_text('')
+
+
+class TestDockerTaskThreadProgress(TempDirFixture):
+
+    @mock.patch('golem.docker.task_thread.DockerJob', FakeProgressJob)
+    @mock.patch('golem.docker.task_thread.EnvironmentsManager')
+    @mock.patch('golem.docker.task_thread.DockerImage.is_available',
+                return_value=True)
+    def test_get_progress(self, _is_available, env_manager):
+        env_manager().get_environment_by_image.return_value = None
+        docker_manager = mock.Mock(warm_pool_enabled=False)
+        docker_manager.get_host_config_for_task.return_value = dict()
+
+        dir_mapping = DockerTaskThread.generate_dir_mapping(
+            resources=str(self.new_path / 'resources'),
+            temporary=str(self.new_path / 'tmp'))
+        thread = DockerTaskThread(
+            [('golemfactory/base', '1.4')],
+            extra_data={'entrypoint': 'python3 job.py'},
+            dir_mapping=dir_mapping,
+            timeout=0)
+        assert thread.get_progress() == 0.0
+
+        observed = []
+        with mock.patch.object(DockerTaskThread, 'docker_manager',
+                               docker_manager):
+            runner = threading.Thread(target=thread.run)
+            runner.start()
+
+            job = FakeProgressJob.instances.get(timeout=5)
+            for _ in FakeProgressJob.records:
+                job.written.get(timeout=5)
+                observed.append(thread.get_progress())
+                job.resume.release()
+            runner.join(timeout=5)
+
+        assert observed == [0.25, 0.5, 0.75]
+        assert thread.get_progress() == 0.75
+        assert thread.error is False
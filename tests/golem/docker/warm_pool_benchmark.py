@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+import requests
+from docker import errors
+
+from golem.docker.client import local_client
+from golem.docker.image import DockerImage
+from golem.docker.job import DockerJob
+from golem.docker.manager import DockerManager
+from golem.docker.pool import WarmContainerPool, WarmDockerJob
+
+IMAGE = DockerImage('golemfactory/base', tag='1.4')
+ENTRYPOINT = 'python3 -c "print(1)"'
+
+
+def skip_benchmarks():
+    if not os.environ.get('benchmarks', False):
+        return True
+    try:
+        local_client().inspect_image(IMAGE.name)
+    except (requests.exceptions.ConnectionError, errors.DockerException):
+        return True
+    return False
+
+
+def subtask_dirs(root: Path):
+    root = Path(tempfile.mkdtemp(dir=str(root)))
+    dirs = dict(
+        resources_dir=root / 'resources',
+        work_dir=root / 'work',
+        output_dir=root / 'output',
+    )
+    for path in dirs.values():
+        path.mkdir()
+    return {key: str(path) for key, path in dirs.items()}
+
+
+def run_cold(manager: DockerManager, root: Path):
+    dirs = subtask_dirs(root)
+    host_config = manager.get_host_config_for_task([])
+    with DockerJob(IMAGE, ENTRYPOINT, {}, host_config=host_config,
+                   environment=DockerJob.get_environment(), **dirs) as job:
+        job.start()
+        assert job.wait() == 0
+
+
+def run_warm(pool: WarmContainerPool, root: Path):
+    # Containers are recycled in the background, off the subtask's path
+    while not pool.idle:
+        time.sleep(0.01)
+
+    dirs = subtask_dirs(root)
+    with WarmDockerJob(pool, ENTRYPOINT, {},
+                       environment=DockerJob.get_environment(),
+                       **dirs) as job:
+        job.start()
+        assert job.wait() == 0
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=10, warmup=False)
+def test_cold_container_overhead(benchmark, tmpdir):
+    manager = DockerManager()
+    benchmark(run_cold, manager, Path(str(tmpdir)))
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=10, warmup=True)
+def test_warm_container_overhead(benchmark, tmpdir):
+    manager = DockerManager()
+    pool = WarmContainerPool(IMAGE, Path(str(tmpdir), 'pool'),
+                             host_config=manager.get_host_config_for_task)
+    pool.fill()
+    try:
+        benchmark(run_warm, pool, Path(str(tmpdir)))
+    finally:
+        pool.close()
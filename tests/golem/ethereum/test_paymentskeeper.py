@@ -1,7 +1,8 @@
 from eth_utils import encode_hex
 from os import urandom
+from unittest.mock import patch
 
-from golem.model import PaymentStatus
+from golem.model import PaymentDetails, PaymentStatus
 from golem.ethereum.paymentskeeper import PaymentsDatabase, PaymentsKeeper
 from golem.tools.testwithdatabase import TestWithDatabase
 from golem.tools.ci import ci_skip
@@ -75,3 +76,28 @@ class TestPaymentsDatabase(TestWithDatabase):
 
         payments = pd.get_subtasks_payments(['id1', 'id4', 'id2'])
         assert self._get_ids(payments) == ['id1', 'id2']
+
+    def test_tasks_payment_totals(self):
+        pd = PaymentsDatabase()
+        for subtask_id, value, fee, status in (
+                ('s1', 10, 1, PaymentStatus.sent),
+                ('s2', 20, 2, PaymentStatus.confirmed),
+                ('s3', 30, 3, PaymentStatus.sent),
+                ('s4', 40, 4, PaymentStatus.awaiting),
+                ('s5', 50, 5, PaymentStatus.confirmed)):
+            self._create_payment(subtask=subtask_id, value=value,
+                                 details=PaymentDetails(fee=fee),
+                                 status=status)
+        subtask_tasks = {
+            's1': 't1',
+            's2': 't1',
+            's3': 't2',
+            's4': 't2',
+            's6': 't3',
+        }
+        expected = {'t1': (30, 3)}
+
+        assert pd.get_tasks_payment_totals(subtask_tasks) == expected
+        with patch('golem.ethereum.paymentskeeper.SUBTASKS_QUERY_LIMIT', 1):
+            assert pd.get_tasks_payment_totals(subtask_tasks) == expected
+        assert pd.get_tasks_payment_totals({}) == {}
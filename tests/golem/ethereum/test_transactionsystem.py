@@ -792,3 +792,69 @@ class IncomesListTest(TransactionSystemBase):
             ],
             self.ets.get_incomes_list(),
         )
+
+    def test_unknown_node(self):
+        income = model_factory.Income()
+        income.save(force_insert=True)
+        incomes = self.ets.get_incomes_list()
+        self.assertEqual(len(incomes), 1)
+        self.assertEqual(incomes[0]['subtask'], income.subtask)
+        self.assertIsNone(incomes[0]['node'])
+
+    def test_pages(self):
+        for _ in range(3):
+            model_factory.Income().save(force_insert=True)
+        incomes = self.ets.get_incomes_list()
+        self.assertEqual(len(incomes), 3)
+
+        page = self.ets.get_incomes_page(limit=2)
+        self.assertEqual(page['incomes'], incomes[:2])
+        self.assertIsNotNone(page['next'])
+        page = self.ets.get_incomes_page(limit=2, after=page['next'])
+        self.assertEqual(page['incomes'], incomes[2:])
+        self.assertIsNone(page['next'])
+
+    def test_stream(self):
+        for _ in range(3):
+            model_factory.Income().save(force_insert=True)
+        incomes = self.ets.get_incomes_list()
+        with patch('golem.ethereum.transactionsystem.collect_chunks') \
+                as collect_chunks:
+            result = self.ets.get_incomes_list(stream=True)
+        self.assertIs(result, collect_chunks.return_value)
+        chunks, = collect_chunks.call_args[0]
+        self.assertEqual([i for chunk in chunks for i in chunk], incomes)
+
+
+class PaymentsListTest(TransactionSystemBase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            self.ets.add_payment_info('subtask{}'.format(i), i + 1,
+                                      '0x' + 40 * '1')
+
+    @staticmethod
+    def _subtasks(payments):
+        return [p['subtask'] for p in payments]
+
+    def test_pages(self):
+        page = self.ets.get_payments_page(limit=2)
+        self.assertEqual(self._subtasks(page['payments']),
+                         ['subtask2', 'subtask1'])
+        page = self.ets.get_payments_page(limit=2, after=page['next'])
+        self.assertEqual(self._subtasks(page['payments']), ['subtask0'])
+        self.assertIsNone(page['next'])
+
+    def test_stream(self):
+        with patch('golem.ethereum.transactionsystem.collect_chunks') \
+                as collect_chunks:
+            self.ets.get_payments_list(stream=True)
+        chunks, = collect_chunks.call_args[0]
+        self.assertEqual(
+            self._subtasks(p for chunk in chunks for p in chunk),
+            ['subtask2', 'subtask1', 'subtask0'],
+        )
+
+    def test_stream_with_filters(self):
+        with self.assertRaises(ValueError):
+            self.ets.get_payments_list(num=1, stream=True)
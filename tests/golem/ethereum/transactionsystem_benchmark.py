@@ -0,0 +1,105 @@
+import datetime
+import os
+
+import pytest
+from golem_messages.factories.datastructures import p2p as dt_p2p_factory
+
+from golem.database import Database
+from golem.ethereum.incomeskeeper import IncomesKeeper
+from golem.ethereum.paymentskeeper import PaymentsKeeper
+from golem.ethereum.transactionsystem import TransactionSystem
+from golem.model import db, DB_FIELDS, DB_MODELS, CachedNode, Income, \
+    Payment, PaymentDetails
+
+ROWS = 1000000
+NODES = 1000
+BATCH_SIZE = 500
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def insert(model, rows):
+    with db.atomic():
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                model.insert_many(batch).execute()
+                batch = []
+        if batch:
+            model.insert_many(batch).execute()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def database(tmpdir_factory):
+    database = Database(db, fields=DB_FIELDS, models=DB_MODELS,
+                        db_dir=str(tmpdir_factory.mktemp('database')))
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope='module')
+def transaction_system(database):  # pylint: disable=redefined-outer-name
+    """ Transaction system with ROWS incomes from NODES known nodes and ROWS
+        payments """
+    # pylint: disable=unused-argument
+    base = datetime.datetime(2018, 1, 1)
+    nodes = [dt_p2p_factory.Node() for _ in range(NODES)]
+    insert(CachedNode, (dict(node=node.key, node_field=node)
+                        for node in nodes))
+    insert(Income, (
+        dict(sender_node=nodes[i % NODES].key, payer_address='0x' + 40 * '3',
+             subtask='subtask-{}'.format(i), value=10 ** 18,
+             created_date=base + datetime.timedelta(seconds=i))
+        for i in range(ROWS)))
+    insert(Payment, (
+        dict(subtask='subtask-{}'.format(i), payee=b'\x01' * 20,
+             value=10 ** 18, details=PaymentDetails(fee=10 ** 14),
+             created_date=base + datetime.timedelta(seconds=i))
+        for i in range(ROWS)))
+
+    transaction_system = TransactionSystem.__new__(TransactionSystem)
+    # pylint: disable=protected-access
+    transaction_system._incomes_keeper = IncomesKeeper()
+    transaction_system._payments_keeper = PaymentsKeeper()
+    return transaction_system
+
+
+def walk_pages(get_page):
+    """ Follows the cursors to the last page """
+    after = None
+    while True:
+        page = get_page(after=after)
+        after = page['next']
+        if after is None:
+            return
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+class TestPaymentLists:
+    # pylint: disable=redefined-outer-name,no-self-use
+
+    def test_incomes_first_page(self, benchmark, transaction_system):
+        benchmark(transaction_system.get_incomes_page)
+
+    def test_incomes_all_pages(self, benchmark, transaction_system):
+        benchmark.pedantic(
+            walk_pages, args=(transaction_system.get_incomes_page, ),
+            rounds=1)
+
+    def test_incomes_list(self, benchmark, transaction_system):
+        benchmark.pedantic(transaction_system.get_incomes_list, rounds=1)
+
+    def test_payments_first_page(self, benchmark, transaction_system):
+        benchmark(transaction_system.get_payments_page)
+
+    def test_payments_all_pages(self, benchmark, transaction_system):
+        benchmark.pedantic(
+            walk_pages, args=(transaction_system.get_payments_page, ),
+            rounds=1)
+
+    def test_payments_list(self, benchmark, transaction_system):
+        benchmark.pedantic(transaction_system.get_payments_list, rounds=1)
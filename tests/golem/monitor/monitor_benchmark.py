@@ -0,0 +1,73 @@
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from golem.monitor.monitor import BatchSenderThread, SenderThread
+from golem.monitorconfig import MONITOR_CONFIG
+from tests.golem.monitor.test_monitor import Event, MonitorSink
+
+EVENTS = 2000
+OUTAGE_EVENTS = 100000
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def create_sender(sink: MonitorSink, batched: bool, **kwargs):
+    cls = BatchSenderThread if batched else SenderThread
+    return cls(
+        node_info=Event(-1),
+        monitor_host=sink.url,
+        monitor_request_timeout=1,
+        monitor_sender_thread_timeout=60,
+        proto_ver=MONITOR_CONFIG['PROTO_VERSION'],
+        **kwargs,
+    )
+
+
+def deliver(batched: bool) -> float:
+    """ Returns the number of events delivered per second """
+    with MonitorSink() as sink:
+        sender = create_sender(sink, batched)
+        sender.start()
+        started = time.time()
+        for n in range(EVENTS):
+            sender.send(Event(n))
+        sink.wait_for(EVENTS, timeout=60)
+        elapsed = time.time() - started
+        sender.join()
+    assert len(sink.events) == EVENTS
+    return EVENTS / elapsed
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("batched", [False, True])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_delivery_rate(benchmark, batched):
+    rate = benchmark.pedantic(deliver, args=(batched, ), rounds=1)
+    benchmark.extra_info['events_per_second'] = rate
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_outage_memory(benchmark):
+    """ Events queued while the monitor is unreachable """
+    def queue_events():
+        with MonitorSink() as sink:
+            sink.available = False
+            sender = create_sender(sink, batched=True)
+            sender.start()
+            tracemalloc.start()
+            for n in range(OUTAGE_EVENTS):
+                sender.send(Event(n))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sender.join()
+        return peak, sender.stats
+
+    peak, stats = benchmark.pedantic(queue_events, rounds=1)
+    benchmark.extra_info['peak_memory'] = peak
+    benchmark.extra_info.update(stats)
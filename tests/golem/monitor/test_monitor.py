@@ -1,5 +1,9 @@
 # pylint: disable=protected-access
+import gzip
+import http.server
 import json
+import socketserver
+import threading
 import time
 from unittest import mock, TestCase
 from urllib.parse import urljoin
@@ -13,7 +17,8 @@ from golem import testutils
 from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.core import variables
 from golem.monitor.model.nodemetadatamodel import NodeMetadataModel
-from golem.monitor.monitor import SystemMonitor, SenderThread, Sender
+from golem.monitor.monitor import SystemMonitor, SenderThread, Sender, \
+    BatchSenderThread
 from golem.monitorconfig import MONITOR_CONFIG
 from golem.task.taskrequestorstats import CurrentStats, FinishedTasksStats, \
     EMPTY_FINISHED_SUMMARY
@@ -277,3 +282,192 @@ class TestSenderThread(TestCase):
         assert len(logs.output) == 1
         output_lines = logs.output[0].split('\n')
         assert len(output_lines) == 1
+
+
+class MonitorSinkHandler(http.server.BaseHTTPRequestHandler):
+    """ Collects messages sent to the monitor """
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if not self.server.available:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        data = json.loads(body.decode())['data']
+        if any(event.get('n') in self.server.rejected for event in
+               (data if isinstance(data, list) else [data])):
+            self.send_response(400)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        with self.server.lock:
+            self.server.events.extend(
+                data if isinstance(data, list) else [data])
+            self.server.requests += 1
+
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *_args):  # pylint: disable=arguments-differ
+        pass
+
+
+class MonitorSink(socketserver.ThreadingMixIn, http.server.HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), MonitorSinkHandler)
+        self.available = True
+        self.rejected: set = set()
+        self.events: list = []
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever,
+                                       daemon=True)
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}/'.format(self.server_address[1])
+
+    def wait_for(self, count: int, timeout: float = 10) -> None:
+        deadline = time.time() + timeout
+        while len(self.events) < count and time.time() < deadline:
+            time.sleep(0.01)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+
+class Event:
+    def __init__(self, n):
+        self.n = n
+
+    def dict_repr(self):
+        return {'type': 'Event', 'n': self.n}
+
+
+class TestBatchSenderThread(TestCase):
+
+    def setUp(self):
+        self.sink = MonitorSink().__enter__()
+        self.node_info = Event(-1)
+
+    def tearDown(self):
+        self.sink.__exit__()
+
+    def _create_sender(self, **kwargs):
+        kwargs.setdefault('batch_size', 10)
+        kwargs.setdefault('batch_interval', 0.05)
+        return BatchSenderThread(
+            node_info=self.node_info,
+            monitor_host=self.sink.url,
+            monitor_request_timeout=1,
+            monitor_sender_thread_timeout=60,
+            proto_ver=MONITOR_CONFIG['PROTO_VERSION'],
+            **kwargs,
+        )
+
+    def _received(self):
+        return [event['n'] for event in self.sink.events]
+
+    def test_batches(self):
+        sender = self._create_sender()
+        for n in range(25):
+            sender.send(Event(n))
+        sender.start()
+        self.sink.wait_for(25)
+        sender.join()
+
+        assert self._received() == list(range(25))
+        assert self.sink.requests == 3
+        assert sender.stats['sent'] == 25
+        assert sender.stats['batches'] == 3
+
+    def test_outage(self):
+        self.sink.available = False
+        sender = self._create_sender(max_pending=10, spool_size=1000)
+        for n in range(200):
+            sender.send(Event(n))
+        assert not sender.flush()
+
+        # Memory use is bounded, the oldest messages are dropped
+        assert len(sender.pending) <= 10
+        assert sender.spool.used <= 1000
+        assert sender.stats['dropped'] > 0
+
+        self.sink.available = True
+        sender.start()
+        delivered = 200 - sender.stats['dropped']
+        self.sink.wait_for(delivered)
+        sender.join()
+
+        received = self._received()
+        assert len(received) == delivered
+        assert received == sorted(received)
+        assert received[-1] == 199
+        assert sender.stats['failed'] > 0
+
+    def test_rejected_batch_dropped(self):
+        self.sink.rejected = {3}
+        sender = self._create_sender(spool_size=1000)
+        for n in range(25):
+            sender.send(Event(n))
+        with self.assertLogs('golem.monitor', level='WARNING'):
+            assert sender.flush()
+
+        assert self._received() == list(range(10, 25))
+        assert sender.stats['dropped'] == 10
+        assert sender.stats['sent'] == 15
+        assert sender.stats['failed'] == 0
+
+    def test_rejected_spooled_batch_dropped(self):
+        self.sink.available = False
+        self.sink.rejected = {3}
+        sender = self._create_sender(max_pending=0, spool_size=10000)
+        for n in range(20):
+            sender.send(Event(n))
+        assert not sender.flush()
+
+        self.sink.available = True
+        assert sender.flush()
+        assert self._received() == list(range(10, 20))
+        assert sender.spool.used == 0
+        assert sender.stats['dropped'] == 10
+
+    def test_flush_on_join(self):
+        sender = self._create_sender(batch_interval=60)
+        sender.start()
+        sender.send(Event(1))
+        sender.join()
+        assert self._received() == [1]
+
+    def test_ping(self):
+        sender = self._create_sender()
+        sender.monitor_sender_thread_timeout = 0
+        sender.start()
+        self.sink.wait_for(1)
+        sender.join()
+        assert self._received()[0] == -1
+
+
+class TestSystemMonitorBatching(TestCase):
+
+    def test_batch_sender_thread(self):
+        config = dict(MONITOR_CONFIG, BATCH_SIZE=50)
+        monitor = SystemMonitor(mock.Mock(), config)
+        assert isinstance(monitor.sender_thread, BatchSenderThread)
+        assert monitor.sender_thread.batch_size == 50
+        monitor.start()
+        monitor.shut_down()
@@ -0,0 +1,81 @@
+import os
+from unittest import TestCase
+
+from golem.monitor.transport.spool import RingSpool, RECORD_LENGTH
+from golem.testutils import TempDirFixture
+
+
+def record(i: int) -> bytes:
+    return b'record %03d' % i
+
+
+RECORD_SIZE = RECORD_LENGTH.size + len(record(0))
+
+
+class TestRingSpool(TestCase):
+
+    def setUp(self):
+        self.spool = RingSpool(capacity=10 * RECORD_SIZE)
+
+    def tearDown(self):
+        self.spool.close()
+
+    def test_fifo(self):
+        assert self.spool.push([record(i) for i in range(3)]) == 0
+        assert len(self.spool) == 3
+        assert self.spool.peek(2) == [record(0), record(1)]
+        # peek does not remove records
+        assert self.spool.peek(5) == [record(0), record(1), record(2)]
+
+        self.spool.discard(2)
+        assert self.spool.peek(5) == [record(2)]
+
+    def test_drop_oldest(self):
+        assert self.spool.push([record(i) for i in range(15)]) == 5
+        assert self.spool.dropped == 5
+        assert self.spool.peek(20) == [record(i) for i in range(5, 15)]
+
+    def test_wrap_around(self):
+        for i in range(0, 100, 3):
+            self.spool.peek(3)
+            self.spool.discard(3)
+            self.spool.push([record(i), b'', record(i + 1) * 2])
+        assert self.spool.peek(3) == [record(99), b'', record(100) * 2]
+
+    def test_too_large(self):
+        assert self.spool.push([b'x' * 10 * RECORD_SIZE]) == 1
+        assert not self.spool
+
+    def test_discard_dropped(self):
+        self.spool.push([record(i) for i in range(10)])
+        assert self.spool.peek(4) == [record(i) for i in range(4)]
+        # Two of the peeked records are dropped in the meantime
+        self.spool.push([record(10), record(11)])
+
+        self.spool.discard(4)
+        assert self.spool.peek(20) == [record(i) for i in range(4, 12)]
+
+
+class TestRingSpoolFile(TempDirFixture):
+
+    def test_reopen(self):
+        path = os.path.join(self.path, 'monitor.spool')
+        spool = RingSpool(capacity=1000, path=path)
+        spool.push([record(i) for i in range(3)])
+        spool.peek(1)
+        spool.discard(1)
+        spool.close()
+
+        spool = RingSpool(capacity=1000, path=path)
+        assert spool.peek(5) == [record(1), record(2)]
+        spool.close()
+
+    def test_reopen_other_capacity(self):
+        path = os.path.join(self.path, 'monitor.spool')
+        spool = RingSpool(capacity=1000, path=path)
+        spool.push([record(1)])
+        spool.close()
+
+        spool = RingSpool(capacity=2000, path=path)
+        assert not spool
+        spool.close()
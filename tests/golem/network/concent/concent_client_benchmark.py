@@ -0,0 +1,38 @@
+import os
+import statistics
+from unittest import mock
+
+import pytest
+
+from golem.core.keysauth import KeysAuth
+from tests.golem.network.concent.test_concent_client import \
+    send_through_stub
+
+MESSAGES = 100
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.fixture(scope='module')
+def keys_auth(tmpdir_factory):
+    return KeysAuth(
+        datadir=str(tmpdir_factory.mktemp('keys')),
+        private_key_name='priv_key',
+        password='password',
+    )
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("latency", [0.0, 0.05, 0.2])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_queue_latency(benchmark, keys_auth, latency):
+    """ Time from queueing a message to handling the Concent's response """
+    with mock.patch('golem.terms.ConcentTermsOfUse.are_accepted',
+                    return_value=True):
+        latencies = benchmark.pedantic(
+            send_through_stub, args=(keys_auth, MESSAGES, latency), rounds=1)
+    benchmark.extra_info['median_queue_latency'] = \
+        statistics.median(latencies)
+    benchmark.extra_info['max_queue_latency'] = max(latencies)
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from golem.core.keysauth import KeysAuth
+from tests.golem.network.concent.test_filetransfers import \
+    create_random_file, transfer_through_stub
+
+MB = 1024 * 1024
+# A mix of small result packages and large resource packages
+FILE_SIZES = [1 * MB] * 20 + [1024 * MB] * 2
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+@pytest.fixture(scope='module')
+def keys_auth(tmpdir_factory):
+    return KeysAuth(
+        datadir=str(tmpdir_factory.mktemp('keys')),
+        private_key_name='priv_key',
+        password='password',
+    )
+
+
+@pytest.fixture(scope='module')
+def files(tmpdir_factory):
+    root = tmpdir_factory.mktemp('files')
+    paths = []
+    for i, size in enumerate(FILE_SIZES):
+        path = str(root.join('file{}'.format(i)))
+        create_random_file(path, size)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("workers", [1, 4])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_transfer_mixed_sizes(benchmark, keys_auth, files, tmpdir, workers):
+    benchmark.extra_info['bytes'] = 2 * sum(FILE_SIZES)
+    benchmark.pedantic(transfer_through_stub,
+                       args=(keys_auth, str(tmpdir), files, workers),
+                       rounds=1)
@@ -1,8 +1,12 @@
 # pylint: disable=protected-access, no-self-use
 import datetime
 import gc
+import http.server
 import logging
+import socketserver
+import threading
 import time
+import typing
 from unittest import mock, TestCase
 import urllib
 
@@ -264,10 +268,13 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         assert 'key' not in self.concent_service._delayed
+        assert len(self.concent_service._queue) == 1
 
-        assert not self.concent_service.cancel('key')
+        assert self.concent_service.cancel('key')
 
         assert 'key' not in self.concent_service._delayed
+        assert not self.concent_service._queue
+        assert not self.concent_service.cancel('key')
 
     def test_delayed_submit(self, *_):
         self.concent_service.submit(
@@ -282,6 +289,10 @@ class TestConcentClientService(testutils.TempDirFixture):
 
         assert 'key' not in self.concent_service._delayed
 
+    def _wait_for_requests(self):
+        self.concent_service._executor.shutdown(wait=True)
+        self.concent_service._loop()
+
     def test_loop_exception(self, send_mock, *_):
         self.concent_service.submit(
             'key',
@@ -290,11 +301,8 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         send_mock.side_effect = exceptions.ConcentRequestError
-        mock_path = ("golem.network.concent.client.ConcentClientService"
-                     "._grace_sleep")
-        with mock.patch(mock_path) as sleep_mock:
-            self.concent_service._loop()
-            sleep_mock.assert_called_once_with()
+        self.concent_service._loop()
+        self._wait_for_requests()
 
         send_mock.assert_called_once_with(
             self.msg,
@@ -303,6 +311,66 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         assert not self.concent_service._delayed
+        # Ill-formed requests are not retried
+        assert not self.concent_service._queue
+        assert self.concent_service._in_flight == 0
+
+    def test_loop_retry(self, send_mock, *_):
+        self.concent_service.submit(
+            'key',
+            self.msg,
+            delay=datetime.timedelta(),
+        )
+
+        send_mock.side_effect = exceptions.ConcentUnavailableError
+        self.concent_service._loop()
+        self._wait_for_requests()
+
+        assert len(self.concent_service._queue) == 1
+        assert self.concent_service._queue.pop_ready() is None
+        with freeze_time(datetime.datetime.utcnow() + datetime.timedelta(
+                seconds=self.concent_service.MIN_GRACE_TIME)):
+            request = self.concent_service._queue.pop_ready()
+        assert request.msg is self.msg
+        assert request.attempts == 1
+
+    def test_cancel_retried(self, send_mock, *_):
+        self.concent_service.submit(
+            'key',
+            self.msg,
+            delay=datetime.timedelta(),
+        )
+
+        send_mock.side_effect = exceptions.ConcentUnavailableError
+        self.concent_service._loop()
+        self._wait_for_requests()
+        assert len(self.concent_service._queue) == 1
+
+        assert self.concent_service.cancel('key')
+        assert not self.concent_service._queue
+        with freeze_time(datetime.datetime.utcnow() + datetime.timedelta(
+                seconds=self.concent_service.MAX_GRACE_TIME)):
+            assert self.concent_service._queue.pop_ready() is None
+
+    def test_cancel_in_flight(self, *_):
+        self.concent_service._executor.shutdown()
+        self.concent_service._executor = mock.Mock()
+        self.concent_service.submit(
+            'key',
+            self.msg,
+            delay=datetime.timedelta(),
+        )
+        self.concent_service._loop()
+        request = self.concent_service._executor.submit.call_args[0][1]
+
+        # Already sent, only the retries are cancelled
+        assert not self.concent_service.cancel('key')
+
+        self.concent_service._completed.put(
+            (request, None, exceptions.ConcentUnavailableError()))
+        self.concent_service._loop()
+        assert not self.concent_service._queue
+        assert not self.concent_service._sending
 
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
@@ -318,6 +386,7 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         self.concent_service._loop()
+        self._wait_for_requests()
         send_mock.assert_called_once_with(
             self.msg,
             self.concent_service.keys_auth._private_key,
@@ -325,6 +394,28 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
         react_mock.assert_called_once_with(data, response_to=self.msg)
 
+    def test_loop_in_flight_window(self, send_mock, *_):
+        send_mock.return_value = None
+        self.concent_service.MAX_IN_FLIGHT = 2
+        self.concent_service._executor.shutdown()
+        self.concent_service._executor = mock.Mock()
+        for i in range(3):
+            self.concent_service.submit(
+                'key{}'.format(i),
+                self.msg,
+                delay=datetime.timedelta(),
+            )
+
+        self.concent_service._loop()
+        assert self.concent_service._executor.submit.call_count == 2
+        assert len(self.concent_service._queue) == 1
+
+        # A finished request frees a slot
+        request = self.concent_service._executor.submit.call_args[0][1]
+        self.concent_service._completed.put((request, None, None))
+        self.concent_service._loop()
+        assert self.concent_service._executor.submit.call_count == 3
+
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
         '.react_to_concent_message'
@@ -345,7 +436,7 @@ class TestConcentClientService(testutils.TempDirFixture):
 
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
-        '._grace_sleep'
+        '._postpone_receive'
     )
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
@@ -369,7 +460,7 @@ class TestConcentClientService(testutils.TempDirFixture):
 
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
-        '._grace_sleep'
+        '._postpone_receive'
     )
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
@@ -429,6 +520,162 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
 
+class TestConcentRequestQueue(TestCase):
+
+    @staticmethod
+    def _request(key, priority=1, **kwargs):
+        return client.ConcentRequest(key, mock.Mock(), priority, **kwargs)
+
+    def test_priority(self):
+        request_queue = client.ConcentRequestQueue()
+        request_queue.put(self._request('payment', priority=2))
+        request_queue.put(self._request('force1', priority=1))
+        request_queue.put(self._request('response', priority=0))
+        request_queue.put(self._request('force2', priority=1))
+
+        keys = []
+        while request_queue:
+            keys.append(request_queue.pop_ready().key)
+        assert keys == ['response', 'force1', 'force2', 'payment']
+        assert request_queue.pop_ready() is None
+
+    def test_supersede(self):
+        request_queue = client.ConcentRequestQueue()
+        old = self._request('key')
+        new = self._request('key')
+        request_queue.put(old)
+        request_queue.put(new)
+
+        assert len(request_queue) == 1
+        assert request_queue.pop_ready() is new
+        assert request_queue.pop_ready() is None
+
+    def test_no_replace(self):
+        request_queue = client.ConcentRequestQueue()
+        new = self._request('key')
+        request_queue.put(new)
+
+        assert not request_queue.put(self._request('key'), replace=False)
+        assert request_queue.pop_ready() is new
+
+    def test_remove(self):
+        request_queue = client.ConcentRequestQueue()
+        request_queue.put(self._request('key'))
+        request_queue.put(self._request('other'))
+
+        assert request_queue.remove('key')
+        assert not request_queue.remove('key')
+        assert len(request_queue) == 1
+        assert request_queue.pop_ready().key == 'other'
+        assert request_queue.pop_ready() is None
+
+    @freeze_time("2018-01-01 00:00:00")
+    def test_not_before(self):
+        request_queue = client.ConcentRequestQueue()
+        request_queue.put(self._request('later', priority=0,
+                                        not_before=time.time() + 10))
+        request_queue.put(self._request('now', priority=1))
+
+        assert request_queue.pop_ready().key == 'now'
+        assert request_queue.pop_ready() is None
+        with freeze_time("2018-01-01 00:00:10"):
+            assert request_queue.pop_ready().key == 'later'
+
+
+class StubConcentHandler(http.server.BaseHTTPRequestHandler):
+    """ Replies to every request with an empty response after a delay """
+
+    latency = 0.0
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Concent-Golem-Messages-Version',
+                         golem_messages.__version__)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *_args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubConcentServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """ Local stand-in for the Concent with a configurable response time """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float) -> None:
+        handler = type('Handler', (StubConcentHandler, ),
+                       {'latency': latency})
+        super().__init__(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.serve_forever,
+                                       daemon=True)
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+
+def send_through_stub(keys_auth, count: int, latency: float) \
+        -> typing.List[float]:
+    """ Sends count messages to a stub Concent, returning the time each one
+    spent between being queued and its response being handled """
+    with StubConcentServer(latency) as server:
+        variant = dict(variables.CONCENT_CHOICES['dev'], url=server.url)
+        service = client.ConcentClientService(
+            keys_auth=keys_auth,
+            variant=variant,
+        )
+        latencies = []
+
+        def react(_data, response_to=None):
+            latencies.append(time.time() - queued[response_to])
+
+        service.react_to_concent_message = react
+        queued = dict()
+        for i in range(count):
+            msg = message.concents.ForceReportComputedTask()
+            queued[msg] = time.time()
+            service._enqueue('key{}'.format(i), msg)
+
+        started = time.time()
+        while len(latencies) < count and time.time() - started < 30:
+            service._loop()
+            service._wakeup.wait(0.1)
+            service._wakeup.clear()
+        service.stop()
+
+    assert len(latencies) == count
+    return latencies
+
+
+@mock.patch('golem.terms.ConcentTermsOfUse.are_accepted', return_value=True)
+class TestConcentClientServiceLatency(testutils.TempDirFixture):
+
+    def test_pipelined(self, *_):
+        keys_auth = keysauth.KeysAuth(
+            datadir=self.path,
+            private_key_name='priv_key',
+            password='password',
+        )
+        latency = 0.2
+        count = 2 * client.ConcentClientService.MAX_IN_FLIGHT
+
+        latencies = send_through_stub(keys_auth, count, latency)
+        # Slow responses do not hold back the other messages: sent one by
+        # one, the last message would wait for count * latency
+        assert max(latencies) < count * latency / 2
+
+
 class ConcentCallLaterTestCase(testutils.TempDirFixture):
     def setUp(self):
         super().setUp()
@@ -1,5 +1,12 @@
 import base64
+import hashlib
+import http.server
+import os
 import queue
+import socketserver
+import threading
+import time
+import typing
 import unittest
 
 import mock
@@ -12,6 +19,7 @@ from golem import testutils
 from golem.core import keysauth
 from golem.core import variables
 from golem.network.concent import filetransfers
+from golem.tools.testwithreactor import TestWithReactor
 from tests.factories.concent import ConcentFileRequestFactory
 
 
@@ -63,6 +71,9 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
 
     def tearDown(self):
         self.assertFalse(self.cfs.running)
+        if self.cfs._executor:
+            self.cfs._executor.shutdown()
+        super().tearDown()
 
     def test_init(self):
         self.assertIsInstance(self.cfs._transfers, queue.Queue)
@@ -101,20 +112,25 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
                          FileTransferToken.FileInfo.Category.results)
 
     @mock.patch('golem.network.concent.filetransfers.'
-                'ConcentFiletransferService.process')
-    def test_run_empty(self, process_mock):
+                'ConcentFiletransferService._transfer')
+    def test_run_empty(self, transfer_mock):
         self.cfs._run()
-        process_mock.assert_not_called()
+        transfer_mock.assert_not_called()
 
+    @mock.patch('twisted.internet.reactor.callFromThread')
     @mock.patch('golem.network.concent.filetransfers.'
-                'ConcentFiletransferService.process')
-    def test_run(self, process_mock):
+                'ConcentFiletransferService._transfer')
+    def test_run(self, transfer_mock, call_mock):
         path = '/yeta/nother.file'
         ftt = FileTransferTokenFactory()
         self.cfs.transfer(path, ftt)
         self.cfs._run()
-        process_mock.assert_called_once()
-        request = process_mock.call_args[0][0]
+        self.cfs._transfers.join()
+        transfer_mock.assert_called_once()
+        request = transfer_mock.call_args[0][0]
+        call_mock.assert_called_once_with(
+            self.cfs._complete, request,
+            response=transfer_mock.return_value)
         self.assertIsInstance(request, filetransfers.ConcentFileRequest)
         self.assertEqual(request.file_path, path)
         self.assertEqual(request.file_transfer_token, ftt)
@@ -185,7 +201,8 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         file.write_text('meh')
         return str(file)
 
-    @mock.patch('golem.network.concent.filetransfers.requests.post')
+    @mock.patch('golem.network.concent.filetransfers.verify_file', mock.Mock())
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.post')
     def test_upload(self, requests_mock):
         path = self._init_uploaded_file('something.good')
 
@@ -210,7 +227,8 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         self.assertIsNotNone(kwargs.get('headers').pop('Concent-Auth'))
         self.assertEqual(kwargs.get('headers'), headers)
 
-    @mock.patch('golem.network.concent.filetransfers.requests.post')
+    @mock.patch('golem.network.concent.filetransfers.verify_file', mock.Mock())
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.post')
     def test_upload_multiple_files(self, requests_mock):
         path = self._init_uploaded_file('obsta.cles')
         category = FileTransferToken.FileInfo.Category.resources
@@ -238,8 +256,10 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         concent_upload_path = kwargs.get('headers').get('Concent-Upload-Path')
         self.assertEqual(concent_upload_path, ftt.files[1].get('path'))  # noqa pylint:disable=unsubscriptable-object
 
-    @mock.patch('golem.network.concent.filetransfers.requests.get')
+    @mock.patch('golem.network.concent.filetransfers.verify_file', mock.Mock())
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.get')
     def test_download(self, requests_mock):
+        requests_mock.return_value.headers = {}
         path = self.path + '/gotwell.soon'
 
         ftt = FileTransferTokenFactory(download=True)
@@ -264,8 +284,10 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
             self._mock_get_auth_headers(ftt)
         )
 
-    @mock.patch('golem.network.concent.filetransfers.requests.get')
+    @mock.patch('golem.network.concent.filetransfers.verify_file', mock.Mock())
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.get')
     def test_download_multiple_files(self, requests_mock):
+        requests_mock.return_value.headers = {}
         path = self.path + '/spanish.sahara'
         category = FileTransferToken.FileInfo.Category.resources
         ftt = FileTransferTokenFactory(
@@ -290,3 +312,372 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
 
         requests_mock.assert_called_once()
         self.assertEqual(requests_mock.call_args[0], (download_address, ))
+
+
+class StubStorageHandler(http.server.BaseHTTPRequestHandler):
+    """ Stand-in for the Concent storage cluster, keeping files on disk.
+    Accepts ranged uploads and serves ranged downloads """
+
+    protocol_version = 'HTTP/1.1'
+    block_size = 1024 * 1024
+
+    def _file_path(self, path: str) -> str:
+        return os.path.join(self.server.root, path.strip('/').replace('/', '_'))
+
+    def _reply(self, status: int, length: int = 0, **headers) -> None:
+        self.send_response(status)
+        self.send_header('Content-Length', str(length))
+        for name, value in headers.items():
+            self.send_header(name.replace('_', '-'), value)
+        self.end_headers()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        remaining = int(self.headers['Content-Length'])
+        content_range = self.headers.get('Content-Range')
+        file_path = self._file_path(self.headers['Concent-Upload-Path'])
+        self.server.requests.append(('POST', content_range))
+        time.sleep(self.server.latency)
+
+        start = 0
+        if content_range:
+            start = int(content_range.split()[1].split('-')[0])
+        with open(file_path, 'r+b' if start else 'wb') as f:
+            f.seek(start)
+            while remaining:
+                data = self.rfile.read(min(remaining, self.block_size))
+                f.write(data)
+                remaining -= len(data)
+        self._reply(200)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        file_path = self._file_path(self.path[len('/download/'):])
+        content_range = self.headers.get('Range')
+        self.server.requests.append(('GET', content_range))
+        time.sleep(self.server.latency)
+
+        if not os.path.exists(file_path):
+            self._reply(404)
+            return
+
+        size = os.path.getsize(file_path)
+        start = 0
+        if content_range:
+            start = int(content_range[len('bytes='):].rstrip('-'))
+            if start >= size:
+                self._reply(416)
+                return
+
+        length = size - start
+        if content_range:
+            self._reply(206, length, Content_Range='bytes {}-{}/{}'.format(
+                start, size - 1, size))
+        else:
+            self._reply(200, length)
+
+        if self.server.broken_downloads:
+            # Send a half of the body and drop the connection
+            self.server.broken_downloads -= 1
+            length //= 2
+            self.close_connection = True
+
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            while length:
+                data = f.read(min(length, self.block_size))
+                self.wfile.write(data)
+                length -= len(data)
+
+    def log_message(self, *_args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubStorageServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, root: str, latency: float = 0.0) -> None:
+        super().__init__(('127.0.0.1', 0), StubStorageHandler)
+        self.root = root
+        self.latency = latency
+        self.broken_downloads = 0
+        self.requests: typing.List[typing.Tuple[str, typing.Optional[str]]] \
+            = []
+        self.thread = threading.Thread(target=self.serve_forever,
+                                       daemon=True)
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}/'.format(self.server_address[1])
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+
+def file_checksum(path: str) -> str:
+    file_hash = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+    return 'sha1:' + file_hash.hexdigest()
+
+
+def stub_file_transfer_token(server: StubStorageServer, file_path: str,
+                             upload: bool) -> FileTransferToken:
+    """ Creates a token for transferring the file to or from the stub,
+    describing the file's current contents """
+    category = FileTransferToken.FileInfo.Category.results
+    file_info = FileInfoFactory(
+        path='blender/result/{}.zip'.format(os.path.basename(file_path)),
+        checksum=file_checksum(file_path),
+        size=os.path.getsize(file_path),
+        category=category,
+    )
+    return FileTransferTokenFactory(
+        storage_cluster_address=server.url,
+        files=[file_info],
+        upload=upload,
+        download=not upload,
+    )
+
+
+class ConcentFiletransferStubTest(testutils.TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.keys_auth = keysauth.KeysAuth(
+            datadir=self.path,
+            private_key_name='priv_key',
+            password='password',
+        )
+        self.storage_dir = os.path.join(self.path, 'storage')
+        os.mkdir(self.storage_dir)
+        self.server = StubStorageServer(self.storage_dir).__enter__()
+        self.cfs = self._create_service()
+
+    def tearDown(self):
+        if self.cfs._executor:
+            self.cfs._executor.shutdown()
+        self.server.__exit__()
+        super().tearDown()
+
+    def _create_service(self, **kwargs):
+        return filetransfers.ConcentFiletransferService(
+            keys_auth=self.keys_auth,
+            variant=variables.CONCENT_CHOICES['dev'],
+            **kwargs,
+        )
+
+    def _create_file(self, name: str, size: int) -> str:
+        path = os.path.join(self.path, name)
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        return path
+
+    def _upload(self, path: str, **kwargs):
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        return self.cfs.process(ConcentFileRequestFactory(
+            file_path=path, file_transfer_token=ftt, **kwargs))
+
+    def _download(self, path: str, ftt: FileTransferToken, **kwargs):
+        download_ftt = FileTransferTokenFactory(
+            storage_cluster_address=ftt.storage_cluster_address,
+            files=ftt.files,
+            download=True,
+        )
+        return self.cfs.process(ConcentFileRequestFactory(
+            file_path=path, file_transfer_token=download_ftt, **kwargs))
+
+    def test_upload_and_download(self):
+        path = self._create_file('result', 3 * 1024 * 1024 + 7)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        self.cfs.chunk_size = 1024 * 1024
+
+        self.assertTrue(self._upload(path).ok)
+        downloaded = os.path.join(self.path, 'downloaded')
+        self.assertTrue(self._download(downloaded, ftt).ok)
+
+        self.assertEqual(file_checksum(downloaded), file_checksum(path))
+        self.assertFalse(os.path.exists(
+            downloaded + filetransfers.PARTIAL_SUFFIX))
+        self.assertEqual(self.server.requests, [('POST', None), ('GET', None)])
+
+    def test_ranged_upload(self):
+        self.cfs.part_size = 1000
+        path = self._create_file('result', 2500)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+
+        self.assertTrue(self._upload(path).ok)
+
+        self.assertEqual(self.server.requests, [
+            ('POST', 'bytes 0-999/2500'),
+            ('POST', 'bytes 1000-1999/2500'),
+            ('POST', 'bytes 2000-2499/2500'),
+        ])
+        downloaded = os.path.join(self.path, 'downloaded')
+        self.assertTrue(self._download(downloaded, ftt).ok)
+        self.assertEqual(file_checksum(downloaded), file_checksum(path))
+
+    def test_upload_checksum_mismatch(self):
+        path = self._create_file('result', 100)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        self._create_file('result', 100)
+        error = mock.Mock()
+
+        self.cfs.process(ConcentFileRequestFactory(
+            file_path=path, file_transfer_token=ftt, error=error))
+
+        error.assert_called_once()
+        self.assertIsInstance(error.call_args[0][0],
+                              filetransfers.ConcentFiletransferError)
+
+    def test_download_resumes_broken_connection(self):
+        path = self._create_file('result', 10000)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        self._upload(path)
+        self.server.broken_downloads = 1
+
+        downloaded = os.path.join(self.path, 'downloaded')
+        self.assertTrue(self._download(downloaded, ftt).ok)
+
+        self.assertEqual(file_checksum(downloaded), file_checksum(path))
+        self.assertEqual(self.server.requests[1:], [
+            ('GET', None), ('GET', 'bytes=5000-')])
+
+    def test_download_resumes_partial_file(self):
+        path = self._create_file('result', 10000)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        self._upload(path)
+
+        downloaded = os.path.join(self.path, 'downloaded')
+        with open(path, 'rb') as src, \
+                open(downloaded + filetransfers.PARTIAL_SUFFIX, 'wb') as dst:
+            dst.write(src.read(4000))
+
+        self.assertTrue(self._download(downloaded, ftt).ok)
+
+        self.assertEqual(file_checksum(downloaded), file_checksum(path))
+        self.assertEqual(self.server.requests[1:], [('GET', 'bytes=4000-')])
+
+    def test_download_partial_file_complete(self):
+        path = self._create_file('result', 10000)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        self._upload(path)
+
+        downloaded = os.path.join(self.path, 'downloaded')
+        with open(path, 'rb') as src, \
+                open(downloaded + filetransfers.PARTIAL_SUFFIX, 'wb') as dst:
+            dst.write(src.read())
+
+        self.assertTrue(self._download(downloaded, ftt).ok)
+        self.assertEqual(file_checksum(downloaded), file_checksum(path))
+
+    def test_download_checksum_mismatch(self):
+        path = self._create_file('result', 10000)
+        ftt = stub_file_transfer_token(self.server, path, upload=True)
+        self._upload(path)
+        self._create_file(os.path.join('storage', ftt.files[0]['path']  # noqa pylint:disable=unsubscriptable-object
+                                       .replace('/', '_')), 10000)
+
+        downloaded = os.path.join(self.path, 'downloaded')
+        with self.assertRaises(filetransfers.ConcentFiletransferError):
+            self._download(downloaded, ftt)
+
+        self.assertFalse(os.path.exists(downloaded))
+        self.assertFalse(os.path.exists(
+            downloaded + filetransfers.PARTIAL_SUFFIX))
+
+    @mock.patch('twisted.internet.reactor.callFromThread',
+                lambda fn, *args, **kwargs: fn(*args, **kwargs))
+    def test_concurrent_transfers(self):
+        latency = 0.2
+        self.server.latency = latency
+        success = mock.Mock()
+
+        for i in range(4):
+            path = self._create_file('result{}'.format(i), 1000)
+            ftt = stub_file_transfer_token(self.server, path, upload=True)
+            self.cfs.transfer(path, ftt, success=success)
+
+        started = time.time()
+        self.cfs._run()
+        self.cfs._transfers.join()
+
+        self.assertEqual(success.call_count, 4)
+        self.assertLess(time.time() - started, 4 * latency)
+
+
+class ConcentFiletransferReactorTest(TestWithReactor):
+
+    @mock.patch('golem.network.concent.filetransfers.'
+                'ConcentFiletransferService._transfer')
+    def test_callbacks_in_reactor_thread(self, transfer_mock):
+        transfer_mock.side_effect = [mock.Mock(ok=True), Exception()]
+        service = filetransfers.ConcentFiletransferService(
+            keys_auth=mock.Mock(),
+            variant=variables.CONCENT_CHOICES['dev'],
+        )
+        threads: queue.Queue = queue.Queue()
+
+        def callback(_):
+            threads.put(threading.current_thread())
+
+        for _ in range(2):
+            service.transfer('/some/file', FileTransferTokenFactory(),
+                             success=callback, error=callback)
+        service._run()
+        service._transfers.join()
+        service._executor.shutdown()
+
+        for _ in range(2):
+            self.assertIs(threads.get(timeout=5), self.reactor_thread)
+
+
+def create_random_file(path: str, size: int) -> None:
+    block = 1024 * 1024
+    with open(path, 'wb') as f:
+        for _ in range(size // block):
+            f.write(os.urandom(block))
+        f.write(os.urandom(size % block))
+
+
+def transfer_through_stub(keys_auth, root: str, paths: typing.List[str],
+                          workers: int) -> None:
+    """ Uploads the files to a stub storage cluster and downloads them back
+    next to the originals """
+    storage_dir = os.path.join(root, 'storage')
+    os.makedirs(storage_dir, exist_ok=True)
+    service = filetransfers.ConcentFiletransferService(
+        keys_auth=keys_auth,
+        variant=variables.CONCENT_CHOICES['dev'],
+        workers=workers,
+    )
+    failed: typing.List[Exception] = []
+
+    def run(transfers):
+        for path, ftt in transfers:
+            service.transfer(path, ftt, error=failed.append)
+        service._run()
+        service._transfers.join()
+        assert not failed, failed
+
+    # Callbacks are called from the worker threads, there is no reactor
+    with StubStorageServer(storage_dir) as server, mock.patch(
+            'twisted.internet.reactor.callFromThread',
+            lambda fn, *args, **kwargs: fn(*args, **kwargs)):
+        uploads = [(path, stub_file_transfer_token(server, path, upload=True))
+                   for path in paths]
+        run(uploads)
+        run([(path + '.downloaded', FileTransferTokenFactory(
+            storage_cluster_address=ftt.storage_cluster_address,
+            files=ftt.files,
+            download=True,
+        )) for path, ftt in uploads])
+
+    service._executor.shutdown()
+    for path in paths:
+        os.remove(path + '.downloaded')
@@ -455,6 +455,7 @@ class FiletransfersTestBase(TaskServerMessageHandlerTestBase):
                 password='password',
             ),
             variant=variables.CONCENT_CHOICES['dev'],
+            workers=1,
         )
 
         self.cft = self.client.concent_filetransfers
@@ -467,6 +468,22 @@ class FiletransfersTestBase(TaskServerMessageHandlerTestBase):
         cft_patch.start()
         self.addCleanup(cft_patch.stop)
 
+        reactor_patch = mock.patch(
+            'twisted.internet.reactor.callFromThread',
+            lambda fn, *args, **kwargs: fn(*args, **kwargs)
+        )
+        reactor_patch.start()
+        self.addCleanup(reactor_patch.stop)
+
+    def tearDown(self):
+        if self.cft._executor:
+            self.cft._executor.shutdown()
+        super().tearDown()
+
+    def _run_transfers(self):
+        self.cft._run()
+        self.cft._transfers.join()
+
 
 class FileTransferTokenTestsBase:
 
@@ -533,7 +550,7 @@ class ForceGetTaskResultUploadTest(FileTransferTokenTests,  # noqa pylint:disabl
             '.ConcentFiletransferService.upload',
             mock.Mock(return_value=response)
         ) as upload_mock:
-            self.cft._run()
+            self._run_transfers()
 
         upload_mock.assert_called_once()
         self.assertEqual(
@@ -562,7 +579,7 @@ class ForceGetTaskResultUploadTest(FileTransferTokenTests,  # noqa pylint:disabl
             '.ConcentFiletransferService.upload',
             mock.Mock(side_effect=exception)
         ):
-            self.cft._run()
+            self._run_transfers()
 
         log_mock.assert_called_with(
             "Concent results upload failed: %r, %s",
@@ -617,7 +634,7 @@ class ForceGetTaskResultDownloadTest(FileTransferTokenTests,  # noqa pylint:disa
             'golem.network.concent.filetransfers'
             '.ConcentFiletransferService.download',
         ) as download_mock:
-            self.cft._run()
+            self._run_transfers()
 
         download_mock.assert_called_once()
         self.assertEqual(
@@ -642,7 +659,7 @@ class ForceGetTaskResultDownloadTest(FileTransferTokenTests,  # noqa pylint:disa
             '.ConcentFiletransferService.download',
             mock.Mock(side_effect=exception)
         ):
-            self.cft._run()
+            self._run_transfers()
 
         log_mock.assert_called_with(
             "Concent download failed: %r, %s",
@@ -664,7 +681,7 @@ class ForceGetTaskResultDownloadTest(FileTransferTokenTests,  # noqa pylint:disa
             'golem.network.concent.filetransfers'
             '.ConcentFiletransferService.download',
         ):
-            self.cft._run()
+            self._run_transfers()
 
         extract.assert_called_once()
         log_mock.assert_called_with(
@@ -740,8 +757,7 @@ class SubtaskResultsVerifyTest(FileTransferTokenTestsBase,  # noqa pylint:disabl
             self.wtr.task_id, [self.path])
         asrv = self.get_asrv()
         library.interpret(asrv)
-        self.cft._run()
-        self.cft._run()
+        self._run_transfers()
         self.assertEqual(upload_mock.call_count, 2)
         resources_call, results_call = upload_mock.call_args_list
 
@@ -784,8 +800,7 @@ class SubtaskResultsVerifyTest(FileTransferTokenTestsBase,  # noqa pylint:disabl
             self.wtr.task_id, [self.path])
         asrv = self.get_asrv()
         library.interpret(asrv)
-        self.cft._run()
-        self.cft._run()
+        self._run_transfers()
         self.assertEqual(upload_mock.call_count, 1)
         self.assertIn('Cannot find the subtask', log_mock.call_args[0][0])
 
@@ -797,8 +812,7 @@ class SubtaskResultsVerifyTest(FileTransferTokenTestsBase,  # noqa pylint:disabl
         self.task_server.results_to_send[self.wtr.subtask_id] = self.wtr
         asrv = self.get_asrv()
         library.interpret(asrv)
-        self.cft._run()
-        self.cft._run()
+        self._run_transfers()
         self.assertEqual(upload_mock.call_count, 1)
         self.assertIn('Cannot upload resources', log_mock.call_args[0][0])
 
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+from golem_messages import factories as msg_factories
+
+from golem.database import Database
+from golem.model import db, DB_FIELDS, DB_MODELS, Actor, MessageCodec, \
+    NetworkMessage
+from golem.network import history
+
+MESSAGES = 1000000
+BATCH_SIZE = 1000
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def messages():
+    msgs = []
+    for _ in range(BATCH_SIZE):
+        msg = msg_factories.tasks.ReportComputedTaskFactory()
+        msg._fake_sign()  # pylint: disable=protected-access
+        msgs.append(msg)
+    return msgs
+
+
+@pytest.fixture
+def database(tmpdir):
+    database = Database(db, fields=DB_FIELDS, models=DB_MODELS,
+                        db_dir=str(tmpdir))
+    yield database
+    database.db.close()
+
+
+def insert(msgs, codec):
+    for offset in range(0, MESSAGES, BATCH_SIZE):
+        rows = []
+        for msg in msgs[:min(BATCH_SIZE, MESSAGES - offset)]:
+            rows.append(history.message_to_model(
+                msg, 'node', Actor.Provider, Actor.Requestor, codec))
+        with db.atomic():
+            NetworkMessage.insert_many(rows).execute()
+
+
+def read_messages():
+    for db_msg in NetworkMessage.select():
+        db_msg.as_message()
+
+
+def read_columns():
+    history.MessageHistoryService.get_columns_sync(['msg_cls', 'msg_date'])
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('codec', list(MessageCodec), ids=lambda c: c.name)
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+class TestMessageHistoryStorage:
+
+    def test_insert(self, benchmark, database, messages, codec):
+        benchmark.pedantic(insert, args=(messages, codec), rounds=1)
+        benchmark.extra_info['db_size'] = os.path.getsize(
+            database.db.database)
+
+    def test_read(self, benchmark, database, messages, codec):
+        insert(messages, codec)
+        benchmark.pedantic(read_messages, rounds=1)
+
+    def test_read_columns(self, benchmark, database, messages, codec):
+        insert(messages, codec)
+        benchmark.pedantic(read_columns, rounds=1)
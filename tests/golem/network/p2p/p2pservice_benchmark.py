@@ -0,0 +1,106 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+from golem_messages.factories.datastructures import p2p as dt_p2p_factory
+from twisted.internet.defer import maybeDeferred
+
+from golem.clientconfigdescriptor import ClientConfigDescriptor
+from golem.database import Database
+from golem.model import db, DB_FIELDS, DB_MODELS
+from golem.network.p2p.candidates import CandidateCache
+from golem.network.p2p.p2pservice import P2PService
+from golem.network.p2p.resolver import ResolverCache
+from golem.network.transport.tcpnetwork import SocketAddress
+from golem.network.transport.tcpserver import PendingConnectionsServer
+
+PEERS = 10000
+SEEDS = 1000
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def create_nodes(count: int):
+    return [
+        dt_p2p_factory.Node(
+            key='{:0128x}'.format(i),
+            pub_addr='1.{}.{}.{}'.format(i >> 16, (i >> 8) & 255, i & 255),
+            prv_addr='10.0.0.1',
+            prv_addresses=['10.0.0.1', '10.0.1.1', '172.17.0.1'],
+            p2p_prv_port=40102,
+            p2p_pub_port=40102,
+        )
+        for i in range(count)
+    ]
+
+
+def prepare_uncached(service: P2PService, nodes) -> None:
+    """ Candidate lists built from scratch, as before they were cached """
+    for node in nodes:
+        addresses = PendingConnectionsServer.get_socket_addresses(
+            service, node, node.p2p_prv_port, node.p2p_pub_port)
+        address = service.suggested_address.get(node.key)
+        if address:
+            service._prepend_address(
+                addresses, SocketAddress(address, node.p2p_prv_port))
+
+
+def prepare(service: P2PService, nodes) -> None:
+    for node in nodes:
+        service.get_socket_addresses(node)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def database(tmpdir_factory):
+    database = Database(db, fields=DB_FIELDS, models=DB_MODELS,
+                        db_dir=str(tmpdir_factory.mktemp('database')))
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope='module')
+def service():
+    keys_auth = Mock(key_id='{:0128x}'.format(PEERS + 1))
+    service = P2PService(None, ClientConfigDescriptor(), keys_auth,
+                         connect_to_known_hosts=False)
+    service.candidates = CandidateCache(max_peers=PEERS)
+    for i in range(0, PEERS, 2):
+        service.suggested_address['{:0128x}'.format(i)] = '10.0.2.1'
+    return service
+
+
+@pytest.fixture(scope='module')
+def nodes():
+    return create_nodes(PEERS)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_prepare_uncached(benchmark, service, nodes):
+    benchmark(prepare_uncached, service, nodes)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=5, warmup=True)
+def test_prepare_cached(benchmark, service, nodes):
+    """ Repeated connection attempts, e.g. after a network change """
+    prepare(service, nodes)
+    benchmark(prepare, service, nodes)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=5, warmup=True)
+def test_sync_seeds_cached(benchmark, service):
+    """ Seeds are synchronised each time a known peer is added """
+    service.bootstrap_seeds = [
+        ('{}.seeds.example.com'.format(i), 40102) for i in range(SEEDS)
+    ]
+    service.resolver = ResolverCache(
+        resolve=lambda host, port: [('1.2.3.4', port)],
+        max_entries=SEEDS,
+        run_async=maybeDeferred,
+    )
+    benchmark(service._sync_seeds, known_hosts=[])
+    assert service.resolver.stats['lookups'] == SEEDS
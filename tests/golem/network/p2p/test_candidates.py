@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from golem.network.p2p.candidates import CandidateCache, MAX_SCORE
+from golem.network.transport.tcpnetwork import SocketAddress
+
+
+def addresses(*hosts, port=40102):
+    return [SocketAddress(host, port) for host in hosts]
+
+
+class TestCandidateCache(TestCase):
+
+    def setUp(self):
+        self.cache = CandidateCache(max_peers=2)
+
+    def test_get(self):
+        candidates = addresses('1.2.3.4', '10.0.0.1')
+        assert self.cache.get('a', 1) is None
+        assert self.cache.put('a', 1, candidates) == candidates
+        assert self.cache.get('a', 1) == candidates
+        assert self.cache.get('a', 2) is None
+
+        # Cached candidates are copied
+        self.cache.get('a', 1).pop()
+        assert self.cache.get('a', 1) == candidates
+
+    def test_bounded(self):
+        self.cache.put('a', 1, addresses('1.2.3.4'))
+        self.cache.put('b', 1, addresses('1.2.3.5'))
+        self.cache.get('a', 1)
+        self.cache.put('c', 1, addresses('1.2.3.6'))
+        assert len(self.cache) == 2
+        assert self.cache.get('b', 1) is None
+        assert self.cache.get('a', 1) is not None
+
+    def test_success(self):
+        self.cache.put('a', 1, addresses('1.2.3.4', '10.0.0.1', '10.0.0.2'))
+        self.cache.record_success('a', '10.0.0.2', 40102)
+        assert self.cache.get('a', 1) == \
+            addresses('10.0.0.2', '1.2.3.4', '10.0.0.1')
+
+        # History is kept when the candidates change
+        assert self.cache.put('a', 2, addresses('1.2.3.5', '10.0.0.2')) == \
+            addresses('10.0.0.2', '1.2.3.5')
+
+    def test_success_before_put(self):
+        self.cache.record_success('a', '10.0.0.1', 40102)
+        assert self.cache.put('a', 1, addresses('1.2.3.4', '10.0.0.1')) == \
+            addresses('10.0.0.1', '1.2.3.4')
+
+    def test_failure(self):
+        self.cache.record_failure('a')
+        self.cache.put('a', 1, addresses('1.2.3.4', '10.0.0.1'))
+        self.cache.record_failure('a')
+        assert self.cache.get('a', 1) == addresses('10.0.0.1', '1.2.3.4')
+
+    def test_score_bounded(self):
+        self.cache.put('a', 1, addresses('1.2.3.4', '10.0.0.1'))
+        for _ in range(MAX_SCORE * 2):
+            self.cache.record_success('a', '10.0.0.1', 40102)
+        self.cache.record_success('a', '1.2.3.4', 40102)
+        for _ in range(MAX_SCORE):
+            self.cache.record_failure('a')
+        assert self.cache.get('a', 1) == addresses('1.2.3.4', '10.0.0.1')
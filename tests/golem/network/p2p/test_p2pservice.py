@@ -11,6 +11,7 @@ import faker
 from golem_messages.datastructures import p2p as dt_p2p
 from golem_messages.factories.datastructures import p2p as dt_p2p_factory
 from golem_messages.message import Disconnect
+from twisted.internet.defer import Deferred, maybeDeferred
 from twisted.internet.tcp import EISCONN
 
 from golem.clientconfigdescriptor import ClientConfigDescriptor
@@ -21,6 +22,7 @@ from golem.network.p2p import peersession
 from golem.network.p2p.p2pservice import HISTORY_LEN, P2PService, \
     RANDOM_DISCONNECT_FRACTION, MAX_STORED_HOSTS
 from golem.network.p2p.peersession import PeerSession
+from golem.network.p2p.resolver import ResolverCache
 from golem.network.transport.tcpnetwork import SocketAddress
 from golem.task.taskconnectionshelper import TaskConnectionsHelper
 from golem.tools.testwithreactor import TestDatabaseWithReactor
@@ -29,6 +31,19 @@ from golem.tools.testwithreactor import TestDatabaseWithReactor
 fake = faker.Faker()
 
 
+class FakeResolver:
+    """ Resolves each host name to a distinct private address """
+
+    def __init__(self):
+        self.hosts = {}
+
+    def __call__(self, host, port):
+        if host == 'nosuchaddress':
+            raise OSError('Name or service not known')
+        self.hosts.setdefault(host, '10.0.0.{}'.format(len(self.hosts) + 1))
+        return [(self.hosts[host], port)]
+
+
 class TestSyncSeeds(TestDatabaseWithReactor):
     def setUp(self):
         super().setUp()
@@ -40,6 +55,12 @@ class TestSyncSeeds(TestDatabaseWithReactor):
             connect_to_known_hosts=False,
         )
         self.service.seeds = set()
+        self.resolve = mock.Mock(side_effect=FakeResolver())
+        self.service.resolver = ResolverCache(
+            resolve=self.resolve,
+            listener=self.service._seed_resolved,
+            run_async=maybeDeferred,
+        )
 
     def test_P2P_SEEDS(self):
         self.service._sync_seeds()
@@ -70,6 +91,59 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service._sync_seeds()
         self.assertEqual(self.service.seeds, set())
 
+    def test_resolutions_cached(self):
+        self.service.bootstrap_seeds = frozenset()
+        self.service.config_desc.seed_host = 'seed.example.com'
+        self.service.config_desc.seed_port = '31337'
+        self.service._sync_seeds()
+        self.service._sync_seeds()
+        self.assertEqual(self.service.seeds, {('10.0.0.1', 31337)})
+        self.resolve.assert_called_once_with('seed.example.com', 31337)
+
+    def test_failures_cached(self):
+        self.service.bootstrap_seeds = frozenset()
+        self.service.config_desc.seed_host = 'nosuchaddress'
+        self.service.config_desc.seed_port = '31337'
+        self.service._sync_seeds()
+        self.service._sync_seeds()
+        self.assertEqual(self.service.seeds, set())
+        self.resolve.assert_called_once_with('nosuchaddress', 31337)
+
+    @mock.patch('golem.network.p2p.p2pservice.P2PService.connect')
+    def test_hostname_resolved_after_connecting(self, connect_mock):
+        lookups = []
+
+        def run_async(fn, *args):
+            deferred = Deferred()
+            lookups.append((deferred, fn, args))
+            return deferred
+
+        self.service.resolver.run_async = run_async
+        self.service.connect_to_known_hosts = True
+        self.service.bootstrap_seeds = frozenset()
+        self.service.config_desc.seed_host = 'seed.example.com'
+        self.service.config_desc.seed_port = '31337'
+        self.service._sync_seeds()
+        self.service.connect_to_network()
+        self.assertEqual(self.service.seeds, set())
+        connect_mock.assert_not_called()
+
+        deferred, fn, args = lookups.pop()
+        deferred.callback(fn(*args))
+        self.assertEqual(self.service.seeds, {('10.0.0.1', 31337)})
+        connect_mock.assert_called_once()
+        socket_address = connect_mock.call_args[0][0]
+        self.assertEqual((socket_address.address, socket_address.port),
+                         ('10.0.0.1', 31337))
+
+    def test_ip_address_not_resolved(self):
+        self.service.bootstrap_seeds = frozenset()
+        self.service.config_desc.seed_host = '127.0.0.1'
+        self.service.config_desc.seed_port = '31337'
+        self.service._sync_seeds()
+        self.assertEqual(self.service.seeds, {('127.0.0.1', 31337)})
+        self.resolve.assert_not_called()
+
 
 class TestP2PService(TestDatabaseWithReactor):
 
@@ -521,6 +595,49 @@ class TestP2PService(TestDatabaseWithReactor):
         assert SocketAddress(address, prv_port) in result
         assert SocketAddress(address, pub_port) in result
 
+    def test_get_socket_addresses_cached(self):
+        node_info = dt_p2p_factory.Node(
+            key='abcd',
+            pub_addr='1.2.3.4',
+            prv_addr='10.0.0.1',
+            prv_addresses=['10.0.0.1', '10.0.0.2'],
+            p2p_prv_port=40102,
+            p2p_pub_port=40102,
+        )
+        result = self.service.get_socket_addresses(node_info)
+        with patch.object(self.service, '_is_address_valid') as valid:
+            assert self.service.get_socket_addresses(node_info) == result
+            valid.assert_not_called()
+
+        # A suggested address changes the candidates
+        self.service.suggested_address['abcd'] = '10.0.0.3'
+        result = self.service.get_socket_addresses(node_info)
+        assert result[0] == SocketAddress('10.0.0.3', 40102)
+
+    def test_socket_addresses_ranked_by_history(self):
+        node_info = dt_p2p_factory.Node(
+            key='abcd',
+            pub_addr='1.2.3.4',
+            prv_addr='10.0.0.1',
+            p2p_prv_port=40102,
+            p2p_pub_port=40102,
+        )
+        result = self.service.get_socket_addresses(node_info)
+        assert result[0] == SocketAddress('1.2.3.4', 40102)
+
+        session = mock.Mock(address='10.0.0.1', port=40102)
+        self.service._P2PService__connection_established(
+            session, conn_id='conn', node_key='abcd')
+        result = self.service.get_socket_addresses(node_info)
+        assert result[0] == SocketAddress('10.0.0.1', 40102)
+
+        self.service._P2PService__connection_failure(
+            conn_id='conn', node_key='abcd')
+        self.service._P2PService__connection_failure(
+            conn_id='conn', node_key='abcd')
+        result = self.service.get_socket_addresses(node_info)
+        assert result[0] == SocketAddress('1.2.3.4', 40102)
+
     def test_get_performance_percentile_rank_single_env(self):
         def _host(perf):
             return MagicMock(metadata={'performance': {'env': perf}})
@@ -0,0 +1,124 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from twisted.internet.defer import Deferred, maybeDeferred
+
+from golem.network.p2p.resolver import ResolverCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResolver:
+    def __init__(self, addresses=None):
+        self.addresses = addresses or {}
+        self.calls = []
+
+    def __call__(self, host, port):
+        self.calls.append((host, port))
+        if host not in self.addresses:
+            raise OSError("Name or service not known")
+        return [(address, port) for address in self.addresses[host]]
+
+
+class TestResolverCache(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.resolve = FakeResolver({
+            'seed.example.com': ['1.2.3.4', '1.2.3.5'],
+            'empty.example.com': [],
+        })
+        self.listener = Mock()
+        self.cache = ResolverCache(resolve=self.resolve, ttl=10,
+                                   negative_ttl=2, max_entries=2,
+                                   listener=self.listener,
+                                   run_async=maybeDeferred, clock=self.clock)
+
+    def test_get(self):
+        expected = [('1.2.3.4', 40102), ('1.2.3.5', 40102)]
+        assert self.cache.get('seed.example.com', 40102) == expected
+        assert self.cache.get('seed.example.com', 40102) == expected
+        assert self.resolve.calls == [('seed.example.com', 40102)]
+        assert self.cache.stats['hits'] == 1
+        self.listener.assert_called_once_with('seed.example.com', 40102,
+                                              expected)
+
+    def test_ip_address(self):
+        assert self.cache.get('10.0.0.1', 1) == [('10.0.0.1', 1)]
+        assert self.cache.get('::1', 1) == [('::1', 1)]
+        assert not self.resolve.calls
+        assert not self.cache
+
+    def test_expired(self):
+        self.cache.get('seed.example.com', 40102)
+        self.clock.now = 10
+        self.resolve.addresses['seed.example.com'] = ['1.2.3.6']
+        assert self.cache.get('seed.example.com', 40102) == \
+            [('1.2.3.6', 40102)]
+        assert len(self.resolve.calls) == 2
+
+    def test_negative(self):
+        assert self.cache.get('nosuchaddress', 1) == []
+        assert self.cache.get('empty.example.com', 1) == []
+        assert self.cache.get('nosuchaddress', 1) == []
+        assert len(self.resolve.calls) == 2
+        assert self.cache.stats['failures'] == 2
+
+        self.clock.now = 2
+        self.cache.get('nosuchaddress', 1)
+        assert len(self.resolve.calls) == 3
+
+    def test_bounded(self):
+        self.resolve.addresses['other.example.com'] = ['1.2.3.7']
+        self.cache.get('seed.example.com', 1)
+        self.cache.get('nosuchaddress', 1)
+        self.cache.get('seed.example.com', 1)
+        self.cache.get('other.example.com', 1)
+        assert len(self.cache) == 2
+        # The least recently used entry has been evicted
+        self.cache.get('seed.example.com', 1)
+        self.cache.get('nosuchaddress', 1)
+        assert len(self.resolve.calls) == 4
+
+    def test_invalidate(self):
+        self.cache.get('seed.example.com', 1)
+        self.cache.invalidate('seed.example.com', 1)
+        self.cache.get('seed.example.com', 1)
+        assert len(self.resolve.calls) == 2
+
+    def test_asynchronous(self):
+        lookups = []
+
+        def run_async(fn, *args):
+            deferred = Deferred()
+            lookups.append((deferred, fn, args))
+            return deferred
+
+        self.cache.run_async = run_async
+        assert self.cache.get('seed.example.com', 1) == []
+        assert self.cache.get('seed.example.com', 1) == []
+        resolved = self.cache.resolve('seed.example.com', 1)
+        # A single lookup is in progress
+        assert len(lookups) == 1
+        assert not resolved.called
+
+        deferred, fn, args = lookups[0]
+        deferred.callback(fn(*args))
+        assert resolved.result == [('1.2.3.4', 1), ('1.2.3.5', 1)]
+        assert self.cache.get('seed.example.com', 1) == resolved.result
+
+        # Stale addresses are returned while they are being refreshed
+        self.clock.now = 10
+        assert self.cache.get('seed.example.com', 1) == resolved.result
+        assert len(lookups) == 2
+
+    def test_resolve_failure(self):
+        resolved = self.cache.resolve('nosuchaddress', 1)
+        assert resolved.result == []
+        self.listener.assert_not_called()
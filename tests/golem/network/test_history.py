@@ -1,5 +1,6 @@
 # pylint: disable=protected-access
 import datetime
+import pickle
 import queue
 import uuid
 import unittest
@@ -11,7 +12,8 @@ from peewee import DataError, PeeweeException, IntegrityError
 
 from golem_messages import factories as msg_factories
 
-from golem.model import NetworkMessage, Actor
+from golem.model import NetworkMessage, Actor, MessageCodec, \
+    decode_message, encode_message
 from golem.network import history
 from golem.testutils import DatabaseFixture
 
@@ -138,6 +140,54 @@ class TestMessageHistoryService(DatabaseFixture):
         result = self.service.get_sync(task="task", subtask=msgs[0]['subtask'])
         assert len(result) == 1
 
+    def test_get_columns_sync(self):
+        msgs = [
+            self._build_dict("task", None),
+            self._build_dict("task", None),
+            self._build_dict("other", None)
+        ]
+        for msg in msgs:
+            self.service.add_sync(msg)
+
+        with mock.patch('golem.model.NetworkMessage.as_message') as as_message:
+            result = self.service.get_columns_sync(
+                ['msg_cls', 'msg_date'], task="task")
+        assert not as_message.called
+        assert result == [(msg['msg_cls'], msg['msg_date'])
+                          for msg in msgs[:2]]
+
+        result = self.service.get_columns_sync(['subtask'])
+        assert result == [(msg['subtask'],) for msg in msgs]
+
+        with self.assertRaises(ValueError):
+            self.service.get_columns_sync(['unknown'])
+
+    @mock.patch('golem.network.history.encode_message',
+                return_value=(MessageCodec.golem_messages, b'encoded'))
+    def test_get_sync_as_message_converts_legacy(self, encode):
+        stored = 'stored message'
+        msg_dict = self._build_dict("task", None)
+        msg_dict['msg_data'] = pickle.dumps(stored)
+        self.service.add_sync(msg_dict)
+
+        msg = self.service.get_sync_as_message(task="task")
+        assert msg == stored
+        encode.assert_called_once_with(stored)
+
+        db_msg = NetworkMessage.get()
+        assert db_msg.msg_codec is MessageCodec.golem_messages
+        assert db_msg.msg_data == b'encoded'
+
+    @mock.patch('golem.network.history.encode_message', side_effect=TypeError)
+    def test_get_sync_as_message_conversion_failure(self, _encode):
+        msg_dict = self._build_dict("task", None)
+        msg_dict['msg_data'] = pickle.dumps('stored message')
+        self.service.add_sync(msg_dict)
+
+        assert self.service.get_sync_as_message(task="task") == \
+            'stored message'
+        assert NetworkMessage.get().msg_codec is MessageCodec.pickle
+
     def test_build_clauses(self):
         clauses = self.service.build_clauses(task="task", subtask="subtask",
                                              unknown="unknown")
@@ -355,11 +405,39 @@ class TestMessageToModel(unittest.TestCase):
             'msg_date': datetime.datetime.now(),
             'msg_cls': 'TaskToCompute',
             'msg_data': mock.ANY,
+            'msg_codec': mock.ANY,
             'local_role': local_role,
             'remote_role': remote_role,
         }
         self.assertEqual(result, expected)
 
+        msg = decode_message(result['msg_codec'], result['msg_data'])
+        self.assertEqual(msg, self.msg)
+
+
+class TestMessageCodec(unittest.TestCase):
+    def setUp(self):
+        self.msg = msg_factories.tasks.TaskToComputeFactory()
+        self.msg._fake_sign()
+
+    def test_round_trip(self):
+        for codec in MessageCodec:
+            used_codec, data = encode_message(self.msg, codec)
+            msg = decode_message(used_codec, data)
+            self.assertEqual(msg, self.msg)
+            self.assertEqual(msg.sig, self.msg.sig)
+
+    def test_compression(self):
+        codec, data = encode_message(self.msg)
+        self.assertIs(codec, MessageCodec.golem_messages_zlib)
+        self.assertLess(len(data), len(pickle.dumps(self.msg)))
+
+    @mock.patch('golem.model.golem_messages.dump', return_value=b'short')
+    def test_short_message_not_compressed(self, _dump):
+        codec, data = encode_message(self.msg)
+        self.assertIs(codec, MessageCodec.golem_messages)
+        self.assertEqual(data, b'short')
+
 
 class TestNetworkMessage(DatabaseFixture):
 
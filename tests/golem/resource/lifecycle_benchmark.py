@@ -0,0 +1,101 @@
+import os
+import time
+
+import pytest
+
+from golem.core.fileshelper import get_dir_size
+from golem.database import Database
+from golem.model import db, DB_FIELDS, DB_MODELS
+from golem.resource.dirmanager import DirManager
+from golem.resource.lifecycle import ResourceLifecycle, UsageLog
+
+FILES = 500000
+FILES_PER_ENTRY = 100
+# Entries expiring in each cleaning pass
+EXPIRED_ENTRIES = 100
+FILE_SIZE = 4
+AGE = 24 * 60 * 60
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def write_entry(directory, index, mtime):
+    entry = os.path.join(directory, 'task{}'.format(index))
+    os.makedirs(entry, exist_ok=True)
+    for i in range(FILES_PER_ENTRY):
+        with open(os.path.join(entry, 'file{}'.format(i)), 'wb') as f:
+            f.write(b'0' * FILE_SIZE)
+    os.utime(entry, (mtime, mtime))
+    return entry
+
+
+@pytest.fixture(scope='module')
+def database(tmpdir_factory):
+    database = Database(db, fields=DB_FIELDS, models=DB_MODELS,
+                        db_dir=str(tmpdir_factory.mktemp('database')))
+    yield database
+    database.db.close()
+
+
+@pytest.fixture(scope='module')
+def directory(tmpdir_factory):
+    """ Resource directory of FILES files, FILES_PER_ENTRY in each entry """
+    directory = str(tmpdir_factory.mktemp('resources'))
+    now = time.time()
+    for i in range(FILES // FILES_PER_ENTRY):
+        write_entry(directory, i, now - i)
+    return directory
+
+
+def create_lifecycle(directory, **kwargs):
+    return ResourceLifecycle([directory], usage_log=UsageLog(),
+                             batch_delay=0, **kwargs)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+class TestResourceCleaning:
+    # pylint: disable=redefined-outer-name,no-self-use,unused-argument
+
+    def test_index(self, benchmark, database, directory):
+        """ First synchronisation, measuring all entries """
+        def index():
+            db.execute_sql('DELETE FROM resourceusage')
+            create_lifecycle(directory).sync()
+        benchmark.pedantic(index, rounds=1)
+
+    def test_clean_idle(self, benchmark, database, directory):
+        """ Cleaning pass with nothing to remove """
+        lifecycle = create_lifecycle(directory, max_age=AGE,
+                                     disk_budget=2 * FILES * FILE_SIZE)
+        lifecycle.sync()
+        assert benchmark(lifecycle.clean) == (0, 0)
+
+    def test_clear_dir_idle(self, benchmark, directory):
+        """ DirManager.clear_dir pass with nothing to remove """
+        benchmark(DirManager(directory).clear_dir, directory, AGE)
+
+    def test_walk(self, benchmark, directory):
+        """ Measuring the directory to check the budget without an index """
+        benchmark.pedantic(get_dir_size, args=(directory, ), rounds=3)
+
+    def test_clean_budget(self, benchmark, database, directory):
+        """ Cleaning pass removing EXPIRED_ENTRIES least recently used
+        entries exceeding the budget """
+        lifecycle = create_lifecycle(directory)
+        lifecycle.sync()
+        lifecycle.disk_budget = lifecycle.total_size()
+        old = time.time() - AGE
+
+        def setup():
+            first = FILES // FILES_PER_ENTRY
+            for i in range(first, first + EXPIRED_ENTRIES):
+                write_entry(directory, i, old)
+
+        def clean():
+            removed, _ = lifecycle.clean()
+            assert removed == EXPIRED_ENTRIES
+
+        benchmark.pedantic(clean, setup=setup, rounds=5)
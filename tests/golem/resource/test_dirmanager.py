@@ -4,6 +4,8 @@ import shutil
 import time
 
 from golem.core.common import is_linux, is_osx
+from golem.core.dirsize import DirSizeTracker
+from golem.core.fileshelper import get_dir_size
 from golem.resource.dirmanager import symlink_or_copy, DirManager, \
     list_dir_recursive
 from golem.testutils import TempDirFixture
@@ -94,6 +96,20 @@ class TestDirManager(TempDirFixture):
         self.assertFalse(os.path.isfile(file4))
         self.assertFalse(os.path.isdir(dir2))
 
+    def test_clear_dir_tracked_size(self):
+        dm = DirManager(self.path)
+        task_dir = dm.get_task_resource_dir('task')
+        with open(os.path.join(task_dir, 'file'), 'w') as f:
+            f.write('a' * 1000)
+
+        tracker = DirSizeTracker()
+        with patch('golem.resource.dirmanager.dirsize.tracker', tracker):
+            tracker.get_size(self.path)
+            dm.get_task_output_dir('task')
+            assert tracker.get_size(self.path) == get_dir_size(self.path)
+            dm.clear_resource('task')
+            assert tracker.get_size(self.path) == get_dir_size(self.path)
+
     def testClearDirOlderThan(self):
         # given
         file1 = os.path.join(self.path, 'file1')
@@ -0,0 +1,176 @@
+import os
+import random
+import unittest
+
+from golem.core.fileshelper import get_dir_size
+from golem.model import ResourceUsage
+from golem.resource.lifecycle import ResourceLifecycle, UsageLog
+from golem.testutils import DatabaseFixture
+
+START = 1500000000.
+
+
+class TestResourceLifecycle(DatabaseFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.time = START
+        self.sleeps = []
+        self.protected = set()
+        self.directory = os.path.join(self.tempdir, 'resources')
+        os.makedirs(self.directory)
+        self.usage_log = UsageLog(clock=lambda: self.time)
+        self.lifecycle = self.create_lifecycle()
+
+    def create_lifecycle(self, **kwargs):
+        return ResourceLifecycle(
+            [self.directory],
+            is_protected=lambda name: name in self.protected,
+            usage_log=self.usage_log,
+            batch_delay=1,
+            clock=lambda: self.time,
+            sleep=self.sleeps.append,
+            **kwargs)
+
+    def write(self, name, size, mtime=START, file_name='file'):
+        """ Writes an entry of the given size, modified at mtime """
+        entry = os.path.join(self.directory, name)
+        os.makedirs(entry, exist_ok=True)
+        with open(os.path.join(entry, file_name), 'wb') as f:
+            f.write(b'0' * size)
+        os.utime(entry, (mtime, mtime))
+        return entry
+
+    def indexed(self):
+        return {os.path.basename(entry.path): entry
+                for entry in ResourceUsage.select()}
+
+    def entries(self):
+        return set(os.listdir(self.directory))
+
+    def test_sync(self):
+        self.write('a', 100, mtime=START - 10)
+        self.write('b', 200)
+        self.lifecycle.sync()
+
+        indexed = self.indexed()
+        self.assertEqual(set(indexed), {'a', 'b'})
+        self.assertEqual(indexed['a'].size,
+                         get_dir_size(os.path.join(self.directory, 'a')))
+        self.assertEqual(indexed['a'].last_used, START - 10)
+        self.assertEqual(self.lifecycle.total_size(),
+                         get_dir_size(self.directory) -
+                         os.path.getsize(self.directory))
+
+    def test_sync_removed(self):
+        entry = self.write('a', 100)
+        self.lifecycle.sync()
+        os.remove(os.path.join(entry, 'file'))
+        os.rmdir(entry)
+        self.lifecycle.sync()
+        self.assertEqual(self.indexed(), {})
+
+    def test_sync_modified(self):
+        self.write('a', 100)
+        self.lifecycle.sync()
+        self.write('a', 100, file_name='other', mtime=START + 1)
+        self.lifecycle.sync()
+        self.assertEqual(self.indexed()['a'].size,
+                         get_dir_size(os.path.join(self.directory, 'a')))
+
+    def test_touch(self):
+        entry = self.write('a', 100)
+        self.lifecycle.sync()
+        self.time = START + 60
+        # Written deeper in the entry, without changing its mtime
+        self.write('a/b', 300)
+        os.utime(entry, (START, START))
+        self.usage_log.touch(os.path.join(entry, 'b', 'file'))
+        self.usage_log.touch(os.path.join(self.tempdir, 'other'))
+        self.lifecycle.sync()
+
+        indexed = self.indexed()['a']
+        self.assertEqual(indexed.last_used, START + 60)
+        self.assertEqual(indexed.size, get_dir_size(entry))
+
+    def test_max_age(self):
+        self.lifecycle = self.create_lifecycle(max_age=100)
+        self.write('old', 100, mtime=START - 100)
+        self.write('new', 100, mtime=START - 99)
+        self.assertEqual(self.lifecycle.clean()[0], 1)
+        self.assertEqual(self.entries(), {'new'})
+        self.assertEqual(set(self.indexed()), {'new'})
+
+    def test_disk_budget(self):
+        self.write('a', 1000, mtime=START - 3)
+        self.write('b', 1000, mtime=START - 2)
+        self.write('c', 1000, mtime=START - 1)
+        self.lifecycle.sync()
+        sizes = {name: entry.size for name, entry in self.indexed().items()}
+
+        self.lifecycle = self.create_lifecycle(
+            disk_budget=sizes['b'] + sizes['c'])
+        self.assertEqual(self.lifecycle.clean(), (1, sizes['a']))
+        self.assertEqual(self.entries(), {'b', 'c'})
+        self.assertEqual(self.lifecycle.clean(), (0, 0))
+
+    def test_protected(self):
+        self.lifecycle = self.create_lifecycle(disk_budget=1500, max_age=100)
+        self.write('a', 1000, mtime=START - 200)
+        self.write('b', 1000, mtime=START - 2)
+        self.protected.add('a')
+        self.lifecycle.clean()
+        self.assertEqual(self.entries(), {'a'})
+
+    def test_batches(self):
+        self.lifecycle = self.create_lifecycle(max_age=100, batch_size=2)
+        for i in range(5):
+            self.write(str(i), 10, mtime=START - 100)
+        self.assertEqual(self.lifecycle.clean()[0], 5)
+        self.assertEqual(self.entries(), set())
+        self.assertEqual(self.sleeps, [1, 1])
+
+    def test_budget_under_write_load(self):
+        budget = 64 * 1024
+        self.lifecycle = self.create_lifecycle(disk_budget=budget)
+        rand = random.Random(0)
+        written = []
+
+        for i in range(50):
+            self.time = START + i
+            written.append(self.write('task{}'.format(i),
+                                      rand.randint(1, 8) * 1024,
+                                      mtime=self.time))
+            # Resources of recent tasks keep being used
+            for entry in written[-3:]:
+                self.usage_log.touch(os.path.join(entry, 'file'))
+            self.lifecycle.clean()
+
+            used = get_dir_size(self.directory) - \
+                os.path.getsize(self.directory)
+            self.assertLessEqual(used, budget)
+            self.assertEqual(used, self.lifecycle.total_size())
+            for entry in written[-3:]:
+                self.assertTrue(os.path.exists(entry))
+
+        self.assertLess(len(self.entries()), len(written))
+
+
+class TestUsageLog(unittest.TestCase):
+
+    def test_disabled(self):
+        log = UsageLog(enabled=False)
+        log.touch('/some/path')
+        self.assertEqual(log.pop(), {})
+
+    def test_bounded(self):
+        log = UsageLog(clock=lambda: 1., max_entries=2)
+        for name in ['a', 'b', 'a', 'c']:
+            log.touch(os.path.join('/', name))
+        self.assertEqual(log.pop(), {'/a': 1., '/c': 1.})
+        self.assertEqual(log.pop(), {})
+
+    def test_enabled_by_lifecycle(self):
+        log = UsageLog(enabled=False)
+        ResourceLifecycle([], usage_log=log)
+        self.assertTrue(log.enabled)
@@ -0,0 +1,151 @@
+import functools
+import os
+import socket
+import statistics
+import struct
+import threading
+import time
+from typing import List
+
+import pytest
+from twisted.internet import protocol, task, threads
+from twisted.internet.selectreactor import SelectReactor
+
+from golem.client import Client
+from golem.core import dirsize
+from golem.rpc.execution import ProcedureExecutor
+from golem.rpc.utils import object_method_map
+
+# Files in each of the resource directories measured by res.dirs.size
+FILES = 20000
+# Interval between messages sent by the peer (seconds)
+MESSAGE_INTERVAL = 0.01
+# Interval between calls of the RPC procedure (seconds)
+RPC_INTERVAL = 0.05
+DURATION = 10
+
+TIMESTAMP = struct.Struct('!d')
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+class Echo(protocol.Protocol):
+    def dataReceived(self, data):
+        self.transport.write(data)
+
+
+class Peer(threading.Thread):
+    """ Peer sending timestamps from its own thread, records round trip
+        times of their echoes """
+
+    def __init__(self, port: int) -> None:
+        super().__init__(daemon=True)
+        self.latencies: List[float] = []
+        self.sock = socket.create_connection(('127.0.0.1', port))
+        self.stopped = threading.Event()
+        self.receiver = threading.Thread(target=self.receive, daemon=True)
+
+    def run(self):
+        self.receiver.start()
+        while not self.stopped.wait(MESSAGE_INTERVAL):
+            self.sock.sendall(TIMESTAMP.pack(time.perf_counter()))
+
+    def receive(self):
+        buffer = b''
+        while True:
+            data = self.sock.recv(4096)
+            if not data:
+                return
+            buffer += data
+            while len(buffer) >= TIMESTAMP.size:
+                sent, = TIMESTAMP.unpack(buffer[:TIMESTAMP.size])
+                buffer = buffer[TIMESTAMP.size:]
+                self.latencies.append(time.perf_counter() - sent)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def close(self):
+        """ Waits for the connection to be closed by the reactor """
+        self.receiver.join()
+        self.sock.close()
+
+
+@pytest.fixture(scope='module')
+def client(tmpdir_factory):
+    """ Client serving res.dirs.size for directories of FILES files """
+    dirs = {}
+    for name in ('received', 'distributed'):
+        path = tmpdir_factory.mktemp(name)
+        for i in range(FILES):
+            path.join('file{}'.format(i)).write('data')
+        dirs[name] = str(path)
+
+    client = Client.__new__(Client)
+    client.get_res_dirs = lambda: dirs
+    return client
+
+
+def measure(client, offloaded):  # pylint: disable=redefined-outer-name
+    """ Round trip times of messages echoed by the reactor while the RPC
+        procedure is called over and over """
+    reactor = SelectReactor()
+
+    def run_async(f, *args, **kwargs):
+        if offloaded:
+            return threads.deferToThreadPool(
+                reactor, reactor.getThreadPool(), f, *args, **kwargs)
+        # Run offloaded procedures on the reactor thread, as before
+        return f(*args, **kwargs)
+
+    # Cached results never stay fresh, every call runs the procedure
+    executor = ProcedureExecutor(run_async=run_async,
+                                 clock=lambda: float('-inf'))
+    get_res_dirs_sizes = object_method_map(client)['res.dirs.size']
+
+    @functools.wraps(get_res_dirs_sizes)
+    def walk_res_dirs():
+        # Walk the directories on every call, not only on the first one
+        for path in client.get_res_dirs().values():
+            dirsize.tracker.forget(path)
+        return get_res_dirs_sizes()
+
+    procedure = executor.wrap('res.dirs.size', walk_res_dirs)
+
+    port = reactor.listenTCP(0, protocol.Factory.forProtocol(Echo),
+                             interface='127.0.0.1')
+    peer = Peer(port.getHost().port)
+    rpc_loop = task.LoopingCall(procedure)
+    rpc_loop.clock = reactor
+    rpc_loop.start(RPC_INTERVAL)
+
+    def stop():
+        peer.stop()
+        reactor.stop()
+
+    reactor.callLater(DURATION, stop)
+    peer.start()
+    reactor.run(installSignalHandlers=False)
+    peer.close()
+    return peer.latencies, executor
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('offloaded', [False, True],
+                         ids=['on_reactor', 'offloaded'])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_message_latency(benchmark, client, offloaded):
+    # pylint: disable=redefined-outer-name
+    latencies, executor = benchmark.pedantic(
+        measure, args=(client, offloaded), rounds=1)
+    latencies.sort()
+    benchmark.extra_info['messages'] = len(latencies)
+    benchmark.extra_info['latency_median'] = statistics.median(latencies)
+    benchmark.extra_info['latency_p99'] = \
+        latencies[int(len(latencies) * 0.99)]
+    stats = executor.stats['res.dirs.size']
+    benchmark.extra_info['rpc_calls'] = stats.latency.count
+    benchmark.extra_info['reactor_blocking'] = stats.blocking.total
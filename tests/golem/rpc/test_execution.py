@@ -0,0 +1,198 @@
+# pylint: disable=protected-access
+import unittest
+from unittest.mock import Mock
+
+from pydispatch import dispatcher
+from twisted.internet.defer import Deferred, succeed
+from twisted.python.failure import Failure
+
+from golem.rpc import execution
+from golem.rpc import utils as rpc_utils
+
+
+class Provider:
+    def __init__(self):
+        self.calls = 0
+        self.deferreds = []
+
+    @rpc_utils.expose('plain')
+    def plain(self, value):
+        self.calls += 1
+        return value
+
+    @rpc_utils.expose('failing')
+    def failing(self):
+        raise ValueError('error')
+
+    @rpc_utils.expose('cached')
+    @execution.cached(10, invalidated_by=('test.execution', ))
+    def cached(self, value, fields=None):
+        self.calls += 1
+        return [value, fields]
+
+    @rpc_utils.expose('deferred')
+    @execution.cached(10)
+    def deferred(self):
+        self.calls += 1
+        deferred = Deferred()
+        self.deferreds.append(deferred)
+        return deferred
+
+    @rpc_utils.expose('offloaded')
+    @execution.offload
+    def offloaded(self, value):
+        self.calls += 1
+        return value
+
+    @rpc_utils.expose('static')
+    @execution.offload
+    @staticmethod
+    def static():
+        return 'static'
+
+
+class TestMarks(unittest.TestCase):
+
+    def test_marks(self):
+        provider = Provider()
+        assert provider.cached.rpc_cache == execution.CachePolicy(
+            10, ('test.execution', ))
+        assert provider.offloaded.rpc_offload
+        assert Provider.static.rpc_offload
+        assert not hasattr(provider.plain, 'rpc_cache')
+        assert not hasattr(provider.plain, 'rpc_offload')
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_record(self):
+        histogram = execution.LatencyHistogram()
+        for seconds in (0.0005, 0.001, 0.003, 10):
+            histogram.record(seconds)
+
+        result = histogram.to_dict()
+        assert result['count'] == 4
+        assert result['max'] == 10
+        assert result['total'] == 10.0045
+        assert result['buckets']['1'] == 2
+        assert result['buckets']['5'] == 1
+        assert result['buckets']['inf'] == 1
+
+
+class TestProcedureExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.time = 0.
+        self.run_async = Mock(
+            side_effect=lambda fn, *args, **kwargs: succeed(fn(*args,
+                                                               **kwargs)))
+        self.executor = execution.ProcedureExecutor(
+            run_async=self.run_async, clock=lambda: self.time)
+        self.provider = Provider()
+        self.procedures = {
+            uri: self.executor.wrap(uri, procedure)
+            for uri, procedure in
+            rpc_utils.object_method_map(self.provider).items()
+        }
+
+    def test_wraps(self):
+        procedure = self.procedures['plain']
+        assert procedure.__qualname__ == 'Provider.plain'
+        assert procedure.__module__ == Provider.__module__
+
+    def test_plain(self):
+        assert self.procedures['plain'](7) == 7
+        stats = self.executor.to_dict()['plain']
+        assert stats['latency']['count'] == 1
+        assert stats['blocking']['count'] == 1
+        assert stats['errors'] == 0
+        self.run_async.assert_not_called()
+
+    def test_failing(self):
+        with self.assertRaises(ValueError):
+            self.procedures['failing']()
+        assert self.executor.stats['failing'].errors == 1
+
+    def test_offloaded(self):
+        deferred = self.procedures['offloaded'](7)
+        assert deferred.result == 7
+        self.run_async.assert_called_once()
+        assert self.executor.stats['offloaded'].latency.count == 1
+        assert self.procedures['static']().result == 'static'
+
+    def test_cached(self):
+        cached = self.procedures['cached']
+        assert cached(1) == [1, None]
+        assert cached(1) == [1, None]
+        assert cached(2, fields=['a']) == [2, ['a']]
+        assert cached(2, fields=['a']) == [2, ['a']]
+        assert self.provider.calls == 2
+        assert self.executor.stats['cached'].cache_hits == 2
+
+    def test_cached_unhashable(self):
+        cached = self.procedures['cached']
+        cached(Mock(__hash__=None))
+        cached(Mock(__hash__=None))
+        assert self.provider.calls == 2
+
+    def test_ttl(self):
+        cached = self.procedures['cached']
+        cached(1)
+        self.time = 9
+        cached(1)
+        assert self.provider.calls == 1
+        self.time = 10
+        cached(1)
+        assert self.provider.calls == 2
+
+    def test_invalidated_by_signal(self):
+        cached = self.procedures['cached']
+        cached(1)
+        dispatcher.send(signal='test.execution', event='update')
+        cached(1)
+        assert self.provider.calls == 2
+
+    def test_invalidate(self):
+        cached = self.procedures['cached']
+        cached(1)
+        self.executor.invalidate('cached')
+        self.executor.invalidate('unknown')
+        cached(1)
+        assert self.provider.calls == 2
+
+    def test_pending_calls_share_result(self):
+        procedure = self.procedures['deferred']
+        first = procedure()
+        second = procedure()
+        assert self.provider.calls == 1
+        assert not first.called and not second.called
+
+        self.provider.deferreds[0].callback('result')
+        assert first.result == 'result'
+        assert second.result == 'result'
+        assert procedure() == 'result'
+        assert self.provider.calls == 1
+
+    def test_pending_call_invalidated(self):
+        procedure = self.procedures['deferred']
+        first = procedure()
+        self.executor.invalidate('deferred')
+        self.provider.deferreds[0].callback('stale')
+        assert first.result == 'stale'
+
+        procedure()
+        assert self.provider.calls == 2
+
+    def test_pending_call_failed(self):
+        procedure = self.procedures['deferred']
+        first = procedure()
+        second = procedure()
+        self.provider.deferreds[0].errback(ValueError('error'))
+
+        for deferred in (first, second):
+            assert isinstance(deferred.result, Failure)
+            deferred.addErrback(lambda _: None)
+        assert self.executor.stats['deferred'].errors == 1
+
+        procedure()
+        assert self.provider.calls == 2
@@ -189,3 +189,17 @@ class TestSession(unittest.TestCase):
 
         assert session.config.realm == 'realm'
         assert not session.ready.called
+
+    def test_register_procedures(self):
+        session = Session(WebSocketAddress('host', 1234, 'realm'))
+        session.register = Mock(return_value=Deferred())
+        procedure = Mock(__module__='module', __qualname__='procedure',
+                         return_value=7, spec=['__call__'])
+
+        session.register_procedures({'uri': procedure})
+
+        registered, uri = session.register.call_args[0]
+        assert uri == 'uri'
+        assert registered.__qualname__ == 'procedure'
+        assert registered() == 7
+        assert session.procedure_stats()['uri']['latency']['count'] == 1
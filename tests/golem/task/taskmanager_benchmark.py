@@ -0,0 +1,90 @@
+import os
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from golem.clientconfigdescriptor import ClientConfigDescriptor
+from golem.database import Database
+from golem.model import db, DB_FIELDS, DB_MODELS
+from golem.task.taskmanager import TaskManager
+from golem.task.taskstate import TaskState, TaskStatus
+
+TASKS = 100
+SUBTASKS = 10000
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def create_task_manager(tmpdir, tasks: int, subtasks: int,
+                        expired: int = 0) -> TaskManager:
+    """ Creates a task manager with all subtasks being computed. The given
+        number of subtasks of each task have already expired, deadlines of
+        the other ones are spread over the next hours """
+    task_manager = TaskManager(
+        Mock(), Mock(), root_path=str(tmpdir),
+        config_desc=ClientConfigDescriptor(),
+        tasks_dir=str(tmpdir), task_persistence=False)
+    task_manager.notice_task_updated = Mock()
+    add_subtask = task_manager._TaskManager__add_subtask_to_tasks_states
+
+    now = int(time.time())
+    for t in range(tasks):
+        task_id = 'task-{}'.format(t)
+        task = Mock()
+        task.header.task_id = task_id
+        task.header.deadline = now + 3600 + subtasks
+        task_state = TaskState()
+        task_state.status = TaskStatus.computing
+
+        task_manager.tasks[task_id] = task
+        task_manager.tasks_states[task_id] = task_state
+        task_manager._task_deadlines.add(task_id, task.header.deadline)
+
+        for s in range(subtasks):
+            subtask_id = '{}-{}'.format(task_id, s)
+            ctd = dict(task_id=task_id, subtask_id=subtask_id,
+                       deadline=now - 1 if s < expired else now + 3600 + s,
+                       extra_data={})
+            add_subtask('node', 'node_id', ctd, 1)
+            task_manager.subtask2task_mapping[subtask_id] = task_id
+
+    return task_manager
+
+
+@pytest.fixture(scope='module', autouse=True)
+def database(tmpdir_factory):
+    database = Database(db, fields=DB_FIELDS, models=DB_MODELS,
+                        db_dir=str(tmpdir_factory.mktemp('database')))
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope='module')
+def task_manager(tmpdir_factory):
+    return create_task_manager(tmpdir_factory.mktemp('taskmanager'),
+                               TASKS, SUBTASKS)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=100, warmup=True)
+def test_check_timeouts_idle_tick(benchmark, task_manager):
+    """ Nothing has expired since the previous tick, the common case """
+    assert benchmark(task_manager.check_timeouts) == []
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_check_timeouts_expiring_tick(benchmark, tmpdir):
+    """ 1% of subtasks have expired since the previous tick """
+    def setup():
+        manager = create_task_manager(tmpdir, TASKS, SUBTASKS,
+                                      expired=SUBTASKS // 100)
+        return (manager,), {}
+
+    def tick(manager):
+        assert len(manager.check_timeouts()) == TASKS * SUBTASKS // 100
+
+    benchmark.pedantic(tick, setup=setup, rounds=1)
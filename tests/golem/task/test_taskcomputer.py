@@ -11,12 +11,16 @@ from golem.client import ClientTaskComputerEventListener
 from golem.clientconfigdescriptor import ClientConfigDescriptor
 from golem.core.common import timeout_to_deadline
 from golem.core.deferred import sync_wait
+from golem.docker.environment import DockerEnvironment
+from golem.docker.image import DockerImage
 from golem.docker.manager import DockerManager
+from golem.environments.environment import SupportStatus
 from golem.task.taskcomputer import TaskComputer, PyTaskThread
 from golem.testutils import DatabaseFixture
 from golem.tools.ci import ci_skip
 from golem.tools.assertlogs import LogTestCase
 from golem.tools.os_info import OSInfo
+from golem.vm.vm import PooledPythonProcVM, PythonProcVM
 
 
 @ci_skip
@@ -71,6 +75,26 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
 
         tc2.run()
 
+    @mock.patch('golem.task.taskcomputer.dispatcher.send')
+    def test_run_reports_progress(self, send):
+        tc = TaskComputer(self.task_server, use_docker_manager=False)
+        tc.assigned_subtask = {'subtask_id': 'xyz'}
+        tc.counting_thread = mock.Mock()
+        tc.counting_thread.get_progress.return_value = 0.5
+
+        tc.run()
+        tc.run()
+        send.assert_called_once_with(
+            signal='golem.taskcomputer',
+            event='subtask_progress',
+            subtask_id='xyz',
+            progress=0.5,
+        )
+
+        tc.counting_thread.get_progress.return_value = 0.75
+        tc.run()
+        assert send.call_count == 2
+
     def test_resource_failure(self):
         task_server = self.task_server
 
@@ -231,7 +255,8 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
         tc.docker_manager = mock.Mock(spec=DockerManager, hypervisor=None)
 
         tc.use_docker_manager = False
-        tc.change_config(mock.Mock(), in_background=False)
+        tc.change_config(mock.Mock(python_worker_pool=0, max_memory_size=0),
+                         in_background=False)
         assert not tc.docker_manager.update_config.called
 
         tc.use_docker_manager = True
@@ -240,14 +265,96 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
             status_callback()
         tc.docker_manager.update_config = _update_config
 
-        tc.change_config(mock.Mock(), in_background=False)
+        tc.change_config(mock.Mock(python_worker_pool=0, max_memory_size=0),
+                         in_background=False)
 
         # pylint: disable=unused-argument
         def _update_config_2(status_callback, done_callback, *_, **__):
             done_callback(False)
         tc.docker_manager.update_config = _update_config_2
 
-        tc.change_config(mock.Mock(), in_background=False)
+        tc.change_config(mock.Mock(python_worker_pool=0, max_memory_size=0),
+                         in_background=False)
+
+    def test_change_config_warm_pool(self):
+        tc = TaskComputer(self.task_server, use_docker_manager=False)
+        tc.docker_manager = mock.Mock(spec=DockerManager, hypervisor=None)
+        tc.use_docker_manager = True
+
+        def environment(image, accepted=True, **container_config):
+            env = mock.Mock(spec=DockerEnvironment, docker_images=[image])
+            env.is_accepted.return_value = accepted
+            env.get_container_config.return_value = dict(
+                dict(runtime=None, volumes=[], binds={}, devices=[],
+                     environment={}),
+                **container_config)
+            return env
+
+        image = DockerImage('golemfactory/blender', tag='1.10')
+        environments_manager = \
+            self.task_server.task_keeper.environments_manager
+        environments_manager.get_environments.return_value = {
+            'BLENDER': environment(image),
+            'BLENDER_NVGPU': environment(
+                DockerImage('golemfactory/blender_nvgpu', tag='1.4'),
+                devices=['/dev/nvidia0'], runtime='nvidia'),
+            'DUMMYPOW': environment(
+                DockerImage('golemfactory/dummy', tag='1.1'),
+                accepted=False),
+        }
+        environments_manager.get_support_status.return_value = \
+            SupportStatus.ok()
+
+        config_desc = ClientConfigDescriptor()
+        config_desc.docker_warm_pool = 1
+        tc.change_config(config_desc, in_background=False)
+        tc.docker_manager.enable_warm_pool.assert_called_once_with(
+            mock.ANY, images=[image])
+
+        config_desc.docker_warm_pool = 0
+        tc.change_config(config_desc, in_background=False)
+        assert tc.docker_manager.disable_warm_pool.called
+
+    @mock.patch('golem.task.taskcomputer.PythonWorkerPool')
+    def test_change_python_worker_pool(self, pool_cls):
+        pool_cls.return_value.size = 2
+        pool_cls.return_value.memory_limit = None
+        tc = TaskComputer(self.task_server, use_docker_manager=False)
+
+        tc.change_python_worker_pool(2)
+        pool = PyTaskThread.worker_pool
+        assert pool is pool_cls.return_value
+        assert pool.fill.called
+
+        thread = PyTaskThread({}, self.path, self.path, 0)
+        assert isinstance(thread.vm, PooledPythonProcVM)
+
+        tc.change_python_worker_pool(2)
+        assert pool_cls.call_count == 1
+
+        tc.quit()
+        assert pool.close.called
+        assert PyTaskThread.worker_pool is None
+        thread = PyTaskThread({}, self.path, self.path, 0)
+        assert isinstance(thread.vm, PythonProcVM)
+
+    @mock.patch('golem.task.taskcomputer.PythonWorkerPool')
+    def test_python_worker_pool_memory_limit(self, pool_cls):
+        pool_cls.return_value.size = 1
+        pool_cls.return_value.memory_limit = None
+        tc = TaskComputer(self.task_server, use_docker_manager=False)
+        tc.docker_manager = mock.Mock(spec=DockerManager, hypervisor=None)
+        config_desc = ClientConfigDescriptor()
+        config_desc.python_worker_pool = 1
+
+        tc.change_config(config_desc)
+        pool_cls.assert_called_once_with(1, memory_limit=None)
+
+        config_desc.max_memory_size = 1024 * 1024  # KiB
+        tc.change_config(config_desc)
+        pool_cls.assert_called_with(1, memory_limit=1024 ** 3)
+        assert pool_cls.return_value.close.called
+        tc.quit()
 
     def test_event_listeners(self):
         client = mock.Mock()
@@ -964,6 +964,42 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
         assert isinstance(all_subtasks, list)
         assert all(isinstance(t, dict) for t in all_subtasks)
 
+    @patch('golem.network.p2p.local_node.LocalNode.collect_network_info')
+    def test_get_task_dict_cached(self, *_):
+        apps_manager = AppsManager()
+        apps_manager.load_all_apps()
+        tm = TaskManager(
+            dt_p2p_factory.Node(),
+            Mock(),
+            root_path=self.path,
+            config_desc=ClientConfigDescriptor(),
+            apps_manager=apps_manager,
+            task_persistence=False)
+        task_id, _ = self.__build_tasks(tm, 1)
+
+        def get_task_dict():
+            task_dict = tm.get_task_dict(task_id)
+            # Time dependent
+            del task_dict['duration']
+            del task_dict['time_remaining']
+            return task_dict
+
+        expected = get_task_dict()
+
+        with patch.object(tm, 'get_task_definition_dict',
+                          wraps=tm.get_task_definition_dict) as definition:
+            assert get_task_dict() == expected
+            definition.assert_not_called()
+
+            tm.tasks_states[task_id].status = TaskStatus.finished
+            task_dict = get_task_dict()
+            assert task_dict['status'] == TaskStatus.finished.value
+            definition.assert_not_called()
+
+            tm.notice_task_updated(task_id)
+            assert get_task_dict() == task_dict
+            definition.assert_called_once()
+
     @patch('golem.network.p2p.local_node.LocalNode.collect_network_info')
     @patch('apps.blender.task.blenderrendertask.'
            'BlenderTaskTypeInfo.get_preview')
@@ -1361,6 +1397,54 @@ class TestTaskManager(LogTestCase, TestDatabaseWithReactor,  # noqa # pylint: di
                 TaskStatus.timeout,
             )
 
+    @freeze_time()
+    def test_check_timeouts_inactive_task(self, *_):
+        start_time = datetime.datetime.now()
+        with freeze_time(start_time):
+            t = self._get_task_mock(timeout=1)
+            self.tm.add_new_task(t)
+
+        # Deadlines of tasks which were not started are put aside
+        with freeze_time(start_time + datetime.timedelta(seconds=2)):
+            self.tm.check_timeouts()
+            self.assertIs(
+                self.tm.tasks_states['xyz'].status,
+                TaskStatus.notStarted,
+            )
+            self.assertIn('xyz', self.tm._dormant_deadlines)
+
+            self.tm.start_task(t.header.task_id)
+            self.tm.check_timeouts()
+            self.assertIs(
+                self.tm.tasks_states['xyz'].status,
+                TaskStatus.timeout,
+            )
+            self.assertNotIn('xyz', self.tm._dormant_deadlines)
+
+    @freeze_time()
+    def test_check_timeouts_only_expired(self, *_):
+        with patch('golem.task.taskbase.Task.needs_computation',
+                   return_value=True):
+            start_time = datetime.datetime.now()
+            with freeze_time(start_time):
+                t = self._get_task_mock(timeout=10, subtask_timeout=5)
+                self.tm.add_new_task(t)
+                self.tm.start_task(t.header.task_id)
+                self.tm.get_next_subtask(
+                    "ABC", "ABC", "xyz", 1000, 10, 5, 10,
+                    "10.10.10.10",
+                )
+
+            with freeze_time(start_time + datetime.timedelta(seconds=2)):
+                assert self.tm.check_timeouts() == []
+            assert len(self.tm._task_deadlines) == 1
+            assert len(self.tm._subtask_deadlines) == 1
+
+            with freeze_time(start_time + datetime.timedelta(seconds=6)):
+                assert self.tm.check_timeouts() == ["ABC"]
+            assert len(self.tm._task_deadlines) == 1
+            assert not self.tm._subtask_deadlines
+
     def test_subtask_to_task(self, *_):
         task_keeper = Mock(subtask_to_task=dict())
         mapping = dict()
@@ -4,7 +4,8 @@ from datetime import timedelta
 
 from freezegun import freeze_time
 
-from golem.task.timer import ActionTimer, ActionTimers, ThirstTimer
+from golem.task.timer import ActionTimer, ActionTimers, DeadlineQueue, \
+    ThirstTimer
 
 
 class TestActionTimer(unittest.TestCase):
@@ -122,3 +123,60 @@ class TestActionTimers(unittest.TestCase):
         timer.finish(identifier)
 
         assert timer.remove(identifier) == 5
+
+
+class TestDeadlineQueue(unittest.TestCase):
+
+    def test_pop_expired(self):
+        queue = DeadlineQueue()
+        queue.add('c', 30)
+        queue.add('a', 10)
+        queue.add('b', 20)
+
+        assert list(queue.pop_expired(10)) == []
+        assert list(queue.pop_expired(25)) == [('a', 10), ('b', 20)]
+        assert len(queue) == 1
+        assert 'c' in queue
+        assert list(queue.pop_expired(25)) == []
+
+    def test_update(self):
+        queue = DeadlineQueue()
+        queue.add('a', 10)
+        queue.add('a', 40)
+
+        assert len(queue) == 1
+        assert list(queue.pop_expired(20)) == []
+        assert list(queue.pop_expired(50)) == [('a', 40)]
+
+    def test_remove(self):
+        queue = DeadlineQueue()
+        queue.add('a', 10)
+        queue.add('b', 10)
+        queue.remove('a')
+        queue.remove('unknown')
+
+        assert 'a' not in queue
+        assert list(queue.pop_expired(20)) == [('b', 10)]
+
+    def test_compaction(self):
+        queue = DeadlineQueue()
+        for i in range(1000):
+            queue.add(i, i)
+        for i in range(999):
+            queue.remove(i)
+
+        assert len(queue) == 1
+        assert len(queue._heap) < 1000
+        assert list(queue.pop_expired(1000)) == [(999, 999)]
+
+    def test_add_while_popping(self):
+        queue = DeadlineQueue()
+        queue.add('a', 10)
+        queue.add('b', 20)
+
+        popped = []
+        for key, _ in queue.pop_expired(30):
+            popped.append(key)
+            if key == 'a':
+                queue.add('c', 15)
+        assert popped == ['a', 'c', 'b']
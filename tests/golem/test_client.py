@@ -38,7 +38,10 @@ from golem.manager.nodestatesnapshot import ComputingSubtaskStateSnapshot
 from golem.network.p2p.peersession import PeerSessionInfo
 from golem.report import StatusPublisher
 from golem.resource.dirmanager import DirManager
-from golem.rpc.mapping.rpceventnames import UI, Environment, Golem
+from golem.resource import lifecycle
+from golem.resource.lifecycle import UsageLog
+from golem.rpc.mapping.rpceventnames import UI, Environment, Golem, \
+    Computation
 from golem.task import taskstate
 from golem.task.acl import Acl
 from golem.task.taskserver import TaskServer
@@ -327,6 +330,26 @@ class TestClient(TestClientBase):
         self.client.clean_old_tasks()
         self.client.delete_task.assert_called_once_with('old_task')
 
+    def test_is_task_in_use(self, *_):
+        tm = Mock()
+        self.client.task_server = Mock(
+            task_manager=tm,
+            task_computer=Mock(assigned_subtask={'task_id': 'computed'}),
+        )
+        tm.tasks_states = {
+            status.name: Mock(status=status)
+            for status in taskstate.TaskStatus
+        }
+
+        for status in taskstate.TaskStatus:
+            self.assertEqual(self.client.is_task_in_use(status.name),
+                             not status.is_completed(),
+                             status)
+        self.assertTrue(self.client.is_task_in_use('notStarted'))
+        self.assertTrue(self.client.is_task_in_use('creatingDeposit'))
+        self.assertTrue(self.client.is_task_in_use('computed'))
+        self.assertFalse(self.client.is_task_in_use('unknown'))
+
     def test_restore_locks(self, *_):
         tm = Mock()
         self.client.task_server = Mock(task_manager=tm)
@@ -544,22 +567,45 @@ class TestResourceCleanerService(testwithreactor.TestWithReactor):
 
     def setUp(self):
         self.older_than_seconds = 5
+        self.disk_budget = 1024
         self.client = Mock()
+        self.client.get_res_dirs.return_value = {
+            'received': 'received_dir',
+            'distributed': 'distributed_dir',
+        }
         self.service = ResourceCleanerService(
             self.client,
             interval_seconds=1,
             older_than_seconds=self.older_than_seconds,
+            disk_budget=self.disk_budget,
         )
 
-    def test_run(self):
+    @patch('golem.client.ResourceLifecycle')
+    def test_run(self, lifecycle):
+        self.service._run()
         self.service._run()
 
-        self.client.remove_distributed_files.assert_called_with(
-            self.older_than_seconds,
-        )
-        self.client.remove_received_files.assert_called_with(
-            self.older_than_seconds,
+        lifecycle.assert_called_once_with(
+            ANY,
+            disk_budget=self.disk_budget,
+            max_age=self.older_than_seconds,
+            is_protected=self.client.is_task_in_use,
         )
+        self.assertEqual(sorted(lifecycle.call_args[0][0]),
+                         ['distributed_dir', 'received_dir'])
+        self.assertEqual(lifecycle.return_value.clean.call_count, 2)
+
+    @patch('golem.client.LoopingCallService.start')
+    @patch('golem.client.LoopingCallService.stop')
+    @patch('golem.client.lifecycle.usage', UsageLog(enabled=False))
+    def test_usage_recorded_while_running(self, *_):
+        self.service.start()
+        self.assertTrue(lifecycle.usage.enabled)
+        lifecycle.usage.touch('/used/path')
+
+        self.service.stop()
+        self.assertFalse(lifecycle.usage.enabled)
+        self.assertEqual(lifecycle.usage.pop(), {})
 
 
 class TestTaskCleanerService(testwithreactor.TestWithReactor):
@@ -726,6 +772,20 @@ class TestClientRPCMethods(TestClientBase, LogTestCase):
         c.config_changed()
         c._publish.assert_called_with(Environment.evt_opts_changed)
 
+    def test_subtask_progress_published(self, *_):
+        c = self.client
+        c._publish = Mock()
+
+        dispatcher.send(signal='golem.taskcomputer', event='subtask_progress',
+                        subtask_id='subtask', progress=0.25)
+        c._publish.assert_called_once_with(Computation.evt_subtask_progress,
+                                           'subtask', 0.25)
+
+        c._publish = Mock()
+        c.taskcomputer_listener(event='subtask_finished',
+                                subtask_id='subtask', min_performance=1.0)
+        assert not c._publish.called
+
     def test_settings(self, *_):
         c = self.client
         HardwarePresets.initialize(self.client.datadir)
@@ -872,6 +932,52 @@ class TestClientRPCMethods(TestClientBase, LogTestCase):
             task_id, single=False
         )
 
+    def test_get_tasks(self, *_):
+        c = self.client
+        task_manager = c.task_server.task_manager
+        task_ids = ['task-{}'.format(i) for i in range(4)]
+        for task_id in task_ids:
+            task_manager.tasks[task_id] = Mock()
+            task_manager.tasks_states[task_id] = Mock(
+                subtask_states={task_id + '-subtask': Mock()})
+            task_manager.subtask2task_mapping[task_id + '-subtask'] = task_id
+        task_manager.get_task_dict = Mock(side_effect=lambda task_id: {
+            'id': task_id,
+            'status': 'Computing',
+            'estimated_cost': 10 ** 20,
+            'estimated_fee': None,
+        })
+        totals = c.transaction_system.get_tasks_payment_totals
+        totals.return_value = {'task-1': (10 ** 20, 10)}
+
+        tasks = c.get_tasks()
+        assert [t['id'] for t in tasks] == task_ids
+        assert tasks[1]['cost'] == str(10 ** 20)
+        assert tasks[1]['fee'] == '10'
+        assert tasks[0]['cost'] is None
+        assert tasks[0]['estimated_cost'] == str(10 ** 20)
+        # A single query for all the tasks
+        totals.assert_called_once_with(task_manager.subtask2task_mapping)
+
+        totals.reset_mock()
+        tasks = c.get_tasks(offset=1, limit=2, fields=['id', 'cost'])
+        assert tasks == [
+            {'id': 'task-1', 'cost': str(10 ** 20)},
+            {'id': 'task-2', 'cost': None},
+        ]
+        totals.assert_called_once_with({
+            'task-1-subtask': 'task-1',
+            'task-2-subtask': 'task-2',
+        })
+
+        totals.reset_mock()
+        tasks = c.get_tasks(fields=['id', 'status'])
+        assert tasks[3] == {'id': 'task-3', 'status': 'Computing'}
+        totals.assert_not_called()
+
+        assert c.get_tasks('task-1', fields=['fee']) == {'fee': '10'}
+        assert c.get_task('task-1')['cost'] == str(10 ** 20)
+
     def test_task_stats(self, *_):
         c = self.client
 
@@ -0,0 +1,119 @@
+import os
+import threading
+
+import psutil
+import pytest
+
+from golem.vm import sharedresult
+from golem.vm.pool import PythonWorkerPool
+from golem.vm.vm import PooledPythonProcVM
+
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+SIZES = [KB, MB, 64 * MB, 512 * MB, 2 * GB]
+
+# The output is sent as bytes through the worker's pipe
+COPIED = 'copied'
+# The output is moved to a shared result by the worker
+SHARED = 'shared'
+# The job writes its output to a shared result in place
+MAPPED = 'mapped'
+
+CODE = {
+    COPIED: "output = {'data': [bytes(size)]}",
+    SHARED: "output = {'data': [bytes(size)]}",
+    MAPPED: """
+result = shared_result(size)
+chunk = bytes(min(size, 1024 * 1024))
+with result.view() as view:
+    for offset in range(0, size, len(chunk)):
+        end = min(offset + len(chunk), size)
+        view[offset:end] = chunk[:end - offset]
+output = {'data': [result]}
+""",
+}
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+class RSSMonitor(threading.Thread):
+    """ Samples the resident memory of the process and its children """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.stopped = threading.Event()
+        self.base = self.sample()
+        self.peak = self.base
+
+    def sample(self) -> int:
+        rss = 0
+        for process in [self.process] + self.process.children(True):
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, self.sample())
+
+    def stop(self) -> int:
+        """ Returns the peak growth of resident memory """
+        self.stopped.set()
+        self.join()
+        return self.peak - self.base
+
+
+def hand_off(pool, mode, size, directory):
+    """ Runs the job and returns the path of its result file, as passed to
+    the result packager """
+    vm = PooledPythonProcVM(pool)
+    output, error = vm.run_task(CODE[mode],
+                                {'size': size, 'tmp_path': directory})
+    assert error is None, error
+    payload, = output['data']
+    if isinstance(payload, bytes):
+        # Copied, or too small to be shared
+        path = os.path.join(directory, 'result.bin')
+        with open(path, 'wb') as f:
+            f.write(payload)
+        return path
+    return sharedresult.claim(payload)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('mode', [COPIED, SHARED, MAPPED])
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_result_handoff(benchmark, monkeypatch, tmpdir, mode, size):
+    if mode == COPIED and size >= 2 * GB:
+        pytest.skip("pickled payloads over 2 GB can't be sent through "
+                    "a multiprocessing pipe")
+    if mode == COPIED:
+        # Set before the worker is forked
+        monkeypatch.setattr(sharedresult, 'SHARE_THRESHOLD', float('inf'))
+
+    directory = str(tmpdir)
+    pool = PythonWorkerPool()
+    pool.fill()
+    peaks = []
+
+    def run():
+        monitor = RSSMonitor()
+        monitor.start()
+        path = hand_off(pool, mode, size, directory)
+        peaks.append(monitor.stop())
+        assert os.path.getsize(path) == size
+        os.remove(path)
+
+    try:
+        benchmark.pedantic(run, rounds=1 if size >= 512 * MB else 3)
+    finally:
+        pool.close()
+    benchmark.extra_info['peak_rss_growth'] = max(peaks)
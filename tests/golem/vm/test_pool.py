@@ -0,0 +1,144 @@
+import time
+from copy import copy
+from unittest import TestCase
+
+from golem.vm.pool import PythonWorkerPool
+from golem.vm.vm import PooledPythonProcVM, PythonProcVM
+
+SUM_CODE = "cnt=0\nfor i in range(n):\n\tcnt += i\noutput=cnt"
+
+
+class WorkerPoolTestBase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pool = PythonWorkerPool(size=1)
+        self.pool.fill()
+
+    def tearDown(self):
+        self.pool.close()
+        super().tearDown()
+
+
+class TestPythonWorkerPool(WorkerPoolTestBase):
+
+    def test_fill(self):
+        self.pool.size = 2
+        self.pool.fill()
+        assert len(self.pool) == 2
+        assert self.pool.idle == 2
+
+    def test_run(self):
+        result, err = self.pool.run(SUM_CODE, {'n': 100})
+        assert err is None
+        assert result == 4950
+
+    def test_exception(self):
+        result, err = self.pool.run("raise Exception('some error')", {})
+        assert result is None
+        assert err == "some error"
+
+        # The worker survives failing jobs
+        assert self.pool.stats['started'] == 1
+        assert self.pool.run("output=1", {}) == (1, None)
+
+    def test_scope_isolation(self):
+        self.pool.run("leaked = 1\noutput = 1", {})
+        result, err = self.pool.run("output = 'leaked' in globals()", {})
+        assert err is None
+        assert result is False
+
+    def test_unpicklable_output(self):
+        result, err = self.pool.run("output = lambda: 1", {})
+        assert result is None
+        assert err.startswith("Cannot send job output")
+        assert self.pool.run("output=1", {}) == (1, None)
+
+    def test_recycle_after_max_jobs(self):
+        self.pool.max_jobs = 2
+        pids = set()
+        for _ in range(5):
+            pid, _ = self.pool.run("import os\noutput = os.getpid()", {})
+            pids.add(pid)
+
+        assert len(pids) == 3
+        assert self.pool.stats['recycled'] == 2
+        assert len(self.pool) == 1
+
+    def test_recycle_on_memory_growth(self):
+        self.pool.max_memory_growth = 10 * 1024 * 1024
+        code = "import os\n" \
+               "output = os.getpid()\n" \
+               "import builtins\n" \
+               "builtins._golem_leak = getattr(builtins, '_golem_leak', [])\n" \
+               "builtins._golem_leak.append(bytearray(n))"
+
+        first, _ = self.pool.run(code, {'n': 1})
+        second, _ = self.pool.run(code, {'n': 64 * 1024 * 1024})
+        third, _ = self.pool.run(code, {'n': 1})
+
+        assert first == second
+        assert third != second
+        assert self.pool.stats['recycled'] == 1
+
+    def test_memory_limit(self):
+        self.pool.close()
+        self.pool = PythonWorkerPool(memory_limit=64 * 1024 * 1024)
+
+        result, err = self.pool.run("output = len(bytearray(n))",
+                                    {'n': 512 * 1024 * 1024})
+        assert result is None
+        assert err == "Job exceeded its memory limit"
+
+        # The limit only applies while a job is running
+        assert self.pool.run("output = len(bytearray(n))",
+                             {'n': 1024}) == (1024, None)
+
+    def test_dead_worker_is_replaced(self):
+        result, err = self.pool.run("import os\nos._exit(1)", {})
+        assert result is None
+        assert err.startswith("Worker process terminated")
+        assert self.pool.run("output=1", {}) == (1, None)
+        assert self.pool.stats['recycled'] == 1
+
+    def test_close(self):
+        worker = self.pool.acquire()
+        self.pool.release(worker)
+        self.pool.close()
+
+        assert not worker.alive
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire()
+
+
+class TestPooledPythonProcVM(WorkerPoolTestBase):
+
+    def test_good_task(self):
+        vm = PooledPythonProcVM(self.pool)
+        extra_arg = {'n': 10000}
+        result, err = vm.run_task(SUM_CODE, copy(extra_arg))
+        assert err is None
+        assert result == (extra_arg['n'] - 1) * extra_arg['n'] * 0.5
+
+    def test_end_comp(self):
+        vm = PooledPythonProcVM(self.pool)
+        vm.worker = self.pool.acquire()
+        vm.end_comp()
+        vm.worker.process.join(5)
+        assert not vm.worker.alive
+
+    def test_dispatch_latency(self):
+        """ Pooled workers skip process and manager start-up """
+        jobs = 5
+
+        started = time.time()
+        for _ in range(jobs):
+            PythonProcVM().run_task("output=1", {})
+        cold = (time.time() - started) / jobs
+
+        started = time.time()
+        for _ in range(jobs):
+            PooledPythonProcVM(self.pool).run_task("output=1", {})
+        pooled = (time.time() - started) / jobs
+
+        assert pooled < cold
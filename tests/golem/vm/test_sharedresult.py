@@ -0,0 +1,161 @@
+import os
+import pickle
+
+from golem.task.taskthread import TaskThread
+from golem.testutils import TempDirFixture
+from golem.vm import sharedresult
+from golem.vm.pool import PythonWorkerPool
+from golem.vm.sharedresult import SharedResult
+from golem.vm.vm import PooledPythonProcVM, PythonProcVM
+
+LARGE = sharedresult.SHARE_THRESHOLD
+
+LARGE_OUTPUT_CODE = "output = {'data': [b'x' * size], 'result_type': 0}"
+
+SHARED_OUTPUT_CODE = """
+result = shared_result(size)
+with result.view() as view:
+    view[:] = b'y' * size
+output = {'data': [result]}
+"""
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class TestSharedResult(TempDirFixture):
+
+    def test_create(self):
+        result = SharedResult.create(10, self.tempdir)
+        self.assertEqual(os.path.dirname(result.path), self.tempdir)
+        self.assertEqual(os.path.getsize(result.path), 10)
+
+        with result.view() as view:
+            view[:] = b'0123456789'
+        with result.view(writable=False) as view:
+            self.assertEqual(view.tobytes(), b'0123456789')
+        self.assertEqual(read(result.path), b'0123456789')
+
+    def test_empty(self):
+        result = SharedResult.from_buffer(b'', self.tempdir)
+        with result.view(writable=False) as view:
+            self.assertEqual(view.tobytes(), b'')
+
+    def test_from_buffer(self):
+        data = bytearray(range(256))
+        result = SharedResult.from_buffer(memoryview(data), self.tempdir)
+        self.assertEqual(result.size, 256)
+        self.assertEqual(read(result.path), bytes(data))
+
+    def test_pickle(self):
+        result = SharedResult.create(10, self.tempdir)
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertLess(len(pickle.dumps(result)), 200)
+
+    def test_release(self):
+        with SharedResult.create(10, self.tempdir) as result:
+            pass
+        self.assertFalse(os.path.exists(result.path))
+        result.release()
+
+    def test_share(self):
+        output = {'data': [b'x' * LARGE, b'small'], 'other': (b'x' * LARGE, )}
+        shared = sharedresult.share(output, self.tempdir)
+
+        self.assertEqual(shared['data'][1], b'small')
+        for result in (shared['data'][0], shared['other'][0]):
+            self.assertIsInstance(result, SharedResult)
+            self.assertEqual(read(result.path), b'x' * LARGE)
+
+        claimed = sharedresult.claim(shared)
+        self.assertEqual(claimed['data'], [shared['data'][0].path, b'small'])
+
+        sharedresult.release(shared)
+        self.assertEqual(os.listdir(self.tempdir), [])
+
+    def test_share_keeps_subclasses(self):
+        class Output(tuple):
+            pass
+
+        output = Output((b'x' * LARGE, ))
+        self.assertIs(sharedresult.share(output, self.tempdir), output)
+
+
+class TestSharedOutput(TempDirFixture):
+
+    def run_task(self, vm, code, size=LARGE):
+        return vm.run_task(code, {'size': size, 'tmp_path': self.tempdir})
+
+    def assert_shared(self, output, content):
+        result, = output['data']
+        self.assertIsInstance(result, SharedResult)
+        self.assertEqual(os.path.dirname(result.path), self.tempdir)
+        self.assertEqual(read(result.path), content)
+
+    def test_proc_vm(self):
+        output, err = self.run_task(PythonProcVM(), SHARED_OUTPUT_CODE)
+        self.assertIsNone(err)
+        self.assert_shared(output, b'y' * LARGE)
+
+    def test_proc_vm_large_output(self):
+        output, err = self.run_task(PythonProcVM(), LARGE_OUTPUT_CODE)
+        self.assertIsNone(err)
+        self.assertEqual(output['data'], [b'x' * LARGE])
+        self.assertEqual(os.listdir(self.tempdir), [])
+
+    def test_pooled_vm_small_output(self):
+        pool = PythonWorkerPool()
+        try:
+            output, err = self.run_task(PooledPythonProcVM(pool),
+                                        LARGE_OUTPUT_CODE, size=10)
+            self.assertIsNone(err)
+            self.assertEqual(output['data'], [b'x' * 10])
+        finally:
+            pool.close()
+
+    def test_pooled_vm(self):
+        pool = PythonWorkerPool()
+        try:
+            output, err = self.run_task(PooledPythonProcVM(pool),
+                                        LARGE_OUTPUT_CODE)
+            self.assertIsNone(err)
+            self.assert_shared(output, b'x' * LARGE)
+
+            output, err = self.run_task(PooledPythonProcVM(pool),
+                                        SHARED_OUTPUT_CODE)
+            self.assertIsNone(err)
+            self.assert_shared(output, b'y' * LARGE)
+        finally:
+            pool.close()
+
+    def test_task_thread(self):
+        extra_data = {'src_code': SHARED_OUTPUT_CODE, 'size': LARGE}
+        thread = TaskThread(extra_data, self.tempdir, self.tempdir)
+        thread.vm = PythonProcVM()
+        thread.run()
+
+        path, = thread.result['data']
+        self.assertEqual(os.path.dirname(path), self.tempdir)
+        self.assertEqual(read(path), b'y' * LARGE)
+
+    def test_task_thread_large_output(self):
+        extra_data = {'src_code': LARGE_OUTPUT_CODE, 'size': LARGE}
+        thread = TaskThread(extra_data, self.tempdir, self.tempdir)
+        thread.vm = PythonProcVM()
+        thread.run()
+
+        self.assertEqual(thread.result['data'], [b'x' * LARGE])
+
+    def test_task_thread_error(self):
+        extra_data = {
+            'src_code': SHARED_OUTPUT_CODE + "\nraise Exception('failed')",
+            'size': LARGE,
+        }
+        thread = TaskThread(extra_data, self.tempdir, self.tempdir)
+        thread.vm = PythonProcVM()
+        thread.run()
+
+        self.assertEqual(thread.error_msg, 'failed')
+        self.assertEqual(os.listdir(self.tempdir), [])
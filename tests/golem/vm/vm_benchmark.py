@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from golem.vm.pool import PythonWorkerPool
+from golem.vm.vm import PooledPythonProcVM, PythonProcVM
+
+JOBS = 1000
+CODE = "output = n + 1"
+
+
+def skip_benchmarks():
+    return not os.environ.get('benchmarks', False)
+
+
+def run_jobs(create_vm):
+    for n in range(JOBS):
+        assert create_vm().run_task(CODE, {'n': n}) == (n + 1, None)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_proc_vm_throughput(benchmark):
+    benchmark.pedantic(run_jobs, args=(PythonProcVM,), rounds=1)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=1, warmup=False)
+def test_pooled_vm_throughput(benchmark):
+    pool = PythonWorkerPool()
+    pool.fill()
+    try:
+        benchmark.pedantic(run_jobs, args=(lambda: PooledPythonProcVM(pool),),
+                           rounds=3)
+    finally:
+        pool.close()
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=20, warmup=False)
+def test_proc_vm_dispatch_latency(benchmark):
+    benchmark(PythonProcVM().run_task, CODE, {'n': 1})
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.benchmark(min_rounds=100, warmup=True)
+def test_pooled_vm_dispatch_latency(benchmark):
+    pool = PythonWorkerPool()
+    pool.fill()
+    try:
+        benchmark(lambda: PooledPythonProcVM(pool).run_task(CODE, {'n': 1}))
+    finally:
+        pool.close()